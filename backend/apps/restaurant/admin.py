@@ -3,7 +3,14 @@ Django Admin configuration for restaurant models.
 """
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Customer, Table, Staff, Supplier, Ingredient
+from .models import (
+    Customer, Table, Staff, Supplier, Ingredient, TableStatusEvent, SectionAssignment,
+    TimeEntry, StaffAvailability, CoverageRequirement, ScheduledShift,
+    TipPool, TipShare, LeaderboardSnapshot, SupplierDelivery, SupplierDeliveryLine,
+    SupplierWeeklyScore, SupplierItem, IngredientPriceHistory, PurchaseOrder, PurchaseOrderLine,
+    StockMovement, Recipe, RecipeLine, StockLot, InventoryValuation,
+    ParLevelSuggestion, StockCountSession, StockCountLine, UnitConversion
+)
 
 
 @admin.register(Customer)
@@ -86,7 +93,7 @@ class TableAdmin(admin.ModelAdmin):
             'fields': ('table_number', 'capacity', 'section', 'is_active')
         }),
         ('Status', {
-            'fields': ('status',)
+            'fields': ('status', 'status_changed_at')
         }),
         ('Floor Plan Coordinates', {
             'fields': ('x_coordinate', 'y_coordinate'),
@@ -95,6 +102,8 @@ class TableAdmin(admin.ModelAdmin):
         }),
     )
     
+    readonly_fields = ['status_changed_at']
+    
     def status_badge(self, obj):
         """Display colored status badge."""
         colors = {
@@ -200,7 +209,10 @@ class SupplierAdmin(admin.ModelAdmin):
             'fields': ('phone_number', 'email', 'address')
         }),
         ('Business Terms', {
-            'fields': ('payment_terms', 'delivery_schedule', 'minimum_order', 'delivery_fee')
+            'fields': (
+                'payment_terms', 'delivery_schedule', 'delivery_days', 'delivery_time',
+                'order_cutoff_time', 'order_lead_days', 'minimum_order', 'delivery_fee'
+            )
         }),
         ('Performance', {
             'fields': ('quality_rating',)
@@ -249,6 +261,7 @@ class IngredientAdmin(admin.ModelAdmin):
     
     list_filter = [
         'category',
+        'stock_status',
         'storage_location',
         'is_perishable',
         'supplier'
@@ -286,6 +299,12 @@ class IngredientAdmin(admin.ModelAdmin):
     
     readonly_fields = ['last_updated']
     
+    def get_readonly_fields(self, request, obj=None):
+        """Stock only changes through the movement ledger once the ingredient exists."""
+        if obj is not None:
+            return self.readonly_fields + ['current_stock']
+        return self.readonly_fields
+    
     def current_stock_display(self, obj):
         """Display current stock with unit of measure."""
         return f"{obj.current_stock} {obj.unit_of_measure}"
@@ -321,6 +340,377 @@ class IngredientAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related('supplier')
 
 
+@admin.register(TableStatusEvent)
+class TableStatusEventAdmin(admin.ModelAdmin):
+    """Read-only admin for the table status event stream."""
+    
+    list_display = [
+        'table',
+        'section',
+        'from_status',
+        'to_status',
+        'occurred_at',
+        'staff'
+    ]
+    
+    list_filter = [
+        'to_status',
+        'section'
+    ]
+    
+    date_hierarchy = 'occurred_at'
+    
+    list_select_related = ['table', 'staff']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SectionAssignment)
+class SectionAssignmentAdmin(admin.ModelAdmin):
+    """Admin configuration for server section assignments."""
+    
+    list_display = [
+        'staff',
+        'section',
+        'load',
+        'assigned_at',
+        'released_at'
+    ]
+    
+    list_filter = [
+        'section',
+        'released_at'
+    ]
+    
+    list_select_related = ['staff']
+    
+    readonly_fields = ['assigned_at']
+
+
+@admin.register(TimeEntry)
+class TimeEntryAdmin(admin.ModelAdmin):
+    """Admin configuration for time clock entries."""
+    
+    list_display = [
+        'staff',
+        'clock_in',
+        'clock_out',
+        'role',
+        'hourly_rate',
+        'source'
+    ]
+    
+    list_filter = [
+        'clock_in',
+        'role',
+        'source'
+    ]
+    
+    search_fields = [
+        'staff__name',
+        'staff__employee_number'
+    ]
+    
+    date_hierarchy = 'clock_in'
+    
+    list_select_related = ['staff']
+
+
+@admin.register(StaffAvailability)
+class StaffAvailabilityAdmin(admin.ModelAdmin):
+    """Admin configuration for staff availability windows."""
+    
+    list_display = ['staff', 'weekday', 'start_time', 'end_time']
+    list_filter = ['weekday']
+    search_fields = ['staff__name']
+    list_select_related = ['staff']
+
+
+@admin.register(CoverageRequirement)
+class CoverageRequirementAdmin(admin.ModelAdmin):
+    """Admin configuration for role coverage requirements."""
+    
+    list_display = ['role', 'weekday', 'hour', 'headcount']
+    list_filter = ['role', 'weekday']
+    list_editable = ['headcount']
+
+
+@admin.register(ScheduledShift)
+class ScheduledShiftAdmin(admin.ModelAdmin):
+    """Admin configuration for rota shifts."""
+    
+    list_display = ['staff', 'role', 'start', 'end', 'status']
+    list_filter = ['week_start', 'role', 'status']
+    search_fields = ['staff__name']
+    list_select_related = ['staff']
+
+
+class TipShareInline(admin.TabularInline):
+    """Read-only inline for tip shares."""
+    
+    model = TipShare
+    fields = ['staff', 'role', 'hours', 'weight', 'amount']
+    readonly_fields = fields
+    can_delete = False
+    extra = 0
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TipPool)
+class TipPoolAdmin(admin.ModelAdmin):
+    """Read-only admin for distributed tip pools."""
+    
+    list_display = ['period_start', 'period_end', 'total_amount', 'created_by', 'created_at']
+    list_filter = ['period_start']
+    readonly_fields = [
+        'period_start', 'period_end', 'total_amount', 'role_weights',
+        'created_by', 'notes', 'created_at'
+    ]
+    inlines = [TipShareInline]
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(LeaderboardSnapshot)
+class LeaderboardSnapshotAdmin(admin.ModelAdmin):
+    """Admin configuration for persisted leaderboard ranks."""
+    
+    list_display = ['period_start', 'period', 'metric', 'rank', 'staff', 'score']
+    list_filter = ['period', 'metric']
+    search_fields = ['staff__name']
+    date_hierarchy = 'period_start'
+    list_select_related = ['staff']
+
+
+class SupplierDeliveryLineInline(admin.TabularInline):
+    """Inline for delivery lines."""
+    
+    model = SupplierDeliveryLine
+    extra = 0
+    raw_id_fields = ['ingredient']
+
+
+@admin.register(SupplierDelivery)
+class SupplierDeliveryAdmin(admin.ModelAdmin):
+    """Admin configuration for received deliveries."""
+    
+    list_display = ['supplier', 'purchase_order', 'expected_at', 'received_at', 'received_by']
+    list_filter = ['supplier']
+    date_hierarchy = 'received_at'
+    list_select_related = ['supplier', 'received_by']
+    raw_id_fields = ['purchase_order']
+    inlines = [SupplierDeliveryLineInline]
+
+
+@admin.register(SupplierWeeklyScore)
+class SupplierWeeklyScoreAdmin(admin.ModelAdmin):
+    """Read-only admin for weekly supplier scorecards."""
+    
+    list_display = [
+        'supplier', 'week_start', 'deliveries', 'on_time_deliveries',
+        'quantity_ordered', 'quantity_accepted', 'quantity_rejected', 'price_variance'
+    ]
+    list_filter = ['supplier', 'week_start']
+    list_select_related = ['supplier']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SupplierItem)
+class SupplierItemAdmin(admin.ModelAdmin):
+    """Admin configuration for the supplier catalog."""
+    
+    list_display = ['ingredient', 'supplier', 'pack_size', 'pack_price', 'unit_price', 'lead_time_days', 'is_available']
+    list_filter = ['supplier', 'is_available']
+    search_fields = ['ingredient__name', 'supplier__name', 'sku']
+    list_editable = ['is_available']
+    list_select_related = ['supplier', 'ingredient']
+    readonly_fields = ['unit_price']
+
+
+@admin.register(UnitConversion)
+class UnitConversionAdmin(admin.ModelAdmin):
+    """Admin configuration for per-ingredient unit conversions."""
+    
+    list_display = ['ingredient', 'unit', 'factor', 'updated_at']
+    list_filter = ['unit']
+    search_fields = ['ingredient__name']
+    list_select_related = ['ingredient']
+    raw_id_fields = ['ingredient']
+
+
+@admin.register(IngredientPriceHistory)
+class IngredientPriceHistoryAdmin(admin.ModelAdmin):
+    """Read-only admin for the append-only price history."""
+    
+    list_display = ['ingredient', 'supplier', 'price', 'effective_at']
+    list_filter = ['supplier']
+    search_fields = ['ingredient__name']
+    date_hierarchy = 'effective_at'
+    list_select_related = ['ingredient', 'supplier']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class PurchaseOrderLineInline(admin.TabularInline):
+    """Inline for purchase order lines."""
+    
+    model = PurchaseOrderLine
+    extra = 0
+    raw_id_fields = ['ingredient', 'supplier_item']
+
+
+@admin.register(PurchaseOrder)
+class PurchaseOrderAdmin(admin.ModelAdmin):
+    """Admin configuration for purchase orders."""
+    
+    list_display = ['id', 'supplier', 'status', 'delivery_date', 'order_cutoff', 'subtotal', 'delivery_fee', 'below_minimum']
+    list_filter = ['status', 'supplier', 'below_minimum']
+    date_hierarchy = 'created_at'
+    list_select_related = ['supplier']
+    readonly_fields = ['submitted_at', 'received_at', 'created_at']
+    inlines = [PurchaseOrderLineInline]
+
+
+@admin.register(StockMovement)
+class StockMovementAdmin(admin.ModelAdmin):
+    """Read-only admin for the stock movement ledger."""
+    
+    list_display = ['ingredient', 'kind', 'quantity', 'reason', 'reference', 'staff', 'created_at']
+    list_filter = ['kind']
+    search_fields = ['ingredient__name', 'reason', 'reference']
+    date_hierarchy = 'created_at'
+    list_select_related = ['ingredient', 'staff']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class RecipeLineInline(admin.TabularInline):
+    """Inline for recipe ingredient lines."""
+    
+    model = RecipeLine
+    extra = 1
+    raw_id_fields = ['ingredient']
+
+
+@admin.register(Recipe)
+class RecipeAdmin(admin.ModelAdmin):
+    """Admin configuration for recipes."""
+    
+    list_display = ['name', 'pos_code', 'yield_quantity', 'is_active', 'updated_at']
+    list_filter = ['is_active']
+    search_fields = ['name', 'pos_code']
+    readonly_fields = ['created_at', 'updated_at']
+    inlines = [RecipeLineInline]
+
+
+@admin.register(StockLot)
+class StockLotAdmin(admin.ModelAdmin):
+    """Read-only admin for stock lots, which follow the movement ledger."""
+    
+    list_display = ['ingredient', 'received_at', 'expiry_date', 'quantity_received', 'quantity_remaining', 'reference']
+    search_fields = ['ingredient__name', 'reference']
+    date_hierarchy = 'received_at'
+    list_select_related = ['ingredient']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(InventoryValuation)
+class InventoryValuationAdmin(admin.ModelAdmin):
+    """Read-only admin for running inventory valuations."""
+    
+    list_display = ['ingredient', 'quantity', 'average_unit_cost', 'average_value', 'fifo_value', 'updated_at']
+    search_fields = ['ingredient__name']
+    list_select_related = ['ingredient']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ParLevelSuggestion)
+class ParLevelSuggestionAdmin(admin.ModelAdmin):
+    """Admin configuration for forecast par level suggestions."""
+    
+    list_display = ['ingredient', 'method', 'daily_demand', 'minimum_stock', 'reorder_point', 'maximum_stock', 'forecast_error', 'status', 'created_at']
+    list_filter = ['status', 'method']
+    search_fields = ['ingredient__name']
+    date_hierarchy = 'created_at'
+    list_select_related = ['ingredient']
+    readonly_fields = ['created_at', 'reviewed_at']
+
+
+class StockCountLineInline(admin.TabularInline):
+    """Read-only inline for counted lines."""
+    
+    model = StockCountLine
+    extra = 0
+    raw_id_fields = ['ingredient', 'counted_by']
+    readonly_fields = ['expected_quantity', 'variance', 'variance_value']
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(StockCountSession)
+class StockCountSessionAdmin(admin.ModelAdmin):
+    """Admin configuration for stock counts."""
+    
+    list_display = ['name', 'status', 'started_by', 'created_at', 'closed_by', 'closed_at']
+    list_filter = ['status']
+    search_fields = ['name']
+    date_hierarchy = 'created_at'
+    readonly_fields = ['status', 'started_by', 'closed_by', 'created_at', 'closed_at']
+    inlines = [StockCountLineInline]
+
+
 # Admin site customization
 admin.site.site_header = "Jiko Milele Restaurant ERP"
 admin.site.site_title = "Jiko Milele Admin"
@@ -2,8 +2,9 @@
 Django filters for restaurant API endpoints.
 """
 import django_filters
-from django.db.models import Q, F
-from .models import Customer, Table, Staff, Supplier, Ingredient
+from django.db.models import Q
+from .models import Customer, Table, Staff, Supplier, Ingredient, TimeEntry
+from .validators import parse_delivery_schedule
 
 
 class CustomerFilter(django_filters.FilterSet):
@@ -100,6 +101,20 @@ class StaffFilter(django_filters.FilterSet):
             return queryset.exclude(role__in=foh_roles)
 
 
+class TimeEntryFilter(django_filters.FilterSet):
+    """Filter set for time clock entries."""
+    
+    date_from = django_filters.DateFilter(field_name='clock_in', lookup_expr='date__gte')
+    date_to = django_filters.DateFilter(field_name='clock_in', lookup_expr='date__lte')
+    on_clock = django_filters.BooleanFilter(field_name='clock_out', lookup_expr='isnull')
+    
+    class Meta:
+        model = TimeEntry
+        fields = {
+            'staff': ['exact'],
+        }
+
+
 class SupplierFilter(django_filters.FilterSet):
     """Filter set for Supplier API."""
     
@@ -110,6 +125,8 @@ class SupplierFilter(django_filters.FilterSet):
     max_rating = django_filters.NumberFilter(field_name='quality_rating', lookup_expr='lte')
     payment_terms = django_filters.CharFilter(lookup_expr='icontains')
     delivery_day = django_filters.CharFilter(method='filter_delivery_day')
+    delivers_on = django_filters.DateFilter(method='filter_delivers_on')
+    delivery_before = django_filters.TimeFilter(field_name='delivery_time', lookup_expr='lte')
     
     class Meta:
         model = Supplier
@@ -122,8 +139,19 @@ class SupplierFilter(django_filters.FilterSet):
         }
     
     def filter_delivery_day(self, queryset, name, value):
-        """Filter suppliers by delivery day."""
-        return queryset.filter(delivery_schedule__icontains=value)
+        """Filter suppliers delivering on any of the given days (names or 0-6, Monday first)."""
+        if value.isdigit():
+            weekdays = [int(value)] if int(value) < 7 else []
+        else:
+            mask, _ = parse_delivery_schedule(value)
+            weekdays = [day for day in range(7) if mask & (1 << day)]
+        if not weekdays:
+            return queryset.none()
+        return queryset.filter(delivery_days__in=Supplier.delivery_masks(weekdays))
+    
+    def filter_delivers_on(self, queryset, name, value):
+        """Filter suppliers delivering on a date."""
+        return queryset.filter(delivery_days__in=Supplier.delivery_masks([value.weekday()]))
 
 
 class IngredientFilter(django_filters.FilterSet):
@@ -140,6 +168,7 @@ class IngredientFilter(django_filters.FilterSet):
     min_stock = django_filters.NumberFilter(field_name='current_stock', lookup_expr='gte')
     max_stock = django_filters.NumberFilter(field_name='current_stock', lookup_expr='lte')
     allergens = django_filters.CharFilter(field_name='allergen_info', lookup_expr='icontains')
+    stock_status = django_filters.ChoiceFilter(choices=Ingredient.STOCK_STATUS_CHOICES)
     
     class Meta:
         model = Ingredient
@@ -155,13 +184,13 @@ class IngredientFilter(django_filters.FilterSet):
     def filter_low_stock(self, queryset, name, value):
         """Filter ingredients with stock below minimum level."""
         if value:
-            return queryset.filter(current_stock__lt=F('minimum_stock'))
+            return queryset.filter(stock_status__in=['low_stock', 'out_of_stock'])
         else:
-            return queryset.filter(current_stock__gte=F('minimum_stock'))
+            return queryset.exclude(stock_status__in=['low_stock', 'out_of_stock'])
     
     def filter_out_of_stock(self, queryset, name, value):
         """Filter ingredients that are completely out of stock."""
         if value:
-            return queryset.filter(current_stock=0)
+            return queryset.filter(stock_status='out_of_stock')
         else:
-            return queryset.exclude(current_stock=0)
\ No newline at end of file
+            return queryset.exclude(stock_status='out_of_stock')
\ No newline at end of file
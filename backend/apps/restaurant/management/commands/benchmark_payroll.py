@@ -0,0 +1,45 @@
+"""
+Benchmark the vectorized payroll computation on synthetic punches.
+"""
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.restaurant.services.timeclock import compute_payroll
+
+
+class Command(BaseCommand):
+    help = 'Time payroll totals over a synthetic month of punches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--staff', type=int, default=60, help='Number of staff members')
+        parser.add_argument('--days', type=int, default=31, help='Number of days of punches')
+        parser.add_argument('--shifts', type=int, default=2, help='Shifts per staff member per day')
+        parser.add_argument('--runs', type=int, default=20, help='Timed repetitions')
+
+    def handle(self, *args, **options):
+        staff, days, shifts = options['staff'], options['days'], options['shifts']
+        rng = np.random.default_rng(42)
+        origin = 1_700_000_000.0
+
+        staff_index = np.repeat(np.arange(staff), days * shifts)
+        day = np.tile(np.repeat(np.arange(days), shifts), staff)
+        shift = np.tile(np.arange(shifts), staff * days)
+        clock_in = origin + day * 86400 + shift * 6 * 3600 + rng.integers(0, 1800, staff_index.size)
+        clock_out = clock_in + rng.integers(3 * 3600, 6 * 3600, staff_index.size)
+        rates = rng.uniform(150, 600, staff)[staff_index]
+
+        timings = []
+        for _ in range(options['runs']):
+            started = time.perf_counter()
+            hours, overtime, gross = compute_payroll(staff_index, clock_in, clock_out, rates, origin, staff)
+            timings.append(time.perf_counter() - started)
+
+        self.stdout.write(
+            f"{staff_index.size} punch pairs for {staff} staff over {days} days: "
+            f"median {np.median(timings) * 1000:.2f} ms, best {min(timings) * 1000:.2f} ms"
+        )
+        self.stdout.write(
+            f"Total hours {hours.sum():.1f}, overtime {overtime.sum():.1f}, gross {gross.sum():,.2f}"
+        )
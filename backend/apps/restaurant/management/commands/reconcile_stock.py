@@ -0,0 +1,55 @@
+"""
+Recompute ingredient stock from the movement ledger and report drift.
+
+Also checks that each ingredient's open stock lots and valuation add up to
+its stock.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.restaurant.services import lots, stock_levels, valuation
+from apps.restaurant.services.stock import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Compare ingredient stock with the stock movement ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Reset drifted stock to the ledger balance and resettle lots and valuations')
+
+    def handle(self, *args, **options):
+        drift = reconcile(fix=options['fix'])
+        for pk, name, current, balance in drift:
+            self.stdout.write(
+                f"{name} (#{pk}): stock {current}, ledger {balance}, drift {current - balance:+}"
+            )
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Stock matches the ledger'))
+        elif options['fix']:
+            stock_levels.restatus()
+            stock_levels.rebuild()
+            self.stdout.write(self.style.WARNING(f"Reset {len(drift)} ingredients to their ledger balance"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} ingredients drifted; run with --fix to reset them"))
+
+        unsettled = lots.unsettled()
+        for pk, name, current, total in unsettled:
+            self.stdout.write(f"{name} (#{pk}): stock {current}, open lots {total}")
+        if not unsettled:
+            self.stdout.write(self.style.SUCCESS('Stock lots add up to stock'))
+        elif options['fix']:
+            lots.resettle([pk for pk, _, _, _ in unsettled])
+            self.stdout.write(self.style.WARNING(f"Resettled the lots of {len(unsettled)} ingredients"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(unsettled)} ingredients have lots out of step; run with --fix"))
+
+        unvalued = valuation.unsettled()
+        for pk, name, current, quantity in unvalued:
+            self.stdout.write(f"{name} (#{pk}): stock {current}, valued {quantity}")
+        if not unvalued:
+            self.stdout.write(self.style.SUCCESS('Valuations cover stock'))
+        elif options['fix']:
+            valuation.resync([pk for pk, _, _, _ in unvalued])
+            self.stdout.write(self.style.WARNING(f"Revalued {len(unvalued)} ingredients at average cost"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(unvalued)} ingredients have valuations out of step; run with --fix"))
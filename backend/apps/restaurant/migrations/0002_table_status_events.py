@@ -0,0 +1,57 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='table',
+            name='status_changed_at',
+            field=models.DateTimeField(blank=True, help_text='When the table entered its current status', null=True),
+        ),
+        migrations.CreateModel(
+            name='TableOccupancyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(blank=True, help_text='Table section', max_length=50)),
+                ('hour', models.DateTimeField(help_text='Start of the hour bucket')),
+                ('occupied_seconds', models.PositiveIntegerField(default=0, help_text='Table-seconds spent occupied')),
+                ('reserved_seconds', models.PositiveIntegerField(default=0, help_text='Table-seconds spent reserved')),
+                ('cleaning_seconds', models.PositiveIntegerField(default=0, help_text='Table-seconds spent cleaning')),
+                ('idle_seconds', models.PositiveIntegerField(default=0, help_text='Table-seconds spent available')),
+                ('turns', models.PositiveIntegerField(default=0, help_text='Completed seatings ending in this hour')),
+                ('turn_seconds', models.PositiveIntegerField(default=0, help_text='Total duration of completed seatings')),
+                ('turn_time_histogram', models.JSONField(blank=True, default=list, help_text='Counts of completed seatings per turn-time bucket')),
+            ],
+            options={
+                'db_table': 'table_occupancy_rollups',
+                'ordering': ['hour', 'section'],
+                'indexes': [models.Index(fields=['hour'], name='table_occup_hour_0d0ee2_idx')],
+                'unique_together': {('section', 'hour')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TableStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(blank=True, help_text='Table section at the time of the transition', max_length=50)),
+                ('from_status', models.CharField(blank=True, choices=[('available', 'Available'), ('occupied', 'Occupied'), ('reserved', 'Reserved'), ('cleaning', 'Cleaning'), ('out_of_order', 'Out of Order')], help_text='Previous status (blank when the table was created)', max_length=20)),
+                ('to_status', models.CharField(choices=[('available', 'Available'), ('occupied', 'Occupied'), ('reserved', 'Reserved'), ('cleaning', 'Cleaning'), ('out_of_order', 'Out of Order')], help_text='New status', max_length=20)),
+                ('occurred_at', models.DateTimeField(help_text='Transition timestamp')),
+                ('staff', models.ForeignKey(blank=True, help_text='Staff member who made the change', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='table_status_events', to='restaurant.staff')),
+                ('table', models.ForeignKey(help_text='Table whose status changed', on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='restaurant.table')),
+            ],
+            options={
+                'db_table': 'table_status_events',
+                'ordering': ['-occurred_at'],
+                'indexes': [models.Index(fields=['occurred_at'], name='table_statu_occurre_d33c03_idx'), models.Index(fields=['table', '-occurred_at'], name='table_statu_table_i_9cda43_idx')],
+            },
+        ),
+    ]
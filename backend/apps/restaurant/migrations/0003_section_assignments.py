@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0002_table_status_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectionAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(blank=True, help_text='Table section covered by the server', max_length=50)),
+                ('load', models.DecimalField(decimal_places=2, default=0, help_text="Share of the section's weighted load at assignment time", max_digits=8)),
+                ('assigned_at', models.DateTimeField(auto_now_add=True)),
+                ('released_at', models.DateTimeField(blank=True, help_text='When the assignment ended (null while active)', null=True)),
+                ('staff', models.ForeignKey(help_text='Assigned server', on_delete=django.db.models.deletion.CASCADE, related_name='section_assignments', to='restaurant.staff')),
+            ],
+            options={
+                'db_table': 'section_assignments',
+                'ordering': ['section', 'staff__name'],
+                'indexes': [models.Index(fields=['released_at'], name='section_ass_release_be42a7_idx'), models.Index(fields=['staff', 'released_at'], name='section_ass_staff_i_41831e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:57
+
+import apps.restaurant.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0003_section_assignments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clock_in', models.DateTimeField(help_text='Clock-in punch time')),
+                ('clock_out', models.DateTimeField(blank=True, help_text='Clock-out punch time (null while on the clock)', null=True)),
+                ('hourly_rate', models.DecimalField(blank=True, decimal_places=2, help_text='Hourly rate at clock-in', max_digits=6, null=True, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('source', models.CharField(blank=True, help_text='Terminal or device that recorded the punch', max_length=50)),
+                ('staff', models.ForeignKey(help_text='Staff member on the clock', on_delete=django.db.models.deletion.CASCADE, related_name='time_entries', to='restaurant.staff')),
+            ],
+            options={
+                'verbose_name_plural': 'Time entries',
+                'db_table': 'time_entries',
+                'ordering': ['-clock_in'],
+                'indexes': [models.Index(fields=['clock_in'], name='time_entrie_clock_i_dbf465_idx'), models.Index(fields=['staff', 'clock_in'], name='time_entrie_staff_i_fe023b_idx'), models.Index(fields=['clock_out'], name='time_entrie_clock_o_cfcac8_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='timeentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('clock_out__isnull', True)), fields=('staff',), name='one_open_time_entry_per_staff'),
+        ),
+    ]
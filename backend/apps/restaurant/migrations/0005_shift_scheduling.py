@@ -0,0 +1,64 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0004_time_entries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoverageRequirement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('general_manager', 'General Manager'), ('shift_supervisor', 'Shift Supervisor'), ('head_chef', 'Head Chef'), ('sous_chef', 'Sous Chef'), ('line_cook', 'Line Cook'), ('server', 'Server'), ('host', 'Host'), ('bartender', 'Bartender'), ('busser', 'Busser')], help_text='Job position', max_length=50)),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')], help_text='Day of the week')),
+                ('hour', models.PositiveSmallIntegerField(help_text='Hour of the day (0-23)')),
+                ('headcount', models.PositiveSmallIntegerField(default=1, help_text='Staff needed during this hour')),
+            ],
+            options={
+                'db_table': 'coverage_requirements',
+                'ordering': ['weekday', 'hour', 'role'],
+                'unique_together': {('role', 'weekday', 'hour')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ScheduledShift',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('general_manager', 'General Manager'), ('shift_supervisor', 'Shift Supervisor'), ('head_chef', 'Head Chef'), ('sous_chef', 'Sous Chef'), ('line_cook', 'Line Cook'), ('server', 'Server'), ('host', 'Host'), ('bartender', 'Bartender'), ('busser', 'Busser')], help_text='Role worked during the shift', max_length=50)),
+                ('week_start', models.DateField(help_text='Monday of the rota week')),
+                ('start', models.DateTimeField(help_text='Shift start')),
+                ('end', models.DateTimeField(help_text='Shift end')),
+                ('status', models.CharField(choices=[('scheduled', 'Scheduled'), ('called_in_sick', 'Called in Sick')], default='scheduled', help_text='Shift status', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('replaces', models.ForeignKey(blank=True, help_text='Shift this one covers for', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='replacements', to='restaurant.scheduledshift')),
+                ('staff', models.ForeignKey(help_text='Assigned staff member', on_delete=django.db.models.deletion.CASCADE, related_name='scheduled_shifts', to='restaurant.staff')),
+            ],
+            options={
+                'db_table': 'scheduled_shifts',
+                'ordering': ['start', 'role'],
+                'indexes': [models.Index(fields=['week_start', 'status'], name='scheduled_s_week_st_156797_idx'), models.Index(fields=['staff', 'start'], name='scheduled_s_staff_i_bb0df9_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StaffAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')], help_text='Day of the week')),
+                ('start_time', models.TimeField(help_text='Available from')),
+                ('end_time', models.TimeField(help_text='Available until')),
+                ('staff', models.ForeignKey(help_text='Staff member', on_delete=django.db.models.deletion.CASCADE, related_name='availability', to='restaurant.staff')),
+            ],
+            options={
+                'verbose_name_plural': 'Staff availability',
+                'db_table': 'staff_availability',
+                'ordering': ['staff', 'weekday', 'start_time'],
+                'indexes': [models.Index(fields=['staff', 'weekday'], name='staff_avail_staff_i_34eaff_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:02
+
+import apps.restaurant.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0005_shift_scheduling'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TipPool',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_start', models.DateTimeField(help_text='Start of the pooled period')),
+                ('period_end', models.DateTimeField(help_text='End of the pooled period')),
+                ('total_amount', models.DecimalField(decimal_places=2, help_text='Total tips in the pool', max_digits=12, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('role_weights', models.JSONField(default=dict, help_text='Points per hour worked by role used for this distribution')),
+                ('notes', models.TextField(blank=True, help_text='Notes about the pool')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, help_text='Staff member who ran the distribution', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tip_pools_created', to='restaurant.staff')),
+            ],
+            options={
+                'db_table': 'tip_pools',
+                'ordering': ['-period_start'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TipShare',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('general_manager', 'General Manager'), ('shift_supervisor', 'Shift Supervisor'), ('head_chef', 'Head Chef'), ('sous_chef', 'Sous Chef'), ('line_cook', 'Line Cook'), ('server', 'Server'), ('host', 'Host'), ('bartender', 'Bartender'), ('busser', 'Busser')], help_text='Role the share was weighted by', max_length=50)),
+                ('hours', models.DecimalField(decimal_places=2, help_text='Hours worked in the period', max_digits=8)),
+                ('weight', models.DecimalField(decimal_places=2, help_text='Role weight applied', max_digits=6)),
+                ('amount', models.DecimalField(decimal_places=2, help_text='Share of the pool', max_digits=12)),
+                ('pool', models.ForeignKey(help_text='Tip pool', on_delete=django.db.models.deletion.PROTECT, related_name='shares', to='restaurant.tippool')),
+                ('staff', models.ForeignKey(help_text='Staff member receiving the share', on_delete=django.db.models.deletion.PROTECT, related_name='tip_shares', to='restaurant.staff')),
+            ],
+            options={
+                'db_table': 'tip_shares',
+                'ordering': ['-amount'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tippool',
+            index=models.Index(fields=['period_start', 'period_end'], name='tip_pools_period__4b72e2_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='tipshare',
+            constraint=models.UniqueConstraint(fields=('pool', 'staff'), name='unique_tip_share_per_staff'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0006_tip_pools'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('covers', 'Covers'), ('turns', 'Tables Turned'), ('sales', 'Sales')], help_text='Ranked metric', max_length=10)),
+                ('period', models.CharField(choices=[('shift', 'Shift'), ('day', 'Day'), ('week', 'Week')], help_text='Leaderboard period', max_length=10)),
+                ('period_start', models.DateTimeField(help_text='Start of the shift, day or week')),
+                ('rank', models.PositiveIntegerField(help_text='Final rank (1 is best)')),
+                ('score', models.DecimalField(decimal_places=2, help_text='Final score', max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('staff', models.ForeignKey(help_text='Ranked staff member', on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_snapshots', to='restaurant.staff')),
+            ],
+            options={
+                'db_table': 'leaderboard_snapshots',
+                'ordering': ['-period_start', 'metric', 'rank'],
+                'indexes': [models.Index(fields=['staff', 'period_start'], name='leaderboard_staff_i_749b98_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardsnapshot',
+            constraint=models.UniqueConstraint(fields=('metric', 'period', 'period_start', 'staff'), name='unique_leaderboard_snapshot'),
+        ),
+    ]
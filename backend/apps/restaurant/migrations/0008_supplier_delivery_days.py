@@ -0,0 +1,108 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:06
+
+import re
+from datetime import time
+
+from django.db import migrations, models
+
+# Frozen copy of apps.restaurant.validators.parse_delivery_schedule, so later
+# changes to the parser cannot change what this migration does
+WEEKDAY_ALIASES = {
+    'mon': 0, 'monday': 0, 'mondays': 0,
+    'tue': 1, 'tues': 1, 'tuesday': 1, 'tuesdays': 1,
+    'wed': 2, 'weds': 2, 'wednesday': 2, 'wednesdays': 2,
+    'thu': 3, 'thur': 3, 'thurs': 3, 'thursday': 3, 'thursdays': 3,
+    'fri': 4, 'friday': 4, 'fridays': 4,
+    'sat': 5, 'saturday': 5, 'saturdays': 5,
+    'sun': 6, 'sunday': 6, 'sundays': 6,
+}
+DAY_PATTERN = '|'.join(sorted(WEEKDAY_ALIASES, key=len, reverse=True))
+DAY_RANGE_RE = re.compile(rf'\b({DAY_PATTERN})\b\s*(?:-|to|through|until)\s*\b({DAY_PATTERN})\b')
+DAY_RE = re.compile(rf'\b({DAY_PATTERN})\b')
+TIME_RE = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\b')
+
+
+def parse_delivery_schedule(value):
+    if not value:
+        return 0, None
+
+    text = str(value).lower()
+    mask = 0
+
+    if re.search(r'\b(daily|every\s*day)\b', text):
+        mask = 0b1111111
+    if re.search(r'\bweekdays\b', text):
+        mask |= 0b0011111
+    if re.search(r'\bweekends?\b', text):
+        mask |= 0b1100000
+
+    for start, end in DAY_RANGE_RE.findall(text):
+        first, last = WEEKDAY_ALIASES[start], WEEKDAY_ALIASES[end]
+        day = first
+        while True:
+            mask |= 1 << day
+            if day == last:
+                break
+            day = (day + 1) % 7
+
+    for name in DAY_RE.findall(text):
+        mask |= 1 << WEEKDAY_ALIASES[name]
+
+    delivery_time = None
+    for hour, minute, meridiem in TIME_RE.findall(text):
+        if not minute and not meridiem:
+            continue
+        hour, minute = int(hour), int(minute or 0)
+        if meridiem == 'pm' and hour < 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+        if hour < 24 and minute < 60:
+            delivery_time = time(hour, minute)
+            break
+
+    return mask, delivery_time
+
+
+def backfill_delivery_days(apps, schema_editor):
+    Supplier = apps.get_model('restaurant', 'Supplier')
+    suppliers = []
+    for supplier in Supplier.objects.exclude(delivery_schedule=''):
+        supplier.delivery_days, supplier.delivery_time = parse_delivery_schedule(supplier.delivery_schedule)
+        suppliers.append(supplier)
+    Supplier.objects.bulk_update(suppliers, ['delivery_days', 'delivery_time'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0007_leaderboard_snapshots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplier',
+            name='delivery_days',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Delivery weekdays as a bitmask (bit 0 = Monday ... bit 6 = Sunday)'),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='delivery_time',
+            field=models.TimeField(blank=True, help_text='Latest expected delivery time on delivery days', null=True),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='order_cutoff_time',
+            field=models.TimeField(blank=True, help_text='Time orders must be placed by for a delivery', null=True),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='order_lead_days',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Days before the delivery day that the order cutoff falls'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['is_active', 'delivery_days', 'delivery_time'], name='suppliers_is_acti_60684a_idx'),
+        ),
+        migrations.RunPython(backfill_delivery_days, migrations.RunPython.noop),
+    ]
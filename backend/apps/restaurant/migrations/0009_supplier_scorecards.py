@@ -0,0 +1,75 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:08
+
+import apps.restaurant.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0008_supplier_delivery_days'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplierDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('expected_at', models.DateTimeField(help_text='When the delivery was due')),
+                ('received_at', models.DateTimeField(help_text='When the delivery arrived')),
+                ('notes', models.TextField(blank=True, help_text='Receiving notes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('received_by', models.ForeignKey(blank=True, help_text='Staff member who checked the delivery in', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deliveries_received', to='restaurant.staff')),
+                ('supplier', models.ForeignKey(help_text='Delivering supplier', on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='restaurant.supplier')),
+            ],
+            options={
+                'verbose_name_plural': 'Supplier deliveries',
+                'db_table': 'supplier_deliveries',
+                'ordering': ['-received_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SupplierDeliveryLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity_ordered', models.DecimalField(decimal_places=3, help_text='Quantity ordered', max_digits=10, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('quantity_received', models.DecimalField(decimal_places=3, help_text='Quantity delivered', max_digits=10, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('quantity_rejected', models.DecimalField(decimal_places=3, default=0, help_text='Quantity refused at receiving', max_digits=10, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('expected_unit_price', models.DecimalField(decimal_places=4, help_text='Agreed price per unit', max_digits=8, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('unit_price', models.DecimalField(decimal_places=4, help_text='Invoiced price per unit', max_digits=8, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('delivery', models.ForeignKey(help_text='Delivery', on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='restaurant.supplierdelivery')),
+                ('ingredient', models.ForeignKey(help_text='Delivered ingredient', on_delete=django.db.models.deletion.CASCADE, related_name='delivery_lines', to='restaurant.ingredient')),
+            ],
+            options={
+                'db_table': 'supplier_delivery_lines',
+            },
+        ),
+        migrations.CreateModel(
+            name='SupplierWeeklyScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField(help_text='Monday of the week')),
+                ('deliveries', models.PositiveIntegerField(default=0)),
+                ('on_time_deliveries', models.PositiveIntegerField(default=0)),
+                ('quantity_ordered', models.DecimalField(decimal_places=3, default=0, max_digits=14)),
+                ('quantity_accepted', models.DecimalField(decimal_places=3, default=0, help_text='Received minus rejected, capped at the ordered quantity per line', max_digits=14)),
+                ('quantity_rejected', models.DecimalField(decimal_places=3, default=0, max_digits=14)),
+                ('expected_cost', models.DecimalField(decimal_places=2, default=0, help_text='Accepted quantity at agreed prices', max_digits=14)),
+                ('price_variance', models.DecimalField(decimal_places=2, default=0, help_text='Invoiced minus agreed cost of accepted quantity', max_digits=14)),
+                ('supplier', models.ForeignKey(help_text='Supplier', on_delete=django.db.models.deletion.CASCADE, related_name='weekly_scores', to='restaurant.supplier')),
+            ],
+            options={
+                'db_table': 'supplier_weekly_scores',
+                'ordering': ['-week_start', 'supplier'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='supplierdelivery',
+            index=models.Index(fields=['supplier', 'received_at'], name='supplier_de_supplie_d837f9_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='supplierweeklyscore',
+            unique_together={('supplier', 'week_start')},
+        ),
+    ]
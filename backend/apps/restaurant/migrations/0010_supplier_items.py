@@ -0,0 +1,39 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:10
+
+import apps.restaurant.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0009_supplier_scorecards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplierItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sku', models.CharField(blank=True, help_text="Supplier's product code", max_length=50)),
+                ('pack_size', models.DecimalField(decimal_places=3, help_text="Quantity per pack in the ingredient's unit of measure", max_digits=10, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('pack_price', models.DecimalField(decimal_places=2, help_text='Price per pack', max_digits=10, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('unit_price', models.DecimalField(decimal_places=4, editable=False, help_text='Price per unit of measure, derived from pack price and size', max_digits=10)),
+                ('lead_time_days', models.PositiveSmallIntegerField(default=1, help_text='Days from order to the earliest possible delivery')),
+                ('is_available', models.BooleanField(default=True, help_text='Whether the supplier can currently supply the item')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('ingredient', models.ForeignKey(help_text='Ingredient sold', on_delete=django.db.models.deletion.CASCADE, related_name='supplier_items', to='restaurant.ingredient')),
+                ('supplier', models.ForeignKey(help_text='Selling supplier', on_delete=django.db.models.deletion.CASCADE, related_name='items', to='restaurant.supplier')),
+            ],
+            options={
+                'db_table': 'supplier_items',
+                'ordering': ['ingredient', 'unit_price'],
+                'indexes': [models.Index(fields=['ingredient', 'is_available', 'unit_price', 'lead_time_days'], name='supplier_it_ingredi_2d273c_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='supplieritem',
+            constraint=models.UniqueConstraint(fields=('supplier', 'ingredient'), name='unique_supplier_item'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_price_history(apps, schema_editor):
+    Ingredient = apps.get_model('restaurant', 'Ingredient')
+    SupplierItem = apps.get_model('restaurant', 'SupplierItem')
+    IngredientPriceHistory = apps.get_model('restaurant', 'IngredientPriceHistory')
+
+    rows = [
+        IngredientPriceHistory(ingredient_id=pk, price=cost, effective_at=updated)
+        for pk, cost, updated in Ingredient.objects.values_list('pk', 'cost_per_unit', 'last_updated')
+    ]
+    rows += [
+        IngredientPriceHistory(ingredient_id=ingredient_id, supplier_id=supplier_id, price=price, effective_at=updated)
+        for ingredient_id, supplier_id, price, updated in SupplierItem.objects.values_list(
+            'ingredient_id', 'supplier_id', 'unit_price', 'updated_at'
+        )
+    ]
+    IngredientPriceHistory.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0010_supplier_items'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngredientPriceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.DecimalField(decimal_places=4, help_text='Price per unit of measure', max_digits=10)),
+                ('effective_at', models.DateTimeField(help_text='When the price took effect')),
+                ('ingredient', models.ForeignKey(help_text='Ingredient', on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='restaurant.ingredient')),
+                ('supplier', models.ForeignKey(blank=True, help_text="Supplier quoting the price (blank for the ingredient's own cost)", null=True, on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='restaurant.supplier')),
+            ],
+            options={
+                'verbose_name_plural': 'Ingredient price history',
+                'db_table': 'ingredient_price_history',
+                'ordering': ['ingredient', '-effective_at'],
+                'indexes': [models.Index(fields=['ingredient', 'supplier', 'effective_at', 'price'], name='ingredient__ingredi_84ae57_idx'), models.Index(fields=['effective_at'], name='ingredient__effecti_672a1c_idx')],
+            },
+        ),
+        migrations.RunPython(seed_price_history, migrations.RunPython.noop),
+    ]
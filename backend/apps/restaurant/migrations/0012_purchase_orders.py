@@ -0,0 +1,57 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0011_ingredient_price_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurchaseOrder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('draft', 'Draft'), ('submitted', 'Submitted'), ('received', 'Received'), ('cancelled', 'Cancelled')], default='draft', help_text='Order status', max_length=20)),
+                ('delivery_date', models.DateField(blank=True, help_text='Earliest delivery date given lead times and delivery days', null=True)),
+                ('order_cutoff', models.DateTimeField(blank=True, help_text='When the order must be placed for that delivery', null=True)),
+                ('subtotal', models.DecimalField(decimal_places=2, default=0, help_text='Sum of line totals', max_digits=12)),
+                ('delivery_fee', models.DecimalField(decimal_places=2, default=0, help_text='Supplier delivery fee', max_digits=8)),
+                ('below_minimum', models.BooleanField(default=False, help_text="Kept below the supplier's minimum order because stock is critical")),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('supplier', models.ForeignKey(help_text='Supplier', on_delete=django.db.models.deletion.PROTECT, related_name='purchase_orders', to='restaurant.supplier')),
+            ],
+            options={
+                'db_table': 'purchase_orders',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PurchaseOrderLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('packs', models.PositiveIntegerField(help_text='Number of packs')),
+                ('quantity', models.DecimalField(decimal_places=3, help_text="Quantity in the ingredient's unit of measure", max_digits=12)),
+                ('pack_price', models.DecimalField(decimal_places=4, help_text='Price per pack', max_digits=10)),
+                ('line_total', models.DecimalField(decimal_places=2, help_text='Packs times pack price', max_digits=12)),
+                ('ingredient', models.ForeignKey(help_text='Ordered ingredient', on_delete=django.db.models.deletion.PROTECT, related_name='purchase_order_lines', to='restaurant.ingredient')),
+                ('purchase_order', models.ForeignKey(help_text='Purchase order', on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='restaurant.purchaseorder')),
+                ('supplier_item', models.ForeignKey(blank=True, help_text='Catalog item ordered', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='purchase_order_lines', to='restaurant.supplieritem')),
+            ],
+            options={
+                'db_table': 'purchase_order_lines',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(fields=['status', 'supplier'], name='purchase_or_status_649e8d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorderline',
+            index=models.Index(fields=['ingredient', 'purchase_order'], name='purchase_or_ingredi_adcb03_idx'),
+        ),
+    ]
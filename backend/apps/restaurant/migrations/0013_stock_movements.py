@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_opening_balances(apps, schema_editor):
+    Ingredient = apps.get_model('restaurant', 'Ingredient')
+    StockMovement = apps.get_model('restaurant', 'StockMovement')
+
+    StockMovement.objects.bulk_create([
+        StockMovement(ingredient_id=pk, kind='adjustment', quantity=current_stock, reason='Opening balance')
+        for pk, current_stock in Ingredient.objects.exclude(current_stock=0).values_list('pk', 'current_stock')
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0012_purchase_orders'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('receipt', 'Receipt'), ('usage', 'Usage'), ('waste', 'Waste'), ('adjustment', 'Adjustment'), ('transfer', 'Transfer')], help_text='Type of movement', max_length=20)),
+                ('quantity', models.DecimalField(decimal_places=3, help_text='Signed change in stock', max_digits=12)),
+                ('reason', models.CharField(blank=True, help_text='Why the stock changed', max_length=200)),
+                ('reference', models.CharField(blank=True, help_text='Source document, e.g. delivery:12', max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('ingredient', models.ForeignKey(help_text='Ingredient moved', on_delete=django.db.models.deletion.PROTECT, related_name='stock_movements', to='restaurant.ingredient')),
+                ('staff', models.ForeignKey(blank=True, help_text='Staff member who recorded the movement', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to='restaurant.staff')),
+            ],
+            options={
+                'db_table': 'stock_movements',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['ingredient', 'created_at'], name='stock_movem_ingredi_4c892c_idx'), models.Index(fields=['kind', 'created_at'], name='stock_movem_kind_233278_idx')],
+            },
+        ),
+        migrations.RunPython(seed_opening_balances, migrations.RunPython.noop),
+    ]
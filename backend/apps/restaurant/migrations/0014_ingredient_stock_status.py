@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:22
+
+from django.db import migrations, models
+
+
+def backfill_stock_status(apps, schema_editor):
+    Ingredient = apps.get_model('restaurant', 'Ingredient')
+    Ingredient.objects.update(stock_status=models.Case(
+        models.When(current_stock__lte=0, then=models.Value('out_of_stock')),
+        models.When(current_stock__lt=models.F('minimum_stock'), then=models.Value('low_stock')),
+        models.When(current_stock__gte=models.F('maximum_stock'), then=models.Value('overstocked')),
+        default=models.Value('normal'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0013_stock_movements'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='stock_status',
+            field=models.CharField(choices=[('out_of_stock', 'Out of Stock'), ('low_stock', 'Low Stock'), ('normal', 'Normal'), ('overstocked', 'Overstocked')], default='normal', editable=False, help_text='Stock level against minimum and maximum, kept up to date on every stock write', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=models.Index(fields=['stock_status'], name='ingredients_stock_s_929450_idx'),
+        ),
+        migrations.RunPython(backfill_stock_status, migrations.RunPython.noop),
+    ]
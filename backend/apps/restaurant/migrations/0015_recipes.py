@@ -0,0 +1,47 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:34
+
+import apps.restaurant.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0014_ingredient_stock_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recipe',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Menu item name', max_length=100)),
+                ('pos_code', models.CharField(help_text='Menu item code sent by the POS', max_length=50, unique=True)),
+                ('yield_quantity', models.DecimalField(decimal_places=2, default=1, help_text='Portions the listed ingredient quantities make', max_digits=8, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('is_active', models.BooleanField(default=True, help_text='Whether sales of this item deplete stock')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'recipes',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipeLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.DecimalField(decimal_places=3, help_text="Quantity used for the recipe's full yield, in the ingredient's unit of measure", max_digits=10, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('ingredient', models.ForeignKey(help_text='Ingredient used', on_delete=django.db.models.deletion.PROTECT, related_name='recipe_lines', to='restaurant.ingredient')),
+                ('recipe', models.ForeignKey(help_text='Recipe', on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='restaurant.recipe')),
+            ],
+            options={
+                'db_table': 'recipe_lines',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='recipeline',
+            constraint=models.UniqueConstraint(fields=('recipe', 'ingredient'), name='unique_recipe_ingredient'),
+        ),
+    ]
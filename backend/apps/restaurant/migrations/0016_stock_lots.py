@@ -0,0 +1,63 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:36
+
+import django.db.models.deletion
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def open_lots_for_current_stock(apps, schema_editor):
+    Ingredient = apps.get_model('restaurant', 'Ingredient')
+    StockLot = apps.get_model('restaurant', 'StockLot')
+
+    now = timezone.now()
+    StockLot.objects.bulk_create([
+        StockLot(
+            ingredient_id=pk,
+            received_at=now,
+            expiry_date=(
+                timezone.localdate(now) + timedelta(days=shelf_life_days)
+                if is_perishable and shelf_life_days else None
+            ),
+            quantity_received=current_stock,
+            quantity_remaining=current_stock,
+            reference='opening-balance',
+        )
+        for pk, current_stock, is_perishable, shelf_life_days in Ingredient.objects.filter(
+            current_stock__gt=0
+        ).values_list('pk', 'current_stock', 'is_perishable', 'shelf_life_days')
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0015_recipes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplierdeliveryline',
+            name='expiry_date',
+            field=models.DateField(blank=True, help_text="Use-by date printed on the goods; defaults from the ingredient's shelf life", null=True),
+        ),
+        migrations.CreateModel(
+            name='StockLot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('received_at', models.DateTimeField(help_text='When the lot was received')),
+                ('expiry_date', models.DateField(blank=True, help_text='Last day the lot can be used; empty for goods that do not expire', null=True)),
+                ('quantity_received', models.DecimalField(decimal_places=3, help_text='Quantity the lot started with', max_digits=12)),
+                ('quantity_remaining', models.DecimalField(decimal_places=3, help_text='Quantity not yet used, wasted or written off', max_digits=12)),
+                ('reference', models.CharField(blank=True, help_text='Source document, e.g. delivery:12', max_length=50)),
+                ('ingredient', models.ForeignKey(help_text='Ingredient in the lot', on_delete=django.db.models.deletion.PROTECT, related_name='lots', to='restaurant.ingredient')),
+            ],
+            options={
+                'db_table': 'stock_lots',
+                'ordering': ['ingredient', 'expiry_date', 'received_at'],
+                'indexes': [models.Index(condition=models.Q(('quantity_remaining__gt', 0)), fields=['expiry_date'], name='stock_lots_open_expiry_idx'), models.Index(condition=models.Q(('quantity_remaining__gt', 0)), fields=['ingredient', 'expiry_date', 'received_at'], name='stock_lots_open_fefo_idx')],
+            },
+        ),
+        migrations.RunPython(open_lots_for_current_stock, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:39
+
+import django.db.models.deletion
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def value_current_stock(apps, schema_editor):
+    Ingredient = apps.get_model('restaurant', 'Ingredient')
+    InventoryValuation = apps.get_model('restaurant', 'InventoryValuation')
+    CostLayer = apps.get_model('restaurant', 'CostLayer')
+
+    now = timezone.now()
+    valuations, layers = [], []
+    for pk, current_stock, cost_per_unit in Ingredient.objects.values_list('pk', 'current_stock', 'cost_per_unit'):
+        value = (current_stock * cost_per_unit).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        valuations.append(InventoryValuation(
+            ingredient_id=pk,
+            quantity=current_stock,
+            average_unit_cost=cost_per_unit,
+            average_value=value,
+            fifo_value=value,
+        ))
+        if current_stock > 0:
+            layers.append(CostLayer(
+                ingredient_id=pk, received_at=now, unit_cost=cost_per_unit, quantity_remaining=current_stock
+            ))
+    InventoryValuation.objects.bulk_create(valuations, batch_size=1000)
+    CostLayer.objects.bulk_create(layers, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0016_stock_lots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockmovement',
+            name='average_value',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Signed change in inventory value under weighted-average costing', max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='stockmovement',
+            name='fifo_value',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Signed change in inventory value under FIFO costing', max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='stockmovement',
+            name='unit_cost',
+            field=models.DecimalField(blank=True, decimal_places=4, help_text='Cost per unit; the purchase price for receipts, the average cost otherwise', max_digits=12, null=True),
+        ),
+        migrations.CreateModel(
+            name='InventoryValuation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.DecimalField(decimal_places=3, default=0, help_text='Stock the values below cover', max_digits=12)),
+                ('average_unit_cost', models.DecimalField(decimal_places=4, default=0, help_text='Weighted-average cost per unit', max_digits=12)),
+                ('average_value', models.DecimalField(decimal_places=2, default=0, help_text='On-hand value under weighted-average costing', max_digits=14)),
+                ('fifo_value', models.DecimalField(decimal_places=2, default=0, help_text='On-hand value under FIFO costing', max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('ingredient', models.OneToOneField(help_text='Ingredient valued', on_delete=django.db.models.deletion.CASCADE, related_name='valuation', to='restaurant.ingredient')),
+            ],
+            options={
+                'db_table': 'inventory_valuations',
+            },
+        ),
+        migrations.CreateModel(
+            name='CostLayer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('received_at', models.DateTimeField(help_text='When the stock was received')),
+                ('unit_cost', models.DecimalField(decimal_places=4, help_text='Cost per unit of the layer', max_digits=12)),
+                ('quantity_remaining', models.DecimalField(decimal_places=3, help_text='Quantity of the layer not yet consumed', max_digits=12)),
+                ('ingredient', models.ForeignKey(help_text='Ingredient', on_delete=django.db.models.deletion.CASCADE, related_name='cost_layers', to='restaurant.ingredient')),
+            ],
+            options={
+                'db_table': 'inventory_cost_layers',
+                'ordering': ['ingredient', 'received_at', 'id'],
+                'indexes': [models.Index(condition=models.Q(('quantity_remaining__gt', 0)), fields=['ingredient', 'received_at', 'id'], name='cost_layers_open_fifo_idx')],
+            },
+        ),
+        migrations.RunPython(value_current_stock, migrations.RunPython.noop),
+    ]
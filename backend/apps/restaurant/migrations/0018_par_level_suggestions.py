@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0017_inventory_valuation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParLevelSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('method', models.CharField(choices=[('moving_average', 'Seasonal moving average'), ('smoothing', 'Seasonal exponential smoothing')], help_text='Forecast model that fitted the usage best', max_length=20)),
+                ('daily_demand', models.DecimalField(decimal_places=3, help_text='Forecast average daily usage', max_digits=12)),
+                ('lead_time_days', models.PositiveSmallIntegerField(help_text='Days from order to delivery used for the forecast')),
+                ('review_days', models.PositiveSmallIntegerField(help_text='Days between deliveries used for the forecast')),
+                ('minimum_stock', models.DecimalField(decimal_places=3, help_text='Suggested minimum stock (safety stock)', max_digits=12)),
+                ('reorder_point', models.DecimalField(decimal_places=3, help_text='Suggested reorder point', max_digits=12)),
+                ('maximum_stock', models.DecimalField(decimal_places=3, help_text='Suggested par level', max_digits=12)),
+                ('forecast_error', models.FloatField(blank=True, help_text='Recent one-step forecast error as a fraction of usage', null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('applied', 'Applied'), ('dismissed', 'Dismissed')], default='pending', help_text='Review status', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reviewed_at', models.DateTimeField(blank=True, help_text='When the suggestion was applied or dismissed', null=True)),
+                ('ingredient', models.ForeignKey(help_text='Ingredient the levels are for', on_delete=django.db.models.deletion.CASCADE, related_name='par_suggestions', to='restaurant.ingredient')),
+            ],
+            options={
+                'db_table': 'par_level_suggestions',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='par_level_s_status_4c798a_idx'), models.Index(fields=['ingredient', 'created_at'], name='par_level_s_ingredi_da2a04_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0018_par_level_suggestions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockCountSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Label for the count, e.g. 'Friday close'", max_length=100)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('closed', 'Closed'), ('cancelled', 'Cancelled')], default='open', help_text='Count status', max_length=20)),
+                ('notes', models.TextField(blank=True, help_text='Notes about the count')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('closed_at', models.DateTimeField(blank=True, help_text='When the counts were applied to stock', null=True)),
+                ('closed_by', models.ForeignKey(blank=True, help_text='Staff member who closed the count', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='closed_stock_counts', to='restaurant.staff')),
+                ('started_by', models.ForeignKey(blank=True, help_text='Staff member who opened the count', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='started_stock_counts', to='restaurant.staff')),
+            ],
+            options={
+                'db_table': 'stock_count_sessions',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockCountLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('counted_quantity', models.DecimalField(decimal_places=3, help_text='Quantity found on the shelf', max_digits=12)),
+                ('counted_at', models.DateTimeField(help_text='When the count was taken on the device')),
+                ('device', models.CharField(blank=True, help_text='Device the count was submitted from', max_length=50)),
+                ('expected_quantity', models.DecimalField(blank=True, decimal_places=3, help_text='Stock on record when the count closed', max_digits=12, null=True)),
+                ('variance', models.DecimalField(blank=True, decimal_places=3, help_text='Counted less expected quantity', max_digits=12, null=True)),
+                ('variance_value', models.DecimalField(blank=True, decimal_places=2, help_text='Value of the variance at weighted-average cost', max_digits=14, null=True)),
+                ('counted_by', models.ForeignKey(blank=True, help_text='Staff member who counted', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_count_lines', to='restaurant.staff')),
+                ('ingredient', models.ForeignKey(help_text='Counted ingredient', on_delete=django.db.models.deletion.PROTECT, related_name='count_lines', to='restaurant.ingredient')),
+                ('session', models.ForeignKey(help_text='Stock count', on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='restaurant.stockcountsession')),
+            ],
+            options={
+                'db_table': 'stock_count_lines',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stockcountsession',
+            index=models.Index(fields=['status', 'created_at'], name='stock_count_status_d215af_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockcountline',
+            constraint=models.UniqueConstraint(fields=('session', 'ingredient'), name='unique_count_session_ingredient'),
+        ),
+    ]
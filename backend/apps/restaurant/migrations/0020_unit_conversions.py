@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:55
+
+import apps.restaurant.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0019_stock_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipeline',
+            name='unit',
+            field=models.CharField(blank=True, choices=[('kg', 'Kilograms'), ('grams', 'Grams'), ('liters', 'Liters'), ('ml', 'Milliliters'), ('pieces', 'Pieces'), ('cases', 'Cases')], help_text="Unit of the quantity; blank for the ingredient's unit of measure", max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='recipeline',
+            name='quantity',
+            field=models.DecimalField(decimal_places=3, help_text="Quantity used for the recipe's full yield, in the line's unit", max_digits=10, validators=[apps.restaurant.validators.validate_positive_decimal]),
+        ),
+        migrations.CreateModel(
+            name='UnitConversion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit', models.CharField(choices=[('kg', 'Kilograms'), ('grams', 'Grams'), ('liters', 'Liters'), ('ml', 'Milliliters'), ('pieces', 'Pieces'), ('cases', 'Cases')], help_text='Unit converted from', max_length=20)),
+                ('factor', models.DecimalField(decimal_places=6, help_text="Quantity in the ingredient's unit of measure per one of this unit", max_digits=12, validators=[apps.restaurant.validators.validate_positive_decimal])),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('ingredient', models.ForeignKey(help_text='Ingredient converted', on_delete=django.db.models.deletion.CASCADE, related_name='unit_conversions', to='restaurant.ingredient')),
+            ],
+            options={
+                'db_table': 'unit_conversions',
+                'ordering': ['ingredient', 'unit'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='unitconversion',
+            constraint=models.UniqueConstraint(fields=('ingredient', 'unit'), name='unique_ingredient_unit_conversion'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 02:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0020_unit_conversions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchaseorder',
+            name='received_at',
+            field=models.DateTimeField(blank=True, help_text='When a delivery against the order was received', null=True),
+        ),
+        migrations.AddField(
+            model_name='supplierdelivery',
+            name='purchase_order',
+            field=models.ForeignKey(blank=True, help_text='Submitted purchase order this delivery fulfils', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deliveries', to='restaurant.purchaseorder'),
+        ),
+    ]
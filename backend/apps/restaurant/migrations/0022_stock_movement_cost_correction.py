@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0021_purchase_order_receipt'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='kind',
+            field=models.CharField(choices=[('receipt', 'Receipt'), ('usage', 'Usage'), ('waste', 'Waste'), ('adjustment', 'Adjustment'), ('transfer', 'Transfer'), ('cost_correction', 'Cost correction')], help_text='Type of movement', max_length=20),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.14 on 2026-10-19 02:40
+
+from django.db import migrations, models
+
+
+def backfill_time_entry_role(apps, schema_editor):
+    # The role worked was never recorded, so the current role is the best guess
+    TimeEntry = apps.get_model('restaurant', 'TimeEntry')
+    Staff = apps.get_model('restaurant', 'Staff')
+    TimeEntry.objects.update(role=models.Subquery(
+        Staff.objects.filter(pk=models.OuterRef('staff_id')).values('role')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant', '0022_stock_movement_cost_correction'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='tipshare',
+            name='unique_tip_share_per_staff',
+        ),
+        migrations.AddField(
+            model_name='timeentry',
+            name='role',
+            field=models.CharField(blank=True, choices=[('general_manager', 'General Manager'), ('shift_supervisor', 'Shift Supervisor'), ('head_chef', 'Head Chef'), ('sous_chef', 'Sous Chef'), ('line_cook', 'Line Cook'), ('server', 'Server'), ('host', 'Host'), ('bartender', 'Bartender'), ('busser', 'Busser')], help_text='Role worked, as at clock-in', max_length=50),
+        ),
+        migrations.RunPython(backfill_time_entry_role, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tipshare',
+            constraint=models.UniqueConstraint(fields=('pool', 'staff', 'role'), name='unique_tip_share_per_staff_role'),
+        ),
+    ]
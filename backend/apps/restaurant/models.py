@@ -1,16 +1,22 @@
 """
 Restaurant management models.
 """
+from decimal import Decimal
+
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from .signals import table_status_changed
 from .validators import (
     validate_kenyan_phone_number, 
     validate_positive_decimal, 
     validate_quality_rating,
     validate_future_date,
     validate_stock_levels,
-    normalize_kenyan_phone_number
+    normalize_kenyan_phone_number,
+    parse_delivery_schedule,
+    ALL_WEEKDAYS_MASK
 )
 
 
@@ -142,6 +148,11 @@ class Table(models.Model):
         default=True,
         help_text=_("For temporarily disabling tables")
     )
+    status_changed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When the table entered its current status")
+    )
 
     class Meta:
         ordering = ['table_number']
@@ -166,6 +177,41 @@ class Table(models.Model):
                 'capacity': _('Table capacity should be between 1 and 12 seats.')
             })
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded status so transitions can be detected on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, changed_by=None, **kwargs):
+        """
+        Override save to stamp status transitions and broadcast them.
+
+        ``changed_by`` is the Staff member responsible for the change, if known.
+        """
+        previous_status = getattr(self, '_loaded_status', None)
+        previous_changed_at = self.status_changed_at
+        status_changed = previous_status != self.status
+
+        if status_changed:
+            self.status_changed_at = timezone.now()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'status', 'status_changed_at'}
+
+        super().save(*args, **kwargs)
+        self._loaded_status = self.status
+
+        if status_changed:
+            table_status_changed.send(
+                sender=Table,
+                table=self,
+                previous_status=previous_status,
+                previous_changed_at=previous_changed_at,
+                staff=changed_by,
+            )
+
 
 class Staff(models.Model):
     """
@@ -301,6 +347,24 @@ class Supplier(models.Model):
         blank=True,
         help_text=_("e.g., 'Monday/Wednesday/Friday'")
     )
+    delivery_days = models.PositiveSmallIntegerField(
+        default=0,
+        help_text=_("Delivery weekdays as a bitmask (bit 0 = Monday ... bit 6 = Sunday)")
+    )
+    delivery_time = models.TimeField(
+        null=True,
+        blank=True,
+        help_text=_("Latest expected delivery time on delivery days")
+    )
+    order_cutoff_time = models.TimeField(
+        null=True,
+        blank=True,
+        help_text=_("Time orders must be placed by for a delivery")
+    )
+    order_lead_days = models.PositiveSmallIntegerField(
+        default=1,
+        help_text=_("Days before the delivery day that the order cutoff falls")
+    )
     minimum_order = models.DecimalField(
         max_digits=10,
         decimal_places=2,
@@ -343,6 +407,7 @@ class Supplier(models.Model):
             models.Index(fields=['name']),
             models.Index(fields=['is_active']),
             models.Index(fields=['quality_rating']),
+            models.Index(fields=['is_active', 'delivery_days', 'delivery_time']),
         ]
 
     def __str__(self):
@@ -355,6 +420,59 @@ class Supplier(models.Model):
         # Normalize phone number
         if self.phone_number:
             self.phone_number = normalize_kenyan_phone_number(self.phone_number)
+        
+        if self.delivery_days > ALL_WEEKDAYS_MASK:
+            raise ValidationError({
+                'delivery_days': _('Delivery days must be a 7-bit weekday mask.')
+            })
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded schedule so edits can be re-parsed on save."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_delivery_schedule = instance.__dict__.get('delivery_schedule')
+        instance._loaded_delivery_days = instance.__dict__.get('delivery_days')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Override save to derive delivery days and time from edited schedule text.
+
+        Delivery days set explicitly in the same save take precedence.
+        """
+        schedule_edited = self.delivery_schedule != getattr(self, '_loaded_delivery_schedule', None)
+        days_edited = self.delivery_days != getattr(self, '_loaded_delivery_days', 0)
+        if schedule_edited and not days_edited:
+            delivery_days, delivery_time = parse_delivery_schedule(self.delivery_schedule)
+            if delivery_days:
+                self.delivery_days = delivery_days
+            if delivery_time and self.delivery_time is None:
+                self.delivery_time = delivery_time
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'delivery_days', 'delivery_time'}
+        
+        super().save(*args, **kwargs)
+        self._loaded_delivery_schedule = self.delivery_schedule
+        self._loaded_delivery_days = self.delivery_days
+
+    @staticmethod
+    def delivery_masks(weekdays):
+        """
+        Every bitmask value that includes any of ``weekdays``.
+
+        Filtering with ``delivery_days__in`` on these values uses the
+        delivery index, unlike a bitwise expression on the column.
+        """
+        bits = 0
+        for weekday in weekdays:
+            bits |= 1 << weekday
+        return [mask for mask in range(1, ALL_WEEKDAYS_MASK + 1) if mask & bits]
+
+    @property
+    def delivery_weekdays(self):
+        """Delivery weekdays as a list of 0 (Monday) to 6 (Sunday)."""
+        return [day for day in range(7) if self.delivery_days & (1 << day)]
 
 
 class Ingredient(models.Model):
@@ -380,6 +498,18 @@ class Ingredient(models.Model):
         ('cases', _('Cases')),
     ]
 
+    # Dimension of each unit and its size in the dimension's smallest unit.
+    # Units of different dimensions only convert through an ingredient's own
+    # UnitConversion rows; cases have no standard size.
+    UNIT_DIMENSIONS = {
+        'kg': ('mass', 1000),
+        'grams': ('mass', 1),
+        'liters': ('volume', 1000),
+        'ml': ('volume', 1),
+        'pieces': ('count', 1),
+        'cases': ('pack', 1),
+    }
+
     STORAGE_CHOICES = [
         ('dry_storage', _('Dry Storage')),
         ('walk_in_cooler', _('Walk-in Cooler')),
@@ -388,6 +518,13 @@ class Ingredient(models.Model):
         ('prep_area', _('Prep Area')),
     ]
 
+    STOCK_STATUS_CHOICES = [
+        ('out_of_stock', _('Out of Stock')),
+        ('low_stock', _('Low Stock')),
+        ('normal', _('Normal')),
+        ('overstocked', _('Overstocked')),
+    ]
+
     name = models.CharField(
         max_length=100,
         help_text=_("Ingredient name")
@@ -409,6 +546,13 @@ class Ingredient(models.Model):
         validators=[validate_positive_decimal],
         help_text=_("Current stock level")
     )
+    stock_status = models.CharField(
+        max_length=20,
+        choices=STOCK_STATUS_CHOICES,
+        default='normal',
+        editable=False,
+        help_text=_("Stock level against minimum and maximum, kept up to date on every stock write")
+    )
     minimum_stock = models.DecimalField(
         max_digits=10,
         decimal_places=3,
@@ -472,6 +616,7 @@ class Ingredient(models.Model):
             models.Index(fields=['category']),
             models.Index(fields=['current_stock']),
             models.Index(fields=['minimum_stock']),
+            models.Index(fields=['stock_status']),
             models.Index(fields=['supplier']),
             models.Index(fields=['is_perishable']),
         ]
@@ -499,14 +644,58 @@ class Ingredient(models.Model):
                 'shelf_life_days': _('Perishable items must have a shelf life specified.')
             })
 
-    @property
-    def is_low_stock(self):
-        """Check if current stock is below minimum stock level."""
-        return self.current_stock < self.minimum_stock
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded cost so price changes can be recorded."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_cost_per_unit = instance.__dict__.get('cost_per_unit')
+        return instance
 
-    @property
-    def stock_status(self):
-        """Return stock status as string."""
+    def save(self, *args, **kwargs):
+        """
+        Leave current_stock alone when updating.
+
+        Stock changes go through the movement ledger as atomic increments; a
+        full save would write back whatever level this instance loaded. The
+        stored stock status is re-derived in the database from the stock
+        there and the thresholds being saved.
+        """
+        if self._state.adding:
+            self.stock_status = self.compute_stock_status()
+            super().save(*args, **kwargs)
+            return
+
+        if kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'current_stock'
+            ]
+        if 'stock_status' not in kwargs['update_fields']:
+            super().save(*args, **kwargs)
+            return
+
+        # SET expressions see the old row, so pass the new thresholds as values
+        self.stock_status = self.stock_status_case(
+            minimum=models.Value(self.minimum_stock),
+            maximum=models.Value(self.maximum_stock) if self.maximum_stock else None,
+        )
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['current_stock', 'stock_status'])
+
+    @staticmethod
+    def stock_status_case(minimum=models.F('minimum_stock'), maximum=models.F('maximum_stock')):
+        """Expression deriving stock_status from current_stock, as compute_stock_status does."""
+        whens = [
+            models.When(current_stock__lte=0, then=models.Value('out_of_stock')),
+            models.When(current_stock__lt=minimum, then=models.Value('low_stock')),
+        ]
+        if maximum is not None:
+            # A NULL maximum_stock never compares true
+            whens.append(models.When(current_stock__gte=maximum, then=models.Value('overstocked')))
+        return models.Case(*whens, default=models.Value('normal'), output_field=models.CharField())
+
+    def compute_stock_status(self):
+        """Stock status from this instance's stock and thresholds."""
         if self.current_stock <= 0:
             return 'out_of_stock'
         elif self.is_low_stock:
@@ -515,3 +704,1633 @@ class Ingredient(models.Model):
             return 'overstocked'
         else:
             return 'normal'
+
+    @property
+    def is_low_stock(self):
+        """Check if current stock is below minimum stock level."""
+        return self.current_stock < self.minimum_stock
+
+
+class TableStatusEvent(models.Model):
+    """
+    Append-only record of a table status transition.
+    """
+    table = models.ForeignKey(
+        Table,
+        on_delete=models.CASCADE,
+        related_name='status_events',
+        help_text=_("Table whose status changed")
+    )
+    section = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text=_("Table section at the time of the transition")
+    )
+    from_status = models.CharField(
+        max_length=20,
+        choices=Table.STATUS_CHOICES,
+        blank=True,
+        help_text=_("Previous status (blank when the table was created)")
+    )
+    to_status = models.CharField(
+        max_length=20,
+        choices=Table.STATUS_CHOICES,
+        help_text=_("New status")
+    )
+    occurred_at = models.DateTimeField(
+        help_text=_("Transition timestamp")
+    )
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='table_status_events',
+        help_text=_("Staff member who made the change")
+    )
+
+    class Meta:
+        ordering = ['-occurred_at']
+        db_table = 'table_status_events'
+        indexes = [
+            models.Index(fields=['occurred_at']),
+            models.Index(fields=['table', '-occurred_at']),
+        ]
+
+    def __str__(self):
+        return f"Table {self.table_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
+class TableOccupancyRollup(models.Model):
+    """
+    Hourly per-section occupancy aggregates, maintained as status events arrive.
+    """
+    section = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text=_("Table section")
+    )
+    hour = models.DateTimeField(
+        help_text=_("Start of the hour bucket")
+    )
+    occupied_seconds = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Table-seconds spent occupied")
+    )
+    reserved_seconds = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Table-seconds spent reserved")
+    )
+    cleaning_seconds = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Table-seconds spent cleaning")
+    )
+    idle_seconds = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Table-seconds spent available")
+    )
+    turns = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Completed seatings ending in this hour")
+    )
+    turn_seconds = models.PositiveIntegerField(
+        default=0,
+        help_text=_("Total duration of completed seatings")
+    )
+    turn_time_histogram = models.JSONField(
+        default=list,
+        blank=True,
+        help_text=_("Counts of completed seatings per turn-time bucket")
+    )
+
+    class Meta:
+        ordering = ['hour', 'section']
+        db_table = 'table_occupancy_rollups'
+        unique_together = ['section', 'hour']
+        indexes = [
+            models.Index(fields=['hour']),
+        ]
+
+    def __str__(self):
+        return f"{self.section or 'Unassigned'} @ {self.hour:%Y-%m-%d %H:00}"
+
+
+class SectionAssignment(models.Model):
+    """
+    Assignment of a server to a floor section for the current shift.
+    """
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.CASCADE,
+        related_name='section_assignments',
+        help_text=_("Assigned server")
+    )
+    section = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text=_("Table section covered by the server")
+    )
+    load = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        default=0,
+        help_text=_("Share of the section's weighted load at assignment time")
+    )
+    assigned_at = models.DateTimeField(
+        auto_now_add=True
+    )
+    released_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When the assignment ended (null while active)")
+    )
+
+    class Meta:
+        ordering = ['section', 'staff__name']
+        db_table = 'section_assignments'
+        indexes = [
+            models.Index(fields=['released_at']),
+            models.Index(fields=['staff', 'released_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.staff.name} -> {self.section or 'Unassigned'}"
+
+    @property
+    def is_active(self):
+        """Whether the assignment is still in effect."""
+        return self.released_at is None
+
+
+class TimeEntry(models.Model):
+    """
+    Clock-in/clock-out punch pair for a staff member.
+    """
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.CASCADE,
+        related_name='time_entries',
+        help_text=_("Staff member on the clock")
+    )
+    clock_in = models.DateTimeField(
+        help_text=_("Clock-in punch time")
+    )
+    clock_out = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("Clock-out punch time (null while on the clock)")
+    )
+    hourly_rate = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        validators=[validate_positive_decimal],
+        help_text=_("Hourly rate at clock-in")
+    )
+    role = models.CharField(
+        max_length=50,
+        choices=Staff.ROLE_CHOICES,
+        blank=True,
+        help_text=_("Role worked, as at clock-in")
+    )
+    source = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text=_("Terminal or device that recorded the punch")
+    )
+
+    class Meta:
+        ordering = ['-clock_in']
+        db_table = 'time_entries'
+        verbose_name_plural = 'Time entries'
+        indexes = [
+            models.Index(fields=['clock_in']),
+            models.Index(fields=['staff', 'clock_in']),
+            models.Index(fields=['clock_out']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['staff'],
+                condition=models.Q(clock_out__isnull=True),
+                name='one_open_time_entry_per_staff'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.staff.name}: {self.clock_in:%Y-%m-%d %H:%M} - {self.clock_out or 'on clock'}"
+
+    def save(self, *args, **kwargs):
+        """Override save to record the staff member's current role on new entries."""
+        if not self.role:
+            self.role = self.staff.role
+        super().save(*args, **kwargs)
+
+    @property
+    def hours(self):
+        """Hours worked, up to now for an open entry."""
+        end = self.clock_out or timezone.now()
+        return round((end - self.clock_in).total_seconds() / 3600, 2)
+
+
+class StaffAvailability(models.Model):
+    """
+    Weekly window in which a staff member can be scheduled.
+    """
+    WEEKDAY_CHOICES = [
+        (0, _('Monday')),
+        (1, _('Tuesday')),
+        (2, _('Wednesday')),
+        (3, _('Thursday')),
+        (4, _('Friday')),
+        (5, _('Saturday')),
+        (6, _('Sunday')),
+    ]
+
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.CASCADE,
+        related_name='availability',
+        help_text=_("Staff member")
+    )
+    weekday = models.PositiveSmallIntegerField(
+        choices=WEEKDAY_CHOICES,
+        help_text=_("Day of the week")
+    )
+    start_time = models.TimeField(
+        help_text=_("Available from")
+    )
+    end_time = models.TimeField(
+        help_text=_("Available until")
+    )
+
+    class Meta:
+        ordering = ['staff', 'weekday', 'start_time']
+        db_table = 'staff_availability'
+        verbose_name_plural = 'Staff availability'
+        indexes = [
+            models.Index(fields=['staff', 'weekday']),
+        ]
+
+    def __str__(self):
+        return f"{self.staff.name}: {self.get_weekday_display()} {self.start_time:%H:%M}-{self.end_time:%H:%M}"
+
+    def clean(self):
+        """Custom validation for the StaffAvailability model."""
+        super().clean()
+
+        if self.start_time and self.end_time and self.end_time <= self.start_time:
+            raise ValidationError({
+                'end_time': _('End time must be after start time.')
+            })
+
+
+class CoverageRequirement(models.Model):
+    """
+    Number of staff needed in a role for one hour of the week.
+    """
+    role = models.CharField(
+        max_length=50,
+        choices=Staff.ROLE_CHOICES,
+        help_text=_("Job position")
+    )
+    weekday = models.PositiveSmallIntegerField(
+        choices=StaffAvailability.WEEKDAY_CHOICES,
+        help_text=_("Day of the week")
+    )
+    hour = models.PositiveSmallIntegerField(
+        help_text=_("Hour of the day (0-23)")
+    )
+    headcount = models.PositiveSmallIntegerField(
+        default=1,
+        help_text=_("Staff needed during this hour")
+    )
+
+    class Meta:
+        ordering = ['weekday', 'hour', 'role']
+        db_table = 'coverage_requirements'
+        unique_together = ['role', 'weekday', 'hour']
+
+    def __str__(self):
+        return f"{self.get_role_display()} x{self.headcount} {self.get_weekday_display()} {self.hour:02d}:00"
+
+    def clean(self):
+        """Custom validation for the CoverageRequirement model."""
+        super().clean()
+
+        if self.hour is not None and self.hour > 23:
+            raise ValidationError({
+                'hour': _('Hour must be between 0 and 23.')
+            })
+
+
+class ScheduledShift(models.Model):
+    """
+    A rota shift assigned to a staff member.
+    """
+    STATUS_CHOICES = [
+        ('scheduled', _('Scheduled')),
+        ('called_in_sick', _('Called in Sick')),
+    ]
+
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.CASCADE,
+        related_name='scheduled_shifts',
+        help_text=_("Assigned staff member")
+    )
+    role = models.CharField(
+        max_length=50,
+        choices=Staff.ROLE_CHOICES,
+        help_text=_("Role worked during the shift")
+    )
+    week_start = models.DateField(
+        help_text=_("Monday of the rota week")
+    )
+    start = models.DateTimeField(
+        help_text=_("Shift start")
+    )
+    end = models.DateTimeField(
+        help_text=_("Shift end")
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='scheduled',
+        help_text=_("Shift status")
+    )
+    replaces = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='replacements',
+        help_text=_("Shift this one covers for")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        ordering = ['start', 'role']
+        db_table = 'scheduled_shifts'
+        indexes = [
+            models.Index(fields=['week_start', 'status']),
+            models.Index(fields=['staff', 'start']),
+        ]
+
+    def __str__(self):
+        return f"{self.staff.name} ({self.role}) {self.start:%a %H:%M}-{self.end:%H:%M}"
+
+    @property
+    def hours(self):
+        return (self.end - self.start).total_seconds() / 3600
+
+
+class TipPool(models.Model):
+    """
+    A tip pool distributed across staff for a shift or pay period.
+
+    Pools and their shares are immutable once created so payouts can be audited.
+    """
+    period_start = models.DateTimeField(
+        help_text=_("Start of the pooled period")
+    )
+    period_end = models.DateTimeField(
+        help_text=_("End of the pooled period")
+    )
+    total_amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        validators=[validate_positive_decimal],
+        help_text=_("Total tips in the pool")
+    )
+    role_weights = models.JSONField(
+        default=dict,
+        help_text=_("Points per hour worked by role used for this distribution")
+    )
+    created_by = models.ForeignKey(
+        Staff,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='tip_pools_created',
+        help_text=_("Staff member who ran the distribution")
+    )
+    notes = models.TextField(
+        blank=True,
+        help_text=_("Notes about the pool")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        ordering = ['-period_start']
+        db_table = 'tip_pools'
+        indexes = [
+            models.Index(fields=['period_start', 'period_end']),
+        ]
+
+    def __str__(self):
+        return f"Tip pool {self.period_start:%Y-%m-%d %H:%M} - {self.period_end:%Y-%m-%d %H:%M}"
+
+    def clean(self):
+        if self.period_start and self.period_end and self.period_end <= self.period_start:
+            raise ValidationError({
+                'period_end': _('Period end must be after period start')
+            })
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError(_('Tip pools cannot be changed once distributed'))
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError(_('Tip pools cannot be deleted'))
+
+
+class TipShare(models.Model):
+    """
+    One staff member's share of a tip pool for the hours worked in one role.
+    """
+    pool = models.ForeignKey(
+        TipPool,
+        on_delete=models.PROTECT,
+        related_name='shares',
+        help_text=_("Tip pool")
+    )
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.PROTECT,
+        related_name='tip_shares',
+        help_text=_("Staff member receiving the share")
+    )
+    role = models.CharField(
+        max_length=50,
+        choices=Staff.ROLE_CHOICES,
+        help_text=_("Role the share was weighted by")
+    )
+    hours = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        help_text=_("Hours worked in the period")
+    )
+    weight = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        help_text=_("Role weight applied")
+    )
+    amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        help_text=_("Share of the pool")
+    )
+
+    class Meta:
+        ordering = ['-amount']
+        db_table = 'tip_shares'
+        constraints = [
+            models.UniqueConstraint(fields=['pool', 'staff', 'role'], name='unique_tip_share_per_staff_role'),
+        ]
+
+    def __str__(self):
+        return f"{self.staff.name}: {self.amount}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError(_('Tip shares cannot be changed once distributed'))
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError(_('Tip shares cannot be deleted'))
+
+
+class LeaderboardSnapshot(models.Model):
+    """
+    A server's final rank on a shift, day or week leaderboard.
+    """
+    METRIC_CHOICES = [
+        ('covers', _('Covers')),
+        ('turns', _('Tables Turned')),
+        ('sales', _('Sales')),
+    ]
+    PERIOD_CHOICES = [
+        ('shift', _('Shift')),
+        ('day', _('Day')),
+        ('week', _('Week')),
+    ]
+
+    metric = models.CharField(
+        max_length=10,
+        choices=METRIC_CHOICES,
+        help_text=_("Ranked metric")
+    )
+    period = models.CharField(
+        max_length=10,
+        choices=PERIOD_CHOICES,
+        help_text=_("Leaderboard period")
+    )
+    period_start = models.DateTimeField(
+        help_text=_("Start of the shift, day or week")
+    )
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_snapshots',
+        help_text=_("Ranked staff member")
+    )
+    rank = models.PositiveIntegerField(
+        help_text=_("Final rank (1 is best)")
+    )
+    score = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        help_text=_("Final score")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        ordering = ['-period_start', 'metric', 'rank']
+        db_table = 'leaderboard_snapshots'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['metric', 'period', 'period_start', 'staff'],
+                name='unique_leaderboard_snapshot'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['staff', 'period_start']),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.staff.name} {self.metric}/{self.period} {self.period_start:%Y-%m-%d %H:%M}"
+
+
+class SupplierDelivery(models.Model):
+    """
+    A delivery received from a supplier.
+    """
+    supplier = models.ForeignKey(
+        Supplier,
+        on_delete=models.CASCADE,
+        related_name='deliveries',
+        help_text=_("Delivering supplier")
+    )
+    expected_at = models.DateTimeField(
+        help_text=_("When the delivery was due")
+    )
+    received_at = models.DateTimeField(
+        help_text=_("When the delivery arrived")
+    )
+    received_by = models.ForeignKey(
+        Staff,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='deliveries_received',
+        help_text=_("Staff member who checked the delivery in")
+    )
+    purchase_order = models.ForeignKey(
+        'PurchaseOrder',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='deliveries',
+        help_text=_("Submitted purchase order this delivery fulfils")
+    )
+    notes = models.TextField(
+        blank=True,
+        help_text=_("Receiving notes")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        ordering = ['-received_at']
+        db_table = 'supplier_deliveries'
+        verbose_name_plural = 'Supplier deliveries'
+        indexes = [
+            models.Index(fields=['supplier', 'received_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.supplier.name} delivery {self.received_at:%Y-%m-%d %H:%M}"
+
+    @property
+    def is_on_time(self):
+        return self.received_at <= self.expected_at
+
+
+class SupplierDeliveryLine(models.Model):
+    """
+    An ingredient line on a supplier delivery.
+    """
+    delivery = models.ForeignKey(
+        SupplierDelivery,
+        on_delete=models.CASCADE,
+        related_name='lines',
+        help_text=_("Delivery")
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='delivery_lines',
+        help_text=_("Delivered ingredient")
+    )
+    quantity_ordered = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        validators=[validate_positive_decimal],
+        help_text=_("Quantity ordered")
+    )
+    quantity_received = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        validators=[validate_positive_decimal],
+        help_text=_("Quantity delivered")
+    )
+    quantity_rejected = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        default=0,
+        validators=[validate_positive_decimal],
+        help_text=_("Quantity refused at receiving")
+    )
+    expected_unit_price = models.DecimalField(
+        max_digits=8,
+        decimal_places=4,
+        validators=[validate_positive_decimal],
+        help_text=_("Agreed price per unit")
+    )
+    unit_price = models.DecimalField(
+        max_digits=8,
+        decimal_places=4,
+        validators=[validate_positive_decimal],
+        help_text=_("Invoiced price per unit")
+    )
+    expiry_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text=_("Use-by date printed on the goods; defaults from the ingredient's shelf life")
+    )
+
+    class Meta:
+        db_table = 'supplier_delivery_lines'
+
+    def __str__(self):
+        return f"{self.ingredient.name}: {self.quantity_received}/{self.quantity_ordered}"
+
+    def clean(self):
+        if self.quantity_rejected and self.quantity_received is not None and self.quantity_rejected > self.quantity_received:
+            raise ValidationError({
+                'quantity_rejected': _('Rejected quantity cannot exceed quantity received')
+            })
+
+    @property
+    def quantity_accepted(self):
+        return self.quantity_received - self.quantity_rejected
+
+
+class SupplierWeeklyScore(models.Model):
+    """
+    Weekly receiving totals per supplier, updated as deliveries are recorded.
+    """
+    supplier = models.ForeignKey(
+        Supplier,
+        on_delete=models.CASCADE,
+        related_name='weekly_scores',
+        help_text=_("Supplier")
+    )
+    week_start = models.DateField(
+        help_text=_("Monday of the week")
+    )
+    deliveries = models.PositiveIntegerField(
+        default=0
+    )
+    on_time_deliveries = models.PositiveIntegerField(
+        default=0
+    )
+    quantity_ordered = models.DecimalField(
+        max_digits=14,
+        decimal_places=3,
+        default=0
+    )
+    quantity_accepted = models.DecimalField(
+        max_digits=14,
+        decimal_places=3,
+        default=0,
+        help_text=_("Received minus rejected, capped at the ordered quantity per line")
+    )
+    quantity_rejected = models.DecimalField(
+        max_digits=14,
+        decimal_places=3,
+        default=0
+    )
+    expected_cost = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_("Accepted quantity at agreed prices")
+    )
+    price_variance = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_("Invoiced minus agreed cost of accepted quantity")
+    )
+
+    class Meta:
+        ordering = ['-week_start', 'supplier']
+        db_table = 'supplier_weekly_scores'
+        unique_together = ['supplier', 'week_start']
+
+    def __str__(self):
+        return f"{self.supplier.name} week of {self.week_start}"
+
+    @property
+    def on_time_rate(self):
+        return self.on_time_deliveries / self.deliveries if self.deliveries else None
+
+    @property
+    def fill_rate(self):
+        return float(self.quantity_accepted / self.quantity_ordered) if self.quantity_ordered else None
+
+
+class SupplierItem(models.Model):
+    """
+    An ingredient as sold by a supplier: pack size, price and lead time.
+    """
+    supplier = models.ForeignKey(
+        Supplier,
+        on_delete=models.CASCADE,
+        related_name='items',
+        help_text=_("Selling supplier")
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='supplier_items',
+        help_text=_("Ingredient sold")
+    )
+    sku = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text=_("Supplier's product code")
+    )
+    pack_size = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        validators=[validate_positive_decimal],
+        help_text=_("Quantity per pack in the ingredient's unit of measure")
+    )
+    pack_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        validators=[validate_positive_decimal],
+        help_text=_("Price per pack")
+    )
+    unit_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=4,
+        editable=False,
+        help_text=_("Price per unit of measure, derived from pack price and size")
+    )
+    lead_time_days = models.PositiveSmallIntegerField(
+        default=1,
+        help_text=_("Days from order to the earliest possible delivery")
+    )
+    is_available = models.BooleanField(
+        default=True,
+        help_text=_("Whether the supplier can currently supply the item")
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True
+    )
+
+    class Meta:
+        ordering = ['ingredient', 'unit_price']
+        db_table = 'supplier_items'
+        constraints = [
+            models.UniqueConstraint(fields=['supplier', 'ingredient'], name='unique_supplier_item'),
+        ]
+        indexes = [
+            # Cheapest available source per ingredient
+            models.Index(fields=['ingredient', 'is_available', 'unit_price', 'lead_time_days']),
+        ]
+
+    def __str__(self):
+        return f"{self.supplier.name}: {self.ingredient.name} {self.pack_size} @ {self.pack_price}"
+
+    def clean(self):
+        if self.pack_size is not None and self.pack_size <= 0:
+            raise ValidationError({
+                'pack_size': _('Pack size must be greater than zero')
+            })
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded unit price so price changes can be recorded."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_unit_price = instance.__dict__.get('unit_price')
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Override save to keep the per-unit price in step with the pack price."""
+        if self.pack_size:
+            self.unit_price = (Decimal(str(self.pack_price)) / Decimal(str(self.pack_size))).quantize(Decimal('0.0001'))
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'unit_price'}
+        super().save(*args, **kwargs)
+
+
+class IngredientPriceHistory(models.Model):
+    """
+    Append-only record of an ingredient price change.
+
+    Rows without a supplier track Ingredient.cost_per_unit; rows with one
+    track that supplier's catalog unit price. A row is only written when the
+    price actually changes.
+    """
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='price_history',
+        help_text=_("Ingredient")
+    )
+    supplier = models.ForeignKey(
+        Supplier,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='price_history',
+        help_text=_("Supplier quoting the price (blank for the ingredient's own cost)")
+    )
+    price = models.DecimalField(
+        max_digits=10,
+        decimal_places=4,
+        help_text=_("Price per unit of measure")
+    )
+    effective_at = models.DateTimeField(
+        help_text=_("When the price took effect")
+    )
+
+    class Meta:
+        ordering = ['ingredient', '-effective_at']
+        db_table = 'ingredient_price_history'
+        verbose_name_plural = 'Ingredient price history'
+        indexes = [
+            # Price-at-date lookups read the price straight from the index
+            models.Index(fields=['ingredient', 'supplier', 'effective_at', 'price']),
+            models.Index(fields=['effective_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.ingredient.name}: {self.price} from {self.effective_at:%Y-%m-%d}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError(_('Price history cannot be changed'))
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError(_('Price history cannot be deleted'))
+
+
+class PurchaseOrder(models.Model):
+    """
+    An order to a supplier, generated as a draft from stock levels.
+    """
+    STATUS_CHOICES = [
+        ('draft', _('Draft')),
+        ('submitted', _('Submitted')),
+        ('received', _('Received')),
+        ('cancelled', _('Cancelled')),
+    ]
+
+    supplier = models.ForeignKey(
+        Supplier,
+        on_delete=models.PROTECT,
+        related_name='purchase_orders',
+        help_text=_("Supplier")
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='draft',
+        help_text=_("Order status")
+    )
+    delivery_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text=_("Earliest delivery date given lead times and delivery days")
+    )
+    order_cutoff = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When the order must be placed for that delivery")
+    )
+    subtotal = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text=_("Sum of line totals")
+    )
+    delivery_fee = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        default=0,
+        help_text=_("Supplier delivery fee")
+    )
+    below_minimum = models.BooleanField(
+        default=False,
+        help_text=_("Kept below the supplier's minimum order because stock is critical")
+    )
+    submitted_at = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+    received_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When a delivery against the order was received")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        db_table = 'purchase_orders'
+        indexes = [
+            models.Index(fields=['status', 'supplier']),
+        ]
+
+    def __str__(self):
+        return f"PO {self.pk} {self.supplier.name} ({self.status})"
+
+    @property
+    def total(self):
+        return self.subtotal + self.delivery_fee
+
+
+class PurchaseOrderLine(models.Model):
+    """
+    An ingredient line on a purchase order.
+    """
+    purchase_order = models.ForeignKey(
+        PurchaseOrder,
+        on_delete=models.CASCADE,
+        related_name='lines',
+        help_text=_("Purchase order")
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.PROTECT,
+        related_name='purchase_order_lines',
+        help_text=_("Ordered ingredient")
+    )
+    supplier_item = models.ForeignKey(
+        SupplierItem,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='purchase_order_lines',
+        help_text=_("Catalog item ordered")
+    )
+    packs = models.PositiveIntegerField(
+        help_text=_("Number of packs")
+    )
+    quantity = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Quantity in the ingredient's unit of measure")
+    )
+    pack_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=4,
+        help_text=_("Price per pack")
+    )
+    line_total = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        help_text=_("Packs times pack price")
+    )
+
+    class Meta:
+        db_table = 'purchase_order_lines'
+        indexes = [
+            models.Index(fields=['ingredient', 'purchase_order']),
+        ]
+
+    def __str__(self):
+        return f"{self.ingredient.name}: {self.packs} x {self.quantity / self.packs if self.packs else 0}"
+
+
+class UnitConversion(models.Model):
+    """
+    How much of an ingredient's own unit one of another unit holds.
+
+    Covers what the standard conversions cannot: pack sizes (one case is 24
+    pieces) and densities (one liter of oil is 0.92 kg). A conversion makes
+    every unit of its dimension available for the ingredient.
+    """
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='unit_conversions',
+        help_text=_("Ingredient converted")
+    )
+    unit = models.CharField(
+        max_length=20,
+        choices=Ingredient.UOM_CHOICES,
+        help_text=_("Unit converted from")
+    )
+    factor = models.DecimalField(
+        max_digits=12,
+        decimal_places=6,
+        validators=[validate_positive_decimal],
+        help_text=_("Quantity in the ingredient's unit of measure per one of this unit")
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True
+    )
+
+    class Meta:
+        ordering = ['ingredient', 'unit']
+        db_table = 'unit_conversions'
+        constraints = [
+            models.UniqueConstraint(fields=['ingredient', 'unit'], name='unique_ingredient_unit_conversion'),
+        ]
+
+    def __str__(self):
+        return f"{self.ingredient.name}: 1 {self.unit} = {self.factor} {self.ingredient.unit_of_measure}"
+
+    def clean(self):
+        if self.factor is not None and self.factor <= 0:
+            raise ValidationError({
+                'factor': _('Factor must be greater than zero')
+            })
+        if self.ingredient_id and self.unit:
+            dimension = Ingredient.UNIT_DIMENSIONS[self.unit][0]
+            if Ingredient.UNIT_DIMENSIONS[self.ingredient.unit_of_measure][0] == dimension:
+                raise ValidationError({
+                    'unit': _('Units of the same dimension as the ingredient convert without a factor')
+                })
+            others = UnitConversion.objects.filter(ingredient_id=self.ingredient_id).exclude(pk=self.pk)
+            if any(Ingredient.UNIT_DIMENSIONS[unit][0] == dimension for unit in others.values_list('unit', flat=True)):
+                raise ValidationError({
+                    'unit': _('The ingredient already has a conversion for this dimension')
+                })
+
+
+class StockMovement(models.Model):
+    """
+    Append-only ledger entry changing an ingredient's stock.
+
+    ``quantity`` is signed: receipts add stock, usage and waste remove it,
+    and adjustments and transfers go either way. Cost corrections move no
+    stock, only value. The sum of an ingredient's movements is its stock
+    level.
+    """
+    KIND_CHOICES = [
+        ('receipt', _('Receipt')),
+        ('usage', _('Usage')),
+        ('waste', _('Waste')),
+        ('adjustment', _('Adjustment')),
+        ('transfer', _('Transfer')),
+        ('cost_correction', _('Cost correction')),
+    ]
+
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.PROTECT,
+        related_name='stock_movements',
+        help_text=_("Ingredient moved")
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        help_text=_("Type of movement")
+    )
+    quantity = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Signed change in stock")
+    )
+    reason = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text=_("Why the stock changed")
+    )
+    reference = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text=_("Source document, e.g. delivery:12")
+    )
+    unit_cost = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        help_text=_("Cost per unit; the purchase price for receipts, the average cost otherwise")
+    )
+    fifo_value = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text=_("Signed change in inventory value under FIFO costing")
+    )
+    average_value = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text=_("Signed change in inventory value under weighted-average costing")
+    )
+    staff = models.ForeignKey(
+        Staff,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='stock_movements',
+        help_text=_("Staff member who recorded the movement")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        db_table = 'stock_movements'
+        indexes = [
+            models.Index(fields=['ingredient', 'created_at']),
+            models.Index(fields=['kind', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.ingredient.name} {self.quantity:+} ({self.kind})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError(_('Stock movements cannot be changed'))
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError(_('Stock movements cannot be deleted'))
+
+
+class Recipe(models.Model):
+    """
+    Bill of materials for a menu item, keyed by its POS code.
+    """
+    name = models.CharField(
+        max_length=100,
+        help_text=_("Menu item name")
+    )
+    pos_code = models.CharField(
+        max_length=50,
+        unique=True,
+        help_text=_("Menu item code sent by the POS")
+    )
+    yield_quantity = models.DecimalField(
+        max_digits=8,
+        decimal_places=2,
+        default=1,
+        validators=[validate_positive_decimal],
+        help_text=_("Portions the listed ingredient quantities make")
+    )
+    is_active = models.BooleanField(
+        default=True,
+        help_text=_("Whether sales of this item deplete stock")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True
+    )
+
+    class Meta:
+        ordering = ['name']
+        db_table = 'recipes'
+
+    def __str__(self):
+        return f"{self.name} ({self.pos_code})"
+
+
+class RecipeLine(models.Model):
+    """
+    An ingredient used by a recipe.
+    """
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='lines',
+        help_text=_("Recipe")
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.PROTECT,
+        related_name='recipe_lines',
+        help_text=_("Ingredient used")
+    )
+    quantity = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        validators=[validate_positive_decimal],
+        help_text=_("Quantity used for the recipe's full yield, in the line's unit")
+    )
+    unit = models.CharField(
+        max_length=20,
+        choices=Ingredient.UOM_CHOICES,
+        blank=True,
+        help_text=_("Unit of the quantity; blank for the ingredient's unit of measure")
+    )
+
+    class Meta:
+        db_table = 'recipe_lines'
+        constraints = [
+            models.UniqueConstraint(fields=['recipe', 'ingredient'], name='unique_recipe_ingredient'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipe.name}: {self.quantity} {self.unit or self.ingredient.unit_of_measure} {self.ingredient.name}"
+
+
+class StockLot(models.Model):
+    """
+    A received batch of an ingredient.
+
+    Lots are consumed first-expired-first-out, and the remaining quantities
+    of an ingredient's open lots add up to its stock whenever stock is above
+    zero. Lots are kept in step with the movement ledger and are not edited
+    directly.
+    """
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.PROTECT,
+        related_name='lots',
+        help_text=_("Ingredient in the lot")
+    )
+    received_at = models.DateTimeField(
+        help_text=_("When the lot was received")
+    )
+    expiry_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text=_("Last day the lot can be used; empty for goods that do not expire")
+    )
+    quantity_received = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Quantity the lot started with")
+    )
+    quantity_remaining = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Quantity not yet used, wasted or written off")
+    )
+    reference = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text=_("Source document, e.g. delivery:12")
+    )
+
+    class Meta:
+        ordering = ['ingredient', 'expiry_date', 'received_at']
+        db_table = 'stock_lots'
+        indexes = [
+            models.Index(
+                fields=['expiry_date'],
+                condition=models.Q(quantity_remaining__gt=0),
+                name='stock_lots_open_expiry_idx'
+            ),
+            models.Index(
+                fields=['ingredient', 'expiry_date', 'received_at'],
+                condition=models.Q(quantity_remaining__gt=0),
+                name='stock_lots_open_fefo_idx'
+            ),
+        ]
+
+    def __str__(self):
+        expires = self.expiry_date.isoformat() if self.expiry_date else _('no expiry')
+        return f"{self.ingredient.name} {self.quantity_remaining}/{self.quantity_received} ({expires})"
+
+    @property
+    def is_expired(self):
+        return self.expiry_date is not None and self.expiry_date < timezone.localdate()
+
+
+class InventoryValuation(models.Model):
+    """
+    Running cost state of an ingredient's stock.
+
+    Updated with every stock movement, so the value of the whole inventory
+    is a sum over these rows rather than a replay of the ledger.
+    """
+    ingredient = models.OneToOneField(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='valuation',
+        help_text=_("Ingredient valued")
+    )
+    quantity = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        default=0,
+        help_text=_("Stock the values below cover")
+    )
+    average_unit_cost = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        default=0,
+        help_text=_("Weighted-average cost per unit")
+    )
+    average_value = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_("On-hand value under weighted-average costing")
+    )
+    fifo_value = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_("On-hand value under FIFO costing")
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True
+    )
+
+    class Meta:
+        db_table = 'inventory_valuations'
+
+    def __str__(self):
+        return f"{self.ingredient.name}: {self.fifo_value} FIFO / {self.average_value} average"
+
+
+class CostLayer(models.Model):
+    """
+    A FIFO cost layer: stock received at one unit cost and not yet consumed.
+    """
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='cost_layers',
+        help_text=_("Ingredient")
+    )
+    received_at = models.DateTimeField(
+        help_text=_("When the stock was received")
+    )
+    unit_cost = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        help_text=_("Cost per unit of the layer")
+    )
+    quantity_remaining = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Quantity of the layer not yet consumed")
+    )
+
+    class Meta:
+        ordering = ['ingredient', 'received_at', 'id']
+        db_table = 'inventory_cost_layers'
+        indexes = [
+            models.Index(
+                fields=['ingredient', 'received_at', 'id'],
+                condition=models.Q(quantity_remaining__gt=0),
+                name='cost_layers_open_fifo_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ingredient.name}: {self.quantity_remaining} @ {self.unit_cost}"
+
+
+class ParLevelSuggestion(models.Model):
+    """
+    Stock levels for an ingredient suggested by the demand forecast.
+
+    Each forecast run replaces the pending suggestions; applying one copies
+    its levels onto the ingredient.
+    """
+    METHOD_CHOICES = [
+        ('moving_average', _('Seasonal moving average')),
+        ('smoothing', _('Seasonal exponential smoothing')),
+    ]
+    STATUS_CHOICES = [
+        ('pending', _('Pending')),
+        ('applied', _('Applied')),
+        ('dismissed', _('Dismissed')),
+    ]
+
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        related_name='par_suggestions',
+        help_text=_("Ingredient the levels are for")
+    )
+    method = models.CharField(
+        max_length=20,
+        choices=METHOD_CHOICES,
+        help_text=_("Forecast model that fitted the usage best")
+    )
+    daily_demand = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Forecast average daily usage")
+    )
+    lead_time_days = models.PositiveSmallIntegerField(
+        help_text=_("Days from order to delivery used for the forecast")
+    )
+    review_days = models.PositiveSmallIntegerField(
+        help_text=_("Days between deliveries used for the forecast")
+    )
+    minimum_stock = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Suggested minimum stock (safety stock)")
+    )
+    reorder_point = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Suggested reorder point")
+    )
+    maximum_stock = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Suggested par level")
+    )
+    forecast_error = models.FloatField(
+        null=True,
+        blank=True,
+        help_text=_("Recent one-step forecast error as a fraction of usage")
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        help_text=_("Review status")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+    reviewed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When the suggestion was applied or dismissed")
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        db_table = 'par_level_suggestions'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['ingredient', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.ingredient.name}: {self.minimum_stock}/{self.reorder_point}/{self.maximum_stock} ({self.status})"
+
+
+class StockCountSession(models.Model):
+    """
+    A physical stock count, typically at the end of the night.
+
+    Counters submit counts while the session is open; closing it sets stock
+    to the counted quantities through the movement ledger and freezes the
+    variance of every line.
+    """
+    STATUS_CHOICES = [
+        ('open', _('Open')),
+        ('closed', _('Closed')),
+        ('cancelled', _('Cancelled')),
+    ]
+
+    name = models.CharField(
+        max_length=100,
+        help_text=_("Label for the count, e.g. 'Friday close'")
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='open',
+        help_text=_("Count status")
+    )
+    notes = models.TextField(
+        blank=True,
+        help_text=_("Notes about the count")
+    )
+    started_by = models.ForeignKey(
+        Staff,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='started_stock_counts',
+        help_text=_("Staff member who opened the count")
+    )
+    closed_by = models.ForeignKey(
+        Staff,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='closed_stock_counts',
+        help_text=_("Staff member who closed the count")
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True
+    )
+    closed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When the counts were applied to stock")
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        db_table = 'stock_count_sessions'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class StockCountLine(models.Model):
+    """
+    The counted quantity of one ingredient in a stock count.
+
+    When several devices count the same ingredient, the most recent count
+    wins. Expected quantity and variance are recorded when the count closes.
+    """
+    session = models.ForeignKey(
+        StockCountSession,
+        on_delete=models.CASCADE,
+        related_name='lines',
+        help_text=_("Stock count")
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.PROTECT,
+        related_name='count_lines',
+        help_text=_("Counted ingredient")
+    )
+    counted_quantity = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        help_text=_("Quantity found on the shelf")
+    )
+    counted_at = models.DateTimeField(
+        help_text=_("When the count was taken on the device")
+    )
+    counted_by = models.ForeignKey(
+        Staff,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='stock_count_lines',
+        help_text=_("Staff member who counted")
+    )
+    device = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text=_("Device the count was submitted from")
+    )
+    expected_quantity = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        null=True,
+        blank=True,
+        help_text=_("Stock on record when the count closed")
+    )
+    variance = models.DecimalField(
+        max_digits=12,
+        decimal_places=3,
+        null=True,
+        blank=True,
+        help_text=_("Counted less expected quantity")
+    )
+    variance_value = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text=_("Value of the variance at weighted-average cost")
+    )
+
+    class Meta:
+        db_table = 'stock_count_lines'
+        constraints = [
+            models.UniqueConstraint(fields=['session', 'ingredient'], name='unique_count_session_ingredient'),
+        ]
+
+    def __str__(self):
+        return f"{self.ingredient.name}: {self.counted_quantity}"
@@ -0,0 +1,146 @@
+"""
+Signal receivers for restaurant domain events.
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Table, Staff, Ingredient, SupplierItem, Recipe, RecipeLine, UnitConversion
+from .signals import stock_alert_digest, stock_changed, table_status_changed
+from .services import (
+    depletion, floor_plan, leaderboard, occupancy, pacing, pricing, rosters, stock, stock_alerts,
+    stock_levels, timers, units
+)
+
+
+@receiver(table_status_changed)
+def record_table_status_event(sender, table, previous_status, previous_changed_at, staff=None, **kwargs):
+    """Store the transition and update occupancy rollups."""
+    occupancy.record_status_change(table, previous_status, previous_changed_at, staff)
+
+
+@receiver(table_status_changed)
+def schedule_table_timer(sender, table, **kwargs):
+    """Schedule automatic cleaning and reservation hold expiry once committed."""
+    transaction.on_commit(partial(timers.schedule_for_status, table))
+
+
+@receiver(table_status_changed)
+def track_reserved_covers(sender, table, previous_status, **kwargs):
+    """Keep kitchen pacing aware of covers held by reserved tables."""
+    transaction.on_commit(partial(pacing.track_reservation, table, previous_status))
+
+
+@receiver(table_status_changed)
+def update_leaderboards(sender, table, previous_status, staff=None, **kwargs):
+    """Credit covers and table turns to servers once committed."""
+    transaction.on_commit(partial(leaderboard.record_table_change, table, previous_status, staff))
+
+
+@receiver(post_save, sender=Table)
+def update_floor_plan(sender, instance, **kwargs):
+    """Refresh the table's entry in the floor-plan snapshot."""
+    transaction.on_commit(partial(floor_plan.write_table, instance))
+
+
+@receiver(post_delete, sender=Table)
+def remove_from_floor_plan(sender, instance, **kwargs):
+    """Drop a deleted table from the floor-plan snapshot."""
+    transaction.on_commit(partial(floor_plan.remove_table, instance.pk))
+
+
+@receiver(post_save, sender=Staff)
+@receiver(post_delete, sender=Staff)
+def invalidate_staff_roster(sender, **kwargs):
+    """Publish a new roster version after staff changes."""
+    transaction.on_commit(rosters.invalidate)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(post_save, sender=RecipeLine)
+@receiver(post_delete, sender=RecipeLine)
+def invalidate_recipe_matrix(sender, **kwargs):
+    """Recompile the depletion matrix after recipe changes."""
+    transaction.on_commit(depletion.invalidate)
+
+
+@receiver(post_save, sender=UnitConversion)
+@receiver(post_delete, sender=UnitConversion)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_unit_conversions(sender, **kwargs):
+    """Recompile the conversion matrix after conversion or ingredient changes."""
+    transaction.on_commit(units.invalidate)
+
+
+@receiver(post_save, sender=Ingredient)
+def record_ingredient_cost(sender, instance, raw=False, **kwargs):
+    """Append to the price history when an ingredient's cost changes."""
+    if raw:
+        return
+    pricing.record_price(instance.pk, None, instance.cost_per_unit, getattr(instance, '_loaded_cost_per_unit', None))
+    instance._loaded_cost_per_unit = instance.cost_per_unit
+
+
+@receiver(post_save, sender=Ingredient)
+def record_opening_stock(sender, instance, created, raw=False, **kwargs):
+    """Start a new ingredient's ledger with the stock it was created with."""
+    if created and not raw:
+        stock.record_opening_balance(instance)
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def update_stock_level_sets(sender, instance, raw=False, **kwargs):
+    """Keep the low and out-of-stock sets current after ingredient edits."""
+    if raw:
+        # Fixtures bypass save(), so derive the stored status here
+        Ingredient.objects.filter(pk=instance.pk).update(stock_status=Ingredient.stock_status_case())
+    transaction.on_commit(partial(stock_levels.sync, [instance.pk]))
+
+
+@receiver(stock_changed)
+def update_stock_levels_after_movements(sender, ingredient_ids, **kwargs):
+    """Keep the low and out-of-stock sets current after stock movements."""
+    transaction.on_commit(partial(stock_levels.sync, ingredient_ids))
+
+
+@receiver(stock_changed)
+def raise_stock_alerts(sender, ingredient_ids, **kwargs):
+    """Announce threshold crossings once the stock write commits."""
+    transaction.on_commit(partial(stock_alerts.evaluate, ingredient_ids))
+
+
+@receiver(post_save, sender=Ingredient)
+def raise_stock_alerts_after_edit(sender, instance, raw=False, **kwargs):
+    """Announce crossings caused by edited thresholds."""
+    if raw:
+        return
+    transaction.on_commit(partial(stock_alerts.evaluate, [instance.pk]))
+
+
+@receiver(post_delete, sender=Ingredient)
+def forget_stock_alerts(sender, instance, **kwargs):
+    """Drop a deleted ingredient's alert level."""
+    transaction.on_commit(partial(stock_alerts.forget, instance.pk))
+
+
+@receiver(stock_alert_digest)
+def email_stock_alert_digest(sender, changes, active, **kwargs):
+    """Send the digest to staff who were not following the live alerts."""
+    stock_alerts.email_digest(changes, active)
+
+
+@receiver(post_save, sender=SupplierItem)
+def record_supplier_item_price(sender, instance, raw=False, **kwargs):
+    """Append to the price history when a supplier's unit price changes."""
+    if raw:
+        return
+    pricing.record_price(
+        instance.ingredient_id, instance.supplier_id, instance.unit_price,
+        getattr(instance, '_loaded_unit_price', None)
+    )
+    instance._loaded_unit_price = instance.unit_price
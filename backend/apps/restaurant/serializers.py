@@ -1,9 +1,18 @@
 """
 Restaurant API serializers for tables, staff, customers, suppliers, and inventory.
 """
+from decimal import Decimal
+
+from django.db import transaction
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Customer, Table, Staff, Supplier, Ingredient
+from .models import (
+    Customer, Table, Staff, Supplier, Ingredient, SectionAssignment, TimeEntry,
+    StaffAvailability, CoverageRequirement, ScheduledShift, TipPool, TipShare,
+    LeaderboardSnapshot, SupplierDelivery, SupplierDeliveryLine, SupplierItem, PurchaseOrder,
+    PurchaseOrderLine, StockMovement, Recipe, RecipeLine, StockLot,
+    ParLevelSuggestion, StockCountSession, UnitConversion
+)
 
 
 class CustomerSerializer(serializers.ModelSerializer):
@@ -119,19 +128,249 @@ class StaffListSerializer(serializers.ModelSerializer):
         ]
 
 
+class SectionAssignmentSerializer(serializers.ModelSerializer):
+    """Serializer for server section assignments."""
+    
+    staff_name = serializers.CharField(source='staff.name', read_only=True)
+    
+    class Meta:
+        model = SectionAssignment
+        fields = ['id', 'staff', 'staff_name', 'section', 'load', 'assigned_at', 'released_at']
+        read_only_fields = fields
+
+
+class SectionRebalanceSerializer(serializers.Serializer):
+    """Input for rebalancing servers across sections."""
+    
+    server_ids = serializers.PrimaryKeyRelatedField(
+        queryset=Staff.objects.filter(role='server', is_active=True),
+        many=True,
+        required=False,
+        help_text="Active servers to assign (defaults to all active servers)"
+    )
+
+
+class SectionReleaseSerializer(serializers.Serializer):
+    """Input for releasing a server from their sections."""
+    
+    staff = serializers.PrimaryKeyRelatedField(queryset=Staff.objects.all())
+
+
+class TimeEntrySerializer(serializers.ModelSerializer):
+    """Serializer for time clock entries."""
+    
+    staff_name = serializers.CharField(source='staff.name', read_only=True)
+    hours = serializers.FloatField(read_only=True)
+    
+    class Meta:
+        model = TimeEntry
+        fields = [
+            'id', 'staff', 'staff_name', 'clock_in', 'clock_out',
+            'role', 'hourly_rate', 'source', 'hours'
+        ]
+        read_only_fields = fields
+
+
+class PunchSerializer(serializers.Serializer):
+    """A single clock-in or clock-out punch."""
+    
+    ACTION_CHOICES = [('in', 'Clock in'), ('out', 'Clock out')]
+    
+    staff = serializers.IntegerField()
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    timestamp = serializers.DateTimeField(required=False)
+
+
+class PunchBatchSerializer(serializers.Serializer):
+    """A batch of punches, typically submitted by a terminal at shift change."""
+    
+    punches = PunchSerializer(many=True, allow_empty=False)
+    source = serializers.CharField(max_length=50, required=False, allow_blank=True)
+
+
+class StaffAvailabilitySerializer(serializers.ModelSerializer):
+    """Serializer for weekly staff availability windows."""
+    
+    weekday_display = serializers.CharField(source='get_weekday_display', read_only=True)
+    
+    class Meta:
+        model = StaffAvailability
+        fields = ['id', 'staff', 'weekday', 'weekday_display', 'start_time', 'end_time']
+        read_only_fields = ['id']
+    
+    def validate(self, data):
+        """Validate the window ends after it starts."""
+        start_time = data.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = data.get('end_time', getattr(self.instance, 'end_time', None))
+        
+        if start_time and end_time and end_time <= start_time:
+            raise serializers.ValidationError({
+                'end_time': 'End time must be after start time'
+            })
+        return data
+
+
+class CoverageRequirementSerializer(serializers.ModelSerializer):
+    """Serializer for hourly role coverage requirements."""
+    
+    role_display = serializers.CharField(source='get_role_display', read_only=True)
+    
+    class Meta:
+        model = CoverageRequirement
+        fields = ['id', 'role', 'role_display', 'weekday', 'hour', 'headcount']
+        read_only_fields = ['id']
+    
+    def validate_hour(self, value):
+        """Validate hour is within a day."""
+        if value > 23:
+            raise serializers.ValidationError("Hour must be between 0 and 23")
+        return value
+
+
+class ScheduledShiftSerializer(serializers.ModelSerializer):
+    """Serializer for rota shifts."""
+    
+    staff_name = serializers.CharField(source='staff.name', read_only=True)
+    
+    class Meta:
+        model = ScheduledShift
+        fields = [
+            'id', 'staff', 'staff_name', 'role', 'week_start', 'start', 'end',
+            'status', 'replaces', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class ScheduleGenerateSerializer(serializers.Serializer):
+    """Input for generating a week's rota."""
+    
+    week_start = serializers.DateField(help_text="Monday of the week to schedule")
+    labor_budget = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    
+    def validate_week_start(self, value):
+        """Validate the week starts on a Monday."""
+        if value.weekday() != 0:
+            raise serializers.ValidationError("Week must start on a Monday")
+        return value
+
+
+class CallInSickSerializer(serializers.Serializer):
+    """Input for re-filling a shift when its staff member calls in sick."""
+    
+    labor_budget = serializers.DecimalField(
+        max_digits=12, decimal_places=2, required=False,
+        help_text="Week labor budget (defaults to the week's cost as scheduled)"
+    )
+
+
+class TipShareSerializer(serializers.ModelSerializer):
+    """Serializer for a staff member's tip share."""
+    
+    staff_name = serializers.CharField(source='staff.name', read_only=True)
+    
+    class Meta:
+        model = TipShare
+        fields = ['id', 'staff', 'staff_name', 'role', 'hours', 'weight', 'amount']
+        read_only_fields = fields
+
+
+class TipPoolSerializer(serializers.ModelSerializer):
+    """Serializer for distributed tip pools."""
+    
+    shares = TipShareSerializer(many=True, read_only=True)
+    created_by_name = serializers.CharField(source='created_by.name', read_only=True, default=None)
+    
+    class Meta:
+        model = TipPool
+        fields = [
+            'id', 'period_start', 'period_end', 'total_amount', 'role_weights',
+            'created_by', 'created_by_name', 'notes', 'created_at', 'shares'
+        ]
+        read_only_fields = fields
+
+
+class TipDistributionSerializer(serializers.Serializer):
+    """Input for distributing a tip pool."""
+    
+    period_start = serializers.DateTimeField()
+    period_end = serializers.DateTimeField()
+    total_amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal('0.01'))
+    role_weights = serializers.DictField(
+        child=serializers.FloatField(min_value=0, max_value=9999.99),
+        required=False,
+        help_text="Points per hour by role, up to 9999.99 (defaults to the configured weights)"
+    )
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    
+    def validate_role_weights(self, value):
+        """Validate weights are keyed by staff roles."""
+        roles = dict(Staff.ROLE_CHOICES)
+        unknown = [role for role in value if role not in roles]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown roles: {', '.join(unknown)}")
+        return value
+    
+    def validate(self, data):
+        """Validate the period."""
+        if data['period_end'] <= data['period_start']:
+            raise serializers.ValidationError({
+                'period_end': 'Period end must be after period start'
+            })
+        return data
+
+
+class HeartbeatSerializer(serializers.Serializer):
+    """Terminal heartbeat for the signed-in staff member."""
+    
+    terminal = serializers.CharField(max_length=50)
+    section = serializers.CharField(max_length=50, required=False, allow_blank=True, default='')
+
+
+class LeaderboardSnapshotSerializer(serializers.ModelSerializer):
+    """Serializer for persisted leaderboard ranks."""
+    
+    staff_name = serializers.CharField(source='staff.name', read_only=True)
+    
+    class Meta:
+        model = LeaderboardSnapshot
+        fields = ['id', 'metric', 'period', 'period_start', 'staff', 'staff_name', 'rank', 'score']
+        read_only_fields = fields
+
+
 class SupplierSerializer(serializers.ModelSerializer):
     """Serializer for Supplier model with quality rating validation."""
     
+    delivery_weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        required=False,
+        help_text="Delivery weekdays, 0 (Monday) to 6 (Sunday); parsed from delivery_schedule when omitted"
+    )
+    
     class Meta:
         model = Supplier
         fields = [
             'id', 'name', 'contact_person', 'phone_number', 'email',
-            'address', 'payment_terms', 'delivery_schedule',
+            'address', 'payment_terms', 'delivery_schedule', 'delivery_weekdays',
+            'delivery_time', 'order_cutoff_time', 'order_lead_days',
             'minimum_order', 'delivery_fee', 'quality_rating',
             'is_active', 'notes', 'created_at'
         ]
         read_only_fields = ['id', 'created_at']
     
+    def _apply_delivery_weekdays(self, validated_data):
+        weekdays = validated_data.pop('delivery_weekdays', None)
+        if weekdays is not None:
+            validated_data['delivery_days'] = sum(1 << day for day in set(weekdays))
+        return validated_data
+    
+    def create(self, validated_data):
+        """Store delivery weekdays as the bitmask."""
+        return super().create(self._apply_delivery_weekdays(validated_data))
+    
+    def update(self, instance, validated_data):
+        """Store delivery weekdays as the bitmask."""
+        return super().update(instance, self._apply_delivery_weekdays(validated_data))
+    
     def validate_phone_number(self, value):
         """Validate phone number format."""
         if not value.startswith('+254') or len(value) != 13:
@@ -156,10 +395,162 @@ class SupplierListSerializer(serializers.ModelSerializer):
         model = Supplier
         fields = [
             'id', 'name', 'contact_person', 'phone_number',
-            'quality_rating', 'is_active', 'delivery_schedule'
+            'quality_rating', 'is_active', 'delivery_schedule',
+            'delivery_weekdays', 'delivery_time'
         ]
 
 
+class SupplierDeliveryLineSerializer(serializers.ModelSerializer):
+    """Serializer for delivery lines."""
+    
+    ingredient_name = serializers.CharField(source='ingredient.name', read_only=True)
+    
+    class Meta:
+        model = SupplierDeliveryLine
+        fields = [
+            'id', 'ingredient', 'ingredient_name', 'quantity_ordered', 'quantity_received',
+            'quantity_rejected', 'expected_unit_price', 'unit_price', 'expiry_date'
+        ]
+        read_only_fields = ['id']
+    
+    def validate(self, data):
+        """Validate rejected quantity does not exceed received quantity."""
+        if data.get('quantity_rejected', 0) > data['quantity_received']:
+            raise serializers.ValidationError({
+                'quantity_rejected': 'Rejected quantity cannot exceed quantity received'
+            })
+        return data
+
+
+class SupplierDeliverySerializer(serializers.ModelSerializer):
+    """Serializer for received supplier deliveries."""
+    
+    supplier_name = serializers.CharField(source='supplier.name', read_only=True)
+    lines = SupplierDeliveryLineSerializer(many=True)
+    is_on_time = serializers.BooleanField(read_only=True)
+    
+    class Meta:
+        model = SupplierDelivery
+        fields = [
+            'id', 'supplier', 'supplier_name', 'purchase_order', 'expected_at', 'received_at',
+            'is_on_time', 'received_by', 'notes', 'lines', 'created_at'
+        ]
+        read_only_fields = ['id', 'received_by', 'created_at']
+        extra_kwargs = {'received_at': {'required': False}}
+    
+    def validate_lines(self, value):
+        """Validate the delivery has lines."""
+        if not value:
+            raise serializers.ValidationError("A delivery needs at least one line")
+        return value
+    
+    def validate(self, data):
+        """Validate the purchase order is submitted and belongs to the delivering supplier."""
+        order = data.get('purchase_order')
+        if order is not None:
+            if order.supplier_id != data['supplier'].pk:
+                raise serializers.ValidationError({
+                    'purchase_order': 'Purchase order belongs to another supplier'
+                })
+            if order.status != 'submitted':
+                raise serializers.ValidationError({
+                    'purchase_order': 'Only submitted purchase orders can be received'
+                })
+        return data
+
+
+class PurchaseOrderLineSerializer(serializers.ModelSerializer):
+    """Serializer for purchase order lines."""
+    
+    ingredient_name = serializers.CharField(source='ingredient.name', read_only=True)
+    sku = serializers.CharField(source='supplier_item.sku', read_only=True, default=None)
+    
+    class Meta:
+        model = PurchaseOrderLine
+        fields = [
+            'id', 'ingredient', 'ingredient_name', 'supplier_item', 'sku', 'packs',
+            'quantity', 'pack_price', 'line_total'
+        ]
+        read_only_fields = fields
+
+
+class PurchaseOrderSerializer(serializers.ModelSerializer):
+    """Serializer for purchase orders with their lines."""
+    
+    supplier_name = serializers.CharField(source='supplier.name', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    lines = PurchaseOrderLineSerializer(many=True, read_only=True)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    
+    class Meta:
+        model = PurchaseOrder
+        fields = [
+            'id', 'supplier', 'supplier_name', 'status', 'status_display', 'delivery_date',
+            'order_cutoff', 'subtotal', 'delivery_fee', 'total', 'below_minimum', 'lines',
+            'submitted_at', 'received_at', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class PurchaseOrderGenerateSerializer(serializers.Serializer):
+    """Serializer for regenerating draft purchase orders."""
+    
+    suppliers = serializers.PrimaryKeyRelatedField(
+        queryset=Supplier.objects.filter(is_active=True), many=True, required=False
+    )
+
+
+class StockMovementSerializer(serializers.ModelSerializer):
+    """Serializer for stock movement ledger entries."""
+    
+    ingredient_name = serializers.CharField(source='ingredient.name', read_only=True)
+    kind_display = serializers.CharField(source='get_kind_display', read_only=True)
+    staff_name = serializers.CharField(source='staff.name', read_only=True, default=None)
+    expiry_date = serializers.DateField(
+        write_only=True, required=False, allow_null=True,
+        help_text="Expiry date of the lot a receipt opens"
+    )
+    
+    class Meta:
+        model = StockMovement
+        fields = [
+            'id', 'ingredient', 'ingredient_name', 'kind', 'kind_display', 'quantity',
+            'reason', 'reference', 'unit_cost', 'fifo_value', 'average_value',
+            'staff', 'staff_name', 'created_at', 'expiry_date'
+        ]
+        read_only_fields = ['id', 'fifo_value', 'average_value', 'staff', 'created_at']
+    
+    def validate(self, data):
+        """Validate the quantity moves stock in the direction the kind allows."""
+        if data['kind'] == 'cost_correction':
+            raise serializers.ValidationError({'kind': 'Cost corrections are only posted by receipts'})
+        if not data['quantity']:
+            raise serializers.ValidationError({'quantity': 'Quantity cannot be zero'})
+        if data['kind'] in ('receipt', 'usage', 'waste') and data['quantity'] < 0:
+            raise serializers.ValidationError({
+                'quantity': f"{data['kind'].title()} quantities are positive amounts"
+            })
+        if data.get('expiry_date') and data['kind'] != 'receipt':
+            raise serializers.ValidationError({'expiry_date': 'Only receipts open a lot with an expiry date'})
+        if data.get('unit_cost') is not None and data['kind'] != 'receipt':
+            raise serializers.ValidationError({'unit_cost': 'Only receipts carry a purchase cost'})
+        if data.get('unit_cost') is not None and data['unit_cost'] < 0:
+            raise serializers.ValidationError({'unit_cost': 'Unit cost cannot be negative'})
+        return data
+
+
+class StockMovementBatchSerializer(serializers.Serializer):
+    """Serializer for applying several stock movements at once."""
+    
+    movements = StockMovementSerializer(many=True)
+    
+    def validate_movements(self, value):
+        """Validate the batch has movements."""
+        if not value:
+            raise serializers.ValidationError("A batch needs at least one movement")
+        return value
+
+
 class IngredientSerializer(serializers.ModelSerializer):
     """Serializer for Ingredient model with stock validation."""
     
@@ -213,6 +604,10 @@ class IngredientListSerializer(serializers.ModelSerializer):
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     unit_display = serializers.CharField(source='get_unit_of_measure_display', read_only=True)
     is_low_stock = serializers.BooleanField(read_only=True)
+    best_supplier = serializers.IntegerField(read_only=True, default=None)
+    best_supplier_name = serializers.CharField(read_only=True, default=None)
+    best_unit_price = serializers.DecimalField(max_digits=10, decimal_places=4, read_only=True, default=None)
+    best_lead_time_days = serializers.IntegerField(read_only=True, default=None)
     
     class Meta:
         model = Ingredient
@@ -220,14 +615,70 @@ class IngredientListSerializer(serializers.ModelSerializer):
             'id', 'name', 'category', 'category_display',
             'current_stock', 'minimum_stock', 'unit_of_measure',
             'unit_display', 'cost_per_unit', 'supplier_name',
-            'is_perishable', 'is_low_stock'
+            'is_perishable', 'is_low_stock', 'best_supplier',
+            'best_supplier_name', 'best_unit_price', 'best_lead_time_days'
         ]
 
 
+class SupplierItemSerializer(serializers.ModelSerializer):
+    """Serializer for supplier catalog items."""
+    
+    supplier_name = serializers.CharField(source='supplier.name', read_only=True)
+    ingredient_name = serializers.CharField(source='ingredient.name', read_only=True)
+    
+    class Meta:
+        model = SupplierItem
+        fields = [
+            'id', 'supplier', 'supplier_name', 'ingredient', 'ingredient_name', 'sku',
+            'pack_size', 'pack_price', 'unit_price', 'lead_time_days', 'is_available', 'updated_at'
+        ]
+        read_only_fields = ['id', 'unit_price', 'updated_at']
+    
+    def validate_pack_size(self, value):
+        """Validate pack size is positive."""
+        if value <= 0:
+            raise serializers.ValidationError("Pack size must be greater than zero")
+        return value
+
+
+class UnitConversionSerializer(serializers.ModelSerializer):
+    """Serializer for an ingredient's pack and density conversions."""
+    
+    ingredient_name = serializers.CharField(source='ingredient.name', read_only=True)
+    unit_of_measure = serializers.CharField(source='ingredient.unit_of_measure', read_only=True)
+    
+    class Meta:
+        model = UnitConversion
+        fields = ['id', 'ingredient', 'ingredient_name', 'unit_of_measure', 'unit', 'factor', 'updated_at']
+        read_only_fields = ['id', 'updated_at']
+    
+    def validate_factor(self, value):
+        """Validate factor is positive."""
+        if value <= 0:
+            raise serializers.ValidationError("Factor must be greater than zero")
+        return value
+    
+    def validate(self, attrs):
+        """Allow one conversion per dimension, and none the standard ratios already cover."""
+        ingredient = attrs.get('ingredient') or self.instance.ingredient
+        unit = attrs.get('unit') or self.instance.unit
+        dimension = Ingredient.UNIT_DIMENSIONS[unit][0]
+        if Ingredient.UNIT_DIMENSIONS[ingredient.unit_of_measure][0] == dimension:
+            raise serializers.ValidationError({
+                'unit': f"{unit} converts to {ingredient.unit_of_measure} without a factor"
+            })
+        others = ingredient.unit_conversions.exclude(pk=getattr(self.instance, 'pk', None))
+        if any(Ingredient.UNIT_DIMENSIONS[other][0] == dimension for other in others.values_list('unit', flat=True)):
+            raise serializers.ValidationError({
+                'unit': f"{ingredient.name} already has a conversion for this dimension"
+            })
+        return attrs
+
+
 class IngredientStockUpdateSerializer(serializers.ModelSerializer):
-    """Serializer for updating ingredient stock levels."""
+    """Serializer for setting ingredient stock to a counted level."""
     
-    reason = serializers.CharField(write_only=True, required=False)
+    reason = serializers.CharField(write_only=True, required=False, allow_blank=True, max_length=200)
     
     class Meta:
         model = Ingredient
@@ -239,4 +690,187 @@ class IngredientStockUpdateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Stock level cannot be negative"
             )
-        return value
\ No newline at end of file
+        return value
+
+
+class RecipeLineSerializer(serializers.ModelSerializer):
+    """Serializer for recipe ingredient lines."""
+    
+    ingredient_name = serializers.CharField(source='ingredient.name', read_only=True)
+    unit_of_measure = serializers.CharField(source='ingredient.unit_of_measure', read_only=True)
+    
+    class Meta:
+        model = RecipeLine
+        fields = ['id', 'ingredient', 'ingredient_name', 'quantity', 'unit', 'unit_of_measure']
+        read_only_fields = ['id']
+    
+    def validate_quantity(self, value):
+        """Validate quantity is positive."""
+        if value <= 0:
+            raise serializers.ValidationError("Quantity must be positive")
+        return value
+
+
+class RecipeSerializer(serializers.ModelSerializer):
+    """Serializer for recipes; writing lines replaces the recipe's lines."""
+    
+    lines = RecipeLineSerializer(many=True)
+    
+    class Meta:
+        model = Recipe
+        fields = [
+            'id', 'name', 'pos_code', 'yield_quantity', 'is_active', 'lines',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate_yield_quantity(self, value):
+        """Validate yield is positive."""
+        if value <= 0:
+            raise serializers.ValidationError("Yield must be positive")
+        return value
+    
+    def validate_lines(self, value):
+        """Validate each ingredient appears once, in a unit it converts from."""
+        ingredients = [line['ingredient'].pk for line in value]
+        if len(ingredients) != len(set(ingredients)):
+            raise serializers.ValidationError("Each ingredient can only appear once in a recipe")
+        dimensions = Ingredient.UNIT_DIMENSIONS
+        converted = {
+            (ingredient_id, dimensions[unit][0])
+            for ingredient_id, unit in UnitConversion.objects.filter(ingredient__in=ingredients).values_list(
+                'ingredient_id', 'unit'
+            )
+        }
+        unconvertible = [
+            f"{line['unit']} of {line['ingredient'].name}"
+            for line in value
+            if line.get('unit')
+            and dimensions[line['unit']][0] != dimensions[line['ingredient'].unit_of_measure][0]
+            and (line['ingredient'].pk, dimensions[line['unit']][0]) not in converted
+        ]
+        if unconvertible:
+            raise serializers.ValidationError("No unit conversion for " + ', '.join(unconvertible))
+        return value
+    
+    @transaction.atomic
+    def create(self, validated_data):
+        lines = validated_data.pop('lines')
+        recipe = Recipe.objects.create(**validated_data)
+        RecipeLine.objects.bulk_create([RecipeLine(recipe=recipe, **line) for line in lines])
+        return recipe
+    
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        lines = validated_data.pop('lines', None)
+        recipe = super().update(instance, validated_data)
+        if lines is not None:
+            recipe.lines.all().delete()
+            RecipeLine.objects.bulk_create([RecipeLine(recipe=recipe, **line) for line in lines])
+        return recipe
+
+
+class SaleItemSerializer(serializers.Serializer):
+    """A sold menu item from the POS."""
+    
+    pos_code = serializers.CharField(max_length=50)
+    quantity = serializers.DecimalField(
+        max_digits=8, decimal_places=2,
+        help_text="Portions sold; negative for refunded or voided portions"
+    )
+    
+    def validate_quantity(self, value):
+        """Validate the line sells or refunds something."""
+        if not value:
+            raise serializers.ValidationError("Quantity must not be zero")
+        return value
+
+
+class DepletionSerializer(serializers.Serializer):
+    """Serializer for depleting stock from a batch of POS sales."""
+    
+    reference = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    items = SaleItemSerializer(many=True)
+    
+    def validate_items(self, value):
+        """Validate the batch has items."""
+        if not value:
+            raise serializers.ValidationError("A batch needs at least one item")
+        return value
+
+
+class StockLotSerializer(serializers.ModelSerializer):
+    """Serializer for received stock lots."""
+    
+    ingredient_name = serializers.CharField(source='ingredient.name', read_only=True)
+    unit_of_measure = serializers.CharField(source='ingredient.unit_of_measure', read_only=True)
+    is_expired = serializers.BooleanField(read_only=True)
+    
+    class Meta:
+        model = StockLot
+        fields = [
+            'id', 'ingredient', 'ingredient_name', 'unit_of_measure', 'received_at', 'expiry_date',
+            'quantity_received', 'quantity_remaining', 'reference', 'is_expired'
+        ]
+        read_only_fields = fields
+
+
+class ParLevelSuggestionSerializer(serializers.ModelSerializer):
+    """Serializer for forecast par level suggestions, alongside the ingredient's current levels."""
+    
+    ingredient_name = serializers.CharField(source='ingredient.name', read_only=True)
+    unit_of_measure = serializers.CharField(source='ingredient.unit_of_measure', read_only=True)
+    method_display = serializers.CharField(source='get_method_display', read_only=True)
+    current_minimum_stock = serializers.DecimalField(
+        source='ingredient.minimum_stock', max_digits=10, decimal_places=3, read_only=True
+    )
+    current_reorder_point = serializers.DecimalField(
+        source='ingredient.reorder_point', max_digits=10, decimal_places=3, read_only=True
+    )
+    current_maximum_stock = serializers.DecimalField(
+        source='ingredient.maximum_stock', max_digits=10, decimal_places=3, read_only=True
+    )
+    
+    class Meta:
+        model = ParLevelSuggestion
+        fields = [
+            'id', 'ingredient', 'ingredient_name', 'unit_of_measure', 'method', 'method_display',
+            'daily_demand', 'lead_time_days', 'review_days',
+            'minimum_stock', 'reorder_point', 'maximum_stock',
+            'current_minimum_stock', 'current_reorder_point', 'current_maximum_stock',
+            'forecast_error', 'status', 'created_at', 'reviewed_at'
+        ]
+        read_only_fields = fields
+
+
+class StockCountSessionSerializer(serializers.ModelSerializer):
+    """Serializer for physical stock count sessions."""
+    
+    started_by_name = serializers.CharField(source='started_by.name', read_only=True, default=None)
+    closed_by_name = serializers.CharField(source='closed_by.name', read_only=True, default=None)
+    line_count = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = StockCountSession
+        fields = [
+            'id', 'name', 'status', 'notes', 'started_by', 'started_by_name',
+            'closed_by', 'closed_by_name', 'line_count', 'created_at', 'closed_at'
+        ]
+        read_only_fields = [
+            'id', 'status', 'started_by', 'closed_by', 'line_count', 'created_at', 'closed_at'
+        ]
+
+
+class StockCountEntrySerializer(serializers.Serializer):
+    """A single counted ingredient."""
+    
+    ingredient = serializers.IntegerField()
+    quantity = serializers.DecimalField(max_digits=12, decimal_places=3, min_value=Decimal('0'))
+    counted_at = serializers.DateTimeField(required=False)
+
+
+class StockCountBatchSerializer(serializers.Serializer):
+    """A batch of counts, typically synced by a counting device."""
+    
+    counts = StockCountEntrySerializer(many=True, allow_empty=False)
+    device = serializers.CharField(max_length=50, required=False, allow_blank=True)
@@ -0,0 +1 @@
+# Restaurant domain services package
@@ -0,0 +1,224 @@
+"""
+Physical stock counts.
+
+Counters submit batches of counts to an open session, possibly late from
+devices that were offline; for each ingredient the count taken last wins,
+whatever order the batches arrive in. Closing the session locks the counted
+ingredients and compares each count with the stock at the moment it was
+taken, the current stock less the movements since, so sales made between a
+count and the close are not mistaken for variance. One adjustment per
+ingredient that differs goes through the movement ledger's bulk update, and
+every line's expected quantity and variance are recorded with one UPDATE
+that reads them back from those adjustments.
+The variance report is a single annotated query over the lines.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Abs, Coalesce
+from django.utils import timezone
+
+from . import stock
+from ..models import Ingredient, StockCountLine, StockCountSession, StockMovement
+
+VALUE = DecimalField(max_digits=14, decimal_places=2)
+QUANTITY = DecimalField(max_digits=12, decimal_places=3)
+ZERO = Decimal('0')
+
+
+class CountNotOpen(ValueError):
+    """The stock count has already been closed or cancelled."""
+
+    def __init__(self, session):
+        self.session = session
+        super().__init__(f"Stock count {session.pk} is {session.status}")
+
+
+def _lock_open(session_id):
+    session = StockCountSession.objects.select_for_update().get(pk=session_id)
+    if session.status != 'open':
+        raise CountNotOpen(session)
+    return session
+
+
+@transaction.atomic
+def submit(session_id, counts, staff=None, device=''):
+    """
+    Record counts in an open session.
+
+    ``counts`` are dicts of ingredient (id), quantity and optional
+    counted_at. A count older than the one already recorded for the
+    ingredient is ignored, so replaying a batch is harmless. Returns the
+    numbers of counts recorded and ignored as stale, and the ids that match
+    no ingredient.
+    """
+    session = _lock_open(session_id)
+    now = timezone.now()
+    latest = {}
+    for count in counts:
+        counted_at = count.get('counted_at') or now
+        previous = latest.get(count['ingredient'])
+        if previous is None or counted_at >= previous[1]:
+            latest[count['ingredient']] = (count['quantity'], counted_at)
+
+    known = set(Ingredient.objects.filter(pk__in=list(latest)).values_list('pk', flat=True))
+    unknown = sorted(set(latest) - known)
+    existing = {
+        ingredient_id: (pk, counted_at)
+        for pk, ingredient_id, counted_at in session.lines.filter(ingredient_id__in=known).values_list(
+            'pk', 'ingredient_id', 'counted_at'
+        )
+    }
+
+    created, updated = [], []
+    for ingredient_id in known:
+        quantity, counted_at = latest[ingredient_id]
+        line = StockCountLine(
+            session=session,
+            ingredient_id=ingredient_id,
+            counted_quantity=quantity,
+            counted_at=counted_at,
+            counted_by=staff,
+            device=device,
+        )
+        if ingredient_id not in existing:
+            created.append(line)
+        elif counted_at >= existing[ingredient_id][1]:
+            line.pk = existing[ingredient_id][0]
+            updated.append(line)
+
+    StockCountLine.objects.bulk_create(created)
+    StockCountLine.objects.bulk_update(updated, ['counted_quantity', 'counted_at', 'counted_by', 'device'])
+    return {
+        'recorded': len(created) + len(updated),
+        'stale': len(known) - len(created) - len(updated),
+        'unknown': unknown,
+    }
+
+
+@transaction.atomic
+def close(session_id, staff=None):
+    """
+    Set stock to the counted quantities and freeze the variances.
+
+    Each count is compared with the stock expected when it was taken, so
+    movements since then stay applied on top of it. A count is authoritative,
+    so the adjustment is applied even when usage posted since the count takes
+    stock below zero. Ingredients not counted are left alone. Returns the
+    session.
+    """
+    session = _lock_open(session_id)
+    current = dict(
+        Ingredient.objects.select_for_update().filter(
+            pk__in=session.lines.values('ingredient_id')
+        ).values_list('pk', 'current_stock')
+    )
+    moved_since = StockMovement.objects.filter(
+        ingredient_id=OuterRef('ingredient_id'), created_at__gt=OuterRef('counted_at')
+    ).values('ingredient_id').annotate(total=Sum('quantity')).values('total')
+    lines = list(session.lines.annotate(
+        moved=Coalesce(Subquery(moved_since), ZERO, output_field=QUANTITY)
+    ).values_list('ingredient_id', 'counted_quantity', 'moved'))
+    expected = {ingredient_id: current[ingredient_id] - moved for ingredient_id, _, moved in lines}
+
+    reference = f'count:{session.pk}'
+    stock.apply_movements([
+        {
+            'ingredient_id': ingredient_id,
+            'kind': 'adjustment',
+            'quantity': counted - expected[ingredient_id],
+            'reason': f'Stock count: {session.name}'[:200],
+            'reference': reference,
+        }
+        for ingredient_id, counted, _ in lines if counted != expected[ingredient_id]
+    ], staff=staff, allow_negative=True)
+
+    # The value includes any cost correction posted for stock the adjustment brought back above zero
+    movements = StockMovement.objects.filter(reference=reference, ingredient_id=OuterRef('ingredient_id'))
+    variance = Coalesce(
+        Subquery(movements.filter(kind='adjustment').values('quantity')[:1]), ZERO, output_field=QUANTITY
+    )
+    variance_value = Coalesce(
+        Subquery(movements.values('ingredient_id').annotate(total=Sum('average_value')).values('total')),
+        ZERO, output_field=VALUE
+    )
+    session.lines.update(
+        expected_quantity=ExpressionWrapper(F('counted_quantity') - variance, output_field=QUANTITY),
+        variance=variance,
+        variance_value=variance_value,
+    )
+
+    session.status = 'closed'
+    session.closed_at = timezone.now()
+    session.closed_by = staff
+    session.save(update_fields=['status', 'closed_at', 'closed_by'])
+    return session
+
+
+@transaction.atomic
+def cancel(session_id):
+    """Discard an open session without changing stock. Returns the session."""
+    session = _lock_open(session_id)
+    session.status = 'cancelled'
+    session.save(update_fields=['status'])
+    return session
+
+
+def variance_report(session):
+    """
+    Variance of every line and totals, largest value first.
+
+    Closed sessions report the frozen variances; open ones preview against
+    current stock at weighted-average cost.
+    """
+    lines = session.lines.all()
+    if session.status == 'closed':
+        lines = lines.annotate(
+            expected=F('expected_quantity'),
+            difference=F('variance'),
+            difference_value=F('variance_value'),
+        )
+    else:
+        lines = lines.annotate(
+            expected=F('ingredient__current_stock'),
+            difference=ExpressionWrapper(
+                F('counted_quantity') - F('ingredient__current_stock'), output_field=QUANTITY
+            ),
+        ).annotate(
+            difference_value=ExpressionWrapper(
+                F('difference') * Coalesce(
+                    F('ingredient__valuation__average_unit_cost'), F('ingredient__cost_per_unit')
+                ),
+                output_field=VALUE,
+            ),
+        )
+
+    totals = lines.aggregate(
+        lines=Count('pk'),
+        lines_with_variance=Count('pk', filter=~Q(difference=0)),
+        shrinkage=Coalesce(Sum('difference_value', filter=Q(difference_value__lt=0)), ZERO, output_field=VALUE),
+        overage=Coalesce(Sum('difference_value', filter=Q(difference_value__gt=0)), ZERO, output_field=VALUE),
+        net=Coalesce(Sum('difference_value'), ZERO, output_field=VALUE),
+    )
+    rows = lines.order_by(Abs('difference_value').desc(), 'ingredient__name').values(
+        'ingredient_id', 'ingredient__name', 'ingredient__unit_of_measure',
+        'counted_quantity', 'expected', 'difference', 'difference_value',
+    )
+    return {
+        'session': session.pk,
+        'status': session.status,
+        'totals': totals,
+        'lines': [
+            {
+                'ingredient': row['ingredient_id'],
+                'ingredient_name': row['ingredient__name'],
+                'unit_of_measure': row['ingredient__unit_of_measure'],
+                'counted_quantity': row['counted_quantity'],
+                'expected_quantity': row['expected'],
+                'variance': row['difference'],
+                'variance_value': row['difference_value'],
+            }
+            for row in rows
+        ],
+    }
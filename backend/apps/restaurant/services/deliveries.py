@@ -0,0 +1,103 @@
+"""
+Supplier delivery days and order cutoffs.
+
+Delivery days are stored as a weekday bitmask. Rather than a bitwise
+expression, which no index can serve, lookups list every mask value that
+contains the wanted day and filter with ``delivery_days__in`` on the
+(is_active, delivery_days, delivery_time) index.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from ..models import Supplier
+from ..signals import supplier_order_cutoff_approaching
+
+logger = logging.getLogger(__name__)
+
+REMINDED_KEY = 'supplier_cutoff:reminded:{supplier_id}:{delivery_date}'
+REMINDED_TTL_SECONDS = 2 * 24 * 60 * 60
+
+
+def suppliers_delivering(delivery_date, before=None):
+    """Active suppliers delivering on ``delivery_date``, optionally by time ``before``."""
+    queryset = Supplier.objects.filter(
+        is_active=True,
+        delivery_days__in=Supplier.delivery_masks([delivery_date.weekday()]),
+    )
+    if before is not None:
+        queryset = queryset.filter(delivery_time__lte=before)
+    return queryset
+
+
+def upcoming_cutoffs(now=None, hours=None):
+    """
+    Order cutoffs falling within the next ``hours`` hours.
+
+    Returns (supplier, delivery_date, cutoff datetime) tuples ordered by cutoff.
+    """
+    now = timezone.localtime(now)
+    end = now + timedelta(hours=hours if hours is not None else settings.SUPPLIER_CUTOFF_REMINDER_HOURS)
+    lead_days = set(
+        Supplier.objects.filter(is_active=True, order_cutoff_time__isnull=False)
+        .values_list('order_lead_days', flat=True)
+    )
+
+    # One condition per cutoff date in the window and lead time in use
+    windows = []
+    condition = Q()
+    day = now.date()
+    while day <= end.date():
+        first = now.time() if day == now.date() else None
+        last = end.time() if day == end.date() else None
+        for lead in lead_days:
+            delivery_date = day + timedelta(days=lead)
+            cutoff = Q(order_lead_days=lead, delivery_days__in=Supplier.delivery_masks([delivery_date.weekday()]))
+            if first is not None:
+                cutoff &= Q(order_cutoff_time__gte=first)
+            if last is not None:
+                cutoff &= Q(order_cutoff_time__lte=last)
+            condition |= cutoff
+            windows.append((day, lead))
+        day += timedelta(days=1)
+
+    if not windows:
+        return []
+
+    upcoming = []
+    for supplier in Supplier.objects.filter(condition, is_active=True, order_cutoff_time__isnull=False):
+        for day, lead in windows:
+            if lead != supplier.order_lead_days:
+                continue
+            cutoff = timezone.make_aware(datetime.combine(day, supplier.order_cutoff_time))
+            delivery_date = day + timedelta(days=lead)
+            if now <= cutoff <= end and delivery_date.weekday() in supplier.delivery_weekdays:
+                upcoming.append((supplier, delivery_date, cutoff))
+    upcoming.sort(key=lambda item: item[2])
+    return upcoming
+
+
+def send_cutoff_reminders(now=None):
+    """
+    Send supplier_order_cutoff_approaching once per supplier and delivery.
+
+    Returns the number of reminders sent.
+    """
+    conn = get_redis_connection('default')
+    sent = 0
+    for supplier, delivery_date, cutoff in upcoming_cutoffs(now):
+        key = REMINDED_KEY.format(supplier_id=supplier.pk, delivery_date=delivery_date.isoformat())
+        if not conn.set(key, 1, nx=True, ex=REMINDED_TTL_SECONDS):
+            continue
+        logger.info(
+            "Order cutoff for %s delivery on %s is at %s", supplier.name, delivery_date, cutoff
+        )
+        supplier_order_cutoff_approaching.send(
+            sender=Supplier, supplier=supplier, delivery_date=delivery_date, cutoff=cutoff
+        )
+        sent += 1
+    return sent
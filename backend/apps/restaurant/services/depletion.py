@@ -0,0 +1,145 @@
+"""
+Stock depletion from POS sales.
+
+Active recipes are compiled into a sparse recipe-by-ingredient matrix of
+per-portion quantities (CSR arrays) once per recipe and unit conversion
+version and kept in process memory. Lines written in another unit are
+converted to the ingredient's own unit while compiling, in one vectorized
+step. A batch of sold line items is folded into portions per
+recipe with one bincount, multiplied through the matrix and summed per
+ingredient with another, so thousands of line items become one usage
+movement per ingredient applied by the ledger's bulk update.
+"""
+import logging
+import time
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+from . import stock, units
+from ..models import RecipeLine
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'recipes:version'
+
+_compiled = {}
+
+
+class RecipeMatrix:
+    """Per-portion ingredient quantities of every active recipe in CSR form."""
+
+    def __init__(self, codes, indptr, indices, data, ingredient_ids):
+        self.row = {code: index for index, code in enumerate(codes)}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.ingredient_ids = ingredient_ids
+        # Owning row of every stored entry, for scaling entries by row
+        self.entry_rows = np.repeat(np.arange(len(codes)), np.diff(indptr))
+
+    def usage(self, rows, quantities):
+        """Total quantity of each ingredient used by ``quantities`` portions of recipe ``rows``."""
+        portions = np.bincount(rows, weights=quantities, minlength=len(self.row))
+        return np.bincount(
+            self.indices, weights=self.data * portions[self.entry_rows], minlength=len(self.ingredient_ids)
+        )
+
+
+def _seed():
+    # Seeded from the clock so a lost key never reissues a version a process compiled
+    return time.time_ns() // 1000
+
+
+def current_version():
+    return cache.get_or_set(VERSION_KEY, _seed, None)
+
+
+def invalidate():
+    """Move to a new recipe version; each process recompiles on next use."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _seed(), None)
+
+
+def compile_matrix():
+    """Build the recipe matrix from the database."""
+    lines = RecipeLine.objects.filter(recipe__is_active=True).order_by('recipe_id').annotate(
+        per_portion=Cast('quantity', FloatField()) / Cast(F('recipe__yield_quantity'), FloatField())
+    ).values_list('recipe_id', 'recipe__pos_code', 'ingredient_id', 'unit', 'per_portion')
+    codes, rows, ingredients, line_units, data = [], [], [], [], []
+    previous = None
+    for recipe_id, pos_code, ingredient_id, unit, per_portion in lines:
+        if recipe_id != previous:
+            codes.append(pos_code)
+            previous = recipe_id
+        rows.append(len(codes) - 1)
+        ingredients.append(ingredient_id)
+        line_units.append(unit)
+        data.append(per_portion)
+
+    ingredients = np.array(ingredients, dtype=np.int64)
+    data = np.array(data, dtype=float) * units.factors(ingredients, line_units)
+    convertible = ~np.isnan(data)
+    if not convertible.all():
+        # A conversion was removed after the recipe was written
+        logger.warning("Skipping recipe lines with no unit conversion: %s", sorted({
+            (codes[rows[index]], line_units[index]) for index in np.flatnonzero(~convertible)
+        }))
+    counts = np.bincount(np.array(rows, dtype=np.int64)[convertible], minlength=len(codes))
+    ingredient_ids, indices = np.unique(ingredients[convertible], return_inverse=True)
+    indptr = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+    return RecipeMatrix(codes, indptr, indices, data[convertible], ingredient_ids)
+
+
+def get_matrix():
+    """The compiled matrix for the current recipe version."""
+    version = (current_version(), units.current_version())
+    if _compiled.get('version') != version:
+        _compiled['matrix'] = compile_matrix()
+        _compiled['version'] = version
+    return _compiled['matrix']
+
+
+def deplete(items, reference='', staff=None):
+    """
+    Deduct the ingredients of sold menu items from stock.
+
+    ``items`` are (pos_code, quantity) pairs, typically a POS batch. Refund
+    and void lines carry negative quantities and net against the batch's
+    sales; an ingredient whose net usage is negative is posted back to stock
+    as an adjustment. Items without an active recipe are skipped and
+    returned so the POS mapping can be fixed. Sales are never refused, so
+    stock may go negative until the next count. Returns (movements, unknown
+    codes).
+    """
+    matrix = get_matrix()
+    rows, quantities, unknown = [], [], set()
+    for pos_code, quantity in items:
+        row = matrix.row.get(pos_code)
+        if row is None:
+            unknown.add(pos_code)
+            continue
+        rows.append(row)
+        quantities.append(float(quantity))
+    if not rows:
+        return [], sorted(unknown)
+
+    usage = matrix.usage(np.array(rows), np.array(quantities))
+    used = np.flatnonzero(np.round(usage, 3))
+    movements = stock.apply_movements([
+        {
+            'ingredient_id': int(matrix.ingredient_ids[index]),
+            'kind': 'usage' if usage[index] > 0 else 'adjustment',
+            'quantity': Decimal(f'{abs(usage[index]):.3f}'),
+            'reason': 'POS sales' if usage[index] > 0 else 'POS refunds',
+            'reference': reference,
+        }
+        for index in used
+    ], staff=staff, allow_negative=True)
+    return movements, sorted(unknown)
+
@@ -0,0 +1,172 @@
+"""
+Precomputed floor-plan snapshot kept in Redis.
+
+Each table is stored as a compact array in a hash and every write bumps a
+monotonically increasing version. A sorted set records the version at which
+each table last changed, so clients holding version ``v`` can fetch only the
+tables written after it. Rendered full snapshots are cached per version.
+
+The hash always holds a placeholder field, so a floor with no tables still
+has a snapshot and a hash Redis evicted is noticed and rebuilt. Writes skip
+a missing hash and leave it to that rebuild.
+"""
+import json
+import time
+
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from ..models import Table
+
+TABLES_KEY = 'floor_plan:tables'
+CHANGES_KEY = 'floor_plan:changes'
+VERSION_KEY = 'floor_plan:version'
+RENDER_CACHE_KEY = 'floor_plan:render:{version}'
+RENDER_CACHE_TIMEOUT = 300
+
+STATUSES = [choice[0] for choice in Table.STATUS_CHOICES]
+TABLE_FIELDS = ['id', 'table_number', 'capacity', 'section', 'status', 'x', 'y', 'is_active']
+
+# Not a valid primary key, so it never collides with a table
+PLACEHOLDER = 0
+
+WRITE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+local version = redis.call('INCR', KEYS[3])
+if ARGV[2] == '' then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+else
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+redis.call('ZADD', KEYS[2], version, ARGV[1])
+return version
+"""
+
+REBUILD_SCRIPT = """
+local version = math.max(tonumber(redis.call('GET', KEYS[3]) or '0') + 1, tonumber(ARGV[1]))
+redis.call('SET', KEYS[3], version)
+redis.call('HSET', KEYS[1], ARGV[2], '')
+for i = 3, #ARGV, 2 do
+    if redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1]) == 1 then
+        redis.call('ZADD', KEYS[2], version, ARGV[i])
+    end
+end
+return version
+"""
+
+KEYS = [TABLES_KEY, CHANGES_KEY, VERSION_KEY]
+
+
+def encode_table(table):
+    """Encode a table as a compact array (see ``TABLE_FIELDS``)."""
+    return [
+        table.pk,
+        table.table_number,
+        table.capacity,
+        table.section,
+        STATUSES.index(table.status),
+        float(table.x_coordinate) if table.x_coordinate is not None else None,
+        float(table.y_coordinate) if table.y_coordinate is not None else None,
+        int(table.is_active),
+    ]
+
+
+def write_table(table):
+    """Store the latest state of a table and bump the snapshot version; 0 if not loaded."""
+    conn = get_redis_connection('default')
+    return conn.register_script(WRITE_SCRIPT)(
+        keys=KEYS, args=[table.pk, json.dumps(encode_table(table), separators=(',', ':'))]
+    )
+
+
+def remove_table(table_id):
+    """Drop a deleted table from the snapshot and bump the version; 0 if not loaded."""
+    conn = get_redis_connection('default')
+    return conn.register_script(WRITE_SCRIPT)(keys=KEYS, args=[table_id, ''])
+
+
+def rebuild():
+    """
+    Load every table into the snapshot.
+
+    Existing rows are never overwritten, so a rebuild racing a write keeps the
+    newer row. The version jumps to at least the current time in milliseconds,
+    keeping it monotonic even if Redis was flushed.
+    """
+    args = [int(time.time() * 1000), PLACEHOLDER]
+    for table in Table.objects.all():
+        args.extend([table.pk, json.dumps(encode_table(table), separators=(',', ':'))])
+
+    conn = get_redis_connection('default')
+    return conn.register_script(REBUILD_SCRIPT)(keys=KEYS, args=args)
+
+
+def summarize_sections(rows):
+    """Per-section table counts by status and seats available."""
+    sections = {}
+    available = STATUSES.index('available')
+
+    for row in rows:
+        _, _, capacity, section, status_code, _, _, is_active = row
+        if not is_active:
+            continue
+        summary = sections.setdefault(section, {
+            'section': section,
+            'tables': 0,
+            'seats': 0,
+            'seats_available': 0,
+            'status_counts': [0] * len(STATUSES),
+        })
+        summary['tables'] += 1
+        summary['seats'] += capacity
+        summary['status_counts'][status_code] += 1
+        if status_code == available:
+            summary['seats_available'] += capacity
+
+    return [sections[name] for name in sorted(sections)]
+
+
+def get_snapshot(since=None):
+    """
+    Return the floor plan, or only the tables changed after ``since``.
+
+    Section summaries are always included since they are small.
+    """
+    conn = get_redis_connection('default')
+    version = conn.get(VERSION_KEY)
+    if version is None or not conn.exists(TABLES_KEY):
+        rebuild()
+        version = conn.get(VERSION_KEY)
+    version = int(version)
+
+    render_key = RENDER_CACHE_KEY.format(version=version)
+    snapshot = cache.get(render_key)
+    if snapshot is None:
+        rows = sorted(
+            (json.loads(value) for value in conn.hvals(TABLES_KEY) if value),
+            key=lambda row: row[1]
+        )
+        snapshot = {
+            'version': version,
+            'statuses': STATUSES,
+            'table_fields': TABLE_FIELDS,
+            'sections': summarize_sections(rows),
+            'tables': rows,
+        }
+        cache.set(render_key, snapshot, RENDER_CACHE_TIMEOUT)
+
+    if since is None or since > version:
+        return dict(snapshot, full=True, removed=[])
+
+    changed_ids = {int(pk) for pk in conn.zrangebyscore(CHANGES_KEY, f'({since}', '+inf')}
+    tables = [row for row in snapshot['tables'] if row[0] in changed_ids]
+    present = {row[0] for row in tables}
+
+    return dict(
+        snapshot,
+        full=False,
+        tables=tables,
+        removed=sorted(changed_ids - present),
+    )
@@ -0,0 +1,264 @@
+"""
+Demand forecasting for par levels.
+
+Daily usage of every ingredient is loaded into one (ingredients, days)
+array. Two day-of-week seasonal models are fitted to all rows at once: a
+seasonal moving average (the mean of the last four same weekdays) and
+exponential smoothing of the deseasonalized series over a grid of smoothing
+constants, stepping through the days with whole-column operations. Each
+ingredient keeps the model with the smallest one-step error over the last
+weeks, and its forecast over the supplier lead time and delivery cycle gives
+the suggested reorder point, par level and safety stock. Large catalogs are
+fitted a chunk of rows at a time, which bounds the memory the working arrays
+take; the fit is fast enough in one process that a process pool would cost
+more in start-up and copying than it saves, and Celery's daemonic prefork
+workers could not start one anyway.
+"""
+import logging
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from statistics import NormalDist
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import FloatField, Sum
+from django.db.models.functions import Cast, TruncDate
+from django.utils import timezone
+
+from ..models import Ingredient, ParLevelSuggestion, StockMovement, SupplierItem
+
+logger = logging.getLogger(__name__)
+
+ALPHAS = np.array([0.05, 0.1, 0.2, 0.3, 0.5])
+SEASON = 7
+# Weeks of history the seasonal indices and model errors are measured over
+FIT_WEEKS = 8
+MOVING_AVERAGE_WEEKS = 4
+MAX_HORIZON_DAYS = 28
+QUANTITY = Decimal('0.001')
+
+
+def load_usage(ingredient_ids, days, today=None):
+    """
+    Daily usage of each ingredient over the ``days`` days up to yesterday.
+
+    Returns a (len(ingredient_ids), days) float array, oldest day first, and
+    the date of the first column.
+    """
+    today = today or timezone.localdate()
+    start = today - timedelta(days=days)
+    position = {ingredient_id: index for index, ingredient_id in enumerate(ingredient_ids)}
+    # A plain range keeps the (kind, created_at) index usable
+    rows = StockMovement.objects.filter(
+        kind='usage',
+        ingredient_id__in=ingredient_ids,
+        created_at__gte=timezone.make_aware(datetime.combine(start, time.min)),
+        created_at__lt=timezone.make_aware(datetime.combine(today, time.min)),
+    ).annotate(day=TruncDate('created_at')).values('ingredient_id', 'day').annotate(
+        used=Cast(-Sum('quantity'), FloatField())
+    ).values_list('ingredient_id', 'day', 'used')
+
+    usage = np.zeros((len(ingredient_ids), days))
+    rows = list(rows)
+    if rows:
+        ingredient, day, used = zip(*rows)
+        index = np.fromiter((position[pk] for pk in ingredient), dtype=np.int64, count=len(rows))
+        offset = np.fromiter(((value - start).days for value in day), dtype=np.int64, count=len(rows))
+        usage[index, offset] = used
+    return usage, start
+
+
+def _seasonal_indices(usage, first_weekday):
+    """Day-of-week demand relative to the weekly mean over the fit window, (rows, 7)."""
+    window = usage[:, -FIT_WEEKS * SEASON:]
+    weekday = (first_weekday + usage.shape[1] - window.shape[1] + np.arange(window.shape[1])) % SEASON
+    totals = np.stack([window[:, weekday == day].mean(axis=1) for day in range(SEASON)], axis=1)
+    mean = totals.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(mean > 0, totals / mean, 1.0)
+
+
+def _moving_average(usage, horizon):
+    """One-step errors over the fit window and forecasts of the seasonal moving average."""
+    weeks = MOVING_AVERAGE_WEEKS
+    days = usage.shape[1]
+    lagged = np.stack([usage[:, (weeks - lag) * SEASON:days - lag * SEASON] for lag in range(1, weeks + 1)])
+    fitted = lagged.mean(axis=0)
+    errors = usage[:, weeks * SEASON:] - fitted
+
+    # Tomorrow is the same weekday as the day a week before it
+    last_weeks = usage[:, -weeks * SEASON:].reshape(len(usage), weeks, SEASON).mean(axis=1)
+    forecast = np.tile(last_weeks, (1, -(-horizon // SEASON)))[:, :horizon]
+    return errors[:, -FIT_WEEKS * SEASON:], forecast
+
+
+def _smoothing(usage, first_weekday, horizon):
+    """
+    One-step errors over the fit window and forecasts of seasonal exponential smoothing.
+
+    Every smoothing constant in ALPHAS is run side by side and each row keeps
+    the constant with the smallest squared error.
+    """
+    rows, days = usage.shape
+    seasonal = _seasonal_indices(usage, first_weekday)
+    weekday = (first_weekday + np.arange(days)) % SEASON
+    alphas = ALPHAS[:, None]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deseasonalized = np.where(seasonal[:, weekday] > 0, usage / seasonal[:, weekday], np.nan)
+    # Every row has a weekday with a positive index, so no opening slice is all NaN
+    initial = np.nanmean(deseasonalized[:, :4 * SEASON], axis=1)
+    level = np.repeat(initial[None, :], len(ALPHAS), axis=0)
+    fit_start = days - FIT_WEEKS * SEASON
+    errors = np.empty((len(ALPHAS), rows, FIT_WEEKS * SEASON))
+    for day in range(days):
+        if day >= fit_start:
+            errors[:, :, day - fit_start] = usage[:, day] - level * seasonal[:, weekday[day]]
+        observed = deseasonalized[:, day]
+        # Weekdays an ingredient is never used on carry no level information
+        level = np.where(np.isnan(observed), level, alphas * np.nan_to_num(observed) + (1 - alphas) * level)
+
+    best = np.argmin((errors ** 2).sum(axis=2), axis=0)
+    chosen = np.arange(rows)
+    future = (first_weekday + days + np.arange(horizon)) % SEASON
+    forecast = level[best, chosen][:, None] * seasonal[:, future]
+    return errors[best, chosen], forecast
+
+
+def fit(usage, first_weekday, lead_days, review_days, z):
+    """
+    Suggested stock levels for each row of ``usage``.
+
+    Returns a dict of per-row arrays: method (0 moving average, 1 smoothing),
+    daily_demand, safety_stock, reorder_point, par_level and error (one-step
+    absolute error relative to demand over the fit window).
+    """
+    horizon = int(min(max((lead_days + review_days).max(initial=1), 1), MAX_HORIZON_DAYS))
+    results = [_moving_average(usage, horizon), _smoothing(usage, first_weekday, horizon)]
+
+    squared = np.stack([(errors ** 2).sum(axis=1) for errors, _ in results])
+    method = np.argmin(squared, axis=0)
+    chosen = np.arange(len(usage))
+    errors = np.stack([errors for errors, _ in results])[method, chosen]
+    forecast = np.stack([forecast for _, forecast in results])[method, chosen]
+
+    days_ahead = np.arange(1, horizon + 1)
+    lead = np.minimum(lead_days, horizon)
+    cover = np.minimum(lead_days + review_days, horizon)
+    lead_demand = np.where(days_ahead[None, :] <= lead[:, None], forecast, 0).sum(axis=1)
+    cycle_demand = np.where(days_ahead[None, :] <= cover[:, None], forecast, 0).sum(axis=1)
+
+    sigma = errors.std(axis=1)
+    safety = z * sigma * np.sqrt(np.maximum(lead, 1))
+    recent = usage[:, -FIT_WEEKS * SEASON:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        error = np.abs(errors).sum(axis=1) / recent.sum(axis=1)
+    return {
+        'method': method,
+        'daily_demand': forecast.mean(axis=1),
+        'safety_stock': safety,
+        'reorder_point': lead_demand + safety,
+        'par_level': cycle_demand + z * sigma * np.sqrt(np.maximum(cover, 1)),
+        'error': error,
+    }
+
+
+def fit_all(usage, first_weekday, lead_days, review_days, z, chunk_size=None):
+    """Fit every row, ``chunk_size`` rows at a time (default FORECAST_CHUNK_ITEMS)."""
+    chunk_size = chunk_size or settings.FORECAST_CHUNK_ITEMS
+    if len(usage) <= chunk_size:
+        return fit(usage, first_weekday, lead_days, review_days, z)
+
+    parts = [
+        fit(usage[start:start + chunk_size], first_weekday, lead_days[start:start + chunk_size],
+            review_days[start:start + chunk_size], z)
+        for start in range(0, len(usage), chunk_size)
+    ]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def replenishment_days(ingredient_ids):
+    """Lead time and days between deliveries from each ingredient's primary supplier."""
+    rows = Ingredient.objects.filter(pk__in=ingredient_ids).values_list(
+        'pk', 'supplier_id', 'supplier__order_lead_days', 'supplier__delivery_days'
+    )
+    item_lead = dict(
+        ((ingredient_id, supplier_id), lead)
+        for ingredient_id, supplier_id, lead in SupplierItem.objects.filter(
+            ingredient_id__in=ingredient_ids
+        ).values_list('ingredient_id', 'supplier_id', 'lead_time_days')
+    )
+    lead, review = {}, {}
+    for pk, supplier_id, order_lead_days, delivery_days in rows:
+        lead[pk] = item_lead.get((pk, supplier_id), order_lead_days)
+        deliveries_per_week = bin(delivery_days).count('1')
+        review[pk] = -(-SEASON // deliveries_per_week) if deliveries_per_week else SEASON
+    return (
+        np.array([lead[pk] for pk in ingredient_ids]),
+        np.array([review[pk] for pk in ingredient_ids]),
+    )
+
+
+def _quantity(value):
+    return Decimal(f'{value:.3f}').quantize(QUANTITY)
+
+
+@transaction.atomic
+def suggest_par_levels(ingredient_ids=None, days=None, today=None):
+    """
+    Forecast demand and replace pending par level suggestions.
+
+    Ingredients without usage over the fit window get no suggestion. Returns
+    the created suggestions.
+    """
+    days = days or settings.FORECAST_HISTORY_DAYS
+    today = today or timezone.localdate()
+    if ingredient_ids is None:
+        ingredient_ids = list(Ingredient.objects.order_by('pk').values_list('pk', flat=True))
+    ingredient_ids = list(ingredient_ids)
+    if not ingredient_ids:
+        return []
+    # Both models need whole weeks of history to fit against
+    days = max(days, (FIT_WEEKS + MOVING_AVERAGE_WEEKS) * SEASON)
+
+    usage, start = load_usage(ingredient_ids, days, today)
+    lead_days, review_days = replenishment_days(ingredient_ids)
+    z = NormalDist().inv_cdf(settings.FORECAST_SERVICE_LEVEL)
+    result = fit_all(usage, start.weekday(), lead_days, review_days, z)
+
+    ParLevelSuggestion.objects.filter(status='pending', ingredient_id__in=ingredient_ids).delete()
+    methods = [choice for choice, _ in ParLevelSuggestion.METHOD_CHOICES]
+    suggestions = []
+    for row in np.flatnonzero(usage[:, -FIT_WEEKS * SEASON:].sum(axis=1) > 0):
+        minimum = max(_quantity(result['safety_stock'][row]), QUANTITY)
+        reorder_point = max(_quantity(result['reorder_point'][row]), minimum)
+        suggestions.append(ParLevelSuggestion(
+            ingredient_id=ingredient_ids[row],
+            method=methods[result['method'][row]],
+            daily_demand=_quantity(result['daily_demand'][row]),
+            lead_time_days=int(lead_days[row]),
+            review_days=int(review_days[row]),
+            minimum_stock=minimum,
+            reorder_point=reorder_point,
+            maximum_stock=max(_quantity(result['par_level'][row]), reorder_point + QUANTITY),
+            forecast_error=round(float(result['error'][row]), 4) if np.isfinite(result['error'][row]) else None,
+        ))
+    created = ParLevelSuggestion.objects.bulk_create(suggestions, batch_size=1000)
+    logger.info("Suggested par levels for %s of %s ingredients", len(created), len(ingredient_ids))
+    return created
+
+
+@transaction.atomic
+def apply_suggestion(suggestion):
+    """Copy a suggestion's levels onto its ingredient."""
+    ingredient = Ingredient.objects.select_for_update().get(pk=suggestion.ingredient_id)
+    ingredient.minimum_stock = suggestion.minimum_stock
+    ingredient.reorder_point = suggestion.reorder_point
+    ingredient.maximum_stock = suggestion.maximum_stock
+    ingredient.save(update_fields=['minimum_stock', 'reorder_point', 'maximum_stock', 'stock_status', 'last_updated'])
+
+    suggestion.status = 'applied'
+    suggestion.reviewed_at = timezone.now()
+    suggestion.save(update_fields=['status', 'reviewed_at'])
+    return ingredient
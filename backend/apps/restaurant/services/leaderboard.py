@@ -0,0 +1,168 @@
+"""
+Live server leaderboards backed by Redis sorted sets.
+
+Each metric (covers, turns, sales) has one sorted set per shift, day and
+week, keyed by the local start of the period. Table transitions increment the
+sets as they happen, so top-N and rank lookups are O(log n) reads and never
+aggregate history. Covers are credited to the server who seats a table and
+the turn to the same server when the table is released. Finished days are
+copied to LeaderboardSnapshot rows for history.
+"""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from ..models import Staff, SectionAssignment, LeaderboardSnapshot
+
+METRICS = ('covers', 'turns', 'sales')
+PERIODS = ('shift', 'day', 'week')
+
+BOARD_KEY = 'leaderboard:{metric}:{period}:{bucket}'
+SEATED_KEY = 'leaderboard:seated'
+
+TTL_SECONDS = {
+    'shift': 3 * 24 * 60 * 60,
+    'day': 3 * 24 * 60 * 60,
+    'week': 15 * 24 * 60 * 60,
+}
+
+
+def period_start(period, when=None):
+    """Local start of the shift, day or week containing ``when`` (default now)."""
+    local = timezone.localtime(when)
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if period == 'day':
+        return midnight
+    if period == 'week':
+        return midnight - timedelta(days=local.weekday())
+
+    # Shifts start at the configured hours; before the first one is still the
+    # previous day's last shift
+    starts = sorted(settings.LEADERBOARD_SHIFT_START_HOURS)
+    current = [hour for hour in starts if hour <= local.hour]
+    if current:
+        return midnight.replace(hour=current[-1])
+    return (midnight - timedelta(days=1)).replace(hour=starts[-1])
+
+
+def bucket_for(period, start):
+    return start.strftime('%Y-%m-%dT%H') if period == 'shift' else start.date().isoformat()
+
+
+def _key(metric, period, when=None):
+    return BOARD_KEY.format(metric=metric, period=period, bucket=bucket_for(period, period_start(period, when)))
+
+
+def credit(staff_id, metric, amount, when=None):
+    """Add ``amount`` to ``staff_id``'s score for ``metric`` in every period containing ``when``."""
+    pipe = get_redis_connection('default').pipeline(transaction=True)
+    for period in PERIODS:
+        key = _key(metric, period, when)
+        pipe.zincrby(key, float(amount), staff_id)
+        pipe.expire(key, TTL_SECONDS[period])
+    pipe.execute()
+
+
+def seating_server(table, staff):
+    """The server credited for seating ``table``: whoever seated it, else the section's server."""
+    if staff is not None and staff.role == 'server':
+        return staff.pk
+    return (
+        SectionAssignment.objects.filter(section=table.section, released_at__isnull=True)
+        .order_by('load').values_list('staff_id', flat=True).first()
+    )
+
+
+def record_table_change(table, previous_status, staff=None):
+    """Credit covers when a table is seated and a turn when it is released."""
+    conn = get_redis_connection('default')
+
+    if table.status == 'occupied':
+        server_id = seating_server(table, staff)
+        if server_id is None:
+            return
+        conn.hset(SEATED_KEY, table.pk, server_id)
+        credit(server_id, 'covers', table.capacity, table.status_changed_at)
+    elif previous_status == 'occupied':
+        server_id = conn.hget(SEATED_KEY, table.pk)
+        if server_id is None:
+            return
+        conn.hdel(SEATED_KEY, table.pk)
+        credit(int(server_id), 'turns', 1, table.status_changed_at)
+
+
+def record_sale(staff_id, amount, when=None):
+    """Credit a sale to a server; called by order settlement."""
+    credit(staff_id, 'sales', amount, when)
+
+
+def _names(staff_ids):
+    return dict(Staff.objects.filter(pk__in=staff_ids).values_list('pk', 'name'))
+
+
+def top(metric, period, limit=10, when=None):
+    """The top ``limit`` staff for ``metric`` in the period containing ``when``."""
+    rows = get_redis_connection('default').zrevrange(
+        _key(metric, period, when), 0, limit - 1, withscores=True
+    )
+    staff_ids = [int(member) for member, _ in rows]
+    names = _names(staff_ids)
+    return [
+        {'rank': rank, 'staff': staff_id, 'name': names.get(staff_id, ''), 'score': score}
+        for rank, (staff_id, (_, score)) in enumerate(zip(staff_ids, rows), start=1)
+    ]
+
+
+def rank_of(staff_id, metric, period, when=None):
+    """``staff_id``'s 1-based rank and score, or (None, 0) when not on the board."""
+    key = _key(metric, period, when)
+    pipe = get_redis_connection('default').pipeline(transaction=False)
+    pipe.zrevrank(key, staff_id)
+    pipe.zscore(key, staff_id)
+    rank, score = pipe.execute()
+    return (None, 0) if rank is None else (rank + 1, score)
+
+
+def snapshot(day):
+    """
+    Persist the boards that finished with ``day``: its shifts, the day itself,
+    and the week when ``day`` is a Sunday. Safe to re-run.
+    """
+    conn = get_redis_connection('default')
+    midnight = timezone.make_aware(datetime.combine(day, time.min))
+
+    starts = [('day', midnight)]
+    starts += [('shift', midnight.replace(hour=hour)) for hour in settings.LEADERBOARD_SHIFT_START_HOURS]
+    if day.weekday() == 6:
+        starts.append(('week', midnight - timedelta(days=6)))
+
+    snapshots = []
+    for period, start in starts:
+        for metric in METRICS:
+            key = BOARD_KEY.format(metric=metric, period=period, bucket=bucket_for(period, start))
+            for rank, (member, score) in enumerate(conn.zrevrange(key, 0, -1, withscores=True), start=1):
+                snapshots.append(LeaderboardSnapshot(
+                    metric=metric,
+                    period=period,
+                    period_start=start,
+                    staff_id=int(member),
+                    rank=rank,
+                    score=Decimal(str(round(score, 2))),
+                ))
+
+    existing = set(Staff.objects.filter(pk__in={row.staff_id for row in snapshots}).values_list('pk', flat=True))
+    snapshots = [row for row in snapshots if row.staff_id in existing]
+
+    with transaction.atomic():
+        LeaderboardSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=['metric', 'period', 'period_start', 'staff'],
+            update_fields=['rank', 'score'],
+        )
+    return len(snapshots)
@@ -0,0 +1,167 @@
+"""
+Lot-level inventory with first-expired-first-out consumption.
+
+Receipts open a lot carrying its received date and expiry date. Whenever
+the ledger moves stock, the open lots of the touched ingredients are locked
+and brought back in line with the new stock level: stock that left is taken
+from the lots expiring first, and stock that arrived without a receipt (an
+upward count adjustment, an opening balance) opens a lot of its own. Open
+lots therefore always add up to the ingredient's stock when it is above
+zero, and to nothing when it is not. Expired lots are written off as waste
+by a nightly sweep.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from . import stock
+from ..models import Ingredient, StockLot
+
+FEFO_ORDER = ['ingredient_id', F('expiry_date').asc(nulls_last=True), 'received_at', 'pk']
+
+
+def default_expiry(is_perishable, shelf_life_days, received_at):
+    """Expiry of a lot of a perishable ingredient received at ``received_at``."""
+    if not is_perishable or not shelf_life_days:
+        return None
+    return timezone.localdate(received_at) + timedelta(days=shelf_life_days)
+
+
+def _fefo_key(lot):
+    return (lot.expiry_date is None, lot.expiry_date, lot.received_at, lot.pk or 0)
+
+
+def settle(ingredient_ids, receipts=()):
+    """
+    Bring the open lots of ``ingredient_ids`` in line with their stock.
+
+    ``receipts`` are (ingredient id, quantity, expiry date or None,
+    reference) tuples that open new lots. Must run in the transaction that
+    changed stock. Returns the number of lots opened.
+    """
+    ingredient_ids = set(ingredient_ids) | {receipt[0] for receipt in receipts}
+    if not ingredient_ids:
+        return 0
+    now = timezone.now()
+    ingredients = {
+        pk: (current_stock, is_perishable, shelf_life_days)
+        for pk, current_stock, is_perishable, shelf_life_days in Ingredient.objects.filter(
+            pk__in=ingredient_ids
+        ).values_list('pk', 'current_stock', 'is_perishable', 'shelf_life_days')
+    }
+
+    by_ingredient = defaultdict(list)
+    for lot in StockLot.objects.select_for_update().filter(
+        ingredient_id__in=ingredient_ids, quantity_remaining__gt=0
+    ).order_by(*FEFO_ORDER):
+        by_ingredient[lot.ingredient_id].append(lot)
+
+    created = []
+    for ingredient_id, quantity, expiry_date, reference in receipts:
+        _, is_perishable, shelf_life_days = ingredients[ingredient_id]
+        lot = StockLot(
+            ingredient_id=ingredient_id,
+            received_at=now,
+            expiry_date=expiry_date or default_expiry(is_perishable, shelf_life_days, now),
+            quantity_received=quantity,
+            quantity_remaining=quantity,
+            reference=reference,
+        )
+        created.append(lot)
+        by_ingredient[ingredient_id].append(lot)
+
+    changed = []
+    for ingredient_id, (current_stock, is_perishable, shelf_life_days) in ingredients.items():
+        lots = sorted(by_ingredient[ingredient_id], key=_fefo_key)
+        excess = sum((lot.quantity_remaining for lot in lots), Decimal('0')) - max(current_stock, Decimal('0'))
+        if excess < 0:
+            created.append(StockLot(
+                ingredient_id=ingredient_id,
+                received_at=now,
+                expiry_date=default_expiry(is_perishable, shelf_life_days, now),
+                quantity_received=-excess,
+                quantity_remaining=-excess,
+                reference='adjustment',
+            ))
+            continue
+        for lot in lots:
+            if excess <= 0:
+                break
+            taken = min(lot.quantity_remaining, excess)
+            lot.quantity_remaining -= taken
+            excess -= taken
+            if lot.pk:
+                changed.append(lot)
+
+    if changed:
+        StockLot.objects.bulk_update(changed, ['quantity_remaining'])
+    StockLot.objects.bulk_create(created)
+    return len(created)
+
+
+def open_lots():
+    """Lots with stock left."""
+    return StockLot.objects.filter(quantity_remaining__gt=0)
+
+
+def expiring(hours=48):
+    """Open lots whose expiry date falls within the next ``hours``, soonest first."""
+    today = timezone.localdate()
+    until = timezone.localdate(timezone.now() + timedelta(hours=hours))
+    return open_lots().filter(expiry_date__gte=today, expiry_date__lte=until).order_by('expiry_date', 'received_at')
+
+
+def expired():
+    """Open lots past their expiry date."""
+    return open_lots().filter(expiry_date__lt=timezone.localdate())
+
+
+def unsettled():
+    """(ingredient id, name, stock, open lot total) for ingredients whose lots do not add up to their stock."""
+    totals = dict(open_lots().values('ingredient_id').annotate(total=Sum('quantity_remaining')).values_list(
+        'ingredient_id', 'total'
+    ))
+    return [
+        (pk, name, current_stock, totals.get(pk, Decimal('0')))
+        for pk, name, current_stock in Ingredient.objects.values_list('pk', 'name', 'current_stock')
+        if totals.get(pk, Decimal('0')) != max(current_stock, Decimal('0'))
+    ]
+
+
+@transaction.atomic
+def resettle(ingredient_ids):
+    """Settle the lots of ``ingredient_ids`` against their current stock."""
+    return settle(ingredient_ids)
+
+
+def sweep(batch_size=500):
+    """
+    Write off expired lots as waste, a batch of lots per transaction.
+
+    Each lot becomes a waste movement referencing it; since expired lots
+    expire first, the ledger's first-expired-first-out settling takes the
+    waste from exactly those lots. Returns (lots written off, movements).
+    """
+    written_off = movements = 0
+    while True:
+        batch = list(expired().order_by('expiry_date', 'pk').values_list(
+            'pk', 'ingredient_id', 'quantity_remaining'
+        )[:batch_size])
+        if not batch:
+            return written_off, movements
+        created = stock.apply_movements([
+            {
+                'ingredient_id': ingredient_id,
+                'kind': 'waste',
+                'quantity': remaining,
+                'reason': 'Expired',
+                'reference': f'lot:{pk}',
+            }
+            for pk, ingredient_id, remaining in batch
+        ], allow_negative=True)
+        written_off += len(batch)
+        movements += len(created)
@@ -0,0 +1,180 @@
+"""
+Table occupancy analytics built from the table status event stream.
+
+Every status transition is stored as a ``TableStatusEvent`` and folded into
+hourly ``TableOccupancyRollup`` rows straight away, so dashboards only ever
+read the rollups.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from ..models import Table, TableStatusEvent, TableOccupancyRollup
+
+# Status -> rollup counter that accumulates time spent in that status
+DWELL_FIELDS = {
+    'occupied': 'occupied_seconds',
+    'reserved': 'reserved_seconds',
+    'cleaning': 'cleaning_seconds',
+    'available': 'idle_seconds',
+}
+
+# Turn-time histogram: 5 minute buckets up to 6 hours, last bucket open-ended
+TURN_BUCKET_SECONDS = 5 * 60
+TURN_BUCKET_COUNT = 73
+
+
+def record_status_change(table, previous_status, previous_changed_at, staff=None):
+    """Store the transition event and fold the finished dwell into the rollups."""
+    changed_at = table.status_changed_at
+
+    with transaction.atomic():
+        TableStatusEvent.objects.create(
+            table=table,
+            section=table.section,
+            from_status=previous_status or '',
+            to_status=table.status,
+            occurred_at=changed_at,
+            staff=staff,
+        )
+
+        if previous_status and previous_changed_at and changed_at > previous_changed_at:
+            _accumulate_dwell(table.section, previous_status, previous_changed_at, changed_at)
+
+
+def _hour_start(value):
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _get_rollup(section, hour):
+    rollup, _ = TableOccupancyRollup.objects.select_for_update().get_or_create(
+        section=section, hour=hour
+    )
+    return rollup
+
+
+def _accumulate_dwell(section, status, started_at, ended_at):
+    """Split a dwell period across hour buckets and add it to the rollups."""
+    field = DWELL_FIELDS.get(status)
+
+    if field:
+        cursor = started_at
+        while cursor < ended_at:
+            hour = _hour_start(cursor)
+            bucket_end = min(hour + timedelta(hours=1), ended_at)
+            rollup = _get_rollup(section, hour)
+            setattr(rollup, field, getattr(rollup, field) + int((bucket_end - cursor).total_seconds()))
+            rollup.save(update_fields=[field])
+            cursor = bucket_end
+
+    if status == 'occupied':
+        turn_seconds = int((ended_at - started_at).total_seconds())
+        rollup = _get_rollup(section, _hour_start(ended_at))
+        histogram = rollup.turn_time_histogram or [0] * TURN_BUCKET_COUNT
+        histogram[min(turn_seconds // TURN_BUCKET_SECONDS, TURN_BUCKET_COUNT - 1)] += 1
+        rollup.turns += 1
+        rollup.turn_seconds += turn_seconds
+        rollup.turn_time_histogram = histogram
+        rollup.save(update_fields=['turns', 'turn_seconds', 'turn_time_histogram'])
+
+
+def histogram_percentile(histogram, percentile):
+    """Return the turn time in minutes at the given percentile of a histogram."""
+    total = sum(histogram)
+    if not total:
+        return None
+
+    threshold = total * percentile / 100
+    running = 0
+    for index, count in enumerate(histogram):
+        running += count
+        if running >= threshold:
+            return (index + 1) * TURN_BUCKET_SECONDS // 60
+    return len(histogram) * TURN_BUCKET_SECONDS // 60
+
+
+def occupancy_report(start, end, section=None):
+    """
+    Summarise occupancy between two datetimes from the hourly rollups.
+
+    Returns per-section totals with turn-time percentiles and the hourly series.
+    """
+    rollups = TableOccupancyRollup.objects.filter(hour__gte=start, hour__lt=end)
+    tables = Table.objects.filter(is_active=True)
+    if section is not None:
+        rollups = rollups.filter(section=section)
+        tables = tables.filter(section=section)
+
+    table_counts = {
+        row['section']: row['tables']
+        for row in tables.values('section').annotate(tables=Count('id'))
+    }
+
+    sections = defaultdict(lambda: {
+        'occupied_seconds': 0, 'reserved_seconds': 0, 'cleaning_seconds': 0,
+        'idle_seconds': 0, 'turns': 0, 'turn_seconds': 0,
+        'histogram': [0] * TURN_BUCKET_COUNT, 'hours': [],
+    })
+
+    for rollup in rollups.order_by('section', 'hour'):
+        totals = sections[rollup.section]
+        for field in DWELL_FIELDS.values():
+            totals[field] += getattr(rollup, field)
+        totals['turns'] += rollup.turns
+        totals['turn_seconds'] += rollup.turn_seconds
+        for index, count in enumerate(rollup.turn_time_histogram or []):
+            totals['histogram'][index] += count
+
+        capacity_seconds = table_counts.get(rollup.section, 0) * 3600
+        totals['hours'].append({
+            'hour': rollup.hour,
+            'occupancy_rate': round(rollup.occupied_seconds / capacity_seconds, 3) if capacity_seconds else None,
+            'turns': rollup.turns,
+        })
+
+    report = []
+    for name, totals in sorted(sections.items()):
+        histogram = totals.pop('histogram')
+        tracked_seconds = sum(totals[field] for field in DWELL_FIELDS.values())
+        report.append({
+            'section': name,
+            'tables': table_counts.get(name, 0),
+            'occupancy_rate': round(totals['occupied_seconds'] / tracked_seconds, 3) if tracked_seconds else None,
+            'idle_minutes': totals['idle_seconds'] // 60,
+            'cleaning_minutes': totals['cleaning_seconds'] // 60,
+            'turns': totals['turns'],
+            'avg_turn_minutes': round(totals['turn_seconds'] / totals['turns'] / 60, 1) if totals['turns'] else None,
+            'p50_turn_minutes': histogram_percentile(histogram, 50),
+            'p90_turn_minutes': histogram_percentile(histogram, 90),
+            'hours': totals['hours'],
+        })
+
+    return report
+
+
+def compact_status_events(retention_days=None, batch_size=5000):
+    """
+    Delete raw status events older than the retention window in batches.
+
+    Rollups are maintained as events arrive, so old events carry no extra information.
+    """
+    if retention_days is None:
+        retention_days = settings.TABLE_STATUS_EVENT_RETENTION_DAYS
+
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    deleted = 0
+
+    while True:
+        batch = list(
+            TableStatusEvent.objects.filter(occurred_at__lt=cutoff)
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            break
+        deleted += TableStatusEvent.objects.filter(pk__in=batch).delete()[0]
+
+    return deleted
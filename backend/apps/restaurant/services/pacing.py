@@ -0,0 +1,124 @@
+"""
+Kitchen pacing: limit covers seated per time slot.
+
+Seated covers are counted per slot in Redis, and covers held by reserved
+tables are kept in a single counter. Seating a table runs one Lua script that
+checks the slot against the kitchen capacity and books the covers atomically,
+so the check costs one Redis round trip. Covers booked for a seating whose
+save then fails are released again.
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+
+SLOT_KEY = 'pacing:slot:{slot}'
+RESERVED_KEY = 'pacing:reserved_covers'
+SLOT_TTL_SECONDS = 24 * 60 * 60
+
+PacingDecision = namedtuple('PacingDecision', 'allowed slot_start seated reserved capacity')
+
+BOOK_SCRIPT = """
+local covers = tonumber(ARGV[1])
+local seated = tonumber(redis.call('GET', KEYS[1]) or '0')
+local reserved = 0
+if ARGV[3] == '1' then
+    reserved = math.max(tonumber(redis.call('GET', KEYS[2]) or '0'), 0)
+end
+if ARGV[4] ~= '1' and seated + reserved + covers > tonumber(ARGV[2]) then
+    return {0, seated, reserved}
+end
+seated = redis.call('INCRBY', KEYS[1], covers)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[5]))
+return {1, seated, reserved}
+"""
+
+
+def _slot_seconds():
+    return settings.KITCHEN_PACING_SLOT_MINUTES * 60
+
+
+def current_slot(now=None):
+    """Index of the pacing slot containing ``now`` (epoch seconds)."""
+    return int((now or time.time()) // _slot_seconds())
+
+
+def slot_start(slot):
+    return datetime.fromtimestamp(slot * _slot_seconds(), tz=dt_timezone.utc)
+
+
+def book_seating(table, force=False):
+    """
+    Check kitchen capacity for seating ``table`` and book its covers if allowed.
+
+    Walk-ins must also leave room for covers held by reserved tables; seating a
+    reserved table does not count those covers twice.
+    """
+    slot = current_slot()
+    capacity = settings.KITCHEN_COVERS_PER_SLOT
+    conn = get_redis_connection('default')
+
+    allowed, seated, reserved = conn.register_script(BOOK_SCRIPT)(
+        keys=[SLOT_KEY.format(slot=slot), RESERVED_KEY],
+        args=[
+            table.capacity,
+            capacity,
+            '0' if table.status == 'reserved' else '1',
+            '1' if force else '0',
+            SLOT_TTL_SECONDS,
+        ],
+    )
+    return PacingDecision(bool(allowed), slot_start(slot), int(seated), int(reserved), capacity)
+
+
+def release_seating(table, slot):
+    """Give back the covers booked for seating ``table`` in ``slot``."""
+    get_redis_connection('default').decrby(SLOT_KEY.format(slot=slot), table.capacity)
+
+
+@contextmanager
+def seating(table, force=False):
+    """
+    Book the covers for seating ``table`` around the block that seats it.
+
+    Yields the pacing decision. The block runs in a transaction; if it
+    raises, the seating is rolled back and the booked covers are released.
+    """
+    decision = book_seating(table, force=force)
+    try:
+        with transaction.atomic():
+            yield decision
+    except Exception:
+        if decision.allowed:
+            release_seating(table, current_slot(decision.slot_start.timestamp()))
+        raise
+
+
+def track_reservation(table, previous_status):
+    """Keep the reserved-covers counter in step with table status changes."""
+    if table.status == 'reserved' and previous_status != 'reserved':
+        get_redis_connection('default').incrby(RESERVED_KEY, table.capacity)
+    elif previous_status == 'reserved' and table.status != 'reserved':
+        get_redis_connection('default').decrby(RESERVED_KEY, table.capacity)
+
+
+def outlook(slots=4):
+    """Seated covers for the current and upcoming slots plus reserved covers."""
+    conn = get_redis_connection('default')
+    first = current_slot()
+    keys = [SLOT_KEY.format(slot=slot) for slot in range(first, first + slots)] + [RESERVED_KEY]
+    values = conn.mget(keys)
+
+    return {
+        'capacity_per_slot': settings.KITCHEN_COVERS_PER_SLOT,
+        'slot_minutes': settings.KITCHEN_PACING_SLOT_MINUTES,
+        'reserved_covers': max(int(values[-1] or 0), 0),
+        'slots': [
+            {'slot_start': slot_start(first + offset), 'seated_covers': int(value or 0)}
+            for offset, value in enumerate(values[:-1])
+        ],
+    }
@@ -0,0 +1,166 @@
+"""
+On-floor staff presence from terminal heartbeats.
+
+Everything lives in Redis; nothing on the heartbeat path touches the
+database. Each staff member on the floor has a hash with a TTL that every
+heartbeat refreshes, plus an entry in a sorted set scored by last heartbeat
+so the floor can be listed without scanning keys. Joins, moves between
+sections or terminals, and departures are appended to a capped stream that
+supervisors' screens read incrementally. Departures are detected either by
+an explicit sign-off or by the sweeper once a hash has expired.
+"""
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+STAFF_KEY = 'presence:staff:{staff_id}'
+LAST_SEEN_KEY = 'presence:last_seen'
+EVENTS_KEY = 'presence:events'
+
+EVENTS_MAX_LENGTH = 10000
+
+FIELDS = ('staff', 'name', 'role', 'section', 'terminal', 'last_seen')
+
+HEARTBEAT_SCRIPT = """
+local previous = redis.call('HMGET', KEYS[1], 'section', 'terminal')
+local existed = redis.call('EXISTS', KEYS[1]) == 1
+if not existed and redis.call('ZSCORE', KEYS[2], ARGV[1]) then
+    -- Expired but not yet swept: close the old visit before opening a new one
+    redis.call('XADD', KEYS[3], 'MAXLEN', '~', ARGV[8], '*',
+        'event', 'left', 'staff', ARGV[1], 'at', ARGV[6])
+end
+redis.call('HSET', KEYS[1],
+    'staff', ARGV[1], 'name', ARGV[2], 'role', ARGV[3],
+    'section', ARGV[4], 'terminal', ARGV[5], 'last_seen', ARGV[6])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[7]))
+redis.call('ZADD', KEYS[2], tonumber(ARGV[6]), ARGV[1])
+local event = false
+if not existed then
+    event = 'joined'
+elseif previous[1] ~= ARGV[4] or previous[2] ~= ARGV[5] then
+    event = 'moved'
+end
+if event then
+    redis.call('XADD', KEYS[3], 'MAXLEN', '~', ARGV[8], '*',
+        'event', event, 'staff', ARGV[1], 'name', ARGV[2], 'role', ARGV[3],
+        'section', ARGV[4], 'terminal', ARGV[5], 'at', ARGV[6])
+end
+return event
+"""
+
+LEAVE_SCRIPT = """
+local current = redis.call('HMGET', KEYS[1], 'name', 'role', 'section', 'terminal')
+redis.call('DEL', KEYS[1])
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('XADD', KEYS[3], 'MAXLEN', '~', ARGV[3], '*',
+    'event', 'left', 'staff', ARGV[1], 'name', current[1] or '', 'role', current[2] or '',
+    'section', current[3] or '', 'terminal', current[4] or '', 'at', ARGV[2])
+return 1
+"""
+
+SWEEP_SCRIPT = """
+local stale = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+local swept = 0
+for _, staff_id in ipairs(stale) do
+    if redis.call('EXISTS', ARGV[2] .. staff_id) == 0 then
+        redis.call('ZREM', KEYS[1], staff_id)
+        redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[4], '*',
+            'event', 'left', 'staff', staff_id, 'at', ARGV[3])
+        swept = swept + 1
+    end
+end
+return swept
+"""
+
+
+def _connection():
+    return get_redis_connection('default')
+
+
+def _decode(mapping):
+    return {key.decode(): value.decode() for key, value in mapping.items()}
+
+
+def heartbeat(staff, terminal, section=''):
+    """
+    Record a heartbeat from ``staff`` at ``terminal``.
+
+    Returns 'joined', 'moved' or None when nothing changed.
+    """
+    conn = _connection()
+    script = conn.register_script(HEARTBEAT_SCRIPT)
+    event = script(
+        keys=[STAFF_KEY.format(staff_id=staff.pk), LAST_SEEN_KEY, EVENTS_KEY],
+        args=[
+            staff.pk, staff.name, staff.role, section or '', terminal,
+            int(time.time()), settings.PRESENCE_TTL_SECONDS, EVENTS_MAX_LENGTH,
+        ],
+    )
+    return event.decode() if event else None
+
+
+def leave(staff_id):
+    """Sign a staff member off the floor. Returns whether they were present."""
+    conn = _connection()
+    script = conn.register_script(LEAVE_SCRIPT)
+    return bool(script(
+        keys=[STAFF_KEY.format(staff_id=staff_id), LAST_SEEN_KEY, EVENTS_KEY],
+        args=[staff_id, int(time.time()), EVENTS_MAX_LENGTH],
+    ))
+
+
+def sweep():
+    """Emit 'left' events for staff whose presence has expired. Returns how many."""
+    conn = _connection()
+    script = conn.register_script(SWEEP_SCRIPT)
+    now = int(time.time())
+    return script(
+        keys=[LAST_SEEN_KEY, EVENTS_KEY],
+        args=[now - settings.PRESENCE_TTL_SECONDS, STAFF_KEY.format(staff_id=''), now, EVENTS_MAX_LENGTH],
+    )
+
+
+def on_floor(role=None, section=None):
+    """Staff currently on the floor, optionally filtered by role or section."""
+    conn = _connection()
+    cutoff = int(time.time()) - settings.PRESENCE_TTL_SECONDS
+    staff_ids = conn.zrangebyscore(LAST_SEEN_KEY, cutoff, '+inf')
+
+    pipe = conn.pipeline(transaction=False)
+    for staff_id in staff_ids:
+        pipe.hgetall(STAFF_KEY.format(staff_id=staff_id.decode()))
+
+    present = []
+    for mapping in pipe.execute():
+        # Expired between the range read and the hash read
+        if not mapping:
+            continue
+        entry = _decode(mapping)
+        if role and entry['role'] != role:
+            continue
+        if section is not None and entry['section'] != section:
+            continue
+        entry['staff'] = int(entry['staff'])
+        entry['last_seen'] = int(entry['last_seen'])
+        present.append(entry)
+
+    present.sort(key=lambda entry: (entry['section'], entry['role'], entry['name']))
+    return present
+
+
+def changes(since='0', count=500):
+    """
+    Presence events after stream id ``since``.
+
+    Returns (events, last id); pass the last id back to continue from there.
+    """
+    entries = _connection().xrange(EVENTS_KEY, min=f'({since}' if since != '0' else '-', count=count)
+    events = []
+    for entry_id, fields in entries:
+        event = _decode(fields)
+        event['id'] = entry_id.decode()
+        events.append(event)
+    return events, events[-1]['id'] if events else since
@@ -0,0 +1,180 @@
+"""
+Ingredient price history: recording, point-in-time lookups, trends and charts.
+
+History is append-only and only grows when a price changes, so each series is
+a step function. Point-in-time lookups are a single descending read of the
+(ingredient, supplier, effective_at, price) index. Trends sample every
+ingredient's series on a daily grid at once with one searchsorted over
+combined (ingredient, time) keys, and charts are downsampled with
+largest-triangle-three-buckets so clients get a bounded number of points.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from ..models import Ingredient, IngredientPriceHistory
+
+SECONDS_PER_DAY = 24 * 60 * 60
+TREND_WINDOW_DAYS = 90
+
+
+def record_price(ingredient_id, supplier_id, price, previous=None):
+    """Append a history row when ``price`` differs from ``previous``."""
+    if price is None or price == previous:
+        return None
+    return IngredientPriceHistory.objects.create(
+        ingredient_id=ingredient_id,
+        supplier_id=supplier_id,
+        price=price,
+        effective_at=timezone.now(),
+    )
+
+
+def _history(supplier_id=None, **filters):
+    queryset = IngredientPriceHistory.objects.filter(**filters)
+    if supplier_id is None:
+        return queryset.filter(supplier__isnull=True)
+    return queryset.filter(supplier_id=supplier_id)
+
+
+def price_at(ingredient, when, supplier_id=None):
+    """The price in effect at ``when``, or None before the first record."""
+    return (
+        _history(supplier_id, ingredient=ingredient).filter(effective_at__lte=when)
+        .order_by('-effective_at').values_list('price', flat=True).first()
+    )
+
+
+def daily_prices(ingredient_ids, days, supplier_id=None, now=None):
+    """
+    Prices of each ingredient at the end of each of the last ``days`` days.
+
+    Returns a (len(ingredient_ids), days + 1) float array; NaN where no price
+    was recorded yet.
+    """
+    now = now or timezone.now()
+    start = now - timedelta(days=days)
+    ingredient_ids = list(ingredient_ids)
+    position = {ingredient_id: index for index, ingredient_id in enumerate(ingredient_ids)}
+
+    # Price carried into the window plus every change inside it
+    opening = Ingredient.objects.filter(pk__in=ingredient_ids).annotate(
+        opening_price=Subquery(
+            _history(supplier_id, ingredient=OuterRef('pk')).filter(effective_at__lt=start)
+            .order_by('-effective_at').values('price')[:1]
+        )
+    ).filter(opening_price__isnull=False).values_list('pk', 'opening_price')
+    changes = _history(supplier_id, ingredient_id__in=ingredient_ids).filter(
+        effective_at__gte=start, effective_at__lte=now
+    ).values_list('ingredient_id', 'price', 'effective_at')
+
+    rows = [(position[pk], 0.0, float(price)) for pk, price in opening]
+    rows += [
+        (position[pk], (effective_at - start).total_seconds(), float(price))
+        for pk, price, effective_at in changes
+    ]
+    grid = np.arange(days + 1) * SECONDS_PER_DAY
+    prices = np.full((len(ingredient_ids), len(grid)), np.nan)
+    if not rows:
+        return prices
+
+    index, offset, price = (np.array(column) for column in zip(*rows))
+    # Combined keys keep each ingredient's rows contiguous and time-ordered
+    span = float(days + 1) * SECONDS_PER_DAY
+    keys = index * span + offset
+    order = np.argsort(keys, kind='stable')
+    keys, index, price = keys[order], index[order], price[order]
+
+    wanted = (np.arange(len(ingredient_ids))[:, None] * span + grid[None, :]).ravel()
+    found = np.searchsorted(keys, wanted, side='right') - 1
+    owner = np.repeat(np.arange(len(ingredient_ids)), len(grid))
+    valid = (found >= 0) & (index[np.maximum(found, 0)] == owner)
+    prices.ravel()[valid] = price[found[valid]]
+    return prices
+
+
+def trends(ingredient_ids, supplier_id=None, now=None):
+    """30- and 90-day change and daily volatility for each ingredient."""
+    ingredient_ids = list(ingredient_ids)
+    prices = daily_prices(ingredient_ids, TREND_WINDOW_DAYS, supplier_id, now)
+    current = prices[:, -1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_30 = current / prices[:, -31] - 1
+        change_90 = current / prices[:, 0] - 1
+        returns = np.diff(np.log(prices), axis=1)
+        observed = np.sum(~np.isnan(returns), axis=1)
+        mean = np.nansum(returns, axis=1) / observed
+        variance = np.nansum((returns - mean[:, None]) ** 2, axis=1) / observed
+        volatility = np.where(observed > 1, np.sqrt(variance), np.nan)
+
+    def clean(value):
+        return None if np.isnan(value) else round(float(value), 4)
+
+    return [
+        {
+            'ingredient': ingredient_id,
+            'price': clean(current[i]),
+            'change_30d': clean(change_30[i]),
+            'change_90d': clean(change_90[i]),
+            'volatility': clean(volatility[i]),
+        }
+        for i, ingredient_id in enumerate(ingredient_ids)
+    ]
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-triangle-three-buckets downsampling.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and the
+    next bucket's average. Returns the indices of the kept points.
+    """
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+
+    edges = np.linspace(1, length - 1, threshold - 1).astype(int)
+    kept = [0]
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else length
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+
+        previous = kept[-1]
+        area = np.abs(
+            (x[previous] - average_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y - y[previous])
+        )
+        kept.append(start + int(np.argmax(area)))
+    kept.append(length - 1)
+    return np.array(kept)
+
+
+def chart(ingredient, days=90, points=200, supplier_id=None, now=None):
+    """Price series over the last ``days`` days, downsampled to at most ``points`` points."""
+    now = now or timezone.now()
+    start = now - timedelta(days=days)
+    rows = list(
+        _history(supplier_id, ingredient=ingredient).filter(effective_at__gte=start, effective_at__lte=now)
+        .order_by('effective_at').values_list('effective_at', 'price')
+    )
+    opening = price_at(ingredient, start, supplier_id)
+    if opening is not None and (not rows or rows[0][0] > start):
+        rows.insert(0, (start, opening))
+    if rows and rows[-1][0] < now:
+        # Extend the step to now so the chart ends at the current price
+        rows.append((now, rows[-1][1]))
+    if not rows:
+        return []
+
+    x = np.array([effective_at.timestamp() for effective_at, _ in rows])
+    y = np.array([float(price) for _, price in rows])
+    return [
+        {'at': rows[i][0], 'price': rows[i][1]}
+        for i in lttb(x, y, points)
+    ]
@@ -0,0 +1,244 @@
+"""
+Draft purchase order generation.
+
+One query finds every ingredient at or below its reorder point and computes
+its order-up-to quantity net of stock already on order; a second loads the
+catalog items that could supply them. Each ingredient starts with its
+cheapest source. Suppliers are then consolidated: a supplier's lines move to
+suppliers already in the plan when the extra cost of doing so is less than
+the delivery fee saved. Orders still below the supplier's minimum move to
+another supplier in the plan if they can, and otherwise wait for a later run
+unless they carry an ingredient below minimum stock.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import Ingredient, PurchaseOrder, PurchaseOrderLine, Supplier, SupplierItem
+
+CENTS = Decimal('0.01')
+QUANTITY = DecimalField(max_digits=12, decimal_places=3)
+
+
+def reorder_needs(exclude_draft_suppliers=None):
+    """
+    Ingredients that need ordering, as dicts with id, need, critical and the
+    primary supplier_id and cost_per_unit.
+
+    Stock on submitted orders counts as on order, as do drafts of suppliers
+    not in ``exclude_draft_suppliers`` (those drafts are about to be replaced).
+    """
+    open_lines = PurchaseOrderLine.objects.filter(ingredient=OuterRef('pk')).filter(
+        Q(purchase_order__status='submitted')
+        | (Q(purchase_order__status='draft') & ~Q(purchase_order__supplier_id__in=exclude_draft_suppliers or []))
+    )
+    on_order = Subquery(
+        open_lines.values('ingredient').annotate(total=Sum('quantity')).values('total')[:1],
+        output_field=QUANTITY,
+    )
+    multiplier = Value(Decimal(str(settings.PURCHASING_TARGET_MULTIPLIER)), output_field=QUANTITY)
+
+    return list(
+        Ingredient.objects.annotate(
+            threshold=Coalesce('reorder_point', 'minimum_stock'),
+            on_order=Coalesce(on_order, Value(Decimal('0'), output_field=QUANTITY)),
+            target=Coalesce(
+                'maximum_stock',
+                ExpressionWrapper(F('minimum_stock') * multiplier, output_field=QUANTITY),
+            ),
+        ).filter(
+            current_stock__lte=F('threshold') - F('on_order'),
+        ).annotate(
+            need=ExpressionWrapper(F('target') - F('current_stock') - F('on_order'), output_field=QUANTITY),
+            critical=Q(current_stock__lt=F('minimum_stock')),
+        ).filter(need__gt=0).values('id', 'need', 'critical', 'supplier_id', 'cost_per_unit')
+    )
+
+
+def _offer(item, need):
+    """(packs, cost) to cover ``need`` with ``item``."""
+    packs = max(math.ceil(need / item['pack_size']), 1)
+    return packs, packs * item['pack_price']
+
+
+def _primary_item(need):
+    """Stand-in catalog item for an ingredient only bought from its primary supplier."""
+    return {
+        'id': None,
+        'supplier_id': need['supplier_id'],
+        'pack_size': Decimal('1'),
+        'pack_price': need['cost_per_unit'],
+        'lead_time_days': 0,
+    }
+
+
+def plan_orders(needs, items, suppliers):
+    """
+    Assign each needed ingredient to a supplier.
+
+    ``items`` maps ingredient id to candidate catalog item dicts and
+    ``suppliers`` maps active supplier id to dicts with delivery_fee and
+    minimum_order. Ingredients without catalog items are bought in whole
+    units from their primary supplier. Returns
+    {supplier id: [(need dict, item dict, packs, cost)]}.
+    """
+    offers = {}
+    assignment = {}
+    for need in needs:
+        candidates = {}
+        catalog = items.get(need['id']) or [_primary_item(need)]
+        for item in catalog:
+            if item['supplier_id'] not in suppliers:
+                continue
+            packs, cost = _offer(item, need['need'])
+            candidates[item['supplier_id']] = (item, packs, cost)
+        if candidates:
+            offers[need['id']] = candidates
+            assignment[need['id']] = min(candidates, key=lambda supplier_id: candidates[supplier_id][2])
+
+    # Fold suppliers into others already used while the saved fee beats the extra cost
+    changed = True
+    while changed:
+        changed = False
+        groups = defaultdict(list)
+        for ingredient_id, supplier_id in assignment.items():
+            groups[supplier_id].append(ingredient_id)
+        subtotal = {
+            supplier_id: sum(offers[ingredient_id][supplier_id][2] for ingredient_id in ingredient_ids)
+            for supplier_id, ingredient_ids in groups.items()
+        }
+
+        for supplier_id in sorted(groups, key=subtotal.get):
+            others = set(groups) - {supplier_id}
+            moves, extra = {}, Decimal('0')
+            for ingredient_id in groups[supplier_id]:
+                choices = [other for other in others if other in offers[ingredient_id]]
+                if not choices:
+                    break
+                best = min(choices, key=lambda other: offers[ingredient_id][other][2])
+                moves[ingredient_id] = best
+                extra += offers[ingredient_id][best][2] - offers[ingredient_id][supplier_id][2]
+            else:
+                if extra < (suppliers[supplier_id]['delivery_fee'] or 0):
+                    assignment.update(moves)
+                    changed = True
+                    break
+
+    needs_by_id = {need['id']: need for need in needs}
+    plan = defaultdict(list)
+    for ingredient_id, supplier_id in assignment.items():
+        item, packs, cost = offers[ingredient_id][supplier_id]
+        plan[supplier_id].append((needs_by_id[ingredient_id], item, packs, cost))
+
+    # Orders under the supplier minimum move to another supplier in the plan
+    # when every line can; otherwise they wait unless something is critical
+    for supplier_id in sorted(plan, key=lambda supplier_id: sum(entry[3] for entry in plan[supplier_id])):
+        entries = plan[supplier_id]
+        if sum(cost for _, _, _, cost in entries) >= (suppliers[supplier_id]['minimum_order'] or 0):
+            continue
+        others = [other for other in plan if other != supplier_id and plan[other]]
+        moves = []
+        for need, _, _, _ in entries:
+            choices = [other for other in others if other in offers[need['id']]]
+            if not choices:
+                break
+            best = min(choices, key=lambda other: offers[need['id']][other][2])
+            moves.append((best, (need,) + offers[need['id']][best]))
+        else:
+            for other, entry in moves:
+                plan[other].append(entry)
+            plan[supplier_id] = []
+            continue
+        if not any(need['critical'] for need, _, _, _ in entries):
+            plan[supplier_id] = []
+    return {supplier_id: entries for supplier_id, entries in plan.items() if entries}
+
+
+def next_delivery(supplier, lead_days, today=None):
+    """Earliest delivery date and its order cutoff for ``supplier`` given ``lead_days``."""
+    today = today or timezone.localdate()
+    earliest = today + timedelta(days=lead_days)
+    weekdays = [day for day in range(7) if supplier['delivery_days'] & (1 << day)]
+    if not weekdays:
+        return earliest, None
+
+    delivery_date = next(
+        earliest + timedelta(days=offset) for offset in range(7)
+        if (earliest + timedelta(days=offset)).weekday() in weekdays
+    )
+    cutoff = None
+    if supplier['order_cutoff_time'] is not None:
+        cutoff = timezone.make_aware(datetime.combine(
+            delivery_date - timedelta(days=supplier['order_lead_days']), supplier['order_cutoff_time']
+        ))
+    return delivery_date, cutoff
+
+
+@transaction.atomic
+def generate_drafts(supplier_ids=None):
+    """
+    Replace draft purchase orders with a fresh plan.
+
+    With ``supplier_ids`` only those suppliers' drafts are replaced; the rest
+    of the plan is left for their own cutoffs. Returns the created orders.
+    """
+    if supplier_ids is None:
+        supplier_ids = list(Supplier.objects.values_list('pk', flat=True))
+    PurchaseOrder.objects.filter(status='draft', supplier_id__in=supplier_ids).delete()
+
+    needs = reorder_needs(exclude_draft_suppliers=supplier_ids)
+    items = defaultdict(list)
+    for item in SupplierItem.objects.filter(
+        ingredient_id__in=[need['id'] for need in needs], is_available=True, supplier__is_active=True
+    ).values('id', 'ingredient_id', 'supplier_id', 'pack_size', 'pack_price', 'lead_time_days'):
+        items[item['ingredient_id']].append(item)
+
+    suppliers = {
+        supplier['id']: supplier
+        for supplier in Supplier.objects.filter(is_active=True).values(
+            'id', 'delivery_fee', 'minimum_order', 'delivery_days', 'order_cutoff_time', 'order_lead_days'
+        )
+    }
+    plan = plan_orders(needs, items, suppliers)
+
+    orders, lines = [], []
+    for supplier_id, entries in plan.items():
+        if supplier_id not in supplier_ids:
+            continue
+        supplier = suppliers[supplier_id]
+        subtotal = sum(cost for _, _, _, cost in entries).quantize(CENTS, ROUND_HALF_UP)
+        delivery_date, cutoff = next_delivery(supplier, max(item['lead_time_days'] for _, item, _, _ in entries))
+        order = PurchaseOrder(
+            supplier_id=supplier_id,
+            delivery_date=delivery_date,
+            order_cutoff=cutoff,
+            subtotal=subtotal,
+            delivery_fee=supplier['delivery_fee'] or 0,
+            below_minimum=subtotal < (supplier['minimum_order'] or 0),
+        )
+        orders.append(order)
+        lines.append([
+            PurchaseOrderLine(
+                ingredient_id=need['id'],
+                supplier_item_id=item['id'],
+                packs=packs,
+                quantity=packs * item['pack_size'],
+                pack_price=item['pack_price'],
+                line_total=cost.quantize(CENTS, ROUND_HALF_UP),
+            )
+            for need, item, packs, cost in entries
+        ])
+
+    PurchaseOrder.objects.bulk_create(orders)
+    for order, order_lines in zip(orders, lines):
+        for line in order_lines:
+            line.purchase_order = order
+    PurchaseOrderLine.objects.bulk_create([line for order_lines in lines for line in order_lines], batch_size=1000)
+    return orders
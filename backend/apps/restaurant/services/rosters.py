@@ -0,0 +1,71 @@
+"""
+Cached, versioned rosters of active staff.
+
+The active roster is serialized once per version, grouped by role and stored
+as pre-rendered JSON. Any Staff save or delete bumps the version, which also
+serves as the ETag.
+"""
+import time
+
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+
+from ..models import Staff
+from ..serializers import StaffListSerializer
+
+VERSION_KEY = 'staff_roster:version'
+ROSTER_KEY = 'staff_roster:{version}'
+ROSTER_TIMEOUT = 24 * 60 * 60
+
+EMPTY = b'[]'
+
+
+def _seed():
+    # Seeded from the clock so a lost key never reissues a version clients hold
+    return time.time_ns() // 1000
+
+
+def current_version():
+    return cache.get_or_set(VERSION_KEY, _seed, None)
+
+
+def invalidate():
+    """Move to a new roster version; the old one simply expires."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _seed(), None)
+
+
+def _build():
+    renderer = JSONRenderer()
+    staff = Staff.objects.filter(is_active=True).order_by('name')
+    rows = StaffListSerializer(staff, many=True).data
+
+    by_role = {}
+    for row in rows:
+        by_role.setdefault(row['role'], []).append(row)
+
+    return {
+        'active': renderer.render(rows),
+        'grouped': renderer.render([
+            {'role': role, 'role_display': members[0]['role_display'], 'staff': members}
+            for role, members in by_role.items()
+        ]),
+        'roles': {role: renderer.render(members) for role, members in by_role.items()},
+    }
+
+
+def get_roster():
+    """Return (version, roster) where roster holds pre-rendered JSON bytes."""
+    version = current_version()
+    key = ROSTER_KEY.format(version=version)
+    roster = cache.get(key)
+    if roster is None:
+        roster = _build()
+        cache.set(key, roster, ROSTER_TIMEOUT)
+    return version, roster
+
+
+def etag(version, part='active'):
+    return f'"roster-{version}-{part}"'
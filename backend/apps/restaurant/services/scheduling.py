@@ -0,0 +1,251 @@
+"""
+Weekly shift schedule generation.
+
+The week is modelled as 168 hour slots. Coverage requirements give the
+headcount needed per role per slot; availability windows give the slots each
+staff member can work. The solver repeatedly takes the earliest uncovered slot
+for a role and day and picks the staff member whose feasible shift starting
+there covers the most uncovered hours, preferring cheaper and less-used
+staff. Conflicts are checked against a per-staff interval index, so the
+same routine re-fills a single sick shift without touching the rest of the
+week.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Staff, StaffAvailability, CoverageRequirement, ScheduledShift
+
+HOURS_PER_WEEK = 7 * 24
+
+
+class IntervalIndex:
+    """
+    Sorted non-overlapping [start, end) intervals per key.
+
+    Because intervals never overlap, ends are sorted along with starts and a
+    conflict check is a single binary search.
+    """
+
+    def __init__(self):
+        self._starts = defaultdict(list)
+        self._ends = defaultdict(list)
+
+    def add(self, key, start, end):
+        position = bisect_left(self._starts[key], start)
+        self._starts[key].insert(position, start)
+        self._ends[key].insert(position, end)
+
+    def remove(self, key, start, end):
+        position = bisect_left(self._starts[key], start)
+        if position < len(self._starts[key]) and self._ends[key][position] == end:
+            del self._starts[key][position]
+            del self._ends[key][position]
+
+    def conflicts(self, key, start, end):
+        """Whether [start, end) overlaps any interval stored for ``key``."""
+        position = bisect_left(self._starts[key], end)
+        return position > 0 and self._ends[key][position - 1] > start
+
+
+class ScheduleSolver:
+    """Greedy coverage solver over one rota week."""
+
+    def __init__(self, week_start, labor_budget=None):
+        self.week_start = week_start
+        self.labor_budget = labor_budget
+        self.min_length = settings.SCHEDULE_MIN_SHIFT_HOURS
+        self.max_length = settings.SCHEDULE_MAX_SHIFT_HOURS
+        self.max_weekly = settings.SCHEDULE_MAX_WEEKLY_HOURS
+
+        self.index = IntervalIndex()
+        self.hours_assigned = defaultdict(int)
+        self.days_worked = defaultdict(set)
+        self.spent = Decimal('0')
+        self.gaps = []
+
+        self._load_staff()
+        self._load_requirements()
+
+    def _load_staff(self):
+        self.rates = {}
+        self.staff_by_role = defaultdict(list)
+        for staff_id, role, rate in Staff.objects.filter(is_active=True).values_list('id', 'role', 'hourly_rate'):
+            self.rates[staff_id] = rate or Decimal('0')
+            self.staff_by_role[role].append(staff_id)
+
+        windows = defaultdict(list)
+        for staff_id, weekday, start, end in StaffAvailability.objects.filter(
+            staff_id__in=self.rates
+        ).values_list('staff_id', 'weekday', 'start_time', 'end_time'):
+            first = weekday * 24 + start.hour + (1 if start.minute else 0)
+            last = weekday * 24 + end.hour
+            windows[staff_id].append((first, last))
+
+        # Staff without availability windows can work any hour
+        self.available = {}
+        for staff_id in self.rates:
+            if staff_id in windows:
+                slots = [False] * HOURS_PER_WEEK
+                for first, last in windows[staff_id]:
+                    for slot in range(first, last):
+                        slots[slot] = True
+            else:
+                slots = [True] * HOURS_PER_WEEK
+            self.available[staff_id] = slots
+
+    def _load_requirements(self):
+        self.need = defaultdict(lambda: [0] * HOURS_PER_WEEK)
+        for role, weekday, hour, headcount in CoverageRequirement.objects.values_list(
+            'role', 'weekday', 'hour', 'headcount'
+        ):
+            self.need[role][weekday * 24 + hour] = headcount
+
+    def to_datetime(self, slot):
+        day, hour = divmod(slot, 24)
+        return timezone.make_aware(
+            datetime.combine(self.week_start + timedelta(days=day), time.min) + timedelta(hours=hour)
+        )
+
+    def to_slot(self, value):
+        delta = timezone.localtime(value) - self.to_datetime(0)
+        return int(delta.total_seconds() // 3600)
+
+    def book(self, staff_id, role, start, end):
+        """Record an existing or newly chosen shift in the solver state."""
+        self.index.add(staff_id, start, end)
+        self.hours_assigned[staff_id] += end - start
+        self.days_worked[staff_id].add(start // 24)
+        self.spent += self.rates.get(staff_id, Decimal('0')) * (end - start)
+        need = self.need[role]
+        for slot in range(start, end):
+            need[slot] -= 1
+
+    def _candidate(self, staff_id, need, start, day_end):
+        """Longest useful shift for ``staff_id`` starting at ``start``, or None."""
+        if start // 24 in self.days_worked[staff_id]:
+            return None
+
+        available = self.available[staff_id]
+        room = min(self.max_length, self.max_weekly - self.hours_assigned[staff_id], day_end - start)
+        end = start
+        while end - start < room and available[end] and not self.index.conflicts(staff_id, end, end + 1):
+            end += 1
+        if end - start < self.min_length:
+            return None
+
+        # Drop trailing hours nobody needs, keeping the minimum shift length
+        last_needed = max(slot for slot in range(start, end) if need[slot] > 0)
+        end = max(last_needed + 1, min(start + self.min_length, end))
+        covered = sum(1 for slot in range(start, end) if need[slot] > 0)
+        cost = self.rates[staff_id] * (end - start)
+
+        if self.labor_budget is not None and self.spent + cost > self.labor_budget:
+            return None
+        return covered, cost, end
+
+    def fill(self, role, first_slot, last_slot):
+        """Cover the role's demand in [first_slot, last_slot); returns new (staff, start, end) shifts."""
+        need = self.need[role]
+        members = self.staff_by_role.get(role, [])
+        shifts = []
+        skipped = set()
+
+        slot = first_slot
+        while slot < last_slot:
+            if need[slot] <= 0 or slot in skipped:
+                slot += 1
+                continue
+
+            day_end = min((slot // 24 + 1) * 24, last_slot)
+            best = None
+            for staff_id in members:
+                candidate = self._candidate(staff_id, need, slot, day_end)
+                if candidate is None:
+                    continue
+                covered, cost, end = candidate
+                key = (covered, -cost / covered, -self.hours_assigned[staff_id])
+                if best is None or key > best[0]:
+                    best = (key, staff_id, end)
+
+            if best is None:
+                self.gaps.append({'role': role, 'start': self.to_datetime(slot), 'missing': need[slot]})
+                skipped.add(slot)
+                continue
+
+            _, staff_id, end = best
+            self.book(staff_id, role, slot, end)
+            shifts.append((staff_id, slot, end))
+
+        return shifts
+
+    def solve(self):
+        """Fill the whole week for every role with requirements."""
+        shifts = []
+        for role in list(self.need):
+            for role_shift in self.fill(role, 0, HOURS_PER_WEEK):
+                shifts.append((role,) + role_shift)
+        return shifts
+
+    def build(self, role, staff_id, start, end, replaces=None):
+        return ScheduledShift(
+            staff_id=staff_id,
+            role=role,
+            week_start=self.week_start,
+            start=self.to_datetime(start),
+            end=self.to_datetime(end),
+            replaces=replaces,
+        )
+
+
+@transaction.atomic
+def generate_week(week_start, labor_budget=None):
+    """
+    Replace the week's scheduled shifts with a freshly solved rota.
+
+    Returns (shifts, gaps, labor_cost).
+    """
+    solver = ScheduleSolver(week_start, labor_budget)
+    ScheduledShift.objects.filter(week_start=week_start, status='scheduled').delete()
+
+    shifts = ScheduledShift.objects.bulk_create([
+        solver.build(role, staff_id, start, end)
+        for role, staff_id, start, end in solver.solve()
+    ])
+    return shifts, solver.gaps, solver.spent
+
+
+@transaction.atomic
+def call_in_sick(shift, labor_budget=None):
+    """
+    Mark a shift as called in sick and re-fill only its hours.
+
+    The rest of the week stays as it is; it is only loaded into the solver so
+    replacements respect existing shifts, weekly hour limits and the labor
+    budget. Without an explicit budget, replacements may not cost more than
+    the week as scheduled before the call-in.
+    Returns (replacement shifts, remaining gaps).
+    """
+    shift.status = 'called_in_sick'
+    shift.save(update_fields=['status'])
+
+    solver = ScheduleSolver(shift.week_start, labor_budget)
+    for other in ScheduledShift.objects.filter(week_start=shift.week_start, status='scheduled'):
+        solver.book(other.staff_id, other.role, solver.to_slot(other.start), solver.to_slot(other.end))
+
+    # The sick staff member cannot cover their own hours
+    start, end = solver.to_slot(shift.start), solver.to_slot(shift.end)
+    solver.index.add(shift.staff_id, start, end)
+    if labor_budget is None:
+        solver.labor_budget = solver.spent + solver.rates.get(shift.staff_id, Decimal('0')) * (end - start)
+
+    replacements = ScheduledShift.objects.bulk_create([
+        solver.build(shift.role, staff_id, slot_start, slot_end, replaces=shift)
+        for staff_id, slot_start, slot_end in solver.fill(shift.role, start, end)
+    ])
+    return replacements, solver.gaps
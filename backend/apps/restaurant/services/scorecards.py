@@ -0,0 +1,154 @@
+"""
+Supplier scorecards from receiving.
+
+Each recorded delivery adds its counts to the supplier's row for the week
+with F() increments, so scorecards never re-read delivery history. A
+supplier's quality_rating is derived from its trailing weeks of rollups and
+stored on the supplier, where the rating index serves top_rated and the
+rating filters.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from . import stock
+from ..models import PurchaseOrder, Supplier, SupplierDelivery, SupplierDeliveryLine, SupplierWeeklyScore
+
+ON_TIME_WEIGHT = Decimal('0.4')
+FILL_WEIGHT = Decimal('0.4')
+PRICE_WEIGHT = Decimal('0.2')
+
+
+def week_start(value):
+    day = timezone.localdate(value)
+    return day - timedelta(days=day.weekday())
+
+
+@transaction.atomic
+def record_delivery(supplier, expected_at, received_at, lines, received_by=None, notes='', purchase_order=None):
+    """
+    Record a delivery and fold it into the supplier's weekly scorecard.
+
+    ``lines`` are dicts of ingredient, quantity_ordered, quantity_received,
+    quantity_rejected, expected_unit_price, unit_price and optional
+    expiry_date. Accepted quantities are received into stock through the
+    movement ledger at the invoiced price, one lot per line. A submitted
+    ``purchase_order`` the delivery fulfils is marked received, so its lines
+    stop counting as on order; any shortfall is reordered on the next run.
+    """
+    delivery = SupplierDelivery.objects.create(
+        supplier=supplier,
+        purchase_order=purchase_order,
+        expected_at=expected_at,
+        received_at=received_at,
+        received_by=received_by,
+        notes=notes,
+    )
+    if purchase_order is not None:
+        PurchaseOrder.objects.filter(pk=purchase_order.pk, status='submitted').update(
+            status='received', received_at=received_at
+        )
+    delivery_lines = SupplierDeliveryLine.objects.bulk_create([
+        SupplierDeliveryLine(delivery=delivery, **line) for line in lines
+    ])
+
+    ordered = accepted = rejected = Decimal('0')
+    expected_cost = variance = Decimal('0')
+    for line in delivery_lines:
+        line_accepted = min(line.quantity_accepted, line.quantity_ordered)
+        ordered += line.quantity_ordered
+        accepted += line_accepted
+        rejected += line.quantity_rejected
+        expected_cost += line.quantity_accepted * line.expected_unit_price
+        variance += line.quantity_accepted * (line.unit_price - line.expected_unit_price)
+
+    score, _ = SupplierWeeklyScore.objects.get_or_create(supplier=supplier, week_start=week_start(received_at))
+    SupplierWeeklyScore.objects.filter(pk=score.pk).update(
+        deliveries=F('deliveries') + 1,
+        on_time_deliveries=F('on_time_deliveries') + (1 if delivery.is_on_time else 0),
+        quantity_ordered=F('quantity_ordered') + ordered,
+        quantity_accepted=F('quantity_accepted') + accepted,
+        quantity_rejected=F('quantity_rejected') + rejected,
+        expected_cost=F('expected_cost') + expected_cost.quantize(Decimal('0.01')),
+        price_variance=F('price_variance') + variance.quantize(Decimal('0.01')),
+    )
+
+    stock.apply_movements([
+        {
+            'ingredient_id': line.ingredient_id,
+            'kind': 'receipt',
+            'quantity': line.quantity_accepted,
+            'reference': f'delivery:{delivery.pk}',
+            'unit_cost': line.unit_price,
+            'expiry_date': line.expiry_date,
+        }
+        for line in delivery_lines if line.quantity_accepted
+    ], staff=received_by)
+
+    refresh_quality_ratings([supplier.pk])
+    return delivery
+
+
+def _rating(totals):
+    """1.0-5.0 rating from summed weekly rollups."""
+    on_time = Decimal(totals['on_time_deliveries']) / totals['deliveries']
+    fill = min(totals['quantity_accepted'] / totals['quantity_ordered'], 1) if totals['quantity_ordered'] else Decimal('1')
+
+    price = Decimal('1')
+    if totals['expected_cost']:
+        overcharge = max(totals['price_variance'], 0) / totals['expected_cost']
+        price = max(1 - overcharge * Decimal(str(settings.SUPPLIER_PRICE_VARIANCE_PENALTY)), 0)
+
+    score = ON_TIME_WEIGHT * on_time + FILL_WEIGHT * fill + PRICE_WEIGHT * price
+    return (1 + 4 * score).quantize(Decimal('0.01'))
+
+
+def refresh_quality_ratings(supplier_ids=None):
+    """
+    Re-derive quality_rating from the trailing scorecard weeks.
+
+    Suppliers without deliveries in the window keep their current rating.
+    Returns the number of suppliers updated.
+    """
+    since = week_start(timezone.now()) - timedelta(weeks=settings.SUPPLIER_SCORECARD_WEEKS - 1)
+    rollups = SupplierWeeklyScore.objects.filter(week_start__gte=since, deliveries__gt=0)
+    if supplier_ids is not None:
+        rollups = rollups.filter(supplier_id__in=supplier_ids)
+
+    suppliers = []
+    for totals in rollups.values('supplier_id').annotate(
+        deliveries=Sum('deliveries'),
+        on_time_deliveries=Sum('on_time_deliveries'),
+        quantity_ordered=Sum('quantity_ordered'),
+        quantity_accepted=Sum('quantity_accepted'),
+        expected_cost=Sum('expected_cost'),
+        price_variance=Sum('price_variance'),
+    ):
+        suppliers.append(Supplier(pk=totals['supplier_id'], quality_rating=_rating(totals)))
+
+    Supplier.objects.bulk_update(suppliers, ['quality_rating'])
+    return len(suppliers)
+
+
+def scorecard(supplier, weeks=None):
+    """Weekly scorecard rows for the supplier, most recent first."""
+    weeks = weeks or settings.SUPPLIER_SCORECARD_WEEKS
+    since = week_start(timezone.now()) - timedelta(weeks=weeks - 1)
+    rows = []
+    for score in supplier.weekly_scores.filter(week_start__gte=since).order_by('-week_start'):
+        rows.append({
+            'week_start': score.week_start,
+            'deliveries': score.deliveries,
+            'on_time_rate': score.on_time_rate,
+            'fill_rate': score.fill_rate,
+            'quantity_rejected': score.quantity_rejected,
+            'price_variance': score.price_variance,
+            'price_variance_rate': (
+                float(score.price_variance / score.expected_cost) if score.expected_cost else None
+            ),
+        })
+    return rows
@@ -0,0 +1,212 @@
+"""
+Balance active servers across table sections.
+
+Section load is seats plus a weight on currently occupied seats, read from the
+cached floor-plan snapshot. With no more servers than sections, sections are
+packed onto servers longest-first and then improved by moves and swaps. With
+more servers than sections, every section gets one server and the rest go to
+the section with the highest load per server.
+"""
+import heapq
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import Staff, SectionAssignment, TimeEntry
+from . import floor_plan
+
+MAX_IMPROVEMENT_ROUNDS = 200
+
+
+def section_loads():
+    """Weighted load per section from the floor-plan snapshot."""
+    snapshot = floor_plan.get_snapshot()
+    occupied = floor_plan.STATUSES.index('occupied')
+    weight = settings.SECTION_OCCUPANCY_WEIGHT
+
+    loads = {}
+    for _, _, capacity, section, status_code, _, _, is_active in snapshot['tables']:
+        if not is_active:
+            continue
+        load = capacity * (1 + weight) if status_code == occupied else capacity
+        loads[section] = loads.get(section, 0) + load
+    return loads
+
+
+def balance(server_ids, loads):
+    """
+    Assign servers to sections.
+
+    Returns a dict of server id -> list of (section, load share).
+    """
+    if not server_ids or not loads:
+        return {server_id: [] for server_id in server_ids}
+
+    if len(server_ids) <= len(loads):
+        return _pack_sections(server_ids, loads)
+    return _apportion_servers(server_ids, loads)
+
+
+def _pack_sections(server_ids, loads):
+    """Longest-processing-time packing followed by local improvement."""
+    bins = {server_id: [] for server_id in server_ids}
+    totals = {server_id: 0 for server_id in server_ids}
+    heap = [(0, index, server_id) for index, server_id in enumerate(server_ids)]
+
+    for section in sorted(loads, key=loads.get, reverse=True):
+        total, index, server_id = heapq.heappop(heap)
+        bins[server_id].append(section)
+        totals[server_id] = total + loads[section]
+        heapq.heappush(heap, (totals[server_id], index, server_id))
+
+    for _ in range(MAX_IMPROVEMENT_ROUNDS):
+        heaviest = max(totals, key=totals.get)
+        lightest = min(totals, key=totals.get)
+        gap = totals[heaviest] - totals[lightest]
+        best = None
+
+        for section in bins[heaviest]:
+            # Moving a section helps if it is smaller than the gap
+            if 0 < loads[section] < gap and (best is None or abs(gap - 2 * loads[section]) < best[0]):
+                best = (abs(gap - 2 * loads[section]), section, None)
+            for other in bins[lightest]:
+                delta = loads[section] - loads[other]
+                if 0 < delta < gap and (best is None or abs(gap - 2 * delta) < best[0]):
+                    best = (abs(gap - 2 * delta), section, other)
+
+        if best is None:
+            break
+
+        _, section, other = best
+        bins[heaviest].remove(section)
+        bins[lightest].append(section)
+        totals[heaviest] -= loads[section]
+        totals[lightest] += loads[section]
+        if other is not None:
+            bins[lightest].remove(other)
+            bins[heaviest].append(other)
+            totals[lightest] -= loads[other]
+            totals[heaviest] += loads[other]
+
+    return {
+        server_id: [(section, loads[section]) for section in sections]
+        for server_id, sections in bins.items()
+    }
+
+
+def _apportion_servers(server_ids, loads):
+    """Give each section a server, then extra servers to the busiest sections."""
+    counts = {section: 1 for section in loads}
+    heap = [(-load, section) for section, load in loads.items()]
+    heapq.heapify(heap)
+
+    for _ in range(len(server_ids) - len(loads)):
+        _, section = heapq.heappop(heap)
+        counts[section] += 1
+        heapq.heappush(heap, (-loads[section] / counts[section], section))
+
+    assignment = {}
+    servers = iter(server_ids)
+    for section in sorted(loads, key=loads.get, reverse=True):
+        for _ in range(counts[section]):
+            assignment[next(servers)] = [(section, loads[section] / counts[section])]
+    return assignment
+
+
+def active_server_ids():
+    """Ids of active staff members with the server role."""
+    return list(
+        Staff.objects.filter(role='server', is_active=True)
+        .order_by('name').values_list('id', flat=True)
+    )
+
+
+@transaction.atomic
+def rebalance(server_ids=None):
+    """Replace all active assignments with a freshly balanced set."""
+    if server_ids is None:
+        server_ids = active_server_ids()
+
+    assignment = balance(server_ids, section_loads())
+    now = timezone.now()
+
+    SectionAssignment.objects.filter(released_at__isnull=True).update(released_at=now)
+    SectionAssignment.objects.bulk_create([
+        SectionAssignment(staff_id=server_id, section=section, load=_to_decimal(load))
+        for server_id, sections in assignment.items()
+        for section, load in sections
+    ])
+    return SectionAssignment.objects.filter(released_at__isnull=True).select_related('staff')
+
+
+@transaction.atomic
+def release(staff_id):
+    """
+    Release one server and hand their sections to the least loaded servers.
+
+    Sections still covered by another server are simply left to them; other
+    assignments are not touched. When no other server holds a section, the
+    servers still on the clock share them; when nobody is, the sections stay
+    uncovered until the next rebalance. Returns the new assignments.
+    """
+    active = list(
+        SectionAssignment.objects.select_for_update()
+        .filter(released_at__isnull=True)
+    )
+    released = [a for a in active if a.staff_id == staff_id]
+    remaining = [a for a in active if a.staff_id != staff_id]
+    if not released:
+        return []
+
+    now = timezone.now()
+    SectionAssignment.objects.filter(pk__in=[a.pk for a in released]).update(released_at=now)
+
+    covered = {a.section for a in remaining}
+    totals = {}
+    for a in remaining:
+        totals[a.staff_id] = totals.get(a.staff_id, 0) + float(a.load)
+    if not totals:
+        totals = {server_id: 0 for server_id in _clocked_in_server_ids(exclude=staff_id)}
+    if not totals:
+        return []
+
+    loads = section_loads()
+    orphaned = sorted(
+        {a.section for a in released} - covered,
+        key=lambda section: loads.get(section, 0),
+        reverse=True
+    )
+
+    heap = [(total, server_id) for server_id, total in totals.items()]
+    heapq.heapify(heap)
+    created = []
+    for section in orphaned:
+        total, server_id = heapq.heappop(heap)
+        load = loads.get(section, 0)
+        created.append(SectionAssignment(staff_id=server_id, section=section, load=_to_decimal(load)))
+        heapq.heappush(heap, (total + load, server_id))
+
+    return SectionAssignment.objects.bulk_create(created)
+
+
+def _clocked_in_server_ids(exclude):
+    return set(
+        TimeEntry.objects.filter(clock_out__isnull=True, staff__role='server', staff__is_active=True)
+        .exclude(staff_id=exclude).values_list('staff_id', flat=True)
+    )
+
+
+def release_staff(staff_ids):
+    """Release every listed staff member who currently covers a section."""
+    assigned = set(
+        SectionAssignment.objects.filter(staff_id__in=staff_ids, released_at__isnull=True)
+        .values_list('staff_id', flat=True)
+    )
+    for staff_id in assigned:
+        release(staff_id)
+
+
+def _to_decimal(value):
+    return Decimal(str(round(value, 2)))
@@ -0,0 +1,65 @@
+"""
+Best-price sourcing across suppliers.
+
+The cheapest source for every ingredient comes from one query: each
+ingredient row joins the one supplier item picked by a correlated subquery
+that walks the (ingredient, is_available, unit_price, lead_time_days) index
+and stops at the first match, and every best_* field is read from that row.
+Ties on price and lead time go to the oldest item, so the pick is stable. "Delivering by a date" is turned into plain conditions on
+lead time and the supplier's delivery-day bitmask, so it stays inside the
+same query.
+"""
+from datetime import timedelta
+
+from django.db.models import F, FilteredRelation, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from ..models import Supplier, SupplierItem
+
+BEST_SOURCE_FIELDS = {
+    'best_supplier_item': 'best_source__pk',
+    'best_supplier': 'best_source__supplier_id',
+    'best_supplier_name': 'best_source__supplier__name',
+    'best_unit_price': 'best_source__unit_price',
+    'best_lead_time_days': 'best_source__lead_time_days',
+}
+
+
+def delivered_by(deliver_by, today=None):
+    """
+    Condition on supplier items that can arrive on or before ``deliver_by``.
+
+    An item ordered today with lead time L can arrive on any delivery day of
+    its supplier from today + L to ``deliver_by``.
+    """
+    today = today or timezone.localdate()
+    span = (deliver_by - today).days
+    if span < 0:
+        # Always false; pk__in=[] would empty the outer query from inside the join
+        return Q(pk__isnull=True)
+
+    # With a week or more of slack any delivery day will do
+    condition = Q(lead_time_days__lte=span - 6, supplier__delivery_days__gt=0) if span >= 6 else Q()
+    for lead in range(max(span - 5, 0), span + 1):
+        earliest = today + timedelta(days=lead)
+        weekdays = {(earliest + timedelta(days=offset)).weekday() for offset in range(span - lead + 1)}
+        condition |= Q(lead_time_days=lead, supplier__delivery_days__in=Supplier.delivery_masks(weekdays))
+    return condition
+
+
+def best_sources(deliver_by=None):
+    """Available supplier items, cheapest first, optionally limited to those arriving by ``deliver_by``."""
+    items = SupplierItem.objects.filter(is_available=True, supplier__is_active=True)
+    if deliver_by is not None:
+        items = items.filter(delivered_by(deliver_by))
+    return items.order_by('unit_price', 'lead_time_days', 'pk')
+
+
+def with_best_source(queryset, deliver_by=None):
+    """Annotate ingredients with their cheapest available source (None when there is none)."""
+    best = best_sources(deliver_by).filter(ingredient=OuterRef('pk'))
+    return queryset.annotate(
+        best_source=FilteredRelation(
+            'supplier_items', condition=Q(supplier_items__pk=Subquery(best.values('pk')[:1]))
+        ),
+    ).annotate(**{name: F(path) for name, path in BEST_SOURCE_FIELDS.items()})
@@ -0,0 +1,185 @@
+"""
+Stock movement ledger.
+
+Stock only changes by appending movements. A batch of movements is written
+with one insert and applied with an UPDATE that adds each ingredient's net
+delta to ``current_stock`` with F() (one UPDATE per hundred distinct deltas),
+so concurrent writers add to each other instead of overwriting.
+``current_stock`` is a running balance of the ledger that ``reconcile`` can
+check and repair. Every write also settles the ingredients' stock lots and
+costs the movements in the same transaction.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Sum, Value, When
+
+from . import lots, valuation
+from ..models import Ingredient, StockMovement
+from ..signals import stock_changed
+
+QUANTITY = DecimalField(max_digits=12, decimal_places=3)
+# CASE branches per UPDATE; each row is tested against every branch
+UPDATE_CHUNK = 100
+# Movements that only ever add or only ever remove stock
+INBOUND_KINDS = {'receipt'}
+OUTBOUND_KINDS = {'usage', 'waste'}
+
+
+class InsufficientStock(ValueError):
+    """Applying the movements would take stock below zero."""
+
+    def __init__(self, ingredient_ids):
+        self.ingredient_ids = ingredient_ids
+        super().__init__(f"Not enough stock for ingredients {sorted(ingredient_ids)}")
+
+
+def signed_quantity(kind, quantity):
+    """Quantity with the sign implied by ``kind``; usage and waste may be given as positive amounts."""
+    if kind in OUTBOUND_KINDS:
+        return -abs(quantity)
+    if kind in INBOUND_KINDS:
+        return abs(quantity)
+    return quantity
+
+
+@transaction.atomic
+def apply_movements(movements, staff=None, allow_negative=False):
+    """
+    Append movements to the ledger and apply them to stock.
+
+    ``movements`` are dicts of ingredient (or ingredient_id), kind, quantity
+    and optional reason, reference and, for receipts, the unit_cost paid and
+    the expiry_date of the lot received. Raises InsufficientStock, rolling
+    everything back, if any ingredient would go below zero unless
+    ``allow_negative``. Returns the created movements, without the cost
+    corrections valuation posted for them.
+    """
+    rows = []
+    receipts = []
+    deltas = defaultdict(Decimal)
+    for movement in movements:
+        ingredient_id = movement.get('ingredient_id') or movement['ingredient'].pk
+        quantity = signed_quantity(movement['kind'], Decimal(str(movement['quantity'])))
+        rows.append(StockMovement(
+            ingredient_id=ingredient_id,
+            kind=movement['kind'],
+            quantity=quantity,
+            reason=movement.get('reason', ''),
+            reference=movement.get('reference', ''),
+            unit_cost=Decimal(str(movement['unit_cost'])) if movement.get('unit_cost') is not None else None,
+            staff=staff,
+        ))
+        deltas[ingredient_id] += quantity
+        if movement['kind'] in INBOUND_KINDS and quantity:
+            receipts.append((ingredient_id, quantity, movement.get('expiry_date'), movement.get('reference', '')))
+
+    deltas = {ingredient_id: delta for ingredient_id, delta in deltas.items() if delta}
+    if deltas:
+        # Ingredients sharing a delta need no CASE branch of their own
+        by_delta = defaultdict(list)
+        for ingredient_id, delta in deltas.items():
+            by_delta[delta].append(ingredient_id)
+        groups = list(by_delta.items())
+        for start in range(0, len(groups), UPDATE_CHUNK):
+            chunk = groups[start:start + UPDATE_CHUNK]
+            Ingredient.objects.filter(pk__in=[pk for _, ids in chunk for pk in ids]).update(
+                current_stock=F('current_stock') + Case(
+                    *[When(pk__in=ids, then=Value(delta)) for delta, ids in chunk],
+                    output_field=QUANTITY,
+                )
+            )
+        Ingredient.objects.filter(pk__in=deltas).update(stock_status=Ingredient.stock_status_case())
+        if not allow_negative:
+            short = set(Ingredient.objects.filter(pk__in=deltas, current_stock__lt=0).values_list('pk', flat=True))
+            if short:
+                raise InsufficientStock(short)
+    lots.settle(deltas, receipts)
+
+    created = StockMovement.objects.bulk_create(valuation.apply(rows))
+    stock_changed.send(sender=StockMovement, ingredient_ids=list(deltas), movements=created)
+    # The cost corrections valuation added are saved with them but not returned
+    return rows
+
+
+@transaction.atomic
+def record_opening_balance(ingredient, reason='Opening balance'):
+    """Ledger entry, lot and valuation for stock an ingredient was created with."""
+    if not ingredient.current_stock:
+        return None
+    lots.settle([ingredient.pk])
+    movement = StockMovement(
+        ingredient=ingredient,
+        kind='adjustment',
+        quantity=ingredient.current_stock,
+        reason=reason,
+    )
+    StockMovement.objects.bulk_create(valuation.apply([movement]))
+    return movement
+
+
+@transaction.atomic
+def adjust_to(ingredient, counted, reason='', staff=None, reference=''):
+    """
+    Record an adjustment bringing stock to a counted level.
+
+    The row is locked while the difference is worked out so a concurrent
+    movement cannot slip in between. Returns the movement, or None when the
+    count matches.
+    """
+    current = Ingredient.objects.select_for_update().values_list('current_stock', flat=True).get(pk=ingredient.pk)
+    delta = counted - current
+    if not delta:
+        return None
+    movement, = apply_movements([{
+        'ingredient_id': ingredient.pk,
+        'kind': 'adjustment',
+        'quantity': delta,
+        'reason': reason,
+        'reference': reference,
+    }], staff=staff)
+    return movement
+
+
+def ledger_balances(ingredient_ids=None):
+    """{ingredient id: sum of its movements}."""
+    movements = StockMovement.objects.all()
+    if ingredient_ids is not None:
+        movements = movements.filter(ingredient_id__in=ingredient_ids)
+    return dict(movements.values('ingredient_id').annotate(balance=Sum('quantity')).values_list(
+        'ingredient_id', 'balance'
+    ))
+
+
+@transaction.atomic
+def reconcile(fix=False):
+    """
+    Compare every ingredient's stock with its ledger balance.
+
+    Returns (ingredient id, name, current_stock, ledger balance) for each
+    ingredient that drifted. With ``fix`` stock is reset to the ledger and
+    the drifted ingredients' lots and valuations are settled to match.
+    """
+    # Lock stock first so no movement lands between reading the two sides
+    rows = list(Ingredient.objects.select_for_update().values_list('pk', 'name', 'current_stock'))
+    balances = ledger_balances()
+    drift = []
+    for pk, name, current in rows:
+        balance = balances.get(pk, Decimal('0'))
+        if balance != current:
+            drift.append((pk, name, current, balance))
+
+    if fix and drift:
+        Ingredient.objects.filter(pk__in=[pk for pk, _, _, _ in drift]).update(
+            current_stock=Case(
+                *[When(pk=pk, then=Value(balance)) for pk, _, _, balance in drift],
+                output_field=QUANTITY,
+            )
+        )
+        Ingredient.objects.filter(pk__in=[pk for pk, _, _, _ in drift]).update(
+            stock_status=Ingredient.stock_status_case()
+        )
+        lots.settle([pk for pk, _, _, _ in drift])
+        valuation.resync([pk for pk, _, _, _ in drift])
+    return drift
@@ -0,0 +1,213 @@
+"""
+Inventory threshold alerts.
+
+Each ingredient has an alert level: ok, reorder (at or below reorder_point),
+low (below minimum_stock) or out (no stock). The current level is kept in a
+Redis hash and moved by a Lua script after every committed stock write, so
+two writers cannot both announce the same crossing. Falling below a
+threshold raises the level at once; it only clears once stock has climbed a
+hysteresis margin above the threshold, so stock hovering around a threshold
+does not flap. Level changes are appended to a capped stream that kitchen
+and manager screens follow over server-sent events, and a periodic digest
+summarizes them for staff who were offline.
+"""
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django_redis import get_redis_connection
+
+from ..models import Ingredient, Staff
+from ..signals import stock_alert_digest
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY = 'stock_alerts:state'
+EVENTS_KEY = 'stock_alerts:events'
+DIGEST_CURSOR_KEY = 'stock_alerts:digest_cursor'
+
+EVENTS_MAX_LENGTH = 10000
+LEVELS = ('ok', 'reorder', 'low', 'out')
+
+# ARGV: hysteresis, now, max length, then id, name, stock, minimum, reorder point per ingredient
+EVALUATE_SCRIPT = """
+local hysteresis = tonumber(ARGV[1])
+local levels = {'ok', 'reorder', 'low', 'out'}
+local changed = 0
+for i = 4, #ARGV, 5 do
+    local id, name = ARGV[i], ARGV[i + 1]
+    local stock, minimum, reorder = tonumber(ARGV[i + 2]), tonumber(ARGV[i + 3]), tonumber(ARGV[i + 4])
+
+    local level = 0
+    if stock <= 0 then
+        level = 3
+    elseif stock < minimum then
+        level = 2
+    elseif reorder > 0 and stock <= reorder then
+        level = 1
+    end
+
+    local previous = tonumber(redis.call('HGET', KEYS[1], id) or '0')
+    local new = previous
+    if level >= previous then
+        new = level
+    else
+        -- Step down only past each threshold's margin
+        local clear = {reorder * (1 + hysteresis), minimum * (1 + hysteresis), minimum * hysteresis}
+        while new > level and stock >= clear[new] do
+            new = new - 1
+        end
+    end
+
+    if new ~= previous then
+        if new == 0 then
+            redis.call('HDEL', KEYS[1], id)
+        else
+            redis.call('HSET', KEYS[1], id, new)
+        end
+        redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*',
+            'ingredient', id, 'name', name, 'level', levels[new + 1], 'previous', levels[previous + 1],
+            'stock', ARGV[i + 2], 'at', ARGV[2])
+        changed = changed + 1
+    end
+end
+return changed
+"""
+
+
+def _connection():
+    return get_redis_connection('default')
+
+
+def evaluate(ingredient_ids):
+    """Move the alert level of each ingredient and emit an event for every change."""
+    rows = Ingredient.objects.filter(pk__in=list(ingredient_ids)).values_list(
+        'pk', 'name', 'current_stock', 'minimum_stock', 'reorder_point'
+    )
+    args = [settings.STOCK_ALERT_HYSTERESIS, int(time.time()), EVENTS_MAX_LENGTH]
+    for pk, name, current_stock, minimum_stock, reorder_point in rows:
+        args.extend([pk, name, str(current_stock), str(minimum_stock), str(reorder_point or 0)])
+    if len(args) == 3:
+        return 0
+    conn = _connection()
+    return conn.register_script(EVALUATE_SCRIPT)(keys=[STATE_KEY, EVENTS_KEY], args=args)
+
+
+def forget(ingredient_id):
+    """Drop a deleted ingredient's alert level."""
+    _connection().hdel(STATE_KEY, ingredient_id)
+
+
+def _decode(entry_id, fields):
+    event = {key.decode(): value.decode() for key, value in fields.items()}
+    event['id'] = entry_id.decode()
+    event['ingredient'] = int(event['ingredient'])
+    event['at'] = int(event['at'])
+    return event
+
+
+def active():
+    """{ingredient id: level} for every ingredient currently alerting."""
+    return {int(pk): LEVELS[int(level)] for pk, level in _connection().hgetall(STATE_KEY).items()}
+
+
+def events(since='0', count=500):
+    """Alert events after stream id ``since``. Returns (events, last id)."""
+    entries = _connection().xrange(EVENTS_KEY, min=f'({since}' if since != '0' else '-', count=count)
+    decoded = [_decode(entry_id, fields) for entry_id, fields in entries]
+    return decoded, decoded[-1]['id'] if decoded else since
+
+
+def stream(since='$', block_seconds=15, lifetime_seconds=None):
+    """
+    Server-sent event chunks for alerts after ``since``.
+
+    Blocks on the stream between events and sends a comment as keepalive.
+    Ends after ``lifetime_seconds`` so the client reconnects with
+    Last-Event-ID instead of holding a worker forever.
+    """
+    conn = _connection()
+    lifetime = lifetime_seconds if lifetime_seconds is not None else settings.STOCK_ALERT_STREAM_SECONDS
+    deadline = time.monotonic() + lifetime
+    if since == '$':
+        # Pin the position now so events between reads are not skipped
+        last = conn.xrevrange(EVENTS_KEY, count=1)
+        since = last[0][0].decode() if last else '0-0'
+
+    yield f"retry: {block_seconds * 1000}\n\n"
+    while time.monotonic() < deadline:
+        block = int(min(block_seconds, max(deadline - time.monotonic(), 0.001)) * 1000)
+        reply = conn.xread({EVENTS_KEY: since}, block=block, count=100)
+        if not reply:
+            yield ": keepalive\n\n"
+            continue
+        for entry_id, fields in reply[0][1]:
+            event = _decode(entry_id, fields)
+            since = event['id']
+            yield f"id: {since}\nevent: stock_alert\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+def send_digest(count=5000):
+    """
+    Summarize alert events since the previous digest.
+
+    Sends stock_alert_digest with the latest level of each ingredient that
+    changed and returns the number of ingredients in the digest.
+    """
+    conn = _connection()
+    cursor = conn.get(DIGEST_CURSOR_KEY)
+    batch, last_id = events(cursor.decode() if cursor else '0', count=count)
+    if not batch:
+        return 0
+
+    latest = {}
+    for event in batch:
+        latest.setdefault(event['ingredient'], {'first_previous': event['previous']}).update(event)
+    changes = [
+        {
+            'ingredient': ingredient_id,
+            'name': event['name'],
+            'level': event['level'],
+            'previous': event['first_previous'],
+            'stock': event['stock'],
+        }
+        for ingredient_id, event in latest.items()
+        # Alerts that cleared again before the digest are left out
+        if event['level'] != event['first_previous']
+    ]
+    conn.set(DIGEST_CURSOR_KEY, last_id)
+
+    if changes:
+        logger.info("Stock alert digest: %s ingredients changed level", len(changes))
+        stock_alert_digest.send(sender=Ingredient, changes=changes, active=active())
+    return len(changes)
+
+
+def email_digest(changes, active_levels):
+    """
+    Email a digest to active staff in STOCK_ALERT_DIGEST_ROLES.
+
+    Returns the number of recipients; staff without an email address are skipped.
+    """
+    recipients = list(
+        Staff.objects.filter(is_active=True, role__in=settings.STOCK_ALERT_DIGEST_ROLES)
+        .exclude(email='').values_list('email', flat=True)
+    )
+    if not recipients:
+        return 0
+
+    lines = [
+        f"{change['name']}: {change['previous']} -> {change['level']} (stock {change['stock']})"
+        for change in sorted(changes, key=lambda change: change['name'])
+    ]
+    alerting = sum(1 for level in active_levels.values() if level != 'ok')
+    body = '\n'.join(lines + ['', f"{alerting} ingredients are currently alerting."])
+    send_mail(
+        subject=f"Stock alerts: {len(changes)} ingredients changed level",
+        message=body,
+        from_email=None,
+        recipient_list=recipients,
+    )
+    return len(recipients)
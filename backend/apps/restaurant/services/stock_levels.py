@@ -0,0 +1,105 @@
+"""
+Low and out-of-stock ingredient sets kept in Redis.
+
+Ingredient.stock_status is stored and re-derived in the same UPDATE that
+changes stock, so it can be filtered through its index. On top of it two
+Redis sets hold the ids of ingredients below minimum stock (out-of-stock
+included) and of those out of stock. They are updated for the touched ids
+once each stock write commits, so the low-stock lists and dashboard counts
+never scan the ingredients table.
+
+Both sets always hold a placeholder member, so an empty set still exists and
+a set that Redis evicted is noticed and reloaded from the stored statuses.
+Syncs read the status after their transaction commits; two commits touching
+the same ingredient can still apply their syncs out of order and leave the
+older status in place, which the periodic rebuild repairs.
+"""
+from django_redis import get_redis_connection
+
+from ..models import Ingredient
+
+LOW_KEY = 'inventory:stock:low'
+OUT_KEY = 'inventory:stock:out'
+
+# Not a valid primary key, so it never collides with an ingredient
+PLACEHOLDER = 0
+
+LOW_STATUSES = ('low_stock', 'out_of_stock')
+OUT_STATUSES = ('out_of_stock',)
+
+# Updates only loaded sets; a missing one is rebuilt in full on the next read
+SYNC_SCRIPT = """
+if redis.call('EXISTS', KEYS[1], KEYS[2]) < 2 then
+    return 0
+end
+for i = 1, #ARGV, 3 do
+    redis.call(ARGV[i + 1] == '1' and 'SADD' or 'SREM', KEYS[1], ARGV[i])
+    redis.call(ARGV[i + 2] == '1' and 'SADD' or 'SREM', KEYS[2], ARGV[i])
+end
+return 1
+"""
+
+
+def sync(ingredient_ids):
+    """Bring the sets up to date for ``ingredient_ids``; ids that no longer exist are dropped."""
+    ingredient_ids = list(ingredient_ids)
+    if not ingredient_ids:
+        return
+    statuses = dict(Ingredient.objects.filter(pk__in=ingredient_ids).values_list('pk', 'stock_status'))
+
+    args = []
+    for pk in ingredient_ids:
+        status = statuses.get(pk)
+        args += [pk, int(status in LOW_STATUSES), int(status in OUT_STATUSES)]
+    conn = get_redis_connection('default')
+    conn.register_script(SYNC_SCRIPT)(keys=[LOW_KEY, OUT_KEY], args=args)
+
+
+def restatus():
+    """Re-derive every stored stock status from stock and thresholds. Returns the rows updated."""
+    return Ingredient.objects.update(stock_status=Ingredient.stock_status_case())
+
+
+def rebuild():
+    """Reload both sets from the stored stock statuses. Returns the number of low-stock ingredients."""
+    low = list(Ingredient.objects.filter(stock_status__in=LOW_STATUSES).values_list('pk', 'stock_status'))
+    out = [pk for pk, status in low if status in OUT_STATUSES]
+
+    pipe = get_redis_connection('default').pipeline()
+    pipe.delete(LOW_KEY, OUT_KEY)
+    pipe.sadd(LOW_KEY, PLACEHOLDER, *[pk for pk, _ in low])
+    pipe.sadd(OUT_KEY, PLACEHOLDER, *out)
+    pipe.execute()
+    return len(low)
+
+
+def _ensure_loaded(conn):
+    if conn.exists(LOW_KEY, OUT_KEY) < 2:
+        rebuild()
+
+
+def _members(key):
+    conn = get_redis_connection('default')
+    _ensure_loaded(conn)
+    return {int(pk) for pk in conn.smembers(key)} - {PLACEHOLDER}
+
+
+def low_stock_ids():
+    """Ids of ingredients below minimum stock, including those out of stock."""
+    return _members(LOW_KEY)
+
+
+def out_of_stock_ids():
+    """Ids of ingredients with no stock."""
+    return _members(OUT_KEY)
+
+
+def counts():
+    """Numbers of low and out-of-stock ingredients for dashboard badges."""
+    conn = get_redis_connection('default')
+    _ensure_loaded(conn)
+    pipe = conn.pipeline()
+    pipe.scard(LOW_KEY)
+    pipe.scard(OUT_KEY)
+    low, out = pipe.execute()
+    return {'low_stock': low - 1, 'out_of_stock': out - 1}
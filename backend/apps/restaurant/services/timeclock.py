@@ -0,0 +1,249 @@
+"""
+Time clock: punch ingestion, live labor cost and payroll totals.
+
+Punches arrive in batches at shift change and are applied with one query for
+open entries, one bulk insert and one bulk update. A Redis hash keeps the live
+labor cost of everyone on the clock as running sums (rate and rate x clock-in
+time), so reading it is O(1). Payroll totals are computed with NumPy over all
+entries in the period.
+"""
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+from functools import partial
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from ..models import Staff, TimeEntry
+from . import sections
+
+LIVE_KEY = 'labor:live'
+CLOSED_KEY = 'labor:closed:{date}'
+CLOSED_TTL_SECONDS = 3 * 24 * 60 * 60
+
+PunchResult = namedtuple('PunchResult', 'staff action timestamp accepted error')
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_WEEK = 7 * 24 * SECONDS_PER_HOUR
+
+
+def record_punches(punches, source=''):
+    """
+    Apply a batch of punches, each a dict with staff (id), action and timestamp.
+
+    Returns a PunchResult per punch in timestamp order.
+    """
+    punches = sorted(punches, key=lambda punch: punch['timestamp'])
+    staff_ids = {punch['staff'] for punch in punches}
+    results = []
+
+    with transaction.atomic():
+        staff = {
+            pk: (hourly_rate, role)
+            for pk, hourly_rate, role in Staff.objects.filter(
+                pk__in=staff_ids, is_active=True
+            ).values_list('pk', 'hourly_rate', 'role')
+        }
+        open_entries = {
+            entry.staff_id: entry
+            for entry in TimeEntry.objects.select_for_update().filter(
+                staff_id__in=staff_ids, clock_out__isnull=True
+            )
+        }
+        created, closed = [], []
+
+        for punch in punches:
+            staff_id, action, timestamp = punch['staff'], punch['action'], punch['timestamp']
+            error = None
+
+            if staff_id not in staff:
+                error = 'Unknown or inactive staff member'
+            elif action == 'in':
+                if staff_id in open_entries:
+                    error = 'Already clocked in'
+                else:
+                    hourly_rate, role = staff[staff_id]
+                    entry = TimeEntry(
+                        staff_id=staff_id, clock_in=timestamp,
+                        hourly_rate=hourly_rate, role=role, source=source
+                    )
+                    open_entries[staff_id] = entry
+                    created.append(entry)
+            else:
+                entry = open_entries.pop(staff_id, None)
+                if entry is None:
+                    error = 'Not clocked in'
+                elif timestamp <= entry.clock_in:
+                    open_entries[staff_id] = entry
+                    error = 'Clock-out must be after clock-in'
+                else:
+                    entry.clock_out = timestamp
+                    if entry.pk:
+                        closed.append(entry)
+
+            results.append(PunchResult(staff_id, action, timestamp, error is None, error))
+
+        TimeEntry.objects.bulk_create(created)
+        TimeEntry.objects.bulk_update(closed, ['clock_out'])
+
+        finished = closed + [entry for entry in created if entry.clock_out is not None]
+        transaction.on_commit(partial(
+            _update_live_cost,
+            opened=[entry for entry in created if entry.clock_out is None],
+            closed=finished,
+            was_open={entry.pk for entry in closed},
+        ))
+        # Servers leaving the floor hand their sections to whoever is left
+        transaction.on_commit(partial(
+            sections.release_staff, [entry.staff_id for entry in finished]
+        ))
+
+    return results
+
+
+def _epoch_hours(value):
+    return value.timestamp() / SECONDS_PER_HOUR
+
+
+def _update_live_cost(opened, closed, was_open):
+    """Fold clock-ins and clock-outs into the running labor sums."""
+    conn = get_redis_connection('default')
+    if not conn.hexists(LIVE_KEY, 'on_clock'):
+        rebuild_live_cost()
+        # Closed shifts still need to be added to the day's closed cost
+        opened, was_open = [], set()
+
+    pipe = conn.pipeline(transaction=True)
+    for entry in opened:
+        rate = float(entry.hourly_rate or 0)
+        pipe.hincrby(LIVE_KEY, 'on_clock', 1)
+        pipe.hincrbyfloat(LIVE_KEY, 'rate_sum', rate)
+        pipe.hincrbyfloat(LIVE_KEY, 'weighted_start', rate * _epoch_hours(entry.clock_in))
+
+    for entry in closed:
+        rate = float(entry.hourly_rate or 0)
+        started = _epoch_hours(entry.clock_in)
+        closed_key = CLOSED_KEY.format(date=timezone.localdate(entry.clock_out).isoformat())
+        pipe.hincrbyfloat(closed_key, 'cost', rate * (_epoch_hours(entry.clock_out) - started))
+        pipe.expire(closed_key, CLOSED_TTL_SECONDS)
+        if entry.pk in was_open:
+            pipe.hincrby(LIVE_KEY, 'on_clock', -1)
+            pipe.hincrbyfloat(LIVE_KEY, 'rate_sum', -rate)
+            pipe.hincrbyfloat(LIVE_KEY, 'weighted_start', -rate * started)
+    pipe.execute()
+
+
+def rebuild_live_cost():
+    """Recompute the running sums from the open time entries."""
+    rate_sum = weighted_start = 0.0
+    on_clock = 0
+    for clock_in, rate in TimeEntry.objects.filter(clock_out__isnull=True).values_list('clock_in', 'hourly_rate'):
+        rate = float(rate or 0)
+        on_clock += 1
+        rate_sum += rate
+        weighted_start += rate * _epoch_hours(clock_in)
+
+    get_redis_connection('default').hset(LIVE_KEY, mapping={
+        'on_clock': on_clock,
+        'rate_sum': rate_sum,
+        'weighted_start': weighted_start,
+    })
+
+
+def live_labor_cost():
+    """Current labor burn rate and today's accumulated labor cost."""
+    conn = get_redis_connection('default')
+    if not conn.hexists(LIVE_KEY, 'on_clock'):
+        rebuild_live_cost()
+
+    live = conn.hgetall(LIVE_KEY)
+    closed = conn.hget(CLOSED_KEY.format(date=timezone.localdate().isoformat()), 'cost')
+    rate_sum = float(live.get(b'rate_sum', 0))
+    open_cost = rate_sum * _epoch_hours(timezone.now()) - float(live.get(b'weighted_start', 0))
+
+    return {
+        'on_clock': int(live.get(b'on_clock', 0)),
+        'hourly_burn': round(rate_sum, 2),
+        'open_shift_cost': round(max(open_cost, 0), 2),
+        'closed_shift_cost_today': round(float(closed or 0), 2),
+    }
+
+
+def compute_payroll(staff_index, clock_in, clock_out, rates, week_origin, staff_count):
+    """
+    Vectorized gross pay per staff member.
+
+    ``clock_in``/``clock_out`` are epoch seconds and ``staff_index`` maps each
+    entry to 0..staff_count-1. Hours beyond the weekly regular hours in each
+    week (counted from ``week_origin``) are paid at the overtime multiplier,
+    using that week's average rate.
+
+    Returns arrays of (hours, overtime_hours, gross_pay) indexed by staff.
+    """
+    regular_limit = settings.PAYROLL_WEEKLY_REGULAR_HOURS
+    premium = settings.PAYROLL_OVERTIME_MULTIPLIER - 1
+
+    hours = (clock_out - clock_in) / SECONDS_PER_HOUR
+    pay = hours * rates
+
+    week = ((clock_in - week_origin) // SECONDS_PER_WEEK).astype(np.int64)
+    week -= week.min(initial=0)
+    weeks = int(week.max(initial=0)) + 1
+    group = staff_index * weeks + week
+
+    group_hours = np.bincount(group, weights=hours, minlength=staff_count * weeks)
+    group_pay = np.bincount(group, weights=pay, minlength=staff_count * weeks)
+    overtime = np.maximum(group_hours - regular_limit, 0)
+    average_rate = np.divide(group_pay, group_hours, out=np.zeros_like(group_pay), where=group_hours > 0)
+    group_pay += overtime * average_rate * premium
+
+    return (
+        group_hours.reshape(staff_count, weeks).sum(axis=1),
+        overtime.reshape(staff_count, weeks).sum(axis=1),
+        group_pay.reshape(staff_count, weeks).sum(axis=1),
+    )
+
+
+def payroll_totals(start, end):
+    """Gross pay per staff member for completed entries clocked in during [start, end)."""
+    rows = list(
+        TimeEntry.objects.filter(clock_in__gte=start, clock_in__lt=end, clock_out__isnull=False)
+        .values_list('staff_id', 'clock_in', 'clock_out', 'hourly_rate')
+    )
+    if not rows:
+        return []
+
+    staff_ids, clock_ins, clock_outs, rates = zip(*rows)
+    unique_ids, staff_index = np.unique(np.array(staff_ids), return_inverse=True)
+    hours, overtime, gross = compute_payroll(
+        staff_index,
+        np.array([value.timestamp() for value in clock_ins]),
+        np.array([value.timestamp() for value in clock_outs]),
+        np.array([float(rate or 0) for rate in rates]),
+        _week_origin(start),
+        len(unique_ids),
+    )
+
+    names = dict(Staff.objects.filter(pk__in=unique_ids.tolist()).values_list('pk', 'name'))
+    cents = Decimal('0.01')
+    return [
+        {
+            'staff': int(staff_id),
+            'name': names.get(int(staff_id), ''),
+            'hours': round(float(hours[i]), 2),
+            'overtime_hours': round(float(overtime[i]), 2),
+            'gross_pay': Decimal(str(gross[i])).quantize(cents),
+        }
+        for i, staff_id in enumerate(unique_ids)
+    ]
+
+
+def _week_origin(start):
+    """Epoch seconds of local midnight on the Monday of ``start``'s week."""
+    local = timezone.localtime(start)
+    monday = local.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=local.weekday())
+    return monday.timestamp()
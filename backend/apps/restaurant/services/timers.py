@@ -0,0 +1,131 @@
+"""
+Scheduled table status transitions backed by a Redis sorted set.
+
+Each table has at most one pending timer, stored as a sorted-set member scored
+by its due time, so scheduling and cancelling are O(log n). Workers claim due
+timers with a Lua script that moves them to an in-flight set under a lease;
+a timer whose worker dies is handed out again once its lease expires, unless
+the table was rescheduled meanwhile, in which case the newer due time stands.
+Firing re-checks the table under a row lock, so a redelivered timer never
+applies twice.
+"""
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from ..models import Table
+
+logger = logging.getLogger(__name__)
+
+DUE_KEY = 'table_timers:due'
+INFLIGHT_KEY = 'table_timers:inflight'
+PAYLOAD_KEY = 'table_timers:payload'
+
+LEASE_SECONDS = 60
+
+CLAIM_SCRIPT = """
+local now = tonumber(ARGV[1])
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)
+for _, member in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], member)
+    redis.call('ZADD', KEYS[1], 'NX', now, member)
+end
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, tonumber(ARGV[3]))
+local claimed = {}
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    redis.call('ZADD', KEYS[2], tonumber(ARGV[2]), member)
+    claimed[#claimed + 1] = member
+    claimed[#claimed + 1] = redis.call('HGET', KEYS[3], member) or ''
+end
+return claimed
+"""
+
+ACK_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[1])
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) == false and redis.call('HGET', KEYS[3], ARGV[1]) == ARGV[2] then
+    redis.call('HDEL', KEYS[3], ARGV[1])
+end
+return 1
+"""
+
+KEYS = [DUE_KEY, INFLIGHT_KEY, PAYLOAD_KEY]
+
+
+def _member(table_id):
+    return f'table:{table_id}'
+
+
+def schedule_transition(table, target_status, delay_seconds):
+    """Schedule ``table`` to move from its current status to ``target_status``."""
+    member = _member(table.pk)
+    payload = json.dumps({
+        'table': table.pk,
+        'from': table.status,
+        'to': target_status,
+        'stamp': table.status_changed_at.isoformat() if table.status_changed_at else None,
+    })
+
+    pipe = get_redis_connection('default').pipeline(transaction=True)
+    pipe.hset(PAYLOAD_KEY, member, payload)
+    pipe.zadd(DUE_KEY, {member: time.time() + delay_seconds})
+    pipe.execute()
+
+
+def cancel_transition(table_id):
+    """Cancel any pending timer for a table."""
+    member = _member(table_id)
+    pipe = get_redis_connection('default').pipeline(transaction=True)
+    pipe.zrem(DUE_KEY, member)
+    pipe.hdel(PAYLOAD_KEY, member)
+    pipe.execute()
+
+
+def schedule_for_status(table):
+    """Replace the table's pending timer according to its new status."""
+    if table.status == 'cleaning':
+        schedule_transition(table, 'available', settings.TABLE_CLEANING_MINUTES * 60)
+    elif table.status == 'reserved':
+        schedule_transition(table, 'available', settings.TABLE_RESERVATION_HOLD_MINUTES * 60)
+    else:
+        cancel_transition(table.pk)
+
+
+def fire_due_transitions(limit=500):
+    """Claim and apply all due transitions. Safe to run from several workers."""
+    conn = get_redis_connection('default')
+    now = time.time()
+    claimed = conn.register_script(CLAIM_SCRIPT)(
+        keys=KEYS, args=[now, now + LEASE_SECONDS, limit]
+    )
+    ack = conn.register_script(ACK_SCRIPT)
+
+    fired = 0
+    for member, payload in zip(claimed[::2], claimed[1::2]):
+        if payload and _apply(json.loads(payload)):
+            fired += 1
+        ack(keys=KEYS, args=[member, payload])
+
+    return fired
+
+
+def _apply(payload):
+    """Apply a timer if the table is still in the status it was scheduled for."""
+    with transaction.atomic():
+        table = Table.objects.select_for_update().filter(pk=payload['table']).first()
+        if table is None or table.status != payload['from']:
+            return False
+
+        stamp = table.status_changed_at.isoformat() if table.status_changed_at else None
+        if stamp != payload['stamp']:
+            return False
+
+        table.status = payload['to']
+        table.save(update_fields=['status'])
+
+    logger.info("Table %s moved %s -> %s by timer", table.table_number, payload['from'], payload['to'])
+    return True
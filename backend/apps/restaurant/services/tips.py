@@ -0,0 +1,126 @@
+"""
+Tip pool distribution.
+
+Each eligible staff member earns points for the hours they worked inside the
+period times the weight of the role they worked, and the pool is split in
+proportion to points. The role comes from each time entry, snapshotted at
+clock-in, so a promotion mid-period does not reweight earlier shifts; someone
+who worked two roles gets a share per role. Amounts are computed in integer cents with the largest remainder
+method, so shares always add up to the pool exactly. Hours come from the time
+clock, clipped to the period, and are aggregated with NumPy.
+"""
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from ..models import TimeEntry, TipPool, TipShare
+
+SECONDS_PER_HOUR = 3600
+CENTS = Decimal('0.01')
+# Largest weight TipShare.weight (6 digits, 2 decimal places) can hold
+MAX_WEIGHT = Decimal('9999.99')
+
+
+def split_cents(points, total_cents):
+    """
+    Split ``total_cents`` in proportion to ``points`` without losing a cent.
+
+    Each share gets the floor of its exact amount; the cents left over go to
+    the shares with the largest fractional remainders (earlier entries win
+    ties). Returns an int64 array the same length as ``points``.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    total_points = points.sum()
+    if total_points <= 0:
+        return np.zeros(len(points), dtype=np.int64)
+
+    exact = points * (total_cents / total_points)
+    shares = np.floor(exact).astype(np.int64)
+    leftover = int(total_cents - shares.sum())
+    if leftover > 0:
+        order = np.argsort(-(exact - shares), kind='stable')
+        shares[order[:leftover]] += 1
+    return shares
+
+
+def hours_worked(period_start, period_end, roles):
+    """
+    Hours per staff member and role worked in ``roles``, clocked inside
+    [period_start, period_end).
+
+    Returns (staff_ids, staff_roles, hours) arrays with one element per
+    (staff member, role) pair. Open entries are ignored.
+    """
+    rows = list(
+        TimeEntry.objects.filter(
+            Q(clock_out__isnull=False) & Q(clock_out__gt=period_start) & Q(clock_in__lt=period_end),
+            role__in=roles,
+        ).values_list('staff_id', 'role', 'clock_in', 'clock_out')
+    )
+    if not rows:
+        return np.array([], dtype=np.int64), np.array([], dtype=object), np.array([])
+
+    staff_ids, staff_roles, clock_ins, clock_outs = zip(*rows)
+    clock_in = np.array([value.timestamp() for value in clock_ins])
+    clock_out = np.array([value.timestamp() for value in clock_outs])
+    seconds = np.minimum(clock_out, period_end.timestamp()) - np.maximum(clock_in, period_start.timestamp())
+
+    role_names, role_index = np.unique(np.array(staff_roles), return_inverse=True)
+    pairs = np.column_stack([np.array(staff_ids, dtype=np.int64), role_index])
+    unique_pairs, pair_index = np.unique(pairs, axis=0, return_inverse=True)
+    hours = np.bincount(pair_index.ravel(), weights=seconds, minlength=len(unique_pairs)) / SECONDS_PER_HOUR
+    return unique_pairs[:, 0], role_names.astype(object)[unique_pairs[:, 1]], hours
+
+
+@transaction.atomic
+def distribute(period_start, period_end, total_amount, role_weights=None, created_by=None, notes=''):
+    """
+    Create an immutable tip pool and its shares for the period.
+
+    ``role_weights`` defaults to TIP_POOL_ROLE_WEIGHTS; roles with a weight of
+    zero or less are left out of the pool. Weights and hours are rounded to
+    the cent before splitting, so the stored shares reproduce the payout.
+    Raises ValueError when a weight is out of range or nobody eligible worked
+    in the period.
+    """
+    weights = {
+        role: Decimal(str(weight)).quantize(CENTS)
+        for role, weight in (role_weights or settings.TIP_POOL_ROLE_WEIGHTS).items()
+    }
+    too_heavy = [role for role, weight in weights.items() if weight > MAX_WEIGHT]
+    if too_heavy:
+        raise ValueError(f"Role weights must not exceed {MAX_WEIGHT}: {', '.join(too_heavy)}")
+    weights = {role: weight for role, weight in weights.items() if weight > 0}
+
+    staff_ids, staff_roles, hours = hours_worked(period_start, period_end, list(weights))
+    hours = np.round(hours, 2)
+    if not hours.any():
+        raise ValueError('No eligible staff worked during the period')
+
+    role_weight = np.array([float(weights[role]) for role in staff_roles], dtype=np.float64)
+    total_cents = int((Decimal(total_amount) / CENTS).to_integral_value())
+    cents = split_cents(hours * role_weight, total_cents)
+
+    pool = TipPool.objects.create(
+        period_start=period_start,
+        period_end=period_end,
+        total_amount=Decimal(total_amount).quantize(CENTS),
+        role_weights={role: float(weight) for role, weight in weights.items()},
+        created_by=created_by,
+        notes=notes,
+    )
+    TipShare.objects.bulk_create([
+        TipShare(
+            pool=pool,
+            staff_id=int(staff_id),
+            role=staff_roles[i],
+            hours=Decimal(str(float(hours[i]))).quantize(CENTS),
+            weight=weights[staff_roles[i]],
+            amount=Decimal(int(cents[i])) * CENTS,
+        )
+        for i, staff_id in enumerate(staff_ids)
+    ])
+    return pool
@@ -0,0 +1,237 @@
+"""
+Unit-of-measure conversion.
+
+Stock, movements and par levels are kept in each ingredient's own unit of
+measure, so quantities of different ingredients, or recipe lines written in
+another unit, are converted before they are combined. Units of one
+dimension (kg and grams, liters and ml) convert by fixed ratios; an
+ingredient's UnitConversion rows bridge to other dimensions with its pack
+sizes and densities.
+
+The factors of every ingredient and unit are compiled into one
+ingredient-by-unit matrix, kept in process memory per conversion version
+like the recipe matrix, so a batch of quantities converts with one lookup
+and one multiplication over numpy arrays. Aggregates in the database use
+``quantity_in``, a CASE over the standard ratios that falls back to the
+ingredient's conversion rows.
+"""
+import time
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import (
+    Case, Count, ExpressionWrapper, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce
+
+from ..models import Ingredient, UnitConversion
+
+VERSION_KEY = 'units:version'
+UNITS = [code for code, _ in Ingredient.UOM_CHOICES]
+UNIT_INDEX = {unit: index for index, unit in enumerate(UNITS)}
+
+_dimensions = np.array([Ingredient.UNIT_DIMENSIONS[unit][0] for unit in UNITS])
+_sizes = np.array([Ingredient.UNIT_DIMENSIONS[unit][1] for unit in UNITS], dtype=float)
+SAME_DIMENSION = _dimensions[:, None] == _dimensions[None, :]
+# STANDARD[a, b]: how many of unit a one of unit b holds, where both share a dimension
+STANDARD = np.where(SAME_DIMENSION, _sizes[None, :] / _sizes[:, None], np.nan)
+
+_compiled = {}
+
+
+class IncompatibleUnits(ValueError):
+    """Quantities are in a unit their ingredient has no conversion for."""
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+        super().__init__(
+            "No conversion for " + ', '.join(f"{unit} of ingredient {pk}" for pk, unit in pairs)
+        )
+
+
+def dimension(unit):
+    return Ingredient.UNIT_DIMENSIONS[unit][0]
+
+
+def _ratio(unit, other):
+    """How many of ``unit`` one of ``other`` holds, for units of one dimension."""
+    return Ingredient.UNIT_DIMENSIONS[other][1] / Ingredient.UNIT_DIMENSIONS[unit][1]
+
+
+def unit_index(field):
+    """Expression giving the position of the unit code in ``field`` among UNITS."""
+    return Case(
+        *[When(**{field: unit}, then=Value(index)) for index, unit in enumerate(UNITS)],
+        output_field=IntegerField(),
+    )
+
+
+class ConversionMatrix:
+    """Quantity of each ingredient's own unit that one of every unit holds; NaN where none converts."""
+
+    def __init__(self, ingredient_ids, factors):
+        self.ingredient_ids = ingredient_ids
+        self.factors = factors
+
+    def lookup(self, ingredient_ids, unit_indices):
+        """Factors for parallel arrays of ingredient ids and unit positions."""
+        if not len(self.ingredient_ids):
+            return np.full(len(ingredient_ids), np.nan)
+        rows = np.minimum(np.searchsorted(self.ingredient_ids, ingredient_ids), len(self.ingredient_ids) - 1)
+        found = self.ingredient_ids[rows] == ingredient_ids
+        return np.where(found, self.factors[rows, unit_indices], np.nan)
+
+
+def _seed():
+    # Seeded from the clock so a lost key never reissues a version a process compiled
+    return time.time_ns() // 1000
+
+
+def current_version():
+    return cache.get_or_set(VERSION_KEY, _seed, None)
+
+
+def invalidate():
+    """Move to a new conversion version; each process recompiles on next use."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, _seed(), None)
+
+
+def compile_matrix():
+    """Build the conversion matrix from the database."""
+    ingredients = np.array(
+        Ingredient.objects.order_by('pk').annotate(base=unit_index('unit_of_measure')).values_list('pk', 'base'),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    ingredient_ids = ingredients[:, 0]
+    factors = STANDARD[ingredients[:, 1]]
+
+    conversions = np.array(
+        UnitConversion.objects.annotate(
+            index=unit_index('unit'), value=Cast('factor', FloatField())
+        ).values_list('ingredient_id', 'index', 'value'),
+        dtype=float,
+    ).reshape(-1, 3)
+    rows = np.searchsorted(ingredient_ids, conversions[:, 0].astype(np.int64))
+    units = conversions[:, 1].astype(np.int64)
+    # A conversion opens every unit of its dimension, scaled by the standard ratio
+    entries, columns = np.nonzero(SAME_DIMENSION[units])
+    factors[rows[entries], columns] = conversions[entries, 2] * STANDARD[units[entries], columns]
+    return ConversionMatrix(ingredient_ids, factors)
+
+
+def get_matrix():
+    """The compiled matrix for the current conversion version."""
+    version = current_version()
+    if _compiled.get('version') != version:
+        _compiled['matrix'] = compile_matrix()
+        _compiled['version'] = version
+    return _compiled['matrix']
+
+
+def _unit_indices(units, size):
+    """Positions of ``units`` (one code, or one per quantity) among UNITS; -1 for blank."""
+    if isinstance(units, str):
+        units = [units]
+    codes, inverse = np.unique(np.asarray(units, dtype=str), return_inverse=True)
+    indices = np.array([UNIT_INDEX.get(code, -1) for code in codes], dtype=np.int64)[inverse]
+    return np.broadcast_to(indices, size)
+
+
+def factors(ingredient_ids, units):
+    """
+    Quantity of each ingredient's own unit that one of ``units`` holds.
+
+    ``units`` is one unit code or one per ingredient; a blank unit is the
+    ingredient's own unit. NaN where the unit does not convert.
+    """
+    ingredient_ids = np.asarray(ingredient_ids, dtype=np.int64)
+    indices = _unit_indices(units, len(ingredient_ids))
+    blank = indices < 0
+    result = get_matrix().lookup(ingredient_ids, np.where(blank, 0, indices))
+    return np.where(blank, 1.0, result)
+
+
+def convert(ingredient_ids, quantities, units, to_units=''):
+    """
+    Convert quantities of ingredients from ``units`` to ``to_units``.
+
+    Both are one unit code or one per quantity, blank for the ingredient's
+    own unit. Returns a float array; raises IncompatibleUnits if any
+    quantity cannot be converted.
+    """
+    ingredient_ids = np.asarray(ingredient_ids, dtype=np.int64)
+    source, target = factors(ingredient_ids, units), factors(ingredient_ids, to_units)
+    missing = set()
+    for values, codes in ((source, units), (target, to_units)):
+        unconverted = np.isnan(values)
+        if unconverted.any():
+            codes = np.broadcast_to(np.asarray(codes, dtype=str), len(ingredient_ids))
+            missing.update(zip(ingredient_ids[unconverted].tolist(), codes[unconverted].tolist()))
+    if missing:
+        raise IncompatibleUnits(sorted(missing))
+    ratio = source / target
+    return np.asarray(quantities, dtype=float) * ratio
+
+
+def quantity_in(unit, field='current_stock', ingredient=''):
+    """
+    Expression converting ``field``, a quantity in the ingredient's own unit, to ``unit``.
+
+    ``ingredient`` is the lookup prefix from the queried model to the
+    ingredient: '' on Ingredient, 'ingredient__' on models that point at
+    one. Evaluated in floating point like the matrix, since SQLite divides
+    whole-number decimals as integers. Null for ingredients with no
+    conversion to ``unit``, so Sum skips them.
+    """
+    same = [other for other in UNITS if dimension(other) == dimension(unit)]
+    # One of the conversion's unit holds factor base units, and _ratio(unit, its unit) of ``unit``
+    per_base = UnitConversion.objects.filter(
+        ingredient=OuterRef(f'{ingredient}pk'), unit__in=same
+    ).annotate(
+        per_base=ExpressionWrapper(
+            Case(*[When(unit=other, then=Value(_ratio(unit, other))) for other in same], output_field=FloatField())
+            / Cast('factor', FloatField()),
+            output_field=FloatField(),
+        )
+    ).order_by('pk').values('per_base')[:1]
+    quantity = Cast(field, FloatField())
+    return Case(
+        *[
+            When(**{f'{ingredient}unit_of_measure': other}, then=quantity * Value(_ratio(unit, other)))
+            for other in same
+        ],
+        default=quantity * Subquery(per_base, output_field=FloatField()),
+        output_field=FloatField(),
+    )
+
+
+def stock_totals(unit, queryset=None):
+    """
+    Stock of the ingredients in ``queryset`` expressed in ``unit``, overall and per category.
+
+    Ingredients with no conversion to ``unit`` are left out and counted.
+    """
+    ingredients = (Ingredient.objects.all() if queryset is None else queryset).annotate(
+        converted=quantity_in(unit)
+    )
+    totals = ingredients.aggregate(
+        total=Coalesce(Sum('converted'), 0.0),
+        ingredients=Count('pk', filter=Q(converted__isnull=False)),
+        unconverted=Count('pk', filter=Q(converted__isnull=True)),
+    )
+    by_category = ingredients.filter(converted__isnull=False).order_by().values('category').annotate(
+        total=Sum('converted'), ingredients=Count('pk')
+    ).order_by('category')
+    return {
+        'unit': unit,
+        'total': round(totals['total'], 3),
+        'ingredients': totals['ingredients'],
+        'unconverted': totals['unconverted'],
+        'by_category': [
+            {'category': row['category'], 'total': round(row['total'], 3), 'ingredients': row['ingredients']}
+            for row in by_category
+        ],
+    }
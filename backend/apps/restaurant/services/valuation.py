@@ -0,0 +1,238 @@
+"""
+Inventory valuation under FIFO and weighted-average costing.
+
+Each ingredient keeps a running valuation row and a queue of FIFO cost
+layers, both moved as every stock movement is written. Receipts open a
+layer at their purchase price and re-weight the average cost; outflows take
+cost from the oldest layers and at the average cost. The signed value change
+under both methods is stored on the movement, so cost of goods for a period
+is a sum over movements, the value on hand is a sum over the valuation rows,
+and the value at an earlier moment is the value on hand less the movements
+since.
+
+Stock taken below zero is expensed at the average cost. The movement that
+brings it back posts the difference from its own cost as a cost_correction
+movement, which counts towards cost of goods, so the layers always add up
+to the FIFO value once stock is positive again.
+"""
+from collections import defaultdict, deque
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import CostLayer, Ingredient, InventoryValuation, StockMovement
+
+CENT = Decimal('0.01')
+UNIT = Decimal('0.0001')
+ZERO = Decimal('0')
+EXPENSE_KINDS = ('usage', 'waste', 'cost_correction')
+
+
+def _money(value):
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _take_fifo(queue, quantity):
+    """Consume ``quantity`` from the oldest layers; returns (cost taken, quantity not covered)."""
+    cost = ZERO
+    while quantity > 0 and queue:
+        layer = queue[0]
+        taken = min(layer.quantity_remaining, quantity)
+        cost += taken * layer.unit_cost
+        layer.quantity_remaining -= taken
+        quantity -= taken
+        if not layer.quantity_remaining:
+            queue.popleft()
+    return cost, quantity
+
+
+def apply(rows):
+    """
+    Cost unsaved stock movements and move the running valuation.
+
+    Fills unit_cost, fifo_value and average_value on each of ``rows`` in
+    order. Receipts without a unit_cost, and other stock gained, are valued
+    at the average cost, or at the ingredient's cost_per_unit when there is
+    no stock to average. Must run in the transaction that saves the rows.
+
+    Returns the rows to save: ``rows`` with a cost_correction movement after
+    each one that covered stock expensed below zero at a different cost.
+    """
+    ingredient_ids = {row.ingredient_id for row in rows}
+    if not ingredient_ids:
+        return []
+    InventoryValuation.objects.bulk_create(
+        [InventoryValuation(ingredient_id=pk) for pk in ingredient_ids], ignore_conflicts=True
+    )
+    states = {
+        state.ingredient_id: state
+        for state in InventoryValuation.objects.select_for_update().filter(ingredient_id__in=ingredient_ids)
+    }
+    list_costs = dict(Ingredient.objects.filter(pk__in=ingredient_ids).values_list('pk', 'cost_per_unit'))
+    queues = defaultdict(deque)
+    for layer in CostLayer.objects.select_for_update().filter(
+        ingredient_id__in=ingredient_ids, quantity_remaining__gt=0
+    ).order_by('ingredient_id', 'received_at', 'pk'):
+        queues[layer.ingredient_id].append(layer)
+    touched = {id(layer): layer for queue in queues.values() for layer in queue}
+
+    now = timezone.now()
+    costed = []
+    for row in rows:
+        costed.append(row)
+        state = states[row.ingredient_id]
+        queue = queues[row.ingredient_id]
+        quantity = row.quantity
+        average_cost = state.average_unit_cost if state.quantity > 0 else list_costs[row.ingredient_id]
+
+        if quantity > 0:
+            unit_cost = row.unit_cost if row.unit_cost is not None else average_cost
+            deficit = max(-state.quantity, ZERO)
+            covered = min(quantity, deficit)
+            rest = quantity - covered
+            fifo_delta = average_delta = _money(quantity * unit_cost)
+            if covered:
+                # The covered shortfall was expensed at an estimate; expense the difference from this cost
+                share = covered / deficit
+                fifo_fix = _money(-state.fifo_value * share + rest * unit_cost) - fifo_delta
+                average_fix = _money(-state.average_value * share + rest * unit_cost) - average_delta
+                if fifo_fix or average_fix:
+                    costed.append(StockMovement(
+                        ingredient_id=row.ingredient_id,
+                        kind='cost_correction',
+                        quantity=ZERO,
+                        reason='Cost of stock used below zero',
+                        reference=row.reference,
+                        unit_cost=unit_cost,
+                        fifo_value=fifo_fix,
+                        average_value=average_fix,
+                        staff_id=row.staff_id,
+                    ))
+                    state.fifo_value += fifo_fix
+                    state.average_value += average_fix
+            if rest:
+                layer = CostLayer(
+                    ingredient_id=row.ingredient_id,
+                    received_at=now,
+                    unit_cost=unit_cost,
+                    quantity_remaining=rest,
+                )
+                queue.append(layer)
+                touched[id(layer)] = layer
+            if state.quantity > 0:
+                state.average_unit_cost = (
+                    (state.average_value + average_delta) / (state.quantity + quantity)
+                ).quantize(UNIT)
+            elif rest:
+                state.average_unit_cost = unit_cost
+        elif quantity < 0:
+            unit_cost = average_cost
+            cost, shortfall = _take_fifo(queue, -quantity)
+            fifo_delta = -_money(cost + shortfall * average_cost)
+            average_delta = -_money(-quantity * average_cost)
+            if state.quantity + quantity == 0:
+                # Emptying stock leaves no value behind, whatever the rounding
+                fifo_delta = -state.fifo_value
+                average_delta = -state.average_value
+        else:
+            unit_cost, fifo_delta, average_delta = average_cost, ZERO, ZERO
+
+        row.unit_cost = unit_cost
+        row.fifo_value = fifo_delta
+        row.average_value = average_delta
+        state.quantity += quantity
+        state.fifo_value += fifo_delta
+        state.average_value += average_delta
+        state.updated_at = now
+
+    # An upsert on rows known to exist: one statement, where bulk_update builds a CASE per row and field
+    InventoryValuation.objects.bulk_create(
+        states.values(),
+        update_conflicts=True,
+        unique_fields=['ingredient'],
+        update_fields=['quantity', 'average_unit_cost', 'average_value', 'fifo_value', 'updated_at'],
+    )
+    layers = list(touched.values())
+    CostLayer.objects.bulk_update([layer for layer in layers if layer.pk], ['quantity_remaining'])
+    CostLayer.objects.bulk_create([layer for layer in layers if not layer.pk])
+    return costed
+
+
+def unsettled():
+    """(ingredient id, name, stock, valued quantity) for ingredients whose valuation lags their stock."""
+    valued = dict(InventoryValuation.objects.values_list('ingredient_id', 'quantity'))
+    return [
+        (pk, name, current_stock, valued.get(pk, ZERO))
+        for pk, name, current_stock in Ingredient.objects.values_list('pk', 'name', 'current_stock')
+        if valued.get(pk, ZERO) != current_stock
+    ]
+
+
+@transaction.atomic
+def resync(ingredient_ids):
+    """
+    Value stock that changed outside the ledger, as an adjustment at average cost.
+
+    No movement records the change, so values at earlier moments keep the
+    difference.
+    """
+    ingredient_ids = list(ingredient_ids)
+    valued = dict(InventoryValuation.objects.filter(ingredient_id__in=ingredient_ids).values_list(
+        'ingredient_id', 'quantity'
+    ))
+    apply([
+        StockMovement(ingredient_id=pk, kind='adjustment', quantity=current_stock - valued.get(pk, ZERO))
+        for pk, current_stock in Ingredient.objects.filter(pk__in=ingredient_ids).values_list('pk', 'current_stock')
+        if current_stock != valued.get(pk, ZERO)
+    ])
+
+
+def _totals(queryset):
+    return queryset.aggregate(
+        fifo=Coalesce(Sum('fifo_value'), ZERO),
+        average=Coalesce(Sum('average_value'), ZERO),
+    )
+
+
+def on_hand():
+    """Value of the whole inventory under both methods, overall and per ingredient category."""
+    valuations = InventoryValuation.objects.all()
+    by_category = valuations.values('ingredient__category').annotate(
+        fifo=Coalesce(Sum('fifo_value'), ZERO),
+        average=Coalesce(Sum('average_value'), ZERO),
+    ).order_by('ingredient__category')
+    return {
+        **_totals(valuations),
+        'by_category': [
+            {'category': row['ingredient__category'], 'fifo': row['fifo'], 'average': row['average']}
+            for row in by_category
+        ],
+    }
+
+
+@transaction.atomic
+def value_at(when):
+    """Value of the whole inventory at ``when``: the value on hand less the movements since."""
+    current = _totals(InventoryValuation.objects.all())
+    since = _totals(StockMovement.objects.filter(created_at__gt=when))
+    return {method: current[method] - since[method] for method in ('fifo', 'average')}
+
+
+def cost_of_goods(start, end):
+    """Cost of stock used and wasted between ``start`` and ``end`` under both methods."""
+    rows = StockMovement.objects.filter(
+        created_at__gte=start, created_at__lt=end, kind__in=EXPENSE_KINDS
+    ).values('kind').annotate(
+        fifo=Coalesce(Sum('fifo_value'), ZERO),
+        average=Coalesce(Sum('average_value'), ZERO),
+    )
+    result = {kind: {'fifo': ZERO, 'average': ZERO} for kind in EXPENSE_KINDS}
+    for row in rows:
+        result[row['kind']] = {'fifo': -row['fifo'], 'average': -row['average']}
+    result['total'] = {
+        method: sum((result[kind][method] for kind in EXPENSE_KINDS), ZERO) for method in ('fifo', 'average')
+    }
+    return result
@@ -0,0 +1,22 @@
+"""
+Custom signals for restaurant domain events.
+
+Receivers are connected in ``receivers.py`` when the app is ready.
+"""
+from django.dispatch import Signal
+
+# Sent after a Table is saved with a different status.
+# Arguments: table, previous_status, previous_changed_at, staff
+table_status_changed = Signal()
+
+# Sent when a supplier's order cutoff for an upcoming delivery is approaching.
+# Arguments: supplier, delivery_date, cutoff
+supplier_order_cutoff_approaching = Signal()
+
+# Sent after stock movements are applied, inside the same transaction.
+# Arguments: ingredient_ids, movements
+stock_changed = Signal()
+
+# Sent periodically with inventory alert levels that changed since the last digest.
+# Arguments: changes, active
+stock_alert_digest = Signal()
@@ -0,0 +1,96 @@
+"""
+Celery tasks for the restaurant app.
+"""
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from .services import (
+    deliveries, forecasting, leaderboard, lots, occupancy, presence, purchasing, scorecards, stock_alerts,
+    stock_levels, timers
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def compact_table_status_events():
+    """Drop raw table status events that are past the retention window."""
+    deleted = occupancy.compact_status_events()
+    logger.info("Compacted %s table status events", deleted)
+    return deleted
+
+
+@shared_task
+def fire_table_timers():
+    """Apply scheduled table transitions that are due."""
+    return timers.fire_due_transitions()
+
+
+@shared_task
+def sweep_staff_presence():
+    """Emit departures for staff whose terminal heartbeats have expired."""
+    return presence.sweep()
+
+
+@shared_task
+def snapshot_leaderboards():
+    """Persist yesterday's finished leaderboards."""
+    saved = leaderboard.snapshot(timezone.localdate() - timedelta(days=1))
+    logger.info("Saved %s leaderboard snapshot rows", saved)
+    return saved
+
+
+@shared_task
+def send_supplier_cutoff_reminders():
+    """Announce supplier order cutoffs that are coming up."""
+    return deliveries.send_cutoff_reminders()
+
+
+@shared_task
+def refresh_supplier_ratings():
+    """Re-derive supplier quality ratings as old scorecard weeks age out."""
+    return scorecards.refresh_quality_ratings()
+
+
+@shared_task
+def generate_purchase_orders():
+    """Refresh draft purchase orders for suppliers whose order cutoff is coming up."""
+    supplier_ids = sorted({
+        supplier.pk
+        for supplier, _, _ in deliveries.upcoming_cutoffs(hours=settings.PURCHASING_LOOKAHEAD_HOURS)
+    })
+    if not supplier_ids:
+        return 0
+    orders = purchasing.generate_drafts(supplier_ids)
+    logger.info("Generated %s draft purchase orders for %s suppliers", len(orders), len(supplier_ids))
+    return len(orders)
+
+
+@shared_task
+def rebuild_stock_level_sets():
+    """Reload the low and out-of-stock sets, repairing any sync applied out of order."""
+    return stock_levels.rebuild()
+
+
+@shared_task
+def send_stock_alert_digest():
+    """Summarize inventory alerts raised since the last digest for offline notification."""
+    return stock_alerts.send_digest()
+
+
+@shared_task
+def sweep_expired_lots():
+    """Write off stock lots that are past their expiry date."""
+    written_off, _ = lots.sweep(settings.LOT_SWEEP_BATCH_SIZE)
+    logger.info("Wrote off %s expired stock lots", written_off)
+    return written_off
+
+
+@shared_task
+def suggest_par_levels():
+    """Forecast ingredient demand and refresh the pending par level suggestions."""
+    return len(forecasting.suggest_par_levels())
@@ -0,0 +1,3 @@
+"""
+Tests for the restaurant app, one module per service.
+"""
@@ -0,0 +1,82 @@
+"""
+Shared fixtures for the restaurant tests.
+
+Most tests only exercise the database: Redis-backed side effects run in
+on_commit hooks, which TestCase never fires. Tests of logic that lives in
+Redis extend RedisTestCase, which points the cache at a scratch database
+and skips when Redis is not reachable.
+"""
+from decimal import Decimal
+
+from decouple import config
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from rest_framework.test import APIClient
+
+from apps.authentication.models import UserProfile
+
+from ..models import Ingredient, Staff, Supplier, Table
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+# Flushed around every Redis test, so never the database the app uses
+REDIS_TEST_CACHE = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': config('REDIS_TEST_URL', default='redis://localhost:6379/15'),
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        }
+    }
+}
+
+
+def make_supplier(name='Green Farm', **kwargs):
+    return Supplier.objects.create(name=name, phone_number='+254700000001', **kwargs)
+
+
+def make_table(number='T1', capacity=4, section='Main', **kwargs):
+    return Table.objects.create(table_number=number, capacity=capacity, section=section, **kwargs)
+
+
+def make_staff(name='Amina', role='server', **kwargs):
+    kwargs.setdefault('hourly_rate', Decimal('200.00'))
+    return Staff.objects.create(
+        name=name, role=role, employee_number=f'EMP{Staff.objects.count() + 1:03d}',
+        phone_number=f'+2547110000{Staff.objects.count():02d}', hire_date=timezone.localdate(), **kwargs
+    )
+
+
+def make_ingredient(supplier, name='Tomatoes', current_stock='0', **kwargs):
+    kwargs.setdefault('category', 'vegetables')
+    kwargs.setdefault('unit_of_measure', 'kg')
+    kwargs.setdefault('minimum_stock', Decimal('5'))
+    kwargs.setdefault('cost_per_unit', Decimal('2.00'))
+    return Ingredient.objects.create(
+        name=name, current_stock=Decimal(current_stock), supplier=supplier, **kwargs
+    )
+
+
+def api_client(role, staff=None):
+    """An API client authenticated as a user acting in ``role``."""
+    user = User.objects.create_user(username=f'{role}-{User.objects.count()}')
+    UserProfile.objects.create(user=user, current_role=role, staff_profile=staff)
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@override_settings(CACHES=REDIS_TEST_CACHE)
+class RedisTestCase(TestCase):
+    """A test case with a scratch Redis database, skipped when Redis is not reachable."""
+
+    def setUp(self):
+        super().setUp()
+        self.redis = get_redis_connection('default')
+        try:
+            self.redis.flushdb()
+        except RedisError:
+            self.skipTest('Redis is not available')
+        self.addCleanup(self.redis.flushdb)
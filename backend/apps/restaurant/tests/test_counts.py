@@ -0,0 +1,66 @@
+"""Tests for physical stock counts."""
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework import status
+
+from ..models import Ingredient, StockCountSession, StockMovement
+from ..services import counts, stock
+from .helpers import api_client, make_ingredient, make_supplier
+class StockCountTests(TestCase):
+    """Counts are compared with the stock at the moment they were taken."""
+
+    def setUp(self):
+        self.ingredient = make_ingredient(make_supplier(), current_stock='10')
+        self.session = StockCountSession.objects.create(name='Monday close')
+
+    def test_movements_after_the_count_are_not_variance(self):
+        counts.submit(self.session.pk, [{'ingredient': self.ingredient.pk, 'quantity': Decimal('8')}])
+        stock.apply_movements([{'ingredient': self.ingredient, 'kind': 'usage', 'quantity': 3}])
+
+        counts.close(self.session.pk)
+
+        line = self.session.lines.get()
+        self.assertEqual(line.expected_quantity, Decimal('10'))
+        self.assertEqual(line.variance, Decimal('-2'))
+        self.ingredient.refresh_from_db()
+        self.assertEqual(self.ingredient.current_stock, Decimal('5'))
+
+    def test_usage_after_a_short_count_can_take_stock_negative(self):
+        counts.submit(self.session.pk, [{'ingredient': self.ingredient.pk, 'quantity': Decimal('2')}])
+        stock.apply_movements([{'ingredient': self.ingredient, 'kind': 'usage', 'quantity': 5}])
+
+        response = api_client('head_chef').post(f'/api/v1/inventory/stock-counts/{self.session.pk}/close/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.session.lines.get().variance, Decimal('-8'))
+        self.ingredient.refresh_from_db()
+        self.assertEqual(self.ingredient.current_stock, Decimal('-3'))
+
+    def test_cost_correction_is_part_of_the_variance_value(self):
+        short = make_ingredient(make_supplier('Blue Dairy'), 'Milk', cost_per_unit=Decimal('2.00'))
+        # Used below zero at 2.00, then counted back up once the list cost is 3.00
+        stock.apply_movements([{'ingredient': short, 'kind': 'usage', 'quantity': 2}], allow_negative=True)
+        Ingredient.objects.filter(pk=short.pk).update(cost_per_unit=Decimal('3.00'))
+        counts.submit(self.session.pk, [{'ingredient': short.pk, 'quantity': Decimal('5')}])
+
+        counts.close(self.session.pk)
+
+        movements = StockMovement.objects.filter(reference=f'count:{self.session.pk}')
+        self.assertEqual(sorted(movements.values_list('kind', flat=True)), ['adjustment', 'cost_correction'])
+        line = self.session.lines.get()
+        self.assertEqual((line.expected_quantity, line.variance), (Decimal('-2'), Decimal('7')))
+        # 7 at 3.00, less a 2.00 correction for the two units already expensed at 2.00
+        self.assertEqual(line.variance_value, Decimal('19.00'))
+
+    def test_open_count_is_cancelled(self):
+        response = api_client('head_chef').post(f'/api/v1/inventory/stock-counts/{self.session.pk}/cancel/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'cancelled')
+
+    def test_closed_count_cannot_be_cancelled(self):
+        counts.close(self.session.pk)
+        response = api_client('head_chef').post(f'/api/v1/inventory/stock-counts/{self.session.pk}/cancel/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.status, 'closed')
@@ -0,0 +1,77 @@
+"""Tests for supplier delivery days and order cutoffs."""
+from datetime import date, datetime, time
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework import status
+
+from ..services import deliveries
+from ..validators import parse_delivery_schedule
+from .helpers import api_client, make_supplier
+
+
+class DeliveryScheduleParsingTests(SimpleTestCase):
+    """Free-text schedules become a Monday-first weekday bitmask and a time."""
+
+    def test_days_ranges_and_keywords(self):
+        self.assertEqual(parse_delivery_schedule('Mon, Wed & Fri'), (0b0010101, None))
+        self.assertEqual(parse_delivery_schedule('Mon-Fri')[0], 0b0011111)
+        self.assertEqual(parse_delivery_schedule('weekdays')[0], 0b0011111)
+        self.assertEqual(parse_delivery_schedule('Weekends')[0], 0b1100000)
+        self.assertEqual(parse_delivery_schedule('Daily')[0], 0b1111111)
+        # Ranges wrap around the end of the week
+        self.assertEqual(parse_delivery_schedule('Sat to Mon')[0], 0b1100001)
+
+    def test_times(self):
+        self.assertEqual(parse_delivery_schedule('Tuesdays before 10am'), (0b0000010, time(10)))
+        self.assertEqual(parse_delivery_schedule('Thu by 09:30')[1], time(9, 30))
+        self.assertEqual(parse_delivery_schedule('Sun 12pm')[1], time(12))
+        self.assertEqual(parse_delivery_schedule('Sun 12am')[1], time(0))
+
+    def test_text_without_days_or_times_gives_nothing(self):
+        self.assertEqual(parse_delivery_schedule(''), (0, None))
+        self.assertEqual(parse_delivery_schedule('Bi-weekly'), (0, None))
+        # Bare numbers are not times, and out-of-range times are skipped
+        self.assertEqual(parse_delivery_schedule('Fri, 2 crates'), (0b0010000, None))
+        self.assertEqual(parse_delivery_schedule('Fri 25:00'), (0b0010000, None))
+
+
+class SupplierDeliveryTests(TestCase):
+    """Suppliers are found by delivery day and reminded before their order cutoff."""
+
+    def setUp(self):
+        # 2026-03-03 is a Tuesday
+        self.tuesday = date(2026, 3, 3)
+        self.wednesday = make_supplier(
+            'Green Farm', delivery_schedule='Wednesdays by 9am',
+            order_cutoff_time=time(14), order_lead_days=1
+        )
+        self.thursday = make_supplier(
+            'Blue Dairy', delivery_schedule='Thursdays by 7am',
+            order_cutoff_time=time(14), order_lead_days=1
+        )
+
+    def at(self, day, hour):
+        return timezone.make_aware(datetime.combine(day, time(hour)))
+
+    def test_schedule_text_sets_delivery_days(self):
+        self.assertEqual(self.wednesday.delivery_weekdays, [2])
+        self.assertEqual(self.wednesday.delivery_time, time(9))
+
+    def test_suppliers_delivering(self):
+        wednesday = date(2026, 3, 4)
+        self.assertEqual(list(deliveries.suppliers_delivering(wednesday)), [self.wednesday])
+        self.assertEqual(list(deliveries.suppliers_delivering(wednesday, before=time(8))), [])
+
+    def test_upcoming_cutoff_is_the_day_before_delivery(self):
+        upcoming = deliveries.upcoming_cutoffs(self.at(self.tuesday, 13), hours=2)
+
+        self.assertEqual(upcoming, [(self.wednesday, date(2026, 3, 4), self.at(self.tuesday, 14))])
+        self.assertEqual(deliveries.upcoming_cutoffs(self.at(self.tuesday, 15), hours=2), [])
+
+    def test_api_rejects_weekdays_out_of_range(self):
+        response = api_client('general_manager').patch(
+            f'/api/v1/suppliers/{self.wednesday.pk}/', {'delivery_weekdays': [1, 7]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('delivery_weekdays', response.data)
@@ -0,0 +1,42 @@
+"""Tests for recipe-based stock depletion from POS sales."""
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from ..models import Recipe, RecipeLine
+from ..services import depletion
+from .helpers import LOCAL_CACHE, make_ingredient, make_supplier
+@override_settings(CACHES=LOCAL_CACHE)
+class DepletionTests(TestCase):
+    """POS batches deplete stock through the recipe matrix."""
+
+    def setUp(self):
+        depletion.invalidate()
+        supplier = make_supplier()
+        self.beef = make_ingredient(supplier, 'Beef', current_stock='3')
+        self.buns = make_ingredient(supplier, 'Buns', current_stock='10', unit_of_measure='pieces')
+        burger = Recipe.objects.create(name='Burger', pos_code='B1', yield_quantity=Decimal('2'))
+        RecipeLine.objects.create(recipe=burger, ingredient=self.beef, quantity=Decimal('500'), unit='grams')
+        RecipeLine.objects.create(recipe=burger, ingredient=self.buns, quantity=Decimal('2'))
+
+    def stock(self, ingredient):
+        ingredient.refresh_from_db()
+        return ingredient.current_stock
+
+    def test_sales_deplete_each_ingredient_once(self):
+        movements, unknown = depletion.deplete([('B1', 2), ('B1', 1), ('X9', 4)], reference='batch-1')
+
+        self.assertEqual(unknown, ['X9'])
+        self.assertEqual(len(movements), 2)
+        self.assertEqual(self.stock(self.beef), Decimal('2.250'))
+        self.assertEqual(self.stock(self.buns), Decimal('7.000'))
+
+    def test_refunds_net_against_sales(self):
+        depletion.deplete([('B1', 4), ('B1', -1)])
+        self.assertEqual(self.stock(self.beef), Decimal('2.250'))
+
+    def test_net_refund_returns_stock(self):
+        movements, _ = depletion.deplete([('B1', -2)])
+        self.assertEqual(self.stock(self.beef), Decimal('3.500'))
+        self.assertEqual(self.stock(self.buns), Decimal('12.000'))
+        self.assertEqual({movement.kind for movement in movements}, {'adjustment'})
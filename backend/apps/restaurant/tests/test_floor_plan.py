@@ -0,0 +1,51 @@
+"""Tests for the versioned floor-plan snapshot."""
+from ..services import floor_plan
+from .helpers import RedisTestCase, make_table
+
+
+class FloorPlanSnapshotTests(RedisTestCase):
+    """Clients holding a version fetch only the tables written after it."""
+
+    def save(self, table):
+        with self.captureOnCommitCallbacks(execute=True):
+            table.save()
+
+    def test_empty_floor_keeps_its_version(self):
+        first = floor_plan.get_snapshot()
+        second = floor_plan.get_snapshot()
+
+        self.assertEqual(first['version'], second['version'])
+        self.assertEqual(first['tables'], [])
+        diff = floor_plan.get_snapshot(since=first['version'])
+        self.assertEqual((diff['full'], diff['tables'], diff['removed']), (False, [], []))
+
+    def test_since_returns_only_changed_tables(self):
+        window = make_table('T1')
+        booth = make_table('T2', section='Patio')
+        version = floor_plan.get_snapshot()['version']
+
+        booth.status = 'occupied'
+        self.save(booth)
+
+        diff = floor_plan.get_snapshot(since=version)
+        self.assertFalse(diff['full'])
+        self.assertEqual([row[0] for row in diff['tables']], [booth.pk])
+        self.assertEqual(diff['tables'][0][4], floor_plan.STATUSES.index('occupied'))
+        self.assertEqual(floor_plan.get_snapshot(since=diff['version'])['tables'], [])
+
+        table_id = window.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            window.delete()
+        diff = floor_plan.get_snapshot(since=diff['version'])
+        self.assertEqual((diff['tables'], diff['removed']), ([], [table_id]))
+
+    def test_evicted_tables_are_rebuilt(self):
+        make_table('T1')
+        version = floor_plan.get_snapshot()['version']
+        self.redis.delete(floor_plan.TABLES_KEY)
+        # A write to the evicted hash waits for the rebuild rather than leaving it partial
+        self.save(make_table('T2'))
+
+        snapshot = floor_plan.get_snapshot()
+        self.assertGreater(snapshot['version'], version)
+        self.assertEqual([row[1] for row in snapshot['tables']], ['T1', 'T2'])
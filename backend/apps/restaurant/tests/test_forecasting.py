@@ -0,0 +1,87 @@
+"""Tests for demand forecasting and par level suggestions."""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from ..models import StockMovement
+from ..services import forecasting
+from .helpers import make_ingredient, make_supplier
+
+DAYS = (forecasting.FIT_WEEKS + forecasting.MOVING_AVERAGE_WEEKS) * forecasting.SEASON
+WEEKLY = np.array([2, 3, 3, 4, 8, 10, 5], dtype=float)
+
+
+class FitTests(SimpleTestCase):
+    """Both seasonal models are fitted to every row at once and the better one is kept."""
+
+    def fit(self, usage, lead=2, review=3, z=1.645, **kw):
+        rows = len(usage)
+        return forecasting.fit_all(usage, 0, np.full(rows, lead), np.full(rows, review), z, **kw)
+
+    def test_output_has_one_value_per_row(self):
+        usage = np.random.default_rng(0).poisson(5, (4, DAYS)).astype(float)
+
+        result = self.fit(usage)
+
+        self.assertEqual(
+            set(result), {'method', 'daily_demand', 'safety_stock', 'reorder_point', 'par_level', 'error'}
+        )
+        for values in result.values():
+            self.assertEqual(values.shape, (4,))
+            self.assertTrue(np.isfinite(values).all())
+        self.assertTrue((result['reorder_point'] >= result['safety_stock']).all())
+        self.assertTrue((result['par_level'] >= result['reorder_point']).all())
+
+    def test_steady_demand_needs_no_safety_stock(self):
+        result = self.fit(np.full((1, DAYS), 5.0))
+
+        self.assertAlmostEqual(result['daily_demand'][0], 5)
+        self.assertAlmostEqual(result['safety_stock'][0], 0)
+        # Two days of lead time, then three more until the next delivery
+        self.assertAlmostEqual(result['reorder_point'][0], 10)
+        self.assertAlmostEqual(result['par_level'][0], 25)
+
+    def test_weekly_pattern_is_forecast_by_weekday(self):
+        usage = np.tile(WEEKLY, DAYS // 7)[None, :]
+
+        result = self.fit(usage, lead=1, review=1)
+
+        # The history starts on a Monday, so tomorrow is a Monday again
+        self.assertAlmostEqual(result['reorder_point'][0], WEEKLY[0])
+        self.assertAlmostEqual(result['par_level'][0], WEEKLY[:2].sum())
+        self.assertAlmostEqual(result['error'][0], 0)
+
+    def test_chunked_fit_matches_a_single_fit(self):
+        usage = np.random.default_rng(1).poisson(3, (5, DAYS)).astype(float)
+
+        whole, chunked = self.fit(usage), self.fit(usage, chunk_size=2)
+
+        for key in whole:
+            np.testing.assert_allclose(chunked[key], whole[key])
+
+
+class ParLevelSuggestionTests(TestCase):
+    """Suggestions are made from recorded usage for ingredients that were used."""
+
+    def test_suggestions_follow_usage(self):
+        supplier = make_supplier(order_lead_days=1, delivery_schedule='Daily')
+        used = make_ingredient(supplier, 'Rice')
+        unused = make_ingredient(supplier, 'Saffron')
+        today = timezone.localdate()
+        for offset in range(DAYS):
+            movement = StockMovement.objects.create(ingredient=used, kind='usage', quantity=Decimal('-4'))
+            day = today - timedelta(days=DAYS - offset)
+            StockMovement.objects.filter(pk=movement.pk).update(
+                created_at=timezone.make_aware(datetime.combine(day, time(12)))
+            )
+
+        suggestion, = forecasting.suggest_par_levels([used.pk, unused.pk], today=today)
+
+        self.assertEqual(suggestion.ingredient, used)
+        self.assertEqual(suggestion.daily_demand, Decimal('4.000'))
+        self.assertEqual((suggestion.lead_time_days, suggestion.review_days), (1, 1))
+        self.assertEqual(suggestion.reorder_point, Decimal('4.000'))
+        self.assertEqual(suggestion.maximum_stock, Decimal('8.000'))
@@ -0,0 +1,76 @@
+"""Tests for the live server leaderboards."""
+from datetime import date, datetime, time
+
+from django.test import override_settings
+from django.utils import timezone
+
+from ..models import LeaderboardSnapshot, SectionAssignment
+from ..services import leaderboard
+from .helpers import RedisTestCase, make_staff, make_table
+
+
+@override_settings(LEADERBOARD_SHIFT_START_HOURS=[6, 16])
+class LeaderboardTests(RedisTestCase):
+    """Seating credits covers, releasing credits a turn, and finished days are snapshotted."""
+
+    def setUp(self):
+        super().setUp()
+        self.amina = make_staff('Amina')
+        self.baraka = make_staff('Baraka')
+        self.table = make_table(capacity=4)
+
+    def change(self, status, staff=None):
+        previous = self.table.status
+        self.table.status = status
+        self.table.save()
+        leaderboard.record_table_change(self.table, previous, staff)
+
+    def test_seating_credits_covers_and_release_credits_the_turn(self):
+        self.change('occupied', self.amina)
+        self.change('cleaning', self.baraka)
+
+        self.assertEqual(leaderboard.rank_of(self.amina.pk, 'covers', 'day'), (1, 4.0))
+        self.assertEqual(leaderboard.rank_of(self.amina.pk, 'turns', 'week'), (1, 1.0))
+        self.assertEqual(leaderboard.rank_of(self.baraka.pk, 'turns', 'shift'), (None, 0))
+
+    def test_section_server_is_credited_when_a_host_seats(self):
+        SectionAssignment.objects.create(staff=self.baraka, section=self.table.section)
+
+        self.change('occupied', make_staff('Chausiku', 'host'))
+
+        self.assertEqual(leaderboard.rank_of(self.baraka.pk, 'covers', 'shift'), (1, 4.0))
+
+    def test_top_ranks_by_score(self):
+        leaderboard.credit(self.amina.pk, 'sales', 120)
+        leaderboard.credit(self.baraka.pk, 'sales', 300)
+
+        board = leaderboard.top('sales', 'day')
+
+        self.assertEqual(
+            [(row['rank'], row['name'], row['score']) for row in board],
+            [(1, 'Baraka', 300.0), (2, 'Amina', 120.0)]
+        )
+
+    def test_before_the_first_shift_is_the_previous_days_last(self):
+        early = timezone.make_aware(datetime(2026, 3, 4, 2, 30))
+        self.assertEqual(
+            leaderboard.period_start('shift', early),
+            timezone.make_aware(datetime(2026, 3, 3, 16))
+        )
+
+    def test_snapshot_persists_ranks_and_is_idempotent(self):
+        # 2026-03-08 is a Sunday, so the week board is snapshotted too
+        day = date(2026, 3, 8)
+        evening = timezone.make_aware(datetime.combine(day, time(19)))
+        leaderboard.credit(self.amina.pk, 'covers', 6, evening)
+        leaderboard.credit(self.baraka.pk, 'covers', 10, evening)
+
+        leaderboard.snapshot(day)
+        self.assertEqual(leaderboard.snapshot(day), 6)
+
+        rows = LeaderboardSnapshot.objects.filter(metric='covers', period='day')
+        self.assertEqual(
+            sorted(rows.values_list('rank', 'staff__name')), [(1, 'Baraka'), (2, 'Amina')]
+        )
+        self.assertEqual(LeaderboardSnapshot.objects.count(), 6)
+        self.assertTrue(LeaderboardSnapshot.objects.filter(period='week', period_start__date=date(2026, 3, 2)).exists())
@@ -0,0 +1,82 @@
+"""Tests for lot-level inventory."""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import StockMovement
+from ..services import lots, stock
+from .helpers import make_ingredient, make_supplier
+
+
+class LotTests(TestCase):
+    """Stock leaves the lots expiring first, and expired lots are written off as waste."""
+
+    def setUp(self):
+        self.ingredient = make_ingredient(make_supplier())
+        self.today = timezone.localdate()
+
+    def receive(self, quantity, expires_in=None):
+        stock.apply_movements([{
+            'ingredient': self.ingredient,
+            'kind': 'receipt',
+            'quantity': quantity,
+            'unit_cost': '2.00',
+            'expiry_date': self.today + timedelta(days=expires_in) if expires_in is not None else None,
+        }])
+        return self.ingredient.lots.latest('pk')
+
+    def use(self, quantity):
+        stock.apply_movements([{'ingredient': self.ingredient, 'kind': 'usage', 'quantity': quantity}])
+
+    def remaining(self, *lot_list):
+        for lot in lot_list:
+            lot.refresh_from_db()
+        return [lot.quantity_remaining for lot in lot_list]
+
+    def test_usage_takes_the_earliest_expiry_first(self):
+        later = self.receive('10', expires_in=10)
+        sooner = self.receive('10', expires_in=3)
+        undated = self.receive('10')
+
+        self.use('15')
+
+        self.assertEqual(self.remaining(sooner, later, undated), [Decimal('0'), Decimal('5'), Decimal('10')])
+        self.assertEqual(lots.unsettled(), [])
+
+    def test_same_expiry_takes_the_oldest_receipt_first(self):
+        first = self.receive('4', expires_in=5)
+        second = self.receive('4', expires_in=5)
+
+        self.use('6')
+
+        self.assertEqual(self.remaining(first, second), [Decimal('0'), Decimal('2')])
+
+    def test_stock_arriving_without_a_receipt_opens_a_lot(self):
+        self.receive('5', expires_in=5)
+
+        stock.adjust_to(self.ingredient, Decimal('8'), 'Count')
+
+        lot = self.ingredient.lots.latest('pk')
+        self.assertEqual((lot.reference, lot.quantity_remaining), ('adjustment', Decimal('3')))
+        self.assertEqual(lots.unsettled(), [])
+
+    def test_expiring_lists_lots_due_soon(self):
+        soon = self.receive('2', expires_in=1)
+        self.receive('2', expires_in=10)
+
+        self.assertEqual(list(lots.expiring(48)), [soon])
+
+    def test_sweep_writes_off_expired_lots(self):
+        expired = self.receive('3', expires_in=-1)
+        fresh = self.receive('5', expires_in=4)
+
+        self.assertEqual(lots.sweep(), (1, 1))
+        self.assertEqual(lots.sweep(), (0, 0))
+
+        self.assertEqual(self.remaining(expired, fresh), [Decimal('0'), Decimal('5')])
+        self.ingredient.refresh_from_db()
+        self.assertEqual(self.ingredient.current_stock, Decimal('5'))
+        waste = StockMovement.objects.get(kind='waste')
+        self.assertEqual((waste.reference, waste.quantity), (f'lot:{expired.pk}', Decimal('-3')))
@@ -0,0 +1,52 @@
+"""Tests for the hourly table occupancy rollups."""
+from datetime import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import TableOccupancyRollup
+from ..services import occupancy
+from .helpers import make_table
+
+
+def at(hour, minute=0):
+    return timezone.make_aware(datetime(2026, 10, 16, hour, minute))
+
+
+class OccupancyRollupTests(TestCase):
+    """Dwell time is split across the hours it spans; the turn lands in the hour it ends."""
+
+    def setUp(self):
+        self.table = make_table()
+
+    def seat(self, start, end):
+        self.table.status = 'cleaning'
+        self.table.status_changed_at = end
+        occupancy.record_status_change(self.table, 'occupied', start)
+
+    def test_seating_is_split_across_hours(self):
+        self.seat(at(10, 40), at(13, 10))
+
+        rollups = {
+            rollup.hour: rollup
+            for rollup in TableOccupancyRollup.objects.filter(section='Main', hour__gte=at(10))
+        }
+        self.assertEqual(
+            {hour: rollup.occupied_seconds for hour, rollup in rollups.items()},
+            {at(10): 1200, at(11): 3600, at(12): 3600, at(13): 600},
+        )
+        self.assertEqual(sum(rollup.turns for rollup in rollups.values()), 1)
+        last = rollups[at(13)]
+        self.assertEqual((last.turns, last.turn_seconds), (1, 9000))
+        # 150 minutes falls in the 150-155 minute bucket
+        self.assertEqual(last.turn_time_histogram[30], 1)
+
+    def test_report_sums_the_rollups(self):
+        self.seat(at(10, 0), at(10, 45))
+        self.seat(at(11, 0), at(12, 30))
+
+        section, = occupancy.occupancy_report(at(10), at(14))
+        self.assertEqual(section['turns'], 2)
+        self.assertEqual(section['avg_turn_minutes'], 67.5)
+        self.assertEqual((section['p50_turn_minutes'], section['p90_turn_minutes']), (50, 95))
+        self.assertEqual([hour['occupancy_rate'] for hour in section['hours']], [0.75, 1.0, 0.5])
@@ -0,0 +1,55 @@
+"""Tests for kitchen pacing of seated covers."""
+from django.test import override_settings
+from rest_framework import status
+
+from ..services import pacing
+from .helpers import RedisTestCase, api_client, make_table
+
+
+@override_settings(KITCHEN_COVERS_PER_SLOT=6)
+class KitchenPacingTests(RedisTestCase):
+    """Seating is refused once a slot's covers would pass the kitchen capacity."""
+
+    def setUp(self):
+        super().setUp()
+        self.window = make_table('T1', capacity=4)
+        self.booth = make_table('T2', capacity=4)
+
+    def seated(self):
+        return int(self.redis.get(pacing.SLOT_KEY.format(slot=pacing.current_slot())) or 0)
+
+    def test_slot_fills_up(self):
+        self.assertTrue(pacing.book_seating(self.window).allowed)
+
+        decision = pacing.book_seating(self.booth)
+        self.assertFalse(decision.allowed)
+        self.assertEqual((decision.seated, decision.capacity), (4, 6))
+        self.assertTrue(pacing.book_seating(self.booth, force=True).allowed)
+        self.assertEqual(self.seated(), 8)
+
+    def test_walk_ins_leave_room_for_reservations(self):
+        self.booth.status = 'reserved'
+        pacing.track_reservation(self.booth, 'available')
+
+        self.assertFalse(pacing.book_seating(self.window).allowed)
+        # The reserved table itself is not counted twice
+        self.assertTrue(pacing.book_seating(self.booth).allowed)
+
+    def test_failed_seating_releases_its_covers(self):
+        with self.assertRaises(RuntimeError):
+            with pacing.seating(self.window) as decision:
+                self.assertTrue(decision.allowed)
+                raise RuntimeError('save failed')
+
+        self.assertEqual(self.seated(), 0)
+
+    def test_full_slot_answers_409(self):
+        client = api_client('host')
+        response = client.patch(f'/api/v1/tables/{self.window.pk}/status/', {'status': 'occupied'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = client.patch(f'/api/v1/tables/{self.booth.pk}/status/', {'status': 'occupied'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.booth.refresh_from_db()
+        self.assertEqual(self.booth.status, 'available')
+        self.assertEqual(self.seated(), 4)
@@ -0,0 +1,66 @@
+"""Tests for on-floor staff presence."""
+from ..services import presence
+from .helpers import RedisTestCase, make_staff
+
+
+class PresenceTests(RedisTestCase):
+    """Heartbeats announce joins and moves; sign-offs and expiry announce departures."""
+
+    def setUp(self):
+        super().setUp()
+        self.staff = make_staff()
+
+    def expire(self, staff_id):
+        """Act as if the staff member's hash timed out and their last heartbeat is long past."""
+        self.redis.delete(presence.STAFF_KEY.format(staff_id=staff_id))
+        self.redis.zadd(presence.LAST_SEEN_KEY, {staff_id: 0})
+
+    def event_names(self, since='0'):
+        events, _ = presence.changes(since)
+        return [event['event'] for event in events]
+
+    def test_heartbeats_emit_join_then_moves_only(self):
+        self.assertEqual(presence.heartbeat(self.staff, 'pos-1', 'Main'), 'joined')
+        self.assertIsNone(presence.heartbeat(self.staff, 'pos-1', 'Main'))
+        self.assertEqual(presence.heartbeat(self.staff, 'pos-2', 'Patio'), 'moved')
+
+        self.assertEqual(self.event_names(), ['joined', 'moved'])
+        entry, = presence.on_floor()
+        self.assertEqual((entry['staff'], entry['section'], entry['terminal']), (self.staff.pk, 'Patio', 'pos-2'))
+
+    def test_leave_emits_left_once(self):
+        presence.heartbeat(self.staff, 'pos-1', 'Main')
+
+        self.assertTrue(presence.leave(self.staff.pk))
+        self.assertFalse(presence.leave(self.staff.pk))
+
+        self.assertEqual(self.event_names(), ['joined', 'left'])
+        self.assertEqual(presence.on_floor(), [])
+
+    def test_changes_continue_from_the_last_id(self):
+        presence.heartbeat(self.staff, 'pos-1', 'Main')
+        _, last_id = presence.changes()
+        presence.leave(self.staff.pk)
+
+        self.assertEqual(self.event_names(last_id), ['left'])
+
+    def test_sweep_reports_expired_members(self):
+        other = make_staff('Baraka')
+        presence.heartbeat(self.staff, 'pos-1', 'Main')
+        presence.heartbeat(other, 'pos-2', 'Main')
+        self.expire(self.staff.pk)
+
+        self.assertEqual(presence.sweep(), 1)
+        self.assertEqual(presence.sweep(), 0)
+
+        self.assertEqual(self.event_names(), ['joined', 'joined', 'left'])
+        self.assertEqual([entry['staff'] for entry in presence.on_floor()], [other.pk])
+
+    def test_rejoin_after_expiry_closes_the_old_visit(self):
+        presence.heartbeat(self.staff, 'pos-1', 'Main')
+        self.expire(self.staff.pk)
+
+        self.assertEqual(presence.heartbeat(self.staff, 'pos-1', 'Main'), 'joined')
+
+        self.assertEqual(self.event_names(), ['joined', 'left', 'joined'])
+        self.assertEqual(presence.sweep(), 0)
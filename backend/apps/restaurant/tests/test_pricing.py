@@ -0,0 +1,97 @@
+"""Tests for ingredient price history, trends and charts."""
+from datetime import timedelta
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from ..models import IngredientPriceHistory
+from ..services import pricing
+from .helpers import make_ingredient, make_supplier
+
+
+class DailyPriceTests(TestCase):
+    """Each series is sampled as a step function on the daily grid."""
+
+    def setUp(self):
+        supplier = make_supplier()
+        self.tomatoes = make_ingredient(supplier, 'Tomatoes')
+        self.onions = make_ingredient(supplier, 'Onions')
+        self.garlic = make_ingredient(supplier, 'Garlic')
+        # Start from a clean history rather than the prices recorded on create
+        IngredientPriceHistory.objects.all().delete()
+        self.now = timezone.now()
+
+    def price(self, ingredient, price, days_ago):
+        IngredientPriceHistory.objects.create(
+            ingredient=ingredient, price=price, effective_at=self.now - timedelta(days=days_ago)
+        )
+
+    def test_prices_carry_forward_from_the_last_change(self):
+        self.price(self.tomatoes, '2.00', 10)
+        self.price(self.tomatoes, '3.00', 2.5)
+        self.price(self.onions, '5.00', 1.5)
+
+        prices = pricing.daily_prices([self.tomatoes.pk, self.onions.pk, self.garlic.pk], 5, now=self.now)
+
+        self.assertEqual(prices.shape, (3, 6))
+        np.testing.assert_array_equal(prices[0], [2, 2, 2, 3, 3, 3])
+        np.testing.assert_array_equal(prices[1], [np.nan] * 4 + [5, 5])
+        self.assertTrue(np.isnan(prices[2]).all())
+
+    def test_supplier_series_are_kept_apart(self):
+        supplier = make_supplier('Blue Dairy')
+        self.price(self.tomatoes, '2.00', 3)
+        IngredientPriceHistory.objects.create(
+            ingredient=self.tomatoes, supplier=supplier, price='1.50', effective_at=self.now - timedelta(days=3)
+        )
+
+        self.assertEqual(pricing.daily_prices([self.tomatoes.pk], 2, now=self.now)[0, -1], 2.0)
+        self.assertEqual(pricing.daily_prices([self.tomatoes.pk], 2, supplier.pk, now=self.now)[0, -1], 1.5)
+
+    def test_trends(self):
+        self.price(self.tomatoes, '2.00', 100)
+        self.price(self.tomatoes, '3.00', 10)
+
+        trend, = pricing.trends([self.tomatoes.pk], now=self.now)
+
+        self.assertEqual(trend['price'], 3.0)
+        self.assertEqual(trend['change_30d'], 0.5)
+        self.assertEqual(trend['change_90d'], 0.5)
+
+    def test_chart_ends_at_the_current_price(self):
+        self.price(self.tomatoes, '2.00', 100)
+        for day in range(60):
+            self.price(self.tomatoes, f'{2 + day % 7}.00', 60 - day)
+
+        points = pricing.chart(self.tomatoes, days=90, points=20, now=self.now)
+
+        self.assertEqual(len(points), 20)
+        self.assertEqual(points[0]['at'], self.now - timedelta(days=90))
+        self.assertEqual(points[-1]['at'], self.now)
+
+
+class DownsamplingTests(SimpleTestCase):
+    """LTTB keeps the ends, the requested number of points, and the extremes."""
+
+    def test_keeps_first_last_and_target_count(self):
+        x = np.arange(1000, dtype=float)
+        y = np.sin(x / 50)
+
+        kept = pricing.lttb(x, y, 100)
+
+        self.assertEqual(len(kept), 100)
+        self.assertEqual((kept[0], kept[-1]), (0, 999))
+        self.assertTrue((np.diff(kept) > 0).all())
+
+    def test_keeps_a_spike(self):
+        x = np.arange(500, dtype=float)
+        y = np.zeros(500)
+        y[321] = 10
+
+        self.assertIn(321, pricing.lttb(x, y, 20))
+
+    def test_short_series_are_returned_whole(self):
+        x = np.arange(10, dtype=float)
+        np.testing.assert_array_equal(pricing.lttb(x, x, 10), np.arange(10))
+        np.testing.assert_array_equal(pricing.lttb(x, x, 2), np.arange(10))
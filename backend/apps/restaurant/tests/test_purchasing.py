@@ -0,0 +1,84 @@
+"""Tests for purchase order generation and receipt."""
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Ingredient, PurchaseOrder, SupplierItem
+from ..services import purchasing, scorecards
+from .helpers import make_ingredient, make_supplier
+class PurchaseOrderReceiptTests(TestCase):
+    """Submitted orders count as on order until a delivery is received against them."""
+
+    def setUp(self):
+        self.supplier = make_supplier()
+        self.ingredient = make_ingredient(self.supplier, current_stock='1', maximum_stock=Decimal('20'))
+
+    def submit_order(self):
+        order, = purchasing.generate_drafts()
+        order.status = 'submitted'
+        order.save(update_fields=['status'])
+        return order
+
+    def test_submitted_order_counts_as_on_order(self):
+        order = self.submit_order()
+        self.assertEqual(order.lines.get().quantity, Decimal('19'))
+        self.assertEqual(purchasing.reorder_needs(), [])
+
+    def test_delivery_against_order_marks_it_received(self):
+        order = self.submit_order()
+        now = timezone.now()
+        scorecards.record_delivery(
+            supplier=self.supplier,
+            expected_at=now,
+            received_at=now,
+            lines=[{
+                'ingredient': self.ingredient,
+                'quantity_ordered': Decimal('19'),
+                'quantity_received': Decimal('3'),
+                'quantity_rejected': Decimal('0'),
+                'expected_unit_price': Decimal('2.00'),
+                'unit_price': Decimal('2.00'),
+            }],
+            purchase_order=order,
+        )
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'received')
+        self.assertEqual(order.received_at, now)
+        # The short delivery leaves stock at 4, below the reorder point again
+        need, = purchasing.reorder_needs()
+        self.assertEqual(need['id'], self.ingredient.pk)
+        self.assertEqual(need['need'], Decimal('16'))
+
+
+class PurchaseOrderGenerationTests(TestCase):
+    """Drafts order up to maximum stock from the cheapest catalog source."""
+
+    def setUp(self):
+        self.ingredient = make_ingredient(make_supplier(), current_stock='1', maximum_stock=Decimal('20'))
+        self.bulk = make_supplier('Bulk Foods')
+        self.market = make_supplier('City Market')
+        SupplierItem.objects.create(
+            supplier=self.bulk, ingredient=self.ingredient, pack_size=Decimal('10'), pack_price=Decimal('25.00')
+        )
+        SupplierItem.objects.create(
+            supplier=self.market, ingredient=self.ingredient, pack_size=Decimal('5'), pack_price=Decimal('10.00')
+        )
+
+    def test_cheapest_source_in_whole_packs(self):
+        order, = purchasing.generate_drafts()
+
+        self.assertEqual(order.supplier_id, self.market.pk)
+        line = order.lines.get()
+        self.assertEqual((line.packs, line.quantity), (4, Decimal('20')))
+        self.assertEqual(order.subtotal, Decimal('40.00'))
+
+    def test_regenerating_replaces_drafts(self):
+        purchasing.generate_drafts()
+        purchasing.generate_drafts()
+        self.assertEqual(PurchaseOrder.objects.filter(status='draft').count(), 1)
+
+    def test_stock_above_reorder_point_is_not_ordered(self):
+        Ingredient.objects.filter(pk=self.ingredient.pk).update(current_stock=Decimal('6'))
+        self.assertEqual(purchasing.generate_drafts(), [])
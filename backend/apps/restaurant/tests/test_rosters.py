@@ -0,0 +1,45 @@
+"""Tests for the cached, versioned staff rosters."""
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from .helpers import LOCAL_CACHE, api_client, make_staff
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class RosterTests(TestCase):
+    """Roster endpoints answer 304 until a staff edit moves the version."""
+
+    def setUp(self):
+        cache.clear()
+        self.amina = make_staff('Amina', 'server')
+        make_staff('Baraka', 'bartender')
+        self.client = api_client('server', staff=self.amina)
+
+    def test_unchanged_roster_answers_304(self):
+        response = self.client.get('/api/v1/staff/active/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['name'] for row in json.loads(response.content)], ['Amina', 'Baraka'])
+
+        response = self.client.get('/api/v1/staff/active/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_staff_edit_changes_the_etag(self):
+        etag = self.client.get('/api/v1/staff/roster/server/')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.amina.name = 'Amina W.'
+            self.amina.save()
+
+        response = self.client.get('/api/v1/staff/roster/server/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual([row['name'] for row in json.loads(response.content)], ['Amina W.'])
+
+    def test_unknown_role_is_rejected(self):
+        self.assertEqual(self.client.get('/api/v1/staff/roster/chef/').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get('/api/v1/staff/by_role/', {'role': 'chef'}).status_code, status.HTTP_400_BAD_REQUEST
+        )
@@ -0,0 +1,103 @@
+"""Tests for the weekly shift schedule solver."""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+
+from ..models import CoverageRequirement, ScheduledShift
+from ..services import scheduling
+from .helpers import make_staff
+
+WEEK = date(2026, 10, 19)
+
+
+@override_settings(SCHEDULE_MIN_SHIFT_HOURS=4, SCHEDULE_MAX_SHIFT_HOURS=10, SCHEDULE_MAX_WEEKLY_HOURS=45)
+class ScheduleSolverTests(TestCase):
+    """Solved rotas cover each required hour without double-booking anyone."""
+
+    def setUp(self):
+        self.servers = [make_staff(name, 'server') for name in ('Amina', 'Baraka', 'Chebet')]
+        self.require(0, range(10, 18), 2)
+        self.require(1, range(12, 15), 1)
+
+    def require(self, weekday, hours, headcount):
+        CoverageRequirement.objects.bulk_create([
+            CoverageRequirement(role='server', weekday=weekday, hour=hour, headcount=headcount) for hour in hours
+        ])
+
+    def coverage(self, shifts, weekday, hour):
+        moment = scheduling.ScheduleSolver(WEEK).to_datetime(weekday * 24 + hour)
+        return sum(1 for shift in shifts if shift.start <= moment < shift.end)
+
+    def assertNoOverlaps(self, shifts):
+        by_staff = {}
+        for shift in sorted(shifts, key=lambda shift: shift.start):
+            previous = by_staff.get(shift.staff_id)
+            if previous is not None:
+                self.assertGreaterEqual(shift.start, previous.end)
+            by_staff[shift.staff_id] = shift
+
+    def test_every_required_hour_is_covered(self):
+        shifts, gaps, cost = scheduling.generate_week(WEEK)
+
+        self.assertEqual(gaps, [])
+        for hour in range(10, 18):
+            self.assertGreaterEqual(self.coverage(shifts, 0, hour), 2)
+        for hour in range(12, 15):
+            self.assertGreaterEqual(self.coverage(shifts, 1, hour), 1)
+        self.assertNoOverlaps(shifts)
+        for shift in shifts:
+            self.assertTrue(timedelta(hours=4) <= shift.end - shift.start <= timedelta(hours=10))
+        self.assertEqual(cost, sum(Decimal('200') * ((shift.end - shift.start).seconds // 3600) for shift in shifts))
+
+    def test_short_demand_still_gets_a_minimum_shift(self):
+        shifts, _, _ = scheduling.generate_week(WEEK)
+
+        tuesday, = [shift for shift in shifts if shift.start.weekday() == 1]
+        self.assertEqual(tuesday.end - tuesday.start, timedelta(hours=4))
+
+    def test_unfilled_hours_are_reported(self):
+        self.require(2, range(9, 13), 4)
+
+        _, gaps, _ = scheduling.generate_week(WEEK)
+
+        # Three servers cover three of the four places each hour
+        self.assertEqual([(gap['start'].hour, gap['missing']) for gap in gaps], [(9, 1), (10, 1), (11, 1), (12, 1)])
+
+    def test_sick_shift_is_refilled_by_someone_free(self):
+        shifts, _, _ = scheduling.generate_week(WEEK)
+        sick = next(shift for shift in shifts if shift.start.weekday() == 0)
+
+        replacements, gaps = scheduling.call_in_sick(sick)
+
+        self.assertEqual(gaps, [])
+        self.assertNotIn(sick.staff_id, {shift.staff_id for shift in replacements})
+        scheduled = list(ScheduledShift.objects.filter(week_start=WEEK, status='scheduled'))
+        for hour in range(10, 18):
+            self.assertGreaterEqual(self.coverage(scheduled, 0, hour), 2)
+        self.assertNoOverlaps(scheduled)
+
+    def test_sick_refill_stays_within_the_scheduled_cost(self):
+        shifts, _, _ = scheduling.generate_week(WEEK)
+        sick = next(shift for shift in shifts if shift.start.weekday() == 0)
+        # The only server free on Monday is dearer than the shift being replaced
+        monday = {shift.staff_id for shift in shifts if shift.start.weekday() == 0}
+        free, = [server for server in self.servers if server.pk not in monday]
+        free.hourly_rate = Decimal('500.00')
+        free.save()
+
+        replacements, gaps = scheduling.call_in_sick(sick)
+
+        self.assertEqual(replacements, [])
+        self.assertTrue(gaps)
+
+    def test_interval_index_detects_overlaps(self):
+        index = scheduling.IntervalIndex()
+        index.add(1, 10, 14)
+        index.add(1, 20, 24)
+
+        self.assertTrue(index.conflicts(1, 13, 15))
+        self.assertFalse(index.conflicts(1, 14, 20))
+        self.assertFalse(index.conflicts(2, 10, 14))
+        index.remove(1, 10, 14)
+        self.assertFalse(index.conflicts(1, 13, 15))
@@ -0,0 +1,68 @@
+"""Tests for supplier scorecards and quality ratings."""
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from ..services import scorecards
+from .helpers import make_ingredient, make_supplier
+
+
+def totals(deliveries=4, on_time=4, ordered='100', accepted='100', expected_cost='200', variance='0'):
+    return {
+        'deliveries': deliveries,
+        'on_time_deliveries': on_time,
+        'quantity_ordered': Decimal(ordered),
+        'quantity_accepted': Decimal(accepted),
+        'expected_cost': Decimal(expected_cost),
+        'price_variance': Decimal(variance),
+    }
+
+
+@override_settings(SUPPLIER_PRICE_VARIANCE_PENALTY=5)
+class RatingTests(SimpleTestCase):
+    """Ratings run from 1.00 to 5.00 on on-time rate, fill rate and overcharging."""
+
+    def test_perfect_and_worst_suppliers_hit_the_bounds(self):
+        self.assertEqual(scorecards._rating(totals()), Decimal('5.00'))
+        self.assertEqual(scorecards._rating(totals(on_time=0, accepted='0', variance='200')), Decimal('1.00'))
+
+    def test_on_time_and_fill_rates_weigh_equally(self):
+        self.assertEqual(scorecards._rating(totals(on_time=2)), Decimal('4.20'))
+        self.assertEqual(scorecards._rating(totals(accepted='50')), Decimal('4.20'))
+
+    def test_over_delivery_does_not_raise_the_fill_rate(self):
+        self.assertEqual(scorecards._rating(totals(accepted='150')), Decimal('5.00'))
+        self.assertEqual(scorecards._rating(totals(ordered='0', accepted='0')), Decimal('5.00'))
+
+    def test_overcharging_is_penalised_and_undercharging_is_not(self):
+        # 10% over at a penalty of 5 halves the price score
+        self.assertEqual(scorecards._rating(totals(variance='20')), Decimal('4.60'))
+        # The price score floors at zero
+        self.assertEqual(scorecards._rating(totals(variance='100')), Decimal('4.20'))
+        self.assertEqual(scorecards._rating(totals(variance='-50')), Decimal('5.00'))
+        self.assertEqual(scorecards._rating(totals(expected_cost='0', variance='5')), Decimal('5.00'))
+
+
+class QualityRatingTests(TestCase):
+    """Recorded deliveries update the supplier's stored quality rating."""
+
+    def test_short_delivery_lowers_the_rating(self):
+        supplier = make_supplier()
+        now = timezone.now()
+        scorecards.record_delivery(
+            supplier=supplier,
+            expected_at=now,
+            received_at=now,
+            lines=[{
+                'ingredient': make_ingredient(supplier),
+                'quantity_ordered': Decimal('10'),
+                'quantity_received': Decimal('5'),
+                'quantity_rejected': Decimal('0'),
+                'expected_unit_price': Decimal('2.00'),
+                'unit_price': Decimal('2.00'),
+            }],
+        )
+
+        supplier.refresh_from_db()
+        self.assertEqual(supplier.quality_rating, Decimal('4.20'))
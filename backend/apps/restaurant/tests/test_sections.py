@@ -0,0 +1,69 @@
+"""Tests for balancing servers across table sections."""
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import SectionAssignment, TimeEntry
+from ..services import sections
+from .helpers import RedisTestCase, make_staff, make_table
+
+
+class BalanceTests(TestCase):
+    """Every section is covered once and server loads are even."""
+
+    def test_sections_are_packed_evenly(self):
+        loads = {'Bar': 10, 'Main': 8, 'Patio': 6, 'Terrace': 4}
+
+        assignment = sections.balance([1, 2], loads)
+
+        covered = [section for shares in assignment.values() for section, _ in shares]
+        self.assertCountEqual(covered, loads)
+        self.assertEqual(sorted(sum(load for _, load in shares) for shares in assignment.values()), [14, 14])
+
+    def test_extra_servers_go_to_the_busiest_section(self):
+        assignment = sections.balance([1, 2, 3], {'Main': 30, 'Patio': 10})
+
+        self.assertEqual(sorted(assignment.values()), [[('Main', 15.0)], [('Main', 15.0)], [('Patio', 10.0)]])
+
+    def test_no_sections_leaves_servers_unassigned(self):
+        self.assertEqual(sections.balance([1, 2], {}), {1: [], 2: []})
+
+
+class ReleaseTests(RedisTestCase):
+    """A released server's sections pass to whoever is left."""
+
+    def setUp(self):
+        super().setUp()
+        make_table('T1', section='Main')
+        make_table('T2', section='Patio')
+        self.amina = make_staff('Amina')
+        self.baraka = make_staff('Baraka')
+
+    def assign(self, staff, section):
+        SectionAssignment.objects.create(staff=staff, section=section, load=4)
+
+    def active(self):
+        return sorted(
+            SectionAssignment.objects.filter(released_at__isnull=True).values_list('staff__name', 'section')
+        )
+
+    def test_sections_pass_to_the_remaining_server(self):
+        self.assign(self.amina, 'Main')
+        self.assign(self.baraka, 'Patio')
+
+        sections.release(self.amina.pk)
+
+        self.assertEqual(self.active(), [('Baraka', 'Main'), ('Baraka', 'Patio')])
+
+    def test_last_server_hands_over_to_a_server_on_the_clock(self):
+        self.assign(self.amina, 'Main')
+        TimeEntry.objects.create(staff=self.baraka, clock_in=timezone.now())
+
+        sections.release(self.amina.pk)
+
+        self.assertEqual(self.active(), [('Baraka', 'Main')])
+
+    def test_sections_stay_uncovered_when_nobody_is_left(self):
+        self.assign(self.amina, 'Main')
+
+        self.assertEqual(sections.release(self.amina.pk), [])
+        self.assertEqual(self.active(), [])
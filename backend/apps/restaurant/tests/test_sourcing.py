@@ -0,0 +1,85 @@
+"""Tests for best-price sourcing across suppliers."""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Ingredient, SupplierItem
+from ..services import sourcing
+from .helpers import api_client, make_ingredient, make_supplier
+
+
+class BestSourceTests(TestCase):
+    """Each ingredient is annotated with one cheapest source, read from a single supplier item."""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.zawadi = make_supplier('Zawadi Farm', delivery_days=1 << self.day(5).weekday())
+        self.acme = make_supplier('Acme Produce', delivery_days=1 << self.day(2).weekday())
+        self.ingredient = make_ingredient(self.zawadi)
+
+    def day(self, offset):
+        return self.today + timedelta(days=offset)
+
+    def offer(self, supplier, pack_price, lead_time_days=1, **kw):
+        return SupplierItem.objects.create(
+            supplier=supplier, ingredient=self.ingredient, pack_size=Decimal('10'),
+            pack_price=Decimal(pack_price), lead_time_days=lead_time_days, **kw
+        )
+
+    def best(self, deliver_by=None):
+        return sourcing.with_best_source(Ingredient.objects.filter(pk=self.ingredient.pk), deliver_by).values(
+            *sourcing.BEST_SOURCE_FIELDS
+        ).get()
+
+    def test_cheapest_available_item_wins(self):
+        self.offer(self.zawadi, '30.00')
+        cheapest = self.offer(self.acme, '20.00', lead_time_days=3)
+
+        best = self.best()
+
+        self.assertEqual(best['best_supplier_item'], cheapest.pk)
+        self.assertEqual(best['best_unit_price'], Decimal('2.0000'))
+        self.assertEqual(best['best_lead_time_days'], 3)
+
+        cheapest.is_available = False
+        cheapest.save()
+        self.assertEqual(self.best()['best_supplier'], self.zawadi.pk)
+
+    def test_tied_suppliers_resolve_to_one_item(self):
+        first = self.offer(self.zawadi, '20.00')
+        self.offer(self.acme, '20.00')
+
+        best = self.best()
+
+        # Every field comes from the same row, the oldest of the tied items
+        self.assertEqual(best, {
+            'best_supplier_item': first.pk,
+            'best_supplier': self.zawadi.pk,
+            'best_supplier_name': 'Zawadi Farm',
+            'best_unit_price': Decimal('2.0000'),
+            'best_lead_time_days': 1,
+        })
+
+    def test_no_source_gives_nulls(self):
+        self.assertEqual(set(self.best().values()), {None})
+
+    def test_deliver_by_skips_suppliers_that_cannot_arrive_in_time(self):
+        self.offer(self.zawadi, '30.00')
+        self.offer(self.acme, '20.00')
+
+        # Acme delivers in two days, Zawadi not for five
+        self.assertEqual(self.best(self.day(3))['best_supplier'], self.acme.pk)
+        self.assertEqual(self.best(self.day(5))['best_supplier'], self.acme.pk)
+        self.assertIsNone(self.best(self.day(1))['best_supplier'])
+        self.assertIsNone(self.best(self.day(-1))['best_supplier'])
+
+    def test_best_sources_endpoint(self):
+        self.offer(self.zawadi, '20.00')
+        self.offer(self.acme, '20.00')
+
+        response = api_client('head_chef').get('/api/v1/inventory/ingredients/best_sources/')
+
+        row, = response.data['ingredients']
+        self.assertEqual((row['best_supplier'], row['best_supplier_name']), (self.zawadi.pk, 'Zawadi Farm'))
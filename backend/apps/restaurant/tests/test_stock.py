@@ -0,0 +1,86 @@
+"""Tests for the stock movement ledger."""
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+
+from ..models import Ingredient, StockMovement, Supplier
+from ..services import lots, stock, valuation
+from .helpers import api_client, make_ingredient, make_supplier
+
+
+class ProtectedDeleteTests(TestCase):
+    """Records the ledger still references answer 409 instead of failing."""
+
+    def setUp(self):
+        self.client = api_client('general_manager')
+        self.supplier = make_supplier()
+        # Created with stock, so the ledger holds its opening balance
+        self.ingredient = make_ingredient(self.supplier, current_stock='4')
+
+    def test_ingredient_with_history_is_not_deleted(self):
+        response = self.client.delete(f'/api/v1/inventory/ingredients/{self.ingredient.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertTrue(Ingredient.objects.filter(pk=self.ingredient.pk).exists())
+
+    def test_supplier_of_ingredient_with_history_is_not_deleted(self):
+        response = self.client.delete(f'/api/v1/suppliers/{self.supplier.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertTrue(Supplier.objects.filter(pk=self.supplier.pk).exists())
+
+    def test_ingredient_without_history_is_deleted(self):
+        unused = make_ingredient(self.supplier, name='Basil')
+        response = self.client.delete(f'/api/v1/inventory/ingredients/{unused.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class LedgerInvariantTests(TestCase):
+    """Stock, lots and valuations stay in step with the movement ledger."""
+
+    def setUp(self):
+        self.ingredient = make_ingredient(make_supplier())
+
+    def move(self, kind, quantity, **kwargs):
+        return stock.apply_movements([{'ingredient': self.ingredient, 'kind': kind, 'quantity': quantity, **kwargs}])
+
+    def assertSettled(self):
+        self.ingredient.refresh_from_db()
+        self.assertEqual(stock.ledger_balances()[self.ingredient.pk], self.ingredient.current_stock)
+        self.assertEqual(stock.reconcile(), [])
+        self.assertEqual(lots.unsettled(), [])
+        self.assertEqual(valuation.unsettled(), [])
+
+    def test_fifo_and_average_costing(self):
+        start = timezone.now()
+        self.move('receipt', 5, unit_cost=Decimal('2.00'))
+        self.move('receipt', 5, unit_cost=Decimal('4.00'))
+        usage, = self.move('usage', 6)
+
+        self.assertEqual(usage.quantity, Decimal('-6'))
+        self.assertEqual(usage.fifo_value, Decimal('-14.00'))
+        self.assertEqual(usage.average_value, Decimal('-18.00'))
+        on_hand = valuation.on_hand()
+        self.assertEqual((on_hand['fifo'], on_hand['average']), (Decimal('16.00'), Decimal('12.00')))
+        self.assertEqual(valuation.cost_of_goods(start, timezone.now())['usage']['fifo'], Decimal('14.00'))
+        self.assertSettled()
+
+    def test_waste_and_adjustments_keep_lots_in_step(self):
+        self.move('receipt', 8, unit_cost=Decimal('2.00'))
+        self.move('waste', 3)
+        self.move('adjustment', Decimal('-1.5'))
+        stock.adjust_to(self.ingredient, Decimal('6'))
+
+        self.assertEqual(
+            lots.open_lots().filter(ingredient=self.ingredient).aggregate(total=Sum('quantity_remaining'))['total'],
+            Decimal('6'),
+        )
+        self.assertSettled()
+
+    def test_insufficient_stock_rolls_back(self):
+        self.move('receipt', 2, unit_cost=Decimal('2.00'))
+        with self.assertRaises(stock.InsufficientStock):
+            self.move('usage', 3)
+        self.assertEqual(StockMovement.objects.filter(kind='usage').count(), 0)
+        self.assertSettled()
@@ -0,0 +1,58 @@
+"""Tests for stock level alerts and digests."""
+from decimal import Decimal
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from rest_framework import status
+
+from ..models import Ingredient
+from ..services import stock_alerts
+from .helpers import RedisTestCase, api_client, make_ingredient, make_staff, make_supplier
+class StockAlertDigestTests(TestCase):
+    """Digests reach inventory managers by email; stream ids are checked before Redis sees them."""
+
+    def test_digest_is_emailed_to_inventory_managers(self):
+        make_staff('Wanjiru', 'head_chef', email='chef@example.com')
+        make_staff('Otieno', 'server', email='server@example.com')
+        make_staff('Kamau', 'sous_chef')
+
+        sent = stock_alerts.email_digest(
+            [{'ingredient': 1, 'name': 'Tomatoes', 'level': 'low', 'previous': 'ok', 'stock': '2.000'}],
+            {1: 'low'},
+        )
+
+        self.assertEqual(sent, 1)
+        message, = mail.outbox
+        self.assertEqual(message.to, ['chef@example.com'])
+        self.assertIn('Tomatoes: ok -> low (stock 2.000)', message.body)
+
+    def test_invalid_since_is_rejected(self):
+        client = api_client('head_chef')
+        response = client.get('/api/v1/inventory/ingredients/alerts/', {'since': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = client.get('/api/v1/inventory/ingredients/alert_stream/', HTTP_LAST_EVENT_ID='1-x')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StockAlertHysteresisTests(RedisTestCase):
+    """Alert levels rise at a threshold and only clear a margin above it."""
+
+    def setUp(self):
+        super().setUp()
+        self.ingredient = make_ingredient(make_supplier(), minimum_stock=Decimal('10'))
+
+    def level_at(self, current_stock):
+        Ingredient.objects.filter(pk=self.ingredient.pk).update(current_stock=Decimal(current_stock))
+        stock_alerts.evaluate([self.ingredient.pk])
+        return stock_alerts.active().get(self.ingredient.pk, 'ok')
+
+    @override_settings(STOCK_ALERT_HYSTERESIS=0.1)
+    def test_level_clears_past_the_margin(self):
+        self.assertEqual(self.level_at('5'), 'low')
+        self.assertEqual(self.level_at('10.5'), 'low')
+        self.assertEqual(self.level_at('11'), 'ok')
+        self.assertEqual(self.level_at('0'), 'out')
+        self.assertEqual(self.level_at('0.5'), 'out')
+        self.assertEqual(self.level_at('1'), 'low')
+        levels = [event['level'] for event in stock_alerts.events()[0]]
+        self.assertEqual(levels, ['low', 'ok', 'out', 'low'])
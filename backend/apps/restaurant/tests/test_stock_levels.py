@@ -0,0 +1,94 @@
+"""Tests for the low and out-of-stock sets."""
+from django.test import TestCase
+from rest_framework import status
+
+from ..services import stock, stock_levels
+from .helpers import RedisTestCase, api_client, make_ingredient, make_supplier
+
+
+class StockLevelSetTests(RedisTestCase):
+    """The sets follow committed stock writes and are reloaded from stored statuses."""
+
+    def setUp(self):
+        super().setUp()
+        supplier = make_supplier()
+        self.plenty = make_ingredient(supplier, 'Rice', current_stock='10')
+        self.low = make_ingredient(supplier, 'Onions', current_stock='2')
+        self.out = make_ingredient(supplier, 'Garlic', current_stock='0')
+
+    def test_sets_load_from_stored_statuses(self):
+        self.assertEqual(stock_levels.low_stock_ids(), {self.low.pk, self.out.pk})
+        self.assertEqual(stock_levels.out_of_stock_ids(), {self.out.pk})
+        self.assertEqual(stock_levels.counts(), {'low_stock': 2, 'out_of_stock': 1})
+
+    def test_sets_follow_committed_movements(self):
+        stock_levels.rebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            stock.apply_movements([
+                {'ingredient': self.plenty, 'kind': 'usage', 'quantity': '9'},
+                {'ingredient': self.out, 'kind': 'receipt', 'quantity': '20', 'unit_cost': '2.00'},
+            ])
+
+        self.assertEqual(stock_levels.low_stock_ids(), {self.plenty.pk, self.low.pk})
+        self.assertEqual(stock_levels.out_of_stock_ids(), set())
+
+    def test_sets_follow_ingredient_edits_and_deletes(self):
+        stock_levels.rebuild()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.plenty.minimum_stock = 20
+            self.plenty.save()
+            self.out.delete()
+
+        self.assertEqual(stock_levels.low_stock_ids(), {self.plenty.pk, self.low.pk})
+        self.assertEqual(stock_levels.counts(), {'low_stock': 2, 'out_of_stock': 0})
+
+    def test_rebuild_repairs_drift(self):
+        stock_levels.rebuild()
+        self.redis.sadd(stock_levels.LOW_KEY, self.plenty.pk)
+        self.redis.srem(stock_levels.OUT_KEY, self.out.pk)
+
+        self.assertEqual(stock_levels.rebuild(), 2)
+
+        self.assertEqual(stock_levels.low_stock_ids(), {self.low.pk, self.out.pk})
+        self.assertEqual(stock_levels.out_of_stock_ids(), {self.out.pk})
+
+    def test_evicted_set_is_reloaded(self):
+        stock_levels.rebuild()
+        self.redis.delete(stock_levels.OUT_KEY)
+
+        # Syncs leave a partly loaded pair alone; the next read rebuilds both
+        stock_levels.sync([self.low.pk])
+        self.assertFalse(self.redis.exists(stock_levels.OUT_KEY))
+        self.assertEqual(stock_levels.out_of_stock_ids(), {self.out.pk})
+
+    def test_empty_sets_still_exist(self):
+        stock.apply_movements([
+            {'ingredient': ingredient, 'kind': 'receipt', 'quantity': '20', 'unit_cost': '2.00'}
+            for ingredient in (self.low, self.out)
+        ])
+        stock_levels.rebuild()
+
+        self.assertEqual(stock_levels.counts(), {'low_stock': 0, 'out_of_stock': 0})
+        self.assertEqual(self.redis.exists(stock_levels.LOW_KEY, stock_levels.OUT_KEY), 2)
+
+
+class LowStockFilterTests(TestCase):
+    """The ingredient list filters on the stored stock status."""
+
+    def test_low_stock_filter(self):
+        supplier = make_supplier()
+        plenty = make_ingredient(supplier, 'Rice', current_stock='10')
+        low = make_ingredient(supplier, 'Onions', current_stock='2')
+        out = make_ingredient(supplier, 'Garlic', current_stock='0')
+        client = api_client('head_chef')
+
+        def ids(**params):
+            response = client.get('/api/v1/inventory/ingredients/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return {row['id'] for row in response.data['results']}
+
+        self.assertEqual(ids(low_stock='true'), {low.pk, out.pk})
+        self.assertEqual(ids(low_stock='false'), {plenty.pk})
+        self.assertEqual(ids(out_of_stock='true'), {out.pk})
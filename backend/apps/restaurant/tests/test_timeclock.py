@@ -0,0 +1,58 @@
+"""Tests for time clock punches and payroll totals."""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from ..models import TimeEntry
+from ..services import timeclock
+from .helpers import api_client, make_staff
+
+
+class TimeClockTests(TestCase):
+    """Punches honour who may set their time; payroll pays overtime per week."""
+
+    def setUp(self):
+        self.staff = make_staff(hourly_rate=Decimal('100.00'))
+
+    def test_staff_punch_ignores_timestamp(self):
+        client = api_client('server', staff=self.staff)
+        earlier = timezone.now() - timedelta(hours=3)
+        response = client.post('/api/v1/staff/time-entries/punch/', {
+            'punches': [{'staff': self.staff.pk, 'action': 'in', 'timestamp': earlier.isoformat()}],
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entry = TimeEntry.objects.get(staff=self.staff)
+        self.assertGreater(entry.clock_in, earlier + timedelta(hours=2))
+
+    def test_manager_punch_keeps_timestamp(self):
+        client = api_client('general_manager')
+        earlier = timezone.now() - timedelta(hours=3)
+        client.post('/api/v1/staff/time-entries/punch/', {
+            'punches': [{'staff': self.staff.pk, 'action': 'in', 'timestamp': earlier.isoformat()}],
+        }, format='json')
+        self.assertEqual(TimeEntry.objects.get(staff=self.staff).clock_in, earlier)
+
+    @override_settings(PAYROLL_WEEKLY_REGULAR_HOURS=40, PAYROLL_OVERTIME_MULTIPLIER=1.5)
+    def test_overtime_is_counted_per_week(self):
+        monday = timezone.make_aware(datetime(2026, 10, 5, 8))
+        for day in range(5):
+            clock_in = monday + timedelta(days=day)
+            TimeEntry.objects.create(
+                staff=self.staff, clock_in=clock_in, clock_out=clock_in + timedelta(hours=9),
+                hourly_rate=Decimal('100.00'),
+            )
+        # A short shift the next week stays regular
+        clock_in = monday + timedelta(days=7)
+        TimeEntry.objects.create(
+            staff=self.staff, clock_in=clock_in, clock_out=clock_in + timedelta(hours=4),
+            hourly_rate=Decimal('100.00'),
+        )
+
+        row, = timeclock.payroll_totals(monday, monday + timedelta(days=14))
+        self.assertEqual((row['hours'], row['overtime_hours']), (49.0, 5.0))
+        # 49 hours at 100 plus half rate on the 5 overtime hours
+        self.assertEqual(row['gross_pay'], Decimal('5150.00'))
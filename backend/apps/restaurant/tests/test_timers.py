@@ -0,0 +1,65 @@
+"""Tests for the Redis-backed table timers."""
+import time
+
+from ..services import timers
+from .helpers import RedisTestCase, make_table
+
+
+class TableTimerTests(RedisTestCase):
+    """Due timers are claimed once under a lease and acknowledged after firing."""
+
+    def setUp(self):
+        super().setUp()
+        self.table = make_table()
+        self.table.status = 'cleaning'
+        self.table.save()
+        self.member = f'table:{self.table.pk}'
+
+    def claim(self, now):
+        script = self.redis.register_script(timers.CLAIM_SCRIPT)
+        claimed = script(keys=timers.KEYS, args=[now, now + timers.LEASE_SECONDS, 10])
+        return [member.decode() for member in claimed[::2]]
+
+    def test_due_timer_fires_and_is_acknowledged(self):
+        timers.schedule_transition(self.table, 'available', -1)
+
+        self.assertEqual(timers.fire_due_transitions(), 1)
+
+        self.table.refresh_from_db()
+        self.assertEqual(self.table.status, 'available')
+        for key in timers.KEYS:
+            self.assertFalse(self.redis.exists(key))
+
+    def test_timer_not_yet_due_is_left(self):
+        timers.schedule_transition(self.table, 'available', 300)
+        self.assertEqual(timers.fire_due_transitions(), 0)
+        self.assertIsNotNone(self.redis.zscore(timers.DUE_KEY, self.member))
+
+    def test_claimed_timer_is_not_handed_out_twice(self):
+        timers.schedule_transition(self.table, 'available', -1)
+        now = time.time()
+
+        self.assertEqual(self.claim(now), [self.member])
+        self.assertEqual(self.claim(now), [])
+        self.assertEqual(timers.fire_due_transitions(), 0)
+        # Once the lease runs out the timer is handed out again
+        self.assertEqual(self.claim(now + timers.LEASE_SECONDS + 1), [self.member])
+
+    def test_expired_lease_keeps_a_newer_due_time(self):
+        timers.schedule_transition(self.table, 'available', -1)
+        now = time.time()
+        self.claim(now)
+        timers.schedule_transition(self.table, 'available', 600)
+
+        self.assertEqual(self.claim(now + timers.LEASE_SECONDS + 1), [])
+        self.assertGreater(self.redis.zscore(timers.DUE_KEY, self.member), now + 500)
+
+    def test_stale_timer_is_dropped(self):
+        timers.schedule_transition(self.table, 'available', -1)
+        self.table.status = 'occupied'
+        self.table.save()
+
+        self.assertEqual(timers.fire_due_transitions(), 0)
+        self.table.refresh_from_db()
+        self.assertEqual(self.table.status, 'occupied')
+        self.assertFalse(self.redis.exists(timers.PAYLOAD_KEY))
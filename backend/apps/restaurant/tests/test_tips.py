@@ -0,0 +1,56 @@
+"""Tests for tip pool distribution."""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import TimeEntry
+from ..services import timeclock, tips
+from .helpers import make_staff
+class TipDistributionTests(TestCase):
+    """Shares follow hours times role weight and add up to the pool."""
+
+    def test_split_cents_never_loses_a_cent(self):
+        self.assertEqual(tips.split_cents([1, 1, 1], 100).tolist(), [34, 33, 33])
+        self.assertEqual(tips.split_cents([0, 0], 100).tolist(), [0, 0])
+
+    def test_shares_reproduce_the_payout(self):
+        start = timezone.now() - timedelta(hours=8)
+        for staff in (make_staff('Amina', 'server'), make_staff('Baraka', 'bartender')):
+            TimeEntry.objects.create(staff=staff, clock_in=start, clock_out=start + timedelta(hours=4))
+
+        pool = tips.distribute(start, timezone.now(), Decimal('90.00'), {'server': 1, 'bartender': 0.5})
+
+        shares = {share.role: share for share in pool.shares.all()}
+        self.assertEqual(shares['server'].amount, Decimal('60.00'))
+        self.assertEqual(shares['bartender'].amount, Decimal('30.00'))
+        # 90.00 over 6 points is 15.00 a point
+        for share in shares.values():
+            self.assertEqual(share.hours * share.weight * Decimal('15'), share.amount)
+
+    def test_out_of_range_weight_is_rejected(self):
+        with self.assertRaises(ValueError):
+            tips.distribute(timezone.now() - timedelta(hours=1), timezone.now(), Decimal('10'), {'server': 10000})
+
+    def test_role_change_keeps_the_weight_of_the_role_worked(self):
+        start = timezone.now() - timedelta(hours=8)
+        staff = make_staff('Amina', 'busser')
+        TimeEntry.objects.create(staff=staff, clock_in=start, clock_out=start + timedelta(hours=2))
+        staff.role = 'server'
+        staff.save()
+        TimeEntry.objects.create(staff=staff, clock_in=start + timedelta(hours=3), clock_out=start + timedelta(hours=5))
+
+        pool = tips.distribute(start, timezone.now(), Decimal('90.00'), {'server': 1, 'busser': 0.5})
+
+        shares = {share.role: share for share in pool.shares.all()}
+        self.assertEqual(set(shares), {'busser', 'server'})
+        self.assertEqual(shares['busser'].hours, Decimal('2.00'))
+        self.assertEqual(shares['busser'].amount, Decimal('30.00'))
+        self.assertEqual(shares['server'].amount, Decimal('60.00'))
+
+    def test_punches_record_the_role_worked(self):
+        staff = make_staff('Baraka', 'bartender')
+        timeclock.record_punches([{'staff': staff.pk, 'action': 'in', 'timestamp': timezone.now()}])
+
+        self.assertEqual(TimeEntry.objects.get(staff=staff).role, 'bartender')
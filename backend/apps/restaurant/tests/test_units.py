@@ -0,0 +1,83 @@
+"""Tests for unit-of-measure conversion."""
+import time
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from ..models import Ingredient, UnitConversion
+from ..services import units
+from .helpers import LOCAL_CACHE, make_ingredient, make_supplier
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class UnitConversionTests(TestCase):
+    """Standard ratios convert within a dimension; an ingredient's own rows bridge dimensions."""
+
+    def setUp(self):
+        cache.clear()
+        supplier = make_supplier()
+        self.flour = make_ingredient(supplier, 'Flour', current_stock='3')
+        self.milk = make_ingredient(supplier, 'Milk', current_stock='2', unit_of_measure='liters')
+        self.eggs = make_ingredient(supplier, 'Eggs', current_stock='30', unit_of_measure='pieces')
+        # A case of flour holds 25 kg; a kg of milk is 0.97 liters
+        UnitConversion.objects.create(ingredient=self.flour, unit='cases', factor=Decimal('25'))
+        UnitConversion.objects.create(ingredient=self.milk, unit='kg', factor=Decimal('0.97'))
+        units.invalidate()
+
+    def row(self, ingredient):
+        matrix = units.compile_matrix()
+        return dict(zip(units.UNITS, matrix.factors[list(matrix.ingredient_ids).index(ingredient.pk)]))
+
+    def test_matrix_holds_standard_ratios_and_conversions(self):
+        flour = self.row(self.flour)
+        self.assertEqual((flour['kg'], flour['grams'], flour['cases']), (1.0, 0.001, 25.0))
+        self.assertTrue(np.isnan(flour['liters']) and np.isnan(flour['pieces']))
+
+        milk = self.row(self.milk)
+        self.assertEqual(milk['ml'], 0.001)
+        # A conversion opens every unit of its dimension
+        self.assertAlmostEqual(milk['grams'], 0.00097)
+
+    def test_convert(self):
+        converted = units.convert([self.flour.pk, self.milk.pk], [2, 500], ['cases', 'grams'])
+        np.testing.assert_allclose(converted, [50, 0.485])
+        np.testing.assert_allclose(units.convert([self.flour.pk], [1.5], '', 'grams'), [1500])
+
+    def test_incompatible_units_are_reported(self):
+        with self.assertRaises(units.IncompatibleUnits) as raised:
+            units.convert([self.flour.pk, self.eggs.pk], [1, 1], 'liters')
+        self.assertEqual(raised.exception.pairs, [(self.flour.pk, 'liters'), (self.eggs.pk, 'liters')])
+
+    def test_quantity_in_matches_the_matrix(self):
+        stock = dict(Ingredient.objects.annotate(kg=units.quantity_in('kg')).values_list('pk', 'kg'))
+
+        self.assertAlmostEqual(stock[self.flour.pk], 3)
+        self.assertAlmostEqual(stock[self.milk.pk], units.convert([self.milk.pk], [2], '', 'kg')[0])
+        self.assertIsNone(stock[self.eggs.pk])
+
+        totals = units.stock_totals('grams')
+        self.assertEqual((totals['ingredients'], totals['unconverted']), (2, 1))
+        self.assertEqual(totals['total'], round(3000 + 2000 / 0.97, 3))
+
+    def test_matrix_is_recompiled_for_a_new_version(self):
+        units.get_matrix()
+        UnitConversion.objects.create(ingredient=self.eggs, unit='cases', factor=Decimal('30'))
+        self.assertTrue(np.isnan(units.factors([self.eggs.pk], 'cases')[0]))
+
+        units.invalidate()
+
+        self.assertEqual(units.factors([self.eggs.pk], 'cases')[0], 30.0)
+
+    def test_lost_version_is_reseeded_from_the_clock(self):
+        version = units.current_version()
+        units.invalidate()
+        self.assertEqual(units.current_version(), version + 1)
+
+        cache.clear()
+        before = time.time_ns() // 1000
+        units.invalidate()
+
+        # Never reissues a version a process may already have compiled
+        self.assertGreaterEqual(units.current_version(), max(before, version + 2))
@@ -0,0 +1,31 @@
+"""Tests for inventory valuation and cost of goods."""
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import StockMovement
+from ..services import stock, valuation
+from .helpers import make_ingredient, make_supplier
+class NegativeStockCostTests(TestCase):
+    """Stock used below zero is expensed at an estimate and trued up by the receipt that covers it."""
+
+    def setUp(self):
+        self.ingredient = make_ingredient(make_supplier())
+
+    def test_true_up_counts_as_cost_of_goods(self):
+        start = timezone.now()
+        stock.apply_movements([{'ingredient': self.ingredient, 'kind': 'usage', 'quantity': 2}], allow_negative=True)
+        receipt, = stock.apply_movements([{
+            'ingredient': self.ingredient, 'kind': 'receipt', 'quantity': 5, 'unit_cost': Decimal('3.00'),
+        }])
+
+        self.assertEqual(receipt.fifo_value, Decimal('15.00'))
+        correction = StockMovement.objects.get(kind='cost_correction')
+        self.assertEqual(correction.quantity, 0)
+        self.assertEqual(correction.fifo_value, Decimal('-2.00'))
+
+        cogs = valuation.cost_of_goods(start, timezone.now())
+        self.assertEqual(cogs['total'], {'fifo': Decimal('6.00'), 'average': Decimal('6.00')})
+        self.assertEqual(valuation.on_hand()['fifo'], Decimal('9.00'))
+        self.assertEqual(valuation.unsettled(), [])
@@ -2,9 +2,20 @@
 Inventory API URLs for ingredient and stock management.
 """
 from rest_framework.routers import DefaultRouter
-from ..viewsets import IngredientViewSet
+from ..viewsets import (
+    IngredientViewSet, SupplierItemViewSet, StockMovementViewSet, RecipeViewSet, StockLotViewSet,
+    ValuationViewSet, ParLevelSuggestionViewSet, StockCountSessionViewSet, UnitConversionViewSet
+)
 
 router = DefaultRouter()
 router.register(r'ingredients', IngredientViewSet)
+router.register(r'supplier-items', SupplierItemViewSet)
+router.register(r'unit-conversions', UnitConversionViewSet)
+router.register(r'stock-movements', StockMovementViewSet)
+router.register(r'recipes', RecipeViewSet)
+router.register(r'stock-lots', StockLotViewSet)
+router.register(r'valuation', ValuationViewSet, basename='valuation')
+router.register(r'par-suggestions', ParLevelSuggestionViewSet)
+router.register(r'stock-counts', StockCountSessionViewSet)
 
 urlpatterns = router.urls
\ No newline at end of file
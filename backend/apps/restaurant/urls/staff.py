@@ -2,9 +2,21 @@
 Staff API URLs for staff member management and role assignments.
 """
 from rest_framework.routers import DefaultRouter
-from ..viewsets import StaffViewSet
+from ..viewsets import (
+    StaffViewSet, SectionAssignmentViewSet, TimeEntryViewSet,
+    StaffAvailabilityViewSet, CoverageRequirementViewSet, ScheduledShiftViewSet,
+    TipPoolViewSet, PresenceViewSet, LeaderboardViewSet
+)
 
 router = DefaultRouter()
+router.register(r'section-assignments', SectionAssignmentViewSet)
+router.register(r'time-entries', TimeEntryViewSet)
+router.register(r'availability', StaffAvailabilityViewSet)
+router.register(r'coverage-requirements', CoverageRequirementViewSet)
+router.register(r'shifts', ScheduledShiftViewSet)
+router.register(r'tip-pools', TipPoolViewSet)
+router.register(r'presence', PresenceViewSet, basename='presence')
+router.register(r'leaderboard', LeaderboardViewSet)
 router.register(r'', StaffViewSet)
 
 urlpatterns = router.urls
\ No newline at end of file
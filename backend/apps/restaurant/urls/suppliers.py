@@ -2,9 +2,11 @@
 Suppliers API URLs for vendor management and procurement.
 """
 from rest_framework.routers import DefaultRouter
-from ..viewsets import SupplierViewSet
+from ..viewsets import SupplierViewSet, SupplierDeliveryViewSet, PurchaseOrderViewSet
 
 router = DefaultRouter()
+router.register(r'deliveries', SupplierDeliveryViewSet)
+router.register(r'purchase-orders', PurchaseOrderViewSet)
 router.register(r'', SupplierViewSet)
 
 urlpatterns = router.urls
\ No newline at end of file
@@ -2,6 +2,8 @@
 Custom validators for restaurant models.
 """
 import re
+from datetime import time
+
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
@@ -108,4 +110,73 @@ def normalize_kenyan_phone_number(value):
     elif cleaned.startswith('07') or cleaned.startswith('01'):
         return '+254' + cleaned[1:]
     
-    return value  # Return as-is if format is unexpected
\ No newline at end of file
+    return value  # Return as-is if format is unexpected
+
+
+WEEKDAY_ALIASES = {
+    'mon': 0, 'monday': 0, 'mondays': 0,
+    'tue': 1, 'tues': 1, 'tuesday': 1, 'tuesdays': 1,
+    'wed': 2, 'weds': 2, 'wednesday': 2, 'wednesdays': 2,
+    'thu': 3, 'thur': 3, 'thurs': 3, 'thursday': 3, 'thursdays': 3,
+    'fri': 4, 'friday': 4, 'fridays': 4,
+    'sat': 5, 'saturday': 5, 'saturdays': 5,
+    'sun': 6, 'sunday': 6, 'sundays': 6,
+}
+
+ALL_WEEKDAYS_MASK = 0b1111111
+
+DAY_PATTERN = '|'.join(sorted(WEEKDAY_ALIASES, key=len, reverse=True))
+DAY_RANGE_RE = re.compile(rf'\b({DAY_PATTERN})\b\s*(?:-|to|through|until)\s*\b({DAY_PATTERN})\b')
+DAY_RE = re.compile(rf'\b({DAY_PATTERN})\b')
+TIME_RE = re.compile(r'\b(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\b')
+
+
+def parse_delivery_schedule(value):
+    """
+    Parse free-text delivery days into a weekday bitmask and optional time.
+
+    Bit 0 is Monday and bit 6 is Sunday. Understands day names and
+    abbreviations, ranges ("Mon-Fri"), "daily", "weekdays" and "weekends",
+    plus a time such as "before 10am" or "by 09:30". Returns (mask, time or
+    None); text without days (e.g. "Bi-weekly") gives a mask of 0.
+    """
+    if not value:
+        return 0, None
+    
+    text = str(value).lower()
+    mask = 0
+    
+    if re.search(r'\b(daily|every\s*day)\b', text):
+        mask = ALL_WEEKDAYS_MASK
+    if re.search(r'\bweekdays\b', text):
+        mask |= 0b0011111
+    if re.search(r'\bweekends?\b', text):
+        mask |= 0b1100000
+    
+    for start, end in DAY_RANGE_RE.findall(text):
+        first, last = WEEKDAY_ALIASES[start], WEEKDAY_ALIASES[end]
+        day = first
+        while True:
+            mask |= 1 << day
+            if day == last:
+                break
+            day = (day + 1) % 7
+    
+    for name in DAY_RE.findall(text):
+        mask |= 1 << WEEKDAY_ALIASES[name]
+    
+    delivery_time = None
+    for hour, minute, meridiem in TIME_RE.findall(text):
+        # Bare numbers are only times when written with minutes or am/pm
+        if not minute and not meridiem:
+            continue
+        hour, minute = int(hour), int(minute or 0)
+        if meridiem == 'pm' and hour < 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+        if hour < 24 and minute < 60:
+            delivery_time = time(hour, minute)
+            break
+    
+    return mask, delivery_time
@@ -1,30 +1,161 @@
 """
 Restaurant API ViewSets with comprehensive CRUD operations and role-based permissions.
 """
+import json
+import re
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
+from rest_framework.exceptions import APIException, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from drf_spectacular.utils import extend_schema, extend_schema_view
-from django.db.models import Q
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Prefetch, ProtectedError, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
 
-from .models import Customer, Table, Staff, Supplier, Ingredient
+from .models import (
+    Customer, Table, Staff, Supplier, Ingredient, SectionAssignment, TimeEntry,
+    StaffAvailability, CoverageRequirement, ScheduledShift, TipPool, TipShare,
+    LeaderboardSnapshot, SupplierDelivery, SupplierItem, PurchaseOrder, StockMovement,
+    Recipe, StockLot, ParLevelSuggestion, StockCountSession, UnitConversion
+)
 from .serializers import (
     CustomerSerializer, CustomerListSerializer,
     TableSerializer, TableStatusSerializer,
     StaffSerializer, StaffListSerializer,
+    SectionAssignmentSerializer, SectionRebalanceSerializer, SectionReleaseSerializer,
+    TimeEntrySerializer, PunchBatchSerializer,
+    StaffAvailabilitySerializer, CoverageRequirementSerializer,
+    ScheduledShiftSerializer, ScheduleGenerateSerializer, CallInSickSerializer,
+    TipPoolSerializer, TipDistributionSerializer, HeartbeatSerializer,
+    LeaderboardSnapshotSerializer, SupplierDeliverySerializer, SupplierItemSerializer,
+    PurchaseOrderSerializer, PurchaseOrderGenerateSerializer,
     SupplierSerializer, SupplierListSerializer,
-    IngredientSerializer, IngredientListSerializer, IngredientStockUpdateSerializer
+    IngredientSerializer, IngredientListSerializer, IngredientStockUpdateSerializer,
+    StockMovementSerializer, StockMovementBatchSerializer,
+    RecipeSerializer, DepletionSerializer, StockLotSerializer, ParLevelSuggestionSerializer,
+    StockCountSessionSerializer, StockCountBatchSerializer, UnitConversionSerializer
+)
+from .filters import (
+    CustomerFilter, TableFilter, StaffFilter, SupplierFilter, IngredientFilter, TimeEntryFilter
 )
-from .filters import CustomerFilter, TableFilter, StaffFilter, SupplierFilter, IngredientFilter
 from .permissions import (
     IsManagerOrReadOnly, IsManagerOnly, IsFOHStaffOrManager,
     CanModifyTableStatus, CanAccessCustomerData, IsStaffMemberOrManager,
-    CanManageInventory, CanUpdateStock
+    CanManageInventory, CanUpdateStock, IsKitchenStaffOrManager
+)
+from .services import (
+    counts, deliveries, depletion, floor_plan, forecasting, leaderboard, lots, occupancy, pacing, presence, pricing,
+    purchasing, rosters, scheduling, scorecards, sections, sourcing, stock, stock_alerts,
+    stock_levels, timeclock, tips, units, valuation
 )
 
 
+def get_request_staff(request):
+    """Return the Staff record linked to the requesting user, if any."""
+    profile = getattr(request.user, 'profile', None)
+    return profile.staff_profile if profile else None
+
+
+def parse_query_date(value):
+    """Parse a YYYY-MM-DD query value; None when malformed or not a real date (e.g. 2024-02-31)."""
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+def parse_query_datetime(value):
+    """Parse an ISO datetime query value; None when malformed or out of range."""
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        return None
+
+
+def parse_query_time(value):
+    """Parse an HH:MM query value; None when malformed or out of range."""
+    try:
+        return parse_time(value)
+    except ValueError:
+        return None
+
+
+STREAM_ID_PATTERN = re.compile(r'\d+(-\d+)?')
+
+
+def is_stream_id(value):
+    """Whether ``value`` is a Redis stream id (ms or ms-seq), safe to pass to XRANGE/XREAD."""
+    return STREAM_ID_PATTERN.fullmatch(value) is not None
+
+
+class KitchenAtCapacity(APIException):
+    """Raised when seating a table would exceed the kitchen pacing limit."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Kitchen is at capacity for the current slot.'
+    default_code = 'kitchen_at_capacity'
+
+
+class ProtectedDestroyMixin:
+    """Answer 409 instead of 500 when other records still reference the one being deleted."""
+    
+    protected_error = 'This record is referenced by other records and cannot be deleted'
+    
+    def destroy(self, request, *args, **kwargs):
+        try:
+            return super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            return Response({'error': self.protected_error}, status=status.HTTP_409_CONFLICT)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets clients ask for text/event-stream; errors are sent as a single error event."""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return f"event: error\ndata: {json.dumps(data)}\n\n".encode()
+
+
+@contextmanager
+def kitchen_pacing(request, view, table, new_status):
+    """
+    Book the table's covers with kitchen pacing around the save that seats it.
+    
+    Yields the pacing decision, or None when the change does not seat the table.
+    Covers are released if the block raises. Managers may pass force=true to
+    seat regardless of the limit.
+    """
+    if new_status != 'occupied' or table.status == 'occupied':
+        yield None
+        return
+    
+    force = str(request.data.get('force', '')).lower() in ('1', 'true')
+    with pacing.seating(table, force=force and IsManagerOnly().has_permission(request, view)) as decision:
+        yield decision
+
+
+def roster_response(request, content, etag):
+    """Return pre-rendered roster JSON, or 304 when the client's copy is current."""
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    return response
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="List all customers",
@@ -155,9 +286,20 @@ class TableViewSet(viewsets.ModelViewSet):
     ordering_fields = ['table_number', 'capacity', 'section', 'status']
     ordering = ['table_number']
     
+    def perform_update(self, serializer):
+        """Apply kitchen pacing when a table is seated through a regular update."""
+        table = serializer.instance
+        new_status = serializer.validated_data.get('status', table.status)
+        with kitchen_pacing(self.request, self, table, new_status) as decision:
+            if decision and not decision.allowed:
+                raise KitchenAtCapacity()
+            serializer.save()
+    
     @extend_schema(
         summary="Update table status",
-        description="Update the status of a specific table (available, occupied, cleaning, etc.).",
+        description="Update the status of a specific table (available, occupied, cleaning, etc.). "
+                    "Seating a table is checked against kitchen pacing and returns 409 when the "
+                    "current slot is full; managers may pass force=true.",
         tags=["Tables"]
     )
     @action(detail=True, methods=['patch'], serializer_class=TableStatusSerializer)
@@ -167,7 +309,20 @@ class TableViewSet(viewsets.ModelViewSet):
         serializer = TableStatusSerializer(table, data=request.data, partial=True)
         
         if serializer.is_valid():
-            serializer.save()
+            new_status = serializer.validated_data.get('status', table.status)
+            
+            with kitchen_pacing(request, self, table, new_status) as decision:
+                if decision and not decision.allowed:
+                    return Response({
+                        'error': 'Kitchen is at capacity for the current slot',
+                        'slot_start': decision.slot_start,
+                        'seated_covers': decision.seated,
+                        'reserved_covers': decision.reserved,
+                        'capacity': decision.capacity,
+                    }, status=status.HTTP_409_CONFLICT)
+                
+                table.status = new_status
+                table.save(update_fields=['status'], changed_by=get_request_staff(request))
             return Response(TableSerializer(table).data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
@@ -186,6 +341,66 @@ class TableViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(available_tables, many=True)
         return Response(serializer.data)
+    
+    @extend_schema(
+        summary="Get floor plan snapshot",
+        description="Compact floor plan with per-section status counts and seats available. "
+                    "Pass since=<version> to receive only tables changed after that version.",
+        tags=["Tables"]
+    )
+    @action(detail=False, methods=['get'])
+    def floor_plan(self, request):
+        """Get the cached floor plan snapshot."""
+        since = request.query_params.get('since')
+        
+        if since is not None and not since.isdigit():
+            return Response(
+                {'error': 'since must be a version number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        snapshot = floor_plan.get_snapshot(int(since) if since is not None else None)
+        return Response(snapshot)
+    
+    @extend_schema(
+        summary="Get kitchen pacing outlook",
+        description="Seated covers for the current and upcoming pacing slots, covers held by reserved tables "
+                    "and the configured kitchen capacity.",
+        tags=["Tables"]
+    )
+    @action(detail=False, methods=['get'])
+    def pacing(self, request):
+        """Get the kitchen pacing outlook."""
+        return Response(pacing.outlook())
+    
+    @extend_schema(
+        summary="Get table occupancy analytics",
+        description="Per-section occupancy, idle time and turn-time percentiles read from hourly rollups. "
+                    "Accepts date_from, date_to (YYYY-MM-DD, default today) and section.",
+        tags=["Tables"]
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsManagerOnly])
+    def occupancy(self, request):
+        """Get occupancy analytics for a date range."""
+        params = request.query_params
+        date_from = parse_query_date(params['date_from']) if params.get('date_from') else timezone.localdate()
+        date_to = parse_query_date(params['date_to']) if params.get('date_to') else date_from
+        
+        if not date_from or not date_to or date_to < date_from:
+            return Response(
+                {'error': 'Dates must be YYYY-MM-DD and date_to must not be before date_from'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        start = timezone.make_aware(datetime.combine(date_from, time.min))
+        end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        report = occupancy.occupancy_report(start, end, request.query_params.get('section'))
+        
+        return Response({
+            'date_from': date_from,
+            'date_to': date_to,
+            'sections': report,
+        })
 
 
 @extend_schema_view(
@@ -220,7 +435,7 @@ class TableViewSet(viewsets.ModelViewSet):
         tags=["Staff"]
     ),
 )
-class StaffViewSet(viewsets.ModelViewSet):
+class StaffViewSet(ProtectedDestroyMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing restaurant staff members and roles.
     
@@ -237,6 +452,9 @@ class StaffViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'employee_number', 'phone_number', 'email']
     ordering_fields = ['name', 'role', 'hire_date', 'employee_number']
     ordering = ['name']
+    protected_error = (
+        'Staff member has tip shares or other records and cannot be deleted; deactivate them instead'
+    )
     
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -257,247 +475,1704 @@ class StaffViewSet(viewsets.ModelViewSet):
     
     @extend_schema(
         summary="Get active staff",
-        description="Retrieve all currently active staff members.",
+        description="Retrieve all currently active staff members from the cached roster. Supports ETag / If-None-Match.",
         tags=["Staff"]
     )
     @action(detail=False, methods=['get'])
     def active(self, request):
         """Get all active staff members."""
-        active_staff = self.get_queryset().filter(is_active=True).order_by('name')
-        serializer = StaffListSerializer(active_staff, many=True)
-        return Response(serializer.data)
+        version, roster = rosters.get_roster()
+        return roster_response(request, roster['active'], rosters.etag(version))
     
     @extend_schema(
         summary="Get staff by role",
-        description="Retrieve staff members filtered by their role.",
+        description="Retrieve active staff members filtered by their role from the cached roster.",
         tags=["Staff"]
     )
     @action(detail=False, methods=['get'])
     def by_role(self, request):
         """Get staff members by role."""
-        role = request.query_params.get('role', '')
-        
+        return self._roster_for_role(request, request.query_params.get('role', ''))
+    
+    @extend_schema(
+        summary="Get active roster grouped by role",
+        description="Active staff grouped by role from the cached roster. Supports ETag / If-None-Match.",
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['get'])
+    def roster(self, request):
+        """Get the active roster grouped by role."""
+        version, roster = rosters.get_roster()
+        return roster_response(request, roster['grouped'], rosters.etag(version, 'grouped'))
+    
+    @extend_schema(
+        summary="Get roster slice for a role",
+        description="Active staff with the given role from the cached roster. Supports ETag / If-None-Match.",
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['get'], url_path=r'roster/(?P<role>[a-z_]+)')
+    def roster_role(self, request, role=None):
+        """Get the active roster for a single role."""
+        return self._roster_for_role(request, role)
+    
+    def _roster_for_role(self, request, role):
+        """Serve one role's slice of the cached roster, rejecting unknown roles."""
         if not role:
             return Response(
                 {'error': 'Role parameter is required'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
+        if role not in dict(Staff.ROLE_CHOICES):
+            return Response(
+                {'error': f'Unknown role: {role}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        staff_by_role = self.get_queryset().filter(
-            role=role, 
-            is_active=True
-        ).order_by('name')
-        
-        serializer = StaffListSerializer(staff_by_role, many=True)
-        return Response(serializer.data)
+        version, roster = rosters.get_roster()
+        return roster_response(
+            request, roster['roles'].get(role, rosters.EMPTY), rosters.etag(version, role)
+        )
 
 
 @extend_schema_view(
     list=extend_schema(
-        summary="List suppliers",
-        description="Retrieve a list of restaurant suppliers with contact and performance information.",
-        tags=["Suppliers"]
-    ),
-    create=extend_schema(
-        summary="Create supplier",
-        description="Add a new supplier for restaurant procurement (Kitchen staff or Manager only).",
-        tags=["Suppliers"]
+        summary="List section assignments",
+        description="Retrieve the servers currently assigned to each floor section.",
+        tags=["Staff"]
     ),
     retrieve=extend_schema(
-        summary="Get supplier details",
-        description="Retrieve detailed information about a specific supplier.",
-        tags=["Suppliers"]
-    ),
-    update=extend_schema(
-        summary="Update supplier information",
-        description="Update supplier details and performance ratings.",
-        tags=["Suppliers"]
-    ),
-    partial_update=extend_schema(
-        summary="Partially update supplier",
-        description="Update specific supplier fields.",
-        tags=["Suppliers"]
-    ),
-    destroy=extend_schema(
-        summary="Delete supplier",
-        description="Remove a supplier from the system (Manager only).",
-        tags=["Suppliers"]
+        summary="Get section assignment",
+        description="Retrieve a single server section assignment.",
+        tags=["Staff"]
     ),
 )
-class SupplierViewSet(viewsets.ModelViewSet):
+class SectionAssignmentViewSet(viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for managing restaurant suppliers and vendor relationships.
+    ViewSet for balancing servers across floor sections.
     
     Provides operations for:
-    - Supplier contact management
-    - Quality ratings and performance tracking
-    - Payment terms and delivery schedules
-    - Procurement relationship management
+    - Viewing active server section assignments
+    - Rebalancing all servers by seats and current occupancy
+    - Incrementally reassigning a server's sections when they leave
     """
-    queryset = Supplier.objects.all()
-    permission_classes = [IsManagerOrReadOnly]  # Kitchen staff can view, managers can modify
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_class = SupplierFilter
-    search_fields = ['name', 'contact_person', 'phone_number', 'email']
-    ordering_fields = ['name', 'quality_rating', 'created_at']
-    ordering = ['name']
-    
-    def get_serializer_class(self):
-        """Return appropriate serializer based on action."""
-        if self.action == 'list':
-            return SupplierListSerializer
-        return SupplierSerializer
+    queryset = SectionAssignment.objects.filter(released_at__isnull=True).select_related('staff')
+    serializer_class = SectionAssignmentSerializer
+    permission_classes = [IsFOHStaffOrManager]
+    pagination_class = None
     
     @extend_schema(
-        summary="Get active suppliers",
-        description="Retrieve all currently active suppliers.",
-        tags=["Suppliers"]
+        summary="Rebalance sections",
+        description="Assign active servers to sections balancing seats and current occupancy.",
+        request=SectionRebalanceSerializer,
+        tags=["Staff"]
     )
-    @action(detail=False, methods=['get'])
-    def active(self, request):
-        """Get all active suppliers."""
-        active_suppliers = self.get_queryset().filter(is_active=True).order_by('name')
-        serializer = SupplierListSerializer(active_suppliers, many=True)
-        return Response(serializer.data)
+    @action(detail=False, methods=['post'], permission_classes=[IsManagerOnly])
+    def rebalance(self, request):
+        """Rebalance all active servers across sections."""
+        serializer = SectionRebalanceSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            servers = serializer.validated_data.get('server_ids')
+            server_ids = list(dict.fromkeys(server.pk for server in servers)) if servers is not None else None
+            assignments = sections.rebalance(server_ids)
+            return Response(SectionAssignmentSerializer(assignments, many=True).data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     @extend_schema(
-        summary="Get top rated suppliers",
-        description="Retrieve suppliers with high quality ratings (4.0+).",
-        tags=["Suppliers"]
+        summary="Release server from sections",
+        description="Hand a server's sections to the least loaded remaining servers without a full rebalance.",
+        request=SectionReleaseSerializer,
+        tags=["Staff"]
     )
-    @action(detail=False, methods=['get'])
-    def top_rated(self, request):
-        """Get suppliers with quality rating >= 4.0."""
-        top_suppliers = self.get_queryset().filter(
-            is_active=True,
-            quality_rating__gte=4.0
-        ).order_by('-quality_rating')
+    @action(detail=False, methods=['post'], permission_classes=[IsManagerOnly])
+    def release(self, request):
+        """Release a server and reassign only their sections."""
+        serializer = SectionReleaseSerializer(data=request.data)
         
-        serializer = SupplierListSerializer(top_suppliers, many=True)
-        return Response(serializer.data)
+        if serializer.is_valid():
+            sections.release(serializer.validated_data['staff'].id)
+            return Response(SectionAssignmentSerializer(self.get_queryset(), many=True).data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 @extend_schema_view(
     list=extend_schema(
-        summary="List ingredients",
-        description="Retrieve a list of inventory ingredients with stock levels and supplier information.",
-        tags=["Inventory"]
-    ),
-    create=extend_schema(
-        summary="Create ingredient",
-        description="Add a new ingredient to inventory (Kitchen staff only).",
-        tags=["Inventory"]
+        summary="List time entries",
+        description="Retrieve clock-in/clock-out entries. Staff see their own entries, managers see all.",
+        tags=["Staff"]
     ),
     retrieve=extend_schema(
-        summary="Get ingredient details",
-        description="Retrieve detailed information about a specific ingredient including stock history.",
-        tags=["Inventory"]
-    ),
-    update=extend_schema(
-        summary="Update ingredient information",
-        description="Update ingredient details and supplier assignments.",
-        tags=["Inventory"]
-    ),
-    partial_update=extend_schema(
-        summary="Partially update ingredient",
-        description="Update specific ingredient fields.",
-        tags=["Inventory"]
-    ),
-    destroy=extend_schema(
-        summary="Delete ingredient",
-        description="Remove an ingredient from inventory (Manager only).",
-        tags=["Inventory"]
+        summary="Get time entry",
+        description="Retrieve a single time clock entry.",
+        tags=["Staff"]
     ),
 )
-class IngredientViewSet(viewsets.ModelViewSet):
+class TimeEntryViewSet(viewsets.ReadOnlyModelViewSet):
     """
-    ViewSet for managing restaurant inventory ingredients and stock levels.
+    ViewSet for the staff time clock.
     
     Provides operations for:
-    - Ingredient catalog management
-    - Stock level tracking and updates
-    - Supplier relationship management
-    - Cost analysis and tracking
-    - Perishable item management
+    - Batched clock-in/clock-out punches from terminals
+    - Live labor cost of everyone on the clock
+    - Payroll period totals with overtime
     """
-    queryset = Ingredient.objects.select_related('supplier').all()
-    permission_classes = [CanManageInventory]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_class = IngredientFilter
-    search_fields = ['name', 'supplier__name', 'category']
-    ordering_fields = ['name', 'current_stock', 'minimum_stock', 'cost_per_unit', 'last_updated']
-    ordering = ['name']
+    queryset = TimeEntry.objects.select_related('staff').all()
+    serializer_class = TimeEntrySerializer
+    permission_classes = [IsStaffMemberOrManager]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = TimeEntryFilter
+    ordering_fields = ['clock_in', 'clock_out']
+    ordering = ['-clock_in']
     
-    def get_serializer_class(self):
-        """Return appropriate serializer based on action."""
-        if self.action == 'list':
-            return IngredientListSerializer
-        elif self.action == 'update_stock':
-            return IngredientStockUpdateSerializer
-        return IngredientSerializer
+    def get_queryset(self):
+        """Limit non-managers to their own entries."""
+        queryset = super().get_queryset()
+        if IsManagerOnly().has_permission(self.request, self):
+            return queryset
+        staff = get_request_staff(self.request)
+        return queryset.filter(staff=staff) if staff else queryset.none()
     
     @extend_schema(
-        summary="Update ingredient stock",
-        description="Update the current stock level of a specific ingredient.",
-        tags=["Inventory"]
+        summary="Record punches",
+        description="Record a batch of clock-in/clock-out punches. Staff may only punch for themselves "
+                    "at the current time; managers may submit punches for anyone with a timestamp.",
+        request=PunchBatchSerializer,
+        tags=["Staff"]
     )
-    @action(detail=True, methods=['patch'], 
-            permission_classes=[CanUpdateStock],
-            serializer_class=IngredientStockUpdateSerializer)
-    def update_stock(self, request, pk=None):
-        """Update ingredient stock level."""
-        ingredient = self.get_object()
-        serializer = IngredientStockUpdateSerializer(data=request.data)
+    @action(detail=False, methods=['post'])
+    def punch(self, request):
+        """Record a batch of punches."""
+        serializer = PunchBatchSerializer(data=request.data)
         
-        if serializer.is_valid():
-            ingredient.current_stock = serializer.validated_data['current_stock']
-            ingredient.save()
-            
-            return Response(IngredientSerializer(ingredient).data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    @extend_schema(
-        summary="Get low stock ingredients",
-        description="Retrieve ingredients with stock levels below minimum threshold.",
-        tags=["Inventory"]
-    )
-    @action(detail=False, methods=['get'])
-    def low_stock(self, request):
-        """Get ingredients with stock below minimum level."""
-        from django.db.models import F
-        low_stock_ingredients = self.get_queryset().filter(
-            current_stock__lt=F('minimum_stock')
-        ).order_by('current_stock')
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        serializer = IngredientListSerializer(low_stock_ingredients, many=True)
-        return Response(serializer.data)
+        now = timezone.now()
+        is_manager = IsManagerOnly().has_permission(request, self)
+        # Only managers may record a punch at a time other than now
+        punches = [
+            dict(punch, timestamp=(punch.get('timestamp') if is_manager else None) or now)
+            for punch in serializer.validated_data['punches']
+        ]
+        
+        if not is_manager:
+            staff = get_request_staff(request)
+            if staff is None or any(punch['staff'] != staff.id for punch in punches):
+                return Response(
+                    {'error': 'You can only punch in or out for yourself'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+        
+        try:
+            results = timeclock.record_punches(punches, source=serializer.validated_data.get('source', ''))
+        except IntegrityError:
+            # A concurrent batch opened an entry for one of these staff members first
+            return Response(
+                {'error': 'A staff member in this batch was clocked in concurrently; retry the batch'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response([result._asdict() for result in results])
     
     @extend_schema(
-        summary="Get out of stock ingredients",
-        description="Retrieve ingredients that are completely out of stock.",
-        tags=["Inventory"]
+        summary="Get live labor cost",
+        description="Staff on the clock, hourly labor burn and labor cost accumulated today.",
+        tags=["Staff"]
     )
-    @action(detail=False, methods=['get'])
-    def out_of_stock(self, request):
-        """Get ingredients that are out of stock."""
-        out_of_stock_ingredients = self.get_queryset().filter(
-            current_stock=0
-        ).order_by('name')
-        
-        serializer = IngredientListSerializer(out_of_stock_ingredients, many=True)
-        return Response(serializer.data)
+    @action(detail=False, methods=['get'], permission_classes=[IsManagerOnly])
+    def labor_cost(self, request):
+        """Get the live labor cost."""
+        return Response(timeclock.live_labor_cost())
     
     @extend_schema(
-        summary="Get perishable ingredients",
-        description="Retrieve all perishable ingredients that require careful stock management.",
-        tags=["Inventory"]
+        summary="Get payroll totals",
+        description="Hours, overtime and gross pay per staff member for entries clocked in between "
+                    "date_from and date_to (YYYY-MM-DD, inclusive).",
+        tags=["Staff"]
     )
-    @action(detail=False, methods=['get'])
-    def perishable(self, request):
-        """Get all perishable ingredients."""
-        perishable_ingredients = self.get_queryset().filter(
-            is_perishable=True
-        ).order_by('shelf_life_days', 'current_stock')
+    @action(detail=False, methods=['get'], permission_classes=[IsManagerOnly])
+    def payroll(self, request):
+        """Get payroll totals for a period."""
+        date_from = parse_query_date(request.query_params.get('date_from', ''))
+        date_to = parse_query_date(request.query_params.get('date_to', ''))
         
-        serializer = IngredientListSerializer(perishable_ingredients, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        if not date_from or not date_to or date_to < date_from:
+            return Response(
+                {'error': 'date_from and date_to are required and date_to must not be before date_from'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        start = timezone.make_aware(datetime.combine(date_from, time.min))
+        end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        
+        return Response({
+            'date_from': date_from,
+            'date_to': date_to,
+            'staff': timeclock.payroll_totals(start, end),
+        })
+
+
+@extend_schema_view(
+    list=extend_schema(summary="List staff availability", tags=["Staff"]),
+    create=extend_schema(summary="Add availability window", tags=["Staff"]),
+    retrieve=extend_schema(summary="Get availability window", tags=["Staff"]),
+    update=extend_schema(summary="Update availability window", tags=["Staff"]),
+    partial_update=extend_schema(summary="Partially update availability window", tags=["Staff"]),
+    destroy=extend_schema(summary="Delete availability window", tags=["Staff"]),
+)
+class StaffAvailabilityViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for weekly staff availability used by the schedule solver.
+    """
+    queryset = StaffAvailability.objects.select_related('staff').all()
+    serializer_class = StaffAvailabilitySerializer
+    permission_classes = [IsManagerOrReadOnly]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['staff', 'weekday']
+    ordering = ['staff', 'weekday', 'start_time']
+
+
+@extend_schema_view(
+    list=extend_schema(summary="List coverage requirements", tags=["Staff"]),
+    create=extend_schema(summary="Add coverage requirement", tags=["Staff"]),
+    retrieve=extend_schema(summary="Get coverage requirement", tags=["Staff"]),
+    update=extend_schema(summary="Update coverage requirement", tags=["Staff"]),
+    partial_update=extend_schema(summary="Partially update coverage requirement", tags=["Staff"]),
+    destroy=extend_schema(summary="Delete coverage requirement", tags=["Staff"]),
+)
+class CoverageRequirementViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for hourly headcount requirements per role used by the schedule solver.
+    """
+    queryset = CoverageRequirement.objects.all()
+    serializer_class = CoverageRequirementSerializer
+    permission_classes = [IsManagerOrReadOnly]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['role', 'weekday']
+    ordering = ['weekday', 'hour', 'role']
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List scheduled shifts",
+        description="Retrieve rota shifts, filterable by week_start, staff, role and status.",
+        tags=["Staff"]
+    ),
+    retrieve=extend_schema(
+        summary="Get scheduled shift",
+        description="Retrieve a single rota shift.",
+        tags=["Staff"]
+    ),
+)
+class ScheduledShiftViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for the weekly rota.
+    
+    Provides operations for:
+    - Generating a week's schedule from coverage, availability and budget
+    - Re-filling a single shift when someone calls in sick
+    """
+    queryset = ScheduledShift.objects.select_related('staff').all()
+    serializer_class = ScheduledShiftSerializer
+    permission_classes = [IsStaffMemberOrManager]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['week_start', 'staff', 'role', 'status']
+    ordering = ['start', 'role']
+    
+    @extend_schema(
+        summary="Generate weekly schedule",
+        description="Replace the week's scheduled shifts with a solved rota. Returns the shifts, "
+                    "uncovered hours and total labor cost.",
+        request=ScheduleGenerateSerializer,
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['post'], permission_classes=[IsManagerOnly])
+    def generate(self, request):
+        """Generate the rota for a week."""
+        serializer = ScheduleGenerateSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            shifts, gaps, labor_cost = scheduling.generate_week(
+                serializer.validated_data['week_start'],
+                serializer.validated_data.get('labor_budget')
+            )
+            return Response({
+                'shifts': ScheduledShiftSerializer(shifts, many=True).data,
+                'gaps': gaps,
+                'labor_cost': labor_cost,
+            }, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @extend_schema(
+        summary="Call in sick",
+        description="Mark the shift as called in sick and find replacements for its hours only, "
+                    "within `labor_budget` (default: the week's labor cost as scheduled).",
+        request=CallInSickSerializer,
+        tags=["Staff"]
+    )
+    @action(detail=True, methods=['post'], permission_classes=[IsManagerOnly])
+    def call_in_sick(self, request, pk=None):
+        """Mark a shift as called in sick and re-fill its hours."""
+        shift = self.get_object()
+        serializer = CallInSickSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        if shift.status != 'scheduled':
+            return Response(
+                {'error': 'Only scheduled shifts can be called in sick'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        replacements, gaps = scheduling.call_in_sick(shift, serializer.validated_data.get('labor_budget'))
+        return Response({
+            'shift': ScheduledShiftSerializer(shift).data,
+            'replacements': ScheduledShiftSerializer(replacements, many=True).data,
+            'gaps': gaps,
+        })
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List tip pools",
+        description="Retrieve distributed tip pools with their shares. Non-managers only see their own shares.",
+        tags=["Staff"]
+    ),
+    retrieve=extend_schema(
+        summary="Get tip pool",
+        description="Retrieve a distributed tip pool with its shares.",
+        tags=["Staff"]
+    ),
+)
+class TipPoolViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for tip pooling.
+    
+    Pools are immutable once distributed; a correction is a new pool.
+    """
+    queryset = TipPool.objects.select_related('created_by').prefetch_related('shares__staff')
+    serializer_class = TipPoolSerializer
+    permission_classes = [IsStaffMemberOrManager]
+    filter_backends = [OrderingFilter]
+    ordering_fields = ['period_start', 'created_at']
+    ordering = ['-period_start']
+    
+    def get_queryset(self):
+        """Limit non-managers to pools they have a share in, showing only their share."""
+        queryset = super().get_queryset()
+        if IsManagerOnly().has_permission(self.request, self):
+            return queryset
+        staff = get_request_staff(self.request)
+        if staff is None:
+            return queryset.none()
+        return queryset.filter(shares__staff=staff).distinct().prefetch_related(None).prefetch_related(
+            Prefetch('shares', queryset=TipShare.objects.filter(staff=staff).select_related('staff'))
+        )
+    
+    @extend_schema(
+        summary="Distribute tips",
+        description="Split a tip pool across staff by hours worked in the period times role weight. "
+                    "Amounts are rounded to the cent and always add up to the pool.",
+        request=TipDistributionSerializer,
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['post'], permission_classes=[IsManagerOnly])
+    def distribute(self, request):
+        """Distribute a tip pool."""
+        serializer = TipDistributionSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            pool = tips.distribute(created_by=get_request_staff(request), **serializer.validated_data)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        pool = self.get_queryset().get(pk=pool.pk)
+        return Response(TipPoolSerializer(pool).data, status=status.HTTP_201_CREATED)
+
+
+class PresenceViewSet(viewsets.ViewSet):
+    """
+    ViewSet for on-floor staff presence.
+    
+    Terminals heartbeat for the signed-in staff member; supervisors list who is
+    on the floor and follow joins, moves and departures. Served from Redis only.
+    """
+    permission_classes = [IsStaffMemberOrManager]
+    
+    @extend_schema(
+        summary="Who's on the floor",
+        description="Staff with a live terminal heartbeat, filterable by `role` and `section`.",
+        tags=["Staff"]
+    )
+    def list(self, request):
+        """List staff currently on the floor."""
+        present = presence.on_floor(
+            role=request.query_params.get('role'),
+            section=request.query_params.get('section'),
+        )
+        return Response({'count': len(present), 'results': present})
+    
+    @extend_schema(
+        summary="Terminal heartbeat",
+        description="Mark the signed-in staff member as on the floor at a terminal and section.",
+        request=HeartbeatSerializer,
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['post'])
+    def heartbeat(self, request):
+        """Record a heartbeat for the signed-in staff member."""
+        staff = get_request_staff(request)
+        if staff is None:
+            return Response(
+                {'error': 'No staff profile linked to this user'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = HeartbeatSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        event = presence.heartbeat(staff, **serializer.validated_data)
+        return Response({'event': event, 'ttl': settings.PRESENCE_TTL_SECONDS})
+    
+    @extend_schema(
+        summary="Sign off the floor",
+        description="Remove the signed-in staff member from the floor immediately.",
+        request=None,
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['post'])
+    def leave(self, request):
+        """Sign the signed-in staff member off the floor."""
+        staff = get_request_staff(request)
+        if staff is None:
+            return Response(
+                {'error': 'No staff profile linked to this user'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response({'left': presence.leave(staff.pk)})
+    
+    @extend_schema(
+        summary="Presence changes",
+        description="Joined, moved and left events after the stream id in `since`. Pass the "
+                    "returned `last_id` as `since` on the next call.",
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsManagerOnly])
+    def changes(self, request):
+        """Get presence changes since a stream id."""
+        since = request.query_params.get('since', '0')
+        if not is_stream_id(since):
+            return Response({'error': 'since must be a stream id'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        events, last_id = presence.changes(since=since)
+        return Response({'events': events, 'last_id': last_id})
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Leaderboard history",
+        description="Persisted final ranks, filterable by metric, period, period_start and staff.",
+        tags=["Staff"]
+    ),
+)
+class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for server leaderboards.
+    
+    Live rankings for the current shift, day or week come from Redis; the
+    list endpoint serves the nightly snapshots.
+    """
+    queryset = LeaderboardSnapshot.objects.select_related('staff').all()
+    serializer_class = LeaderboardSnapshotSerializer
+    permission_classes = [IsStaffMemberOrManager]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['metric', 'period', 'period_start', 'staff']
+    ordering = ['-period_start', 'metric', 'rank']
+    board_params_error = (
+        f"metric must be one of {', '.join(leaderboard.METRICS)} "
+        f"and period one of {', '.join(leaderboard.PERIODS)}"
+    )
+    
+    def _board_params(self, request):
+        metric = request.query_params.get('metric', 'covers')
+        period = request.query_params.get('period', 'shift')
+        if metric not in leaderboard.METRICS or period not in leaderboard.PERIODS:
+            return None
+        return metric, period
+    
+    @extend_schema(
+        summary="Live leaderboard",
+        description="Top servers for the current period. Query params: `metric` (covers, turns, sales), "
+                    "`period` (shift, day, week) and `limit` (default 10).",
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['get'])
+    def live(self, request):
+        """Get the live top-N for a metric and period."""
+        params = self._board_params(request)
+        if params is None:
+            return Response({'error': self.board_params_error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        except ValueError:
+            limit = 10
+        
+        metric, period = params
+        return Response({
+            'metric': metric,
+            'period': period,
+            'period_start': leaderboard.period_start(period),
+            'results': leaderboard.top(metric, period, limit),
+        })
+    
+    @extend_schema(
+        summary="My rank",
+        description="Rank and score of the signed-in staff member (or `staff` for managers) "
+                    "on the live board for `metric` and `period`.",
+        tags=["Staff"]
+    )
+    @action(detail=False, methods=['get'])
+    def rank(self, request):
+        """Get a staff member's live rank."""
+        params = self._board_params(request)
+        if params is None:
+            return Response({'error': self.board_params_error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        staff = get_request_staff(request)
+        staff_id = staff.pk if staff else None
+        if request.query_params.get('staff') and IsManagerOnly().has_permission(request, self):
+            try:
+                staff_id = int(request.query_params['staff'])
+            except ValueError:
+                return Response({'error': 'staff must be an id'}, status=status.HTTP_400_BAD_REQUEST)
+        if staff_id is None:
+            return Response(
+                {'error': 'No staff profile linked to this user'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        metric, period = params
+        rank, score = leaderboard.rank_of(staff_id, metric, period)
+        return Response({
+            'metric': metric,
+            'period': period,
+            'staff': staff_id,
+            'rank': rank,
+            'score': score,
+        })
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List suppliers",
+        description="Retrieve a list of restaurant suppliers with contact and performance information.",
+        tags=["Suppliers"]
+    ),
+    create=extend_schema(
+        summary="Create supplier",
+        description="Add a new supplier for restaurant procurement (Kitchen staff or Manager only).",
+        tags=["Suppliers"]
+    ),
+    retrieve=extend_schema(
+        summary="Get supplier details",
+        description="Retrieve detailed information about a specific supplier.",
+        tags=["Suppliers"]
+    ),
+    update=extend_schema(
+        summary="Update supplier information",
+        description="Update supplier details and performance ratings.",
+        tags=["Suppliers"]
+    ),
+    partial_update=extend_schema(
+        summary="Partially update supplier",
+        description="Update specific supplier fields.",
+        tags=["Suppliers"]
+    ),
+    destroy=extend_schema(
+        summary="Delete supplier",
+        description="Remove a supplier from the system (Manager only).",
+        tags=["Suppliers"]
+    ),
+)
+class SupplierViewSet(ProtectedDestroyMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for managing restaurant suppliers and vendor relationships.
+    
+    Provides operations for:
+    - Supplier contact management
+    - Quality ratings and performance tracking
+    - Payment terms and delivery schedules
+    - Procurement relationship management
+    """
+    queryset = Supplier.objects.all()
+    permission_classes = [IsManagerOrReadOnly]  # Kitchen staff can view, managers can modify
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_class = SupplierFilter
+    search_fields = ['name', 'contact_person', 'phone_number', 'email']
+    ordering_fields = ['name', 'quality_rating', 'created_at']
+    ordering = ['name']
+    protected_error = (
+        'Supplier has purchase orders or ingredients with stock history and cannot be deleted; '
+        'deactivate it instead'
+    )
+    
+    def get_serializer_class(self):
+        """Return appropriate serializer based on action."""
+        if self.action == 'list':
+            return SupplierListSerializer
+        return SupplierSerializer
+    
+    @extend_schema(
+        summary="Get active suppliers",
+        description="Retrieve all currently active suppliers.",
+        tags=["Suppliers"]
+    )
+    @action(detail=False, methods=['get'])
+    def active(self, request):
+        """Get all active suppliers."""
+        active_suppliers = self.get_queryset().filter(is_active=True).order_by('name')
+        serializer = SupplierListSerializer(active_suppliers, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(
+        summary="Get supplier scorecard",
+        description="Weekly on-time rate, fill rate, rejected quantity and price variance from "
+                    "received deliveries. `weeks` sets how many weeks back (default from settings).",
+        tags=["Suppliers"]
+    )
+    @action(detail=True, methods=['get'])
+    def scorecard(self, request, pk=None):
+        """Get a supplier's weekly scorecard."""
+        supplier = self.get_object()
+        try:
+            weeks = min(max(int(request.query_params.get('weeks', 0)), 0), 104)
+        except ValueError:
+            return Response({'error': 'weeks must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'supplier': supplier.pk,
+            'quality_rating': supplier.quality_rating,
+            'weeks': scorecards.scorecard(supplier, weeks or None),
+        })
+    
+    @extend_schema(
+        summary="Get top rated suppliers",
+        description="Retrieve suppliers with high quality ratings (4.0+).",
+        tags=["Suppliers"]
+    )
+    @action(detail=False, methods=['get'])
+    def top_rated(self, request):
+        """Get suppliers with quality rating >= 4.0 (derived from scorecards once deliveries exist)."""
+        top_suppliers = self.get_queryset().filter(
+            is_active=True,
+            quality_rating__gte=4.0
+        ).order_by('-quality_rating')
+        
+        serializer = SupplierListSerializer(top_suppliers, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(
+        summary="Get suppliers delivering on a date",
+        description="Active suppliers delivering on `date` (YYYY-MM-DD, default tomorrow), optionally "
+                    "only those expected by `before` (HH:MM).",
+        tags=["Suppliers"]
+    )
+    @action(detail=False, methods=['get'])
+    def delivering(self, request):
+        """Get suppliers delivering on a date."""
+        delivery_date = timezone.localdate() + timedelta(days=1)
+        if 'date' in request.query_params:
+            delivery_date = parse_query_date(request.query_params['date'])
+        before = parse_query_time(request.query_params['before']) if 'before' in request.query_params else None
+        
+        if delivery_date is None or ('before' in request.query_params and before is None):
+            return Response(
+                {'error': 'date must be YYYY-MM-DD and before must be HH:MM'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        suppliers = deliveries.suppliers_delivering(delivery_date, before).order_by('delivery_time', 'name')
+        return Response({
+            'date': delivery_date,
+            'before': before,
+            'suppliers': SupplierListSerializer(suppliers, many=True).data,
+        })
+    
+    @extend_schema(
+        summary="Get upcoming order cutoffs",
+        description="Supplier order cutoffs in the next `hours` hours (default from settings).",
+        tags=["Suppliers"]
+    )
+    @action(detail=False, methods=['get'])
+    def cutoffs(self, request):
+        """Get upcoming order cutoffs."""
+        try:
+            hours = float(request.query_params.get('hours', settings.SUPPLIER_CUTOFF_REMINDER_HOURS))
+        except ValueError:
+            return Response({'error': 'hours must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response([
+            {
+                'supplier': supplier.pk,
+                'name': supplier.name,
+                'delivery_date': delivery_date,
+                'cutoff': cutoff,
+            }
+            for supplier, delivery_date, cutoff in deliveries.upcoming_cutoffs(hours=min(hours, 7 * 24))
+        ])
+
+
+@extend_schema_view(
+    list=extend_schema(summary="List supplier items", tags=["Inventory"]),
+    create=extend_schema(summary="Add supplier item", tags=["Inventory"]),
+    retrieve=extend_schema(summary="Get supplier item", tags=["Inventory"]),
+    update=extend_schema(summary="Update supplier item", tags=["Inventory"]),
+    partial_update=extend_schema(summary="Partially update supplier item", tags=["Inventory"]),
+    destroy=extend_schema(summary="Delete supplier item", tags=["Inventory"]),
+)
+class SupplierItemViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for the supplier catalog: which suppliers sell each ingredient,
+    in what pack size, at what price and lead time.
+    """
+    queryset = SupplierItem.objects.select_related('supplier', 'ingredient').all()
+    serializer_class = SupplierItemSerializer
+    permission_classes = [CanManageInventory]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['supplier', 'ingredient', 'is_available']
+    search_fields = ['ingredient__name', 'supplier__name', 'sku']
+    ordering_fields = ['unit_price', 'lead_time_days', 'updated_at']
+    ordering = ['ingredient', 'unit_price']
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List unit conversions",
+        description="Pack sizes and densities converting other units to each ingredient's unit of measure.",
+        tags=["Inventory"]
+    ),
+    create=extend_schema(summary="Add unit conversion", tags=["Inventory"]),
+    retrieve=extend_schema(summary="Get unit conversion", tags=["Inventory"]),
+    update=extend_schema(summary="Update unit conversion", tags=["Inventory"]),
+    partial_update=extend_schema(summary="Partially update unit conversion", tags=["Inventory"]),
+    destroy=extend_schema(summary="Delete unit conversion", tags=["Inventory"]),
+)
+class UnitConversionViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for per-ingredient unit conversions: one case is 24 pieces, one
+    liter of oil weighs 0.92 kg.
+    """
+    queryset = UnitConversion.objects.select_related('ingredient').all()
+    serializer_class = UnitConversionSerializer
+    permission_classes = [CanManageInventory]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['ingredient', 'unit']
+    search_fields = ['ingredient__name']
+    ordering_fields = ['unit', 'updated_at']
+    ordering = ['ingredient', 'unit']
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List supplier deliveries",
+        description="Retrieve received deliveries with their lines.",
+        tags=["Suppliers"]
+    ),
+    retrieve=extend_schema(
+        summary="Get supplier delivery",
+        description="Retrieve a received delivery with its lines.",
+        tags=["Suppliers"]
+    ),
+)
+class SupplierDeliveryViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for receiving supplier deliveries.
+    
+    Recording a delivery adds accepted quantities to stock and updates the
+    supplier's weekly scorecard and quality rating.
+    """
+    queryset = SupplierDelivery.objects.select_related('supplier', 'received_by').prefetch_related(
+        'lines__ingredient'
+    )
+    serializer_class = SupplierDeliverySerializer
+    permission_classes = [IsKitchenStaffOrManager]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['supplier']
+    ordering_fields = ['received_at', 'expected_at']
+    ordering = ['-received_at']
+    
+    @extend_schema(
+        summary="Receive delivery",
+        description="Record a delivery from a supplier with ordered, received and rejected quantities "
+                    "and agreed and invoiced prices per line. Pass the submitted `purchase_order` it "
+                    "fulfils to mark that order received.",
+        request=SupplierDeliverySerializer,
+        tags=["Suppliers"]
+    )
+    @action(detail=False, methods=['post'], permission_classes=[CanManageInventory])
+    def receive(self, request):
+        """Record a received delivery."""
+        serializer = SupplierDeliverySerializer(data=request.data)
+        
+        if serializer.is_valid():
+            data = serializer.validated_data
+            delivery = scorecards.record_delivery(
+                supplier=data['supplier'],
+                expected_at=data['expected_at'],
+                received_at=data.get('received_at') or timezone.now(),
+                lines=data['lines'],
+                received_by=get_request_staff(request),
+                notes=data.get('notes', ''),
+                purchase_order=data.get('purchase_order'),
+            )
+            delivery = self.get_queryset().get(pk=delivery.pk)
+            return Response(SupplierDeliverySerializer(delivery).data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List purchase orders",
+        description="Retrieve purchase orders with their lines. Filter by supplier or status.",
+        tags=["Suppliers"]
+    ),
+    retrieve=extend_schema(
+        summary="Get purchase order",
+        description="Retrieve a purchase order with its lines.",
+        tags=["Suppliers"]
+    ),
+)
+class PurchaseOrderViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for purchase orders.
+    
+    Drafts are generated from stock levels and replaced on each run until
+    they are submitted. A submitted order is received by recording a
+    supplier delivery against it.
+    """
+    queryset = PurchaseOrder.objects.select_related('supplier').prefetch_related(
+        'lines__ingredient', 'lines__supplier_item'
+    )
+    serializer_class = PurchaseOrderSerializer
+    permission_classes = [CanManageInventory]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['supplier', 'status', 'below_minimum']
+    ordering_fields = ['created_at', 'order_cutoff', 'delivery_date', 'subtotal']
+    ordering = ['-created_at']
+    
+    @extend_schema(
+        summary="Generate draft orders",
+        description="Replace draft purchase orders with order-up-to quantities for every ingredient at "
+                    "or below its reorder point, grouped by supplier. Limit to some suppliers with "
+                    "'suppliers'.",
+        request=PurchaseOrderGenerateSerializer,
+        tags=["Suppliers"]
+    )
+    @action(detail=False, methods=['post'], permission_classes=[IsManagerOnly])
+    def generate(self, request):
+        """Regenerate draft purchase orders."""
+        serializer = PurchaseOrderGenerateSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            suppliers = serializer.validated_data.get('suppliers')
+            orders = purchasing.generate_drafts([supplier.pk for supplier in suppliers] if suppliers else None)
+            orders = self.get_queryset().filter(pk__in=[order.pk for order in orders])
+            return Response(PurchaseOrderSerializer(orders, many=True).data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @extend_schema(
+        summary="Submit purchase order",
+        description="Submit a draft order to its supplier. Submitted quantities count as on order "
+                    "in later runs until a delivery is received against the order.",
+        request=None,
+        tags=["Suppliers"]
+    )
+    @action(detail=True, methods=['post'], permission_classes=[IsManagerOnly])
+    def submit(self, request, pk=None):
+        """Submit a draft purchase order."""
+        order = self.get_object()
+        
+        if order.status != 'draft':
+            return Response(
+                {'error': 'Only draft orders can be submitted'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        order.status = 'submitted'
+        order.submitted_at = timezone.now()
+        order.save(update_fields=['status', 'submitted_at'])
+        return Response(PurchaseOrderSerializer(order).data)
+    
+    @extend_schema(
+        summary="Cancel purchase order",
+        description="Cancel a draft or submitted order.",
+        request=None,
+        tags=["Suppliers"]
+    )
+    @action(detail=True, methods=['post'], permission_classes=[IsManagerOnly])
+    def cancel(self, request, pk=None):
+        """Cancel a purchase order."""
+        order = self.get_object()
+        
+        if order.status not in ('draft', 'submitted'):
+            return Response(
+                {'error': 'Only draft or submitted orders can be cancelled'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        order.status = 'cancelled'
+        order.save(update_fields=['status'])
+        return Response(PurchaseOrderSerializer(order).data)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List ingredients",
+        description="Retrieve a list of inventory ingredients with stock levels and supplier information.",
+        tags=["Inventory"]
+    ),
+    create=extend_schema(
+        summary="Create ingredient",
+        description="Add a new ingredient to inventory (Kitchen staff only).",
+        tags=["Inventory"]
+    ),
+    retrieve=extend_schema(
+        summary="Get ingredient details",
+        description="Retrieve detailed information about a specific ingredient including stock history.",
+        tags=["Inventory"]
+    ),
+    update=extend_schema(
+        summary="Update ingredient information",
+        description="Update ingredient details and supplier assignments.",
+        tags=["Inventory"]
+    ),
+    partial_update=extend_schema(
+        summary="Partially update ingredient",
+        description="Update specific ingredient fields.",
+        tags=["Inventory"]
+    ),
+    destroy=extend_schema(
+        summary="Delete ingredient",
+        description="Remove an ingredient from inventory (Manager only).",
+        tags=["Inventory"]
+    ),
+)
+class IngredientViewSet(ProtectedDestroyMixin, viewsets.ModelViewSet):
+    """
+    ViewSet for managing restaurant inventory ingredients and stock levels.
+    
+    Provides operations for:
+    - Ingredient catalog management
+    - Stock level tracking and updates
+    - Supplier relationship management
+    - Cost analysis and tracking
+    - Perishable item management
+    """
+    queryset = Ingredient.objects.select_related('supplier').all()
+    permission_classes = [CanManageInventory]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_class = IngredientFilter
+    search_fields = ['name', 'supplier__name', 'category']
+    ordering_fields = ['name', 'current_stock', 'minimum_stock', 'cost_per_unit', 'last_updated']
+    ordering = ['name']
+    protected_error = 'Ingredient has stock history or is used by recipes or orders and cannot be deleted'
+    
+    def _deliver_by(self):
+        """Optional `deliver_by` date query parameter."""
+        value = self.request.query_params.get('deliver_by')
+        if value is None:
+            return None
+        deliver_by = parse_query_date(value)
+        if deliver_by is None:
+            raise ValidationError({'deliver_by': 'Date must be YYYY-MM-DD'})
+        return deliver_by
+    
+    def get_queryset(self):
+        """Annotate the list and best_sources reads with each ingredient's cheapest available source."""
+        queryset = super().get_queryset()
+        if self.action in ('list', 'best_sources'):
+            queryset = sourcing.with_best_source(queryset, self._deliver_by())
+        return queryset
+    
+    def get_serializer_class(self):
+        """Return appropriate serializer based on action."""
+        if self.action == 'list':
+            return IngredientListSerializer
+        elif self.action == 'update_stock':
+            return IngredientStockUpdateSerializer
+        return IngredientSerializer
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        """Record a changed stock level as a ledger adjustment instead of overwriting it."""
+        counted = serializer.validated_data.pop('current_stock', None)
+        ingredient = serializer.save()
+        if counted is not None:
+            stock.adjust_to(ingredient, counted, 'Ingredient edit', get_request_staff(self.request))
+            ingredient.refresh_from_db(fields=['current_stock', 'stock_status'])
+    
+    @extend_schema(
+        summary="Update ingredient stock",
+        description="Set stock to a counted level. The difference is recorded in the stock movement "
+                    "ledger as an adjustment with the given reason.",
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['patch'], 
+            permission_classes=[CanUpdateStock],
+            serializer_class=IngredientStockUpdateSerializer)
+    def update_stock(self, request, pk=None):
+        """Update ingredient stock level."""
+        ingredient = self.get_object()
+        serializer = IngredientStockUpdateSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            stock.adjust_to(
+                ingredient,
+                serializer.validated_data['current_stock'],
+                serializer.validated_data.get('reason', ''),
+                get_request_staff(request),
+            )
+            ingredient.refresh_from_db(fields=['current_stock', 'stock_status'])
+            
+            return Response(IngredientSerializer(ingredient).data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @extend_schema(
+        summary="Get best sources",
+        description="Cheapest available supplier for every ingredient, optionally only suppliers that "
+                    "can deliver by `deliver_by` (YYYY-MM-DD) given lead time and delivery days.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def best_sources(self, request):
+        """Get the cheapest available source for every ingredient."""
+        rows = self.filter_queryset(self.get_queryset()).values(
+            'id', 'name', 'unit_of_measure', *sourcing.BEST_SOURCE_FIELDS
+        )
+        return Response({
+            'deliver_by': self._deliver_by(),
+            'ingredients': list(rows),
+        })
+    
+    def _supplier_param(self):
+        """Optional `supplier` id query parameter selecting a supplier's price series."""
+        value = self.request.query_params.get('supplier')
+        if not value:
+            return None
+        if not value.isdigit():
+            raise ValidationError({'supplier': 'Supplier must be an id'})
+        return int(value)
+    
+    @extend_schema(
+        summary="Get price at date",
+        description="Price in effect at `at` (ISO date or datetime, default now). Pass `supplier` for "
+                    "that supplier's catalog price instead of the ingredient's cost.",
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['get'])
+    def price_at(self, request, pk=None):
+        """Get the price in effect at a point in time."""
+        ingredient = self.get_object()
+        value = request.query_params.get('at')
+        when = timezone.now()
+        if value:
+            day = parse_query_date(value)
+            when = datetime.combine(day, time.max) if day else parse_query_datetime(value)
+            if when is None:
+                return Response({'error': 'at must be an ISO date or datetime'}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(when):
+                when = timezone.make_aware(when)
+        
+        return Response({
+            'ingredient': ingredient.pk,
+            'at': when,
+            'price': pricing.price_at(ingredient, when, self._supplier_param()),
+        })
+    
+    @extend_schema(
+        summary="Get price chart",
+        description="Price series for the last `days` days (default 90), downsampled to at most "
+                    "`points` points (default 200). Pass `supplier` for a supplier's catalog price.",
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['get'])
+    def price_history(self, request, pk=None):
+        """Get a downsampled price series."""
+        ingredient = self.get_object()
+        try:
+            days = min(max(int(request.query_params.get('days', 90)), 1), 3650)
+            points = min(max(int(request.query_params.get('points', 200)), 3), 1000)
+        except ValueError:
+            return Response({'error': 'days and points must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'ingredient': ingredient.pk,
+            'days': days,
+            'points': pricing.chart(ingredient, days, points, self._supplier_param()),
+        })
+    
+    @extend_schema(
+        summary="Get price trends",
+        description="Current price, 30- and 90-day change and daily volatility for the filtered "
+                    "ingredients. Pass `supplier` for supplier catalog prices.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def price_trends(self, request):
+        """Get price trends for ingredients."""
+        ingredient_ids = self.filter_queryset(self.get_queryset()).values_list('pk', flat=True)
+        return Response(pricing.trends(ingredient_ids, self._supplier_param()))
+    
+    @extend_schema(
+        summary="Get low stock ingredients",
+        description="Retrieve ingredients with stock levels below minimum threshold.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def low_stock(self, request):
+        """Get ingredients with stock below minimum level."""
+        low_stock_ingredients = self.get_queryset().filter(
+            pk__in=stock_levels.low_stock_ids()
+        ).order_by('current_stock')
+        
+        serializer = IngredientListSerializer(low_stock_ingredients, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(
+        summary="Get out of stock ingredients",
+        description="Retrieve ingredients that are completely out of stock.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def out_of_stock(self, request):
+        """Get ingredients that are out of stock."""
+        out_of_stock_ingredients = self.get_queryset().filter(
+            pk__in=stock_levels.out_of_stock_ids()
+        ).order_by('name')
+        
+        serializer = IngredientListSerializer(out_of_stock_ingredients, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(
+        summary="Get stock alerts",
+        description="Ingredients currently alerting (reorder, low or out) and alert events after the "
+                    "stream id in `since`. Pass the returned `last_id` as `since`, or follow "
+                    "`alert_stream` instead of polling.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsKitchenStaffOrManager])
+    def alerts(self, request):
+        """Get active stock alerts and recent alert events."""
+        since = request.query_params.get('since', '0')
+        if not is_stream_id(since):
+            return Response({'error': 'since must be a stream id'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        events, last_id = stock_alerts.events(since=since)
+        return Response({
+            'active': [
+                {'ingredient': ingredient_id, 'level': level}
+                for ingredient_id, level in sorted(stock_alerts.active().items())
+            ],
+            'events': events,
+            'last_id': last_id,
+        })
+    
+    @extend_schema(
+        summary="Stream stock alerts",
+        description="Server-sent events (text/event-stream) for stock alerts as they are raised and "
+                    "cleared. Each event carries its stream id; reconnect with Last-Event-ID (or "
+                    "`since`) to resume. The connection closes after a few minutes and clients "
+                    "reconnect.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsKitchenStaffOrManager],
+            renderer_classes=[EventStreamRenderer, JSONRenderer])
+    def alert_stream(self, request):
+        """Stream stock alerts as server-sent events."""
+        since = request.headers.get('Last-Event-ID') or request.query_params.get('since') or '$'
+        if since != '$' and not is_stream_id(since):
+            return Response(
+                {'error': 'Last-Event-ID and since must be stream ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        response = StreamingHttpResponse(stock_alerts.stream(since), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    
+    @extend_schema(
+        summary="Get stock alert counts",
+        description="Numbers of low and out-of-stock ingredients for dashboard badges. Low stock "
+                    "includes ingredients that are out of stock.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def stock_counts(self, request):
+        """Get low and out-of-stock counts."""
+        return Response(stock_levels.counts())
+    
+    @extend_schema(
+        summary="Get stock totals in one unit",
+        description="Total stock of the (filtered) ingredients converted to `unit`, overall and per "
+                    "category. kg and grams, and liters and ml, convert directly; other units use "
+                    "each ingredient's pack and density conversions. Ingredients that cannot be "
+                    "converted are counted in `unconverted` and left out of the totals.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def stock_totals(self, request):
+        """Get stock totals converted to one unit."""
+        unit = request.query_params.get('unit')
+        if unit not in units.UNIT_INDEX:
+            return Response(
+                {'error': f"unit must be one of {', '.join(units.UNITS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(units.stock_totals(unit, self.filter_queryset(Ingredient.objects.all())))
+    
+    @extend_schema(
+        summary="Get perishable ingredients",
+        description="Retrieve all perishable ingredients that require careful stock management, "
+                    "those whose open stock lots expire soonest first.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def perishable(self, request):
+        """Get all perishable ingredients."""
+        perishable_ingredients = self.get_queryset().filter(
+            is_perishable=True
+        ).annotate(
+            next_expiry=Min('lots__expiry_date', filter=Q(lots__quantity_remaining__gt=0))
+        ).order_by(F('next_expiry').asc(nulls_last=True), 'shelf_life_days', 'current_stock')
+        
+        serializer = IngredientListSerializer(perishable_ingredients, many=True)
+        return Response(serializer.data)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List stock movements",
+        description="Retrieve the stock movement ledger. Filter by ingredient, kind or staff.",
+        tags=["Inventory"]
+    ),
+    retrieve=extend_schema(
+        summary="Get stock movement",
+        description="Retrieve a single stock movement.",
+        tags=["Inventory"]
+    ),
+)
+class StockMovementViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for the stock movement ledger.
+    
+    Movements are append-only; a mistake is corrected with another movement.
+    """
+    queryset = StockMovement.objects.select_related('ingredient', 'staff')
+    serializer_class = StockMovementSerializer
+    permission_classes = [CanManageInventory]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['ingredient', 'kind', 'staff']
+    search_fields = ['reason', 'reference', 'ingredient__name']
+    ordering_fields = ['created_at', 'quantity']
+    ordering = ['-created_at']
+    
+    @extend_schema(
+        summary="Record stock movements",
+        description="Apply a batch of receipts, usage, waste, adjustments and transfers in one "
+                    "transaction. Usage and waste are given as positive amounts. The whole batch is "
+                    "rejected if any ingredient would go below zero.",
+        request=StockMovementBatchSerializer,
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['post'], permission_classes=[CanUpdateStock])
+    def batch(self, request):
+        """Apply several stock movements at once."""
+        serializer = StockMovementBatchSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            try:
+                movements = stock.apply_movements(
+                    serializer.validated_data['movements'], staff=get_request_staff(request)
+                )
+            except stock.InsufficientStock as exc:
+                return Response(
+                    {'error': 'Not enough stock', 'ingredients': sorted(exc.ingredient_ids)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return Response(StockMovementSerializer(movements, many=True).data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List recipes",
+        description="Recipes map POS menu codes to the ingredients one batch uses.",
+        tags=["Inventory"]
+    ),
+    create=extend_schema(summary="Create recipe", tags=["Inventory"]),
+    retrieve=extend_schema(summary="Get recipe", tags=["Inventory"]),
+    update=extend_schema(summary="Update recipe", tags=["Inventory"]),
+    partial_update=extend_schema(summary="Partially update recipe", tags=["Inventory"]),
+    destroy=extend_schema(summary="Delete recipe", tags=["Inventory"]),
+)
+class RecipeViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet for recipes (bills of materials).
+    
+    Sales reported by the POS are depleted from stock through the active recipes.
+    """
+    queryset = Recipe.objects.prefetch_related('lines__ingredient')
+    serializer_class = RecipeSerializer
+    permission_classes = [CanManageInventory]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['is_active']
+    search_fields = ['name', 'pos_code']
+    ordering_fields = ['name', 'pos_code', 'updated_at']
+    ordering = ['name']
+    
+    @extend_schema(
+        summary="Deplete stock from POS sales",
+        description="Deduct the ingredients of a batch of sold menu items in one transaction, one "
+                    "usage movement per ingredient. Refunds and voids are sent as negative "
+                    "quantities; ingredients they net back to stock get an adjustment instead. "
+                    "Sales are never refused, so stock may go negative. POS codes without an "
+                    "active recipe are skipped and listed in `unknown_codes`.",
+        request=DepletionSerializer,
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['post'], permission_classes=[CanUpdateStock])
+    def deplete(self, request):
+        """Deplete stock for sold menu items."""
+        serializer = DepletionSerializer(data=request.data)
+        
+        if serializer.is_valid():
+            movements, unknown = depletion.deplete(
+                [(item['pos_code'], item['quantity']) for item in serializer.validated_data['items']],
+                reference=serializer.validated_data.get('reference', ''),
+                staff=get_request_staff(request)
+            )
+            return Response({
+                'movements': StockMovementSerializer(movements, many=True).data,
+                'unknown_codes': unknown,
+            }, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List stock lots",
+        description="Retrieve received stock lots. Filter by ingredient or expiry date; "
+                    "`open=true` keeps lots with stock left.",
+        tags=["Inventory"]
+    ),
+    retrieve=extend_schema(
+        summary="Get stock lot",
+        description="Retrieve a single stock lot.",
+        tags=["Inventory"]
+    ),
+)
+class StockLotViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for stock lots.
+    
+    Lots follow the stock movement ledger and are consumed first-expired-first-out.
+    """
+    queryset = StockLot.objects.select_related('ingredient')
+    serializer_class = StockLotSerializer
+    permission_classes = [CanManageInventory]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = {
+        'ingredient': ['exact'],
+        'expiry_date': ['exact', 'lte', 'gte'],
+    }
+    search_fields = ['ingredient__name', 'reference']
+    ordering_fields = ['expiry_date', 'received_at', 'quantity_remaining']
+    ordering = ['expiry_date', 'received_at']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.query_params.get('open') == 'true':
+            queryset = queryset.filter(quantity_remaining__gt=0)
+        return queryset
+    
+    @extend_schema(
+        summary="Get lots expiring soon",
+        description="Open lots that expire within the next `hours` (default 48), soonest first.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def expiring(self, request):
+        """Get open lots about to expire."""
+        try:
+            hours = int(request.query_params.get('hours', settings.LOT_EXPIRY_WARNING_HOURS))
+        except ValueError:
+            return Response({'error': 'hours must be a whole number'}, status=status.HTTP_400_BAD_REQUEST)
+        if hours < 0:
+            return Response({'error': 'hours cannot be negative'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        expiring_lots = lots.expiring(hours).select_related('ingredient')
+        serializer = self.get_serializer(expiring_lots, many=True)
+        return Response(serializer.data)
+
+
+class ValuationViewSet(viewsets.ViewSet):
+    """
+    ViewSet for inventory valuation under FIFO and weighted-average costing.
+    
+    Served from running valuations kept current with every stock movement.
+    """
+    permission_classes = [IsManagerOnly]
+    
+    @extend_schema(
+        summary="Inventory value on hand",
+        description="Current value of the inventory under FIFO and weighted-average costing, "
+                    "overall and per ingredient category.",
+        tags=["Inventory"]
+    )
+    def list(self, request):
+        """Get the value of the inventory on hand."""
+        return Response(valuation.on_hand())
+    
+    @extend_schema(
+        summary="Inventory value at a point in time",
+        description="Value of the inventory at `at` (ISO date for its end of day, or datetime). "
+                    "Covers the period since valuations were introduced.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def at(self, request):
+        """Get the value of the inventory at a point in time."""
+        value = request.query_params.get('at', '')
+        day = parse_query_date(value)
+        when = timezone.make_aware(datetime.combine(day, time.max)) if day else parse_query_datetime(value)
+        if when is None:
+            return Response({'error': 'at must be an ISO date or datetime'}, status=status.HTTP_400_BAD_REQUEST)
+        if timezone.is_naive(when):
+            when = timezone.make_aware(when)
+        
+        return Response({'at': when, **valuation.value_at(when)})
+    
+    @extend_schema(
+        summary="Cost of goods",
+        description="Cost of stock used and wasted from `date_from` to `date_to` inclusive, "
+                    "under FIFO and weighted-average costing.",
+        tags=["Inventory"]
+    )
+    @action(detail=False, methods=['get'])
+    def cost_of_goods(self, request):
+        """Get the cost of goods used and wasted over a date range."""
+        date_from = parse_query_date(request.query_params.get('date_from', ''))
+        date_to = parse_query_date(request.query_params.get('date_to', ''))
+        
+        if not date_from or not date_to or date_to < date_from:
+            return Response(
+                {'error': 'date_from and date_to are required and date_to must not be before date_from'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        start = timezone.make_aware(datetime.combine(date_from, time.min))
+        end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        return Response({
+            'date_from': date_from,
+            'date_to': date_to,
+            **valuation.cost_of_goods(start, end),
+        })
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List par level suggestions",
+        description="Retrieve stock levels suggested by the nightly demand forecast next to the "
+                    "ingredient's current levels. Filter by status, ingredient or method.",
+        tags=["Inventory"]
+    ),
+    retrieve=extend_schema(
+        summary="Get par level suggestion",
+        description="Retrieve a single par level suggestion.",
+        tags=["Inventory"]
+    ),
+)
+class ParLevelSuggestionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for forecast par level suggestions.
+    
+    Suggestions change nothing until applied to their ingredient.
+    """
+    queryset = ParLevelSuggestion.objects.select_related('ingredient')
+    serializer_class = ParLevelSuggestionSerializer
+    permission_classes = [CanManageInventory]
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['status', 'ingredient', 'method']
+    search_fields = ['ingredient__name']
+    ordering_fields = ['created_at', 'daily_demand', 'forecast_error']
+    ordering = ['-created_at']
+    
+    @extend_schema(
+        summary="Apply par level suggestion",
+        description="Set the ingredient's minimum stock, reorder point and maximum stock to the "
+                    "suggested levels.",
+        request=None,
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['post'])
+    def apply(self, request, pk=None):
+        """Apply a pending suggestion to its ingredient."""
+        suggestion = self.get_object()
+        
+        if suggestion.status != 'pending':
+            return Response(
+                {'error': 'Only pending suggestions can be applied'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        forecasting.apply_suggestion(suggestion)
+        return Response(self.get_serializer(self.get_queryset().get(pk=suggestion.pk)).data)
+    
+    @extend_schema(
+        summary="Dismiss par level suggestion",
+        description="Keep the ingredient's current levels.",
+        request=None,
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['post'])
+    def dismiss(self, request, pk=None):
+        """Dismiss a pending suggestion."""
+        suggestion = self.get_object()
+        
+        if suggestion.status != 'pending':
+            return Response(
+                {'error': 'Only pending suggestions can be dismissed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        suggestion.status = 'dismissed'
+        suggestion.reviewed_at = timezone.now()
+        suggestion.save(update_fields=['status', 'reviewed_at'])
+        return Response(self.get_serializer(suggestion).data)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List stock counts",
+        description="Retrieve physical stock count sessions. Filter by status.",
+        tags=["Inventory"]
+    ),
+    retrieve=extend_schema(
+        summary="Get stock count",
+        description="Retrieve a stock count session with its number of counted lines.",
+        tags=["Inventory"]
+    ),
+)
+class StockCountSessionViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for physical stock counts.
+    
+    Counts are submitted in batches while the session is open and applied to
+    stock together when it closes.
+    """
+    queryset = StockCountSession.objects.select_related('started_by', 'closed_by').annotate(
+        line_count=Count('lines')
+    )
+    serializer_class = StockCountSessionSerializer
+    permission_classes = [CanUpdateStock]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['status']
+    ordering_fields = ['created_at', 'closed_at']
+    ordering = ['-created_at']
+    
+    @extend_schema(
+        summary="Start stock count",
+        description="Open a stock count session for counters to submit counts to.",
+        tags=["Inventory"]
+    )
+    def create(self, request):
+        """Open a stock count session."""
+        serializer = self.get_serializer(data=request.data)
+        
+        if serializer.is_valid():
+            session = serializer.save(started_by=get_request_staff(request))
+            return Response(
+                self.get_serializer(self.get_queryset().get(pk=session.pk)).data,
+                status=status.HTTP_201_CREATED
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @extend_schema(
+        summary="Submit counts",
+        description="Record a batch of counted quantities. Batches can arrive late and from several "
+                    "devices: for each ingredient the count with the latest `counted_at` wins, so a "
+                    "batch can be resent safely. Unknown ingredient ids are returned, not rejected.",
+        request=StockCountBatchSerializer,
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['post'], url_path='counts')
+    def submit_counts(self, request, pk=None):
+        """Submit a batch of counts."""
+        session = self.get_object()
+        serializer = StockCountBatchSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            result = counts.submit(
+                session.pk,
+                serializer.validated_data['counts'],
+                staff=get_request_staff(request),
+                device=serializer.validated_data.get('device', ''),
+            )
+        except counts.CountNotOpen as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+    
+    @extend_schema(
+        summary="Close stock count",
+        description="Set stock to the counted quantities in one transaction, recording an adjustment "
+                    "for every difference, and return the variance report.",
+        request=None,
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['post'])
+    def close(self, request, pk=None):
+        """Apply the counts and close the session."""
+        session = self.get_object()
+        
+        try:
+            session = counts.close(session.pk, staff=get_request_staff(request))
+        except counts.CountNotOpen as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(counts.variance_report(session))
+    
+    @extend_schema(
+        summary="Cancel stock count",
+        description="Discard an open count without changing stock.",
+        request=None,
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """Cancel an open session."""
+        session = self.get_object()
+        
+        try:
+            counts.cancel(session.pk)
+        except counts.CountNotOpen as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(self.get_object()).data)
+    
+    @extend_schema(
+        summary="Get variance report",
+        description="Counted against expected quantity and value per ingredient, largest value first, "
+                    "with shrinkage, overage and net totals. Open counts are previewed against current "
+                    "stock at weighted-average cost.",
+        tags=["Inventory"]
+    )
+    @action(detail=True, methods=['get'])
+    def variance(self, request, pk=None):
+        """Get the variance report of a count."""
+        return Response(counts.variance_report(self.get_object()))
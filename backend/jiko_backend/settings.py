@@ -5,6 +5,7 @@ Django settings for jiko_backend project.
 from pathlib import Path
 from decouple import config, Csv
 from datetime import timedelta
+from celery.schedules import crontab
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -108,6 +109,127 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Africa/Nairobi'
+CELERY_BEAT_SCHEDULE = {
+    'compact-table-status-events': {
+        'task': 'apps.restaurant.tasks.compact_table_status_events',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'fire-table-timers': {
+        'task': 'apps.restaurant.tasks.fire_table_timers',
+        'schedule': timedelta(seconds=15),
+    },
+    'sweep-staff-presence': {
+        'task': 'apps.restaurant.tasks.sweep_staff_presence',
+        'schedule': timedelta(seconds=15),
+    },
+    'snapshot-leaderboards': {
+        'task': 'apps.restaurant.tasks.snapshot_leaderboards',
+        'schedule': crontab(hour=6, minute=30),
+    },
+    'send-supplier-cutoff-reminders': {
+        'task': 'apps.restaurant.tasks.send_supplier_cutoff_reminders',
+        'schedule': crontab(minute='*/15'),
+    },
+    'refresh-supplier-ratings': {
+        'task': 'apps.restaurant.tasks.refresh_supplier_ratings',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'generate-purchase-orders': {
+        'task': 'apps.restaurant.tasks.generate_purchase_orders',
+        'schedule': crontab(minute='*/15'),
+    },
+    'rebuild-stock-level-sets': {
+        'task': 'apps.restaurant.tasks.rebuild_stock_level_sets',
+        'schedule': crontab(minute='*/30'),
+    },
+    'send-stock-alert-digest': {
+        'task': 'apps.restaurant.tasks.send_stock_alert_digest',
+        'schedule': crontab(minute='*/15'),
+    },
+    'sweep-expired-lots': {
+        'task': 'apps.restaurant.tasks.sweep_expired_lots',
+        'schedule': crontab(hour=0, minute=15),
+    },
+    'suggest-par-levels': {
+        'task': 'apps.restaurant.tasks.suggest_par_levels',
+        'schedule': crontab(hour=4, minute=30),
+    },
+}
+
+# Table Analytics Configuration
+TABLE_STATUS_EVENT_RETENTION_DAYS = config('TABLE_STATUS_EVENT_RETENTION_DAYS', default=90, cast=int)
+TABLE_CLEANING_MINUTES = config('TABLE_CLEANING_MINUTES', default=10, cast=int)
+TABLE_RESERVATION_HOLD_MINUTES = config('TABLE_RESERVATION_HOLD_MINUTES', default=15, cast=int)
+# Extra load per occupied seat when balancing servers across sections
+SECTION_OCCUPANCY_WEIGHT = config('SECTION_OCCUPANCY_WEIGHT', default=0.5, cast=float)
+
+# Kitchen Pacing Configuration
+KITCHEN_PACING_SLOT_MINUTES = config('KITCHEN_PACING_SLOT_MINUTES', default=15, cast=int)
+KITCHEN_COVERS_PER_SLOT = config('KITCHEN_COVERS_PER_SLOT', default=40, cast=int)
+
+# Payroll Configuration
+PAYROLL_WEEKLY_REGULAR_HOURS = config('PAYROLL_WEEKLY_REGULAR_HOURS', default=45, cast=float)
+PAYROLL_OVERTIME_MULTIPLIER = config('PAYROLL_OVERTIME_MULTIPLIER', default=1.5, cast=float)
+
+# Shift Scheduling Configuration
+SCHEDULE_MIN_SHIFT_HOURS = config('SCHEDULE_MIN_SHIFT_HOURS', default=4, cast=int)
+SCHEDULE_MAX_SHIFT_HOURS = config('SCHEDULE_MAX_SHIFT_HOURS', default=10, cast=int)
+SCHEDULE_MAX_WEEKLY_HOURS = config('SCHEDULE_MAX_WEEKLY_HOURS', default=45, cast=int)
+
+# Staff Presence Configuration
+# A terminal that misses heartbeats for this long drops its staff member off the floor
+PRESENCE_TTL_SECONDS = config('PRESENCE_TTL_SECONDS', default=45, cast=int)
+
+# Leaderboard Configuration
+# Local hours at which shifts start; e.g. "6,16" for a day and an evening shift
+LEADERBOARD_SHIFT_START_HOURS = config('LEADERBOARD_SHIFT_START_HOURS', default='6,16', cast=Csv(int))
+
+# Supplier Configuration
+# How far ahead of an order cutoff reminders go out
+SUPPLIER_CUTOFF_REMINDER_HOURS = config('SUPPLIER_CUTOFF_REMINDER_HOURS', default=2, cast=float)
+# Trailing weeks of deliveries behind a supplier's quality rating
+SUPPLIER_SCORECARD_WEEKS = config('SUPPLIER_SCORECARD_WEEKS', default=12, cast=int)
+# Price score lost per unit of overcharge rate (5 means 20% over agreed prices scores zero)
+SUPPLIER_PRICE_VARIANCE_PENALTY = config('SUPPLIER_PRICE_VARIANCE_PENALTY', default=5, cast=float)
+
+# Purchasing Configuration
+# Order-up-to level as a multiple of minimum stock when maximum_stock is unset
+PURCHASING_TARGET_MULTIPLIER = config('PURCHASING_TARGET_MULTIPLIER', default=2, cast=float)
+# Draft orders are regenerated for suppliers whose cutoff falls within this window
+PURCHASING_LOOKAHEAD_HOURS = config('PURCHASING_LOOKAHEAD_HOURS', default=3, cast=float)
+
+# Inventory Alert Configuration
+# Fraction above a threshold stock must reach before its alert clears
+STOCK_ALERT_HYSTERESIS = config('STOCK_ALERT_HYSTERESIS', default=0.1, cast=float)
+# How long one server-sent event connection stays open before the client reconnects
+STOCK_ALERT_STREAM_SECONDS = config('STOCK_ALERT_STREAM_SECONDS', default=300, cast=int)
+# Roles of active staff emailed the periodic alert digest
+STOCK_ALERT_DIGEST_ROLES = config(
+    'STOCK_ALERT_DIGEST_ROLES', default='general_manager,head_chef,sous_chef', cast=Csv()
+)
+
+# Stock Lot Configuration
+# Window of the expiring-lots list
+LOT_EXPIRY_WARNING_HOURS = config('LOT_EXPIRY_WARNING_HOURS', default=48, cast=int)
+# Expired lots written off per transaction by the nightly sweep
+LOT_SWEEP_BATCH_SIZE = config('LOT_SWEEP_BATCH_SIZE', default=500, cast=int)
+
+# Demand Forecast Configuration
+# Days of usage history the forecast is fitted to
+FORECAST_HISTORY_DAYS = config('FORECAST_HISTORY_DAYS', default=730, cast=int)
+# Chance of not running out between deliveries the safety stock is sized for
+FORECAST_SERVICE_LEVEL = config('FORECAST_SERVICE_LEVEL', default=0.95, cast=float)
+# Ingredients fitted at a time, bounding the forecast's working memory
+FORECAST_CHUNK_ITEMS = config('FORECAST_CHUNK_ITEMS', default=5000, cast=int)
+
+# Tip Pool Configuration
+# Points per hour worked; roles not listed do not share in the pool
+TIP_POOL_ROLE_WEIGHTS = {
+    'server': config('TIP_WEIGHT_SERVER', default=1.0, cast=float),
+    'bartender': config('TIP_WEIGHT_BARTENDER', default=1.0, cast=float),
+    'busser': config('TIP_WEIGHT_BUSSER', default=0.5, cast=float),
+    'host': config('TIP_WEIGHT_HOST', default=0.5, cast=float),
+}
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
@@ -182,6 +304,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Email Configuration
+EMAIL_HOST = config('EMAIL_HOST', default='')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+# Mail is printed to the console until an SMTP host is configured
+EMAIL_BACKEND = (
+    'django.core.mail.backends.smtp.EmailBackend' if EMAIL_HOST
+    else 'django.core.mail.backends.console.EmailBackend'
+)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@jikomilele.local')
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'Africa/Nairobi'